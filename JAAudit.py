@@ -117,6 +117,8 @@ def JAHelp():
             Takes the environment snapshot by carrying out instructions in <baseConfigFile>.<subsystem>.compare.yml
             It is like save except, it will save the environment in BackupYYYYMMDD directory under 'LocalRepositoryHome'
             It will also delete expired backup directories based on duration specified by parameter 'BackupRetencyDurationInDays'
+            If 'BackupObjectStore' is True, contents are saved once in object store under 'LocalRepositoryHome' and 
+                hardlinked from BackupYYYYMMDD directory. Contents not referenced by any unexpired backup are deleted.
 
         If called with operation 'cert'
             Checks the start and end dates, DNS alias of certificates specified in <baseConfigFile>.<subsystem>.cert.yml file.
@@ -1024,8 +1026,8 @@ if (re.search(r"sync", operations) and re.search(r"nosync", operations) == None)
                         defaultParameters, connectivitySpec, OSType, OSName, OSVersion, interactiveMode, debugLevel)
                     if passCount != 1:
                         JAGlobalLib.LogLine(
-                            "ERROR JAAudit() connectivity check to rsync port:{0} on SCMHostName:{1} FAILED".format(
-                                    defaultParameters['SCMPortRsync'], SCMHostName ), 
+                            "ERROR JAAudit() connectivity check to rsync port:{0} on SCMHostName:{1} FAILED, details:{2}".format(
+                                    defaultParameters['SCMPortRsync'], SCMHostName, detailedResults ), 
                                     interactiveMode,
                                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
                         
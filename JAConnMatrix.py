@@ -0,0 +1,375 @@
+#!/usr/bin/python3
+
+"""
+Builds connectivity matrix on SCM host from conn reports uploaded by all hosts
+Conn reports JAAudit.conn.YYYYMMDD are saved by JAUploadWS.py under <DocumentRoot>/<savePath>/<hostName>/
+
+Matrix has one cell per source host, destination host and port, holding the latest outcome of connectivity check.
+Cells are stored in parallel arrays (sparse, coordinate form) with host names interned to integer ids,
+    and indexed by destination and by source so that queries like 'which sources fail to reach X'
+    do not need to scan all cells.
+Matrix is saved to matrix file along with bytes read from each report, when run again, only the
+    contents appended to reports since last run and new reports are read.
+
+Parameters passed
+    -d <uploadRoot> - optional, directory under which uploaded reports are present, defaults to JADocumentRoot
+    -m <matrixFileName> - optional, defaults to <uploadRoot>/JAConnMatrix.json
+    -t <destinationHost> - optional, show cells to this destination host
+    -s <sourceHost> - optional, show cells from this source host
+    -p <port> - optional, show cells of this port only
+    -a yes - optional, show passed cells also, by default only failed cells are shown
+    -r yes - optional, rebuild the matrix by reading all reports again
+    -D <debugLevel> - optional, 0 no debug, 1,2,3, 3 highest level
+
+Examples
+    python3 JAConnMatrix.py  <-- read new reports, update matrix, print all failed connections
+    python3 JAConnMatrix.py -t db01 <-- which sources fail to reach db01
+    python3 JAConnMatrix.py -s app01 -a yes <-- all connections checked from app01
+
+Output has 'Reverse' column, indicating the outcome of checks from destination host to source host
+    so that A to B failure can be correlated with B to A in one place.
+
+"""
+
+import os
+import sys
+import re
+import json
+import datetime
+from array import array
+import JAGlobalLib
+
+### root path on web server where uploaded files are stored, same as in JAUploadWS.py
+JADocumentRoot = '/var/www/JaaduAudit/'
+JAMatrixFileName = 'JAConnMatrix.json'
+
+### outcome stored in matrix cell as index to this list, refer to JAGlobalLib.JAClassifyConnectivityOutput()
+JAMatrixOutcomes = ['PASS', 'REFUSED', 'DNS', 'TIMEOUT', 'FAILED', 'UNKNOWN']
+
+def JAMatrixNew():
+    """
+    JAMatrixNew()
+
+    Returns empty matrix
+        Hosts - host names, position is host id
+        HostIndex - host name to host id
+        Sources, Destinations, Ports, Outcomes, TimeStamps - parallel arrays, one entry per cell
+        CellIndex - (source id, destination id, port) to cell position
+        DestinationCells, SourceCells - host id to cell positions
+        FileOffsets - report file name to bytes read from that file
+    """
+    return {
+        'Hosts': [], 'HostIndex': {},
+        'Sources': array('I'), 'Destinations': array('I'), 'Ports': array('I'),
+        'Outcomes': array('B'), 'TimeStamps': array('d'),
+        'CellIndex': {}, 'DestinationCells': {}, 'SourceCells': {},
+        'FileOffsets': {} }
+
+def JAMatrixHostId( matrix, hostName:str ):
+    """
+    JAMatrixHostId( matrix, hostName:str )
+
+    Returns id of hostName, adds it to the matrix if not present
+    """
+    if hostName not in matrix['HostIndex']:
+        matrix['HostIndex'][hostName] = len(matrix['Hosts'])
+        matrix['Hosts'].append( hostName )
+    return matrix['HostIndex'][hostName]
+
+def JAMatrixAddCellIndex( matrix, cell:int ):
+    """
+    JAMatrixAddCellIndex( matrix, cell:int )
+
+    Adds the cell to CellIndex, DestinationCells and SourceCells
+    """
+    sourceId = matrix['Sources'][cell]
+    destinationId = matrix['Destinations'][cell]
+    matrix['CellIndex'][(sourceId, destinationId, matrix['Ports'][cell])] = cell
+    if destinationId not in matrix['DestinationCells']:
+        matrix['DestinationCells'][destinationId] = array('I')
+    matrix['DestinationCells'][destinationId].append( cell )
+    if sourceId not in matrix['SourceCells']:
+        matrix['SourceCells'][sourceId] = array('I')
+    matrix['SourceCells'][sourceId].append( cell )
+
+def JAMatrixUpdate( matrix, sourceHost:str, destinationHost:str, port:int, outcome:str, timeStamp:float ):
+    """
+    JAMatrixUpdate( matrix, sourceHost:str, destinationHost:str, port:int, outcome:str, timeStamp:float )
+
+    Saves outcome of the check from sourceHost to destinationHost port in matrix.
+    Existing cell is updated only when the given check is same age or newer than the one in the cell.
+    """
+    sourceId = JAMatrixHostId( matrix, sourceHost )
+    destinationId = JAMatrixHostId( matrix, destinationHost )
+    outcomeId = JAMatrixOutcomes.index( outcome )
+    cellKey = (sourceId, destinationId, port)
+    if cellKey in matrix['CellIndex']:
+        cell = matrix['CellIndex'][cellKey]
+        if timeStamp >= matrix['TimeStamps'][cell]:
+            matrix['Outcomes'][cell] = outcomeId
+            matrix['TimeStamps'][cell] = timeStamp
+    else:
+        matrix['Sources'].append( sourceId )
+        matrix['Destinations'].append( destinationId )
+        matrix['Ports'].append( port )
+        matrix['Outcomes'].append( outcomeId )
+        matrix['TimeStamps'].append( timeStamp )
+        JAMatrixAddCellIndex( matrix, len(matrix['Sources']) - 1 )
+
+def JAMatrixSaveResult( matrix, sourceHost:str, timeStamp:float, result ):
+    """
+    JAMatrixSaveResult( matrix, sourceHost:str, timeStamp:float, result )
+
+    Saves result of single host and port parsed from conn report to the matrix.
+    Overall result of the service and results with port range or host list are skipped.
+
+    Returned values
+        True if saved, else False
+    """
+    if sourceHost == None or 'Name' not in result or 'Port' not in result or 'Details' not in result:
+        return False
+    if re.match(r'Overall Result', result['Details']) or re.match(r'^\d+$', result['Port']) == None:
+        return False
+    if result.get('Outcome') in JAMatrixOutcomes:
+        outcome = result['Outcome']
+    else:
+        ### reports written before outcome was recorded
+        outcome = JAGlobalLib.JAClassifyConnectivityOutput( result['Details'] )
+    JAMatrixUpdate( matrix, sourceHost, result['Name'].strip(), int(result['Port']), outcome, timeStamp )
+    return True
+
+def JAMatrixReadReport( matrix, reportFileName:str, debugLevel:int ):
+    """
+    JAMatrixReadReport( matrix, reportFileName:str, debugLevel:int )
+
+    Reads conn report in one pass from the offset read last time and saves results in the matrix.
+    Conn reports are written in append mode, each run starting with TimeStamp line,
+        so the contents after saved offset start with new run.
+    If the report is smaller than saved offset, report is replaced, read from the beginning.
+
+    Returned values
+        numberOfResults - number of results saved in matrix
+    """
+    numberOfResults = 0
+    fileOffset = matrix['FileOffsets'].get( reportFileName, 0 )
+    try:
+        if os.path.getsize( reportFileName ) < fileOffset:
+            fileOffset = 0
+        reportFile = open( reportFileName, 'rb' )
+    except OSError as err:
+        print("ERROR JAMatrixReadReport() Can't read report:{0}, error:{1}".format( reportFileName, err ))
+        return numberOfResults
+
+    sourceHost = None
+    timeStamp = os.path.getmtime( reportFileName )
+    result = {}
+    with reportFile:
+        reportFile.seek( fileOffset )
+        for rawLine in reportFile:
+            fileOffset += len(rawLine)
+            line = rawLine.decode('utf-8', errors='replace').rstrip()
+            strippedLine = line.strip()
+            if strippedLine.startswith('- Name:') or strippedLine.startswith('TimeStamp:') \
+                or strippedLine in ['Summary:', 'ListenPorts:'] or re.match(r'^ {8}\S.*:$', line):
+                ### start of next result, next run, or end of results of a service
+                if JAMatrixSaveResult( matrix, sourceHost, timeStamp, result ) == True:
+                    numberOfResults += 1
+                result = {}
+
+            if strippedLine.startswith('TimeStamp:'):
+                sourceHost = None
+                try:
+                    timeStamp = datetime.datetime.strptime(
+                        strippedLine[10:].strip()[:26], "%Y-%m-%dT%H:%M:%S.%f" ).replace(
+                        tzinfo=datetime.timezone.utc ).timestamp()
+                except ValueError:
+                    timeStamp = os.path.getmtime( reportFileName )
+            elif strippedLine.startswith('HostName:'):
+                sourceHost = strippedLine[9:].strip()
+            elif strippedLine.startswith('- Name:'):
+                result['Name'] = strippedLine[7:].strip()
+            elif len(result) > 0:
+                fieldMatch = re.match(r'(Port|Result|Details|Outcome):\s?(.*)', strippedLine)
+                if fieldMatch != None:
+                    result[fieldMatch.group(1)] = fieldMatch.group(2).strip()
+
+    if JAMatrixSaveResult( matrix, sourceHost, timeStamp, result ) == True:
+        numberOfResults += 1
+    matrix['FileOffsets'][reportFileName] = fileOffset
+    if debugLevel > 1:
+        print("DEBUG-2 JAMatrixReadReport() report:{0}, results saved:{1}, bytes read till:{2}".format(
+            reportFileName, numberOfResults, fileOffset))
+    return numberOfResults
+
+def JAMatrixScanReports( matrix, uploadRoot:str, debugLevel:int ):
+    """
+    JAMatrixScanReports( matrix, uploadRoot:str, debugLevel:int )
+
+    Finds conn reports under uploadRoot and reads new contents of those into the matrix.
+    Reports are read in the order of date in file name so that latest result stays in the matrix.
+
+    Returned values
+        numberOfReports - reports having new contents
+        numberOfResults - results saved in matrix
+    """
+    reportFileNames = []
+    for dirPath, dirNames, fileNames in os.walk( uploadRoot ):
+        for fileName in fileNames:
+            if re.match(r'JAAudit\.conn\.\d{8}$', fileName):
+                reportFileNames.append( os.path.join( dirPath, fileName ) )
+    reportFileNames.sort( key=lambda reportFileName: (os.path.basename(reportFileName), reportFileName) )
+
+    numberOfReports = numberOfResults = 0
+    for reportFileName in reportFileNames:
+        try:
+            if os.path.getsize( reportFileName ) == matrix['FileOffsets'].get( reportFileName, -1 ):
+                ### no new contents since last run
+                continue
+        except OSError:
+            continue
+        numberOfReports += 1
+        numberOfResults += JAMatrixReadReport( matrix, reportFileName, debugLevel )
+    return numberOfReports, numberOfResults
+
+def JAMatrixWrite( matrix, matrixFileName:str ):
+    """
+    JAMatrixWrite( matrix, matrixFileName:str )
+
+    Saves matrix arrays and report offsets to matrixFileName, indexes are rebuilt while reading.
+    File is written to temporary file first and renamed so that partially written matrix is never read.
+
+    Returned values
+        returnStatus, errorMsg
+    """
+    matrixData = {
+        'Hosts': matrix['Hosts'],
+        'Sources': matrix['Sources'].tolist(),
+        'Destinations': matrix['Destinations'].tolist(),
+        'Ports': matrix['Ports'].tolist(),
+        'Outcomes': matrix['Outcomes'].tolist(),
+        'TimeStamps': matrix['TimeStamps'].tolist(),
+        'FileOffsets': matrix['FileOffsets'] }
+    try:
+        with open( matrixFileName + '.tmp', 'w' ) as matrixFile:
+            json.dump( matrixData, matrixFile, separators=(',', ':') )
+        os.replace( matrixFileName + '.tmp', matrixFileName )
+    except OSError as err:
+        return False, "ERROR JAMatrixWrite() Can't write matrix file:{0}, error:{1}".format( matrixFileName, err )
+    return True, ''
+
+def JAMatrixRead( matrixFileName:str ):
+    """
+    JAMatrixRead( matrixFileName:str )
+
+    Reads matrix saved by JAMatrixWrite() and rebuilds indexes.
+    Returns empty matrix if file is not present or not readable.
+    """
+    matrix = JAMatrixNew()
+    if os.path.exists( matrixFileName ) == False:
+        return matrix
+    try:
+        with open( matrixFileName, 'r' ) as matrixFile:
+            matrixData = json.load( matrixFile )
+        matrix['Hosts'] = matrixData['Hosts']
+        matrix['Sources'] = array('I', matrixData['Sources'])
+        matrix['Destinations'] = array('I', matrixData['Destinations'])
+        matrix['Ports'] = array('I', matrixData['Ports'])
+        matrix['Outcomes'] = array('B', matrixData['Outcomes'])
+        matrix['TimeStamps'] = array('d', matrixData['TimeStamps'])
+        matrix['FileOffsets'] = matrixData['FileOffsets']
+    except (OSError, ValueError, KeyError) as err:
+        print("WARN JAMatrixRead() Can't read matrix file:{0}, error:{1}, rebuilding the matrix".format( matrixFileName, err ))
+        return JAMatrixNew()
+
+    for hostId, hostName in enumerate( matrix['Hosts'] ):
+        matrix['HostIndex'][hostName] = hostId
+    for cell in range( len(matrix['Sources']) ):
+        JAMatrixAddCellIndex( matrix, cell )
+    return matrix
+
+def JAMatrixReverseOutcome( matrix, sourceId:int, destinationId:int ):
+    """
+    JAMatrixReverseOutcome( matrix, sourceId:int, destinationId:int )
+
+    Returns outcome of checks from destinationId to sourceId on any port
+        PASS when all checks passed, FAIL when at least one failed, '-' when not checked
+    """
+    reverseOutcome = '-'
+    for cell in matrix['SourceCells'].get( destinationId, [] ):
+        if matrix['Destinations'][cell] == sourceId:
+            if matrix['Outcomes'][cell] != 0:
+                return 'FAIL'
+            reverseOutcome = 'PASS'
+    return reverseOutcome
+
+def JAMatrixQuery( matrix, sourceHost:str, destinationHost:str, port:int, failuresOnly:bool ):
+    """
+    JAMatrixQuery( matrix, sourceHost:str, destinationHost:str, port:int, failuresOnly:bool )
+
+    Returns cells matching given source host, destination host and port, None to match any.
+    Index of destination or source is used when those are given.
+
+    Returned values
+        list of (sourceHost, destinationHost, port, outcome, timeStamp, reverseOutcome)
+    """
+    if destinationHost != None:
+        if destinationHost not in matrix['HostIndex']:
+            return []
+        cells = matrix['DestinationCells'].get( matrix['HostIndex'][destinationHost], [] )
+    elif sourceHost != None:
+        if sourceHost not in matrix['HostIndex']:
+            return []
+        cells = matrix['SourceCells'].get( matrix['HostIndex'][sourceHost], [] )
+    else:
+        cells = range( len(matrix['Sources']) )
+
+    queryResults = []
+    for cell in cells:
+        sourceId = matrix['Sources'][cell]
+        destinationId = matrix['Destinations'][cell]
+        if sourceHost != None and matrix['Hosts'][sourceId] != sourceHost:
+            continue
+        if port != None and matrix['Ports'][cell] != port:
+            continue
+        if failuresOnly == True and matrix['Outcomes'][cell] == 0:
+            continue
+        queryResults.append( (
+            matrix['Hosts'][sourceId], matrix['Hosts'][destinationId], matrix['Ports'][cell],
+            JAMatrixOutcomes[ matrix['Outcomes'][cell] ], matrix['TimeStamps'][cell],
+            JAMatrixReverseOutcome( matrix, sourceId, destinationId ) ) )
+    queryResults.sort()
+    return queryResults
+
+if __name__ == '__main__':
+    argsPassed = {}
+    JAGlobalLib.JAParseArgs(argsPassed)
+
+    debugLevel = int( argsPassed.get('-D', 0) )
+    uploadRoot = argsPassed.get('-d', JADocumentRoot)
+    matrixFileName = argsPassed.get('-m', os.path.join( uploadRoot, JAMatrixFileName ))
+    if '-p' in argsPassed:
+        queryPort = int( argsPassed['-p'] )
+    else:
+        queryPort = None
+    failuresOnly = JAGlobalLib.JAParseBool( argsPassed.get('-a'), False ) == False
+
+    if JAGlobalLib.JAParseBool( argsPassed.get('-r'), False ) == True:
+        matrix = JAMatrixNew()
+    else:
+        matrix = JAMatrixRead( matrixFileName )
+
+    numberOfReports, numberOfResults = JAMatrixScanReports( matrix, uploadRoot, debugLevel )
+    returnStatus, errorMsg = JAMatrixWrite( matrix, matrixFileName )
+    if returnStatus == False:
+        print( errorMsg )
+
+    print("INFO JAConnMatrix() Reports read:{0}, results saved:{1}, hosts:{2}, cells:{3}, failed cells:{4}".format(
+        numberOfReports, numberOfResults, len(matrix['Hosts']), len(matrix['Sources']),
+        sum( 1 for outcomeId in matrix['Outcomes'] if outcomeId != 0 ) ))
+
+    print("{0:8s} {1:24s} {2:24s} {3:6s} {4:7s} {5}".format( 'Outcome', 'Source', 'Destination', 'Port', 'Reverse', 'TimeStamp' ))
+    for sourceHost, destinationHost, port, outcome, timeStamp, reverseOutcome in JAMatrixQuery(
+            matrix, argsPassed.get('-s'), argsPassed.get('-t'), queryPort, failuresOnly ):
+        print("{0:8s} {1:24s} {2:24s} {3:<6d} {4:7s} {5}".format(
+            outcome, sourceHost, destinationHost, port, reverseOutcome,
+            datetime.datetime.fromtimestamp( timeStamp, datetime.timezone.utc ).strftime("%Y-%m-%dT%H:%M:%S") ))
@@ -74,6 +74,8 @@ def JARun(
     else:
         # This is the child process
         os.close(readDescriptor)
+        ### process table snapshot taken by previous operation is not valid for current operation
+        JAGlobalLib.JAInvalidateProcessSnapshot()
         returnStatus = False
         if operation == 'save' or operation == 'backup':
             returnStatus, errorMsg = JAOperationSaveCompare.JAOperationSaveCompare(
@@ -3,6 +3,7 @@
 
     GetGMTTime() - returns string with current GMT time the form YYYY/MM/DD hh:mm:ss.sss
     JAYamlLoad(fileName) - reads the yaml file, returns data in dictionary
+    JAYamlParseFlowMapping(paramValue) - converts flow mapping value { key: value } to dictionary
 
     Author: havembha@gmail.com, 2021-06-28
 """
@@ -11,9 +12,26 @@ import platform
 import re
 import sys
 import os
+import struct
 import time
 
-JACPUUsageFileName = 'JACPUUsage.data'
+### process table snapshot and index by process name, built once per run by JAGetProcessSnapshot()
+JAProcessSnapshot = None
+JAProcessNameIndex = None
+
+### health metrics history, ring buffer of fixed width records, replaces JACPUUsage.data
+JAHealthMetricsFileName = 'JAHealthMetrics.data'
+JAHealthMetricsHistorySize = 1440
+### LogFilePath of current run, set by JAReadEnvironmentConfig(), used when health metrics file name is not passed
+JALogFilePath = '.'
+JAHealthMetricNames = [
+    'TimeStamp', 'CPUUsage', 'CPUTotalTicks', 'CPUIdleTicks', 'Load1', 'Load5', 'Load15',
+    'ProcessesRunning', 'ProcessesTotal', 'MemTotalMB', 'MemAvailableMB', 'MemUsedPercent', 'SwapUsedPercent',
+    'DiskUsedPercent', 'SelfCPUSeconds', 'SelfRSSMB' ]
+### magic, number of fields, capacity, count of records, index of next record to write
+JAHealthMetricsMagic = b'JAHM'
+JAHealthMetricsHeader = struct.Struct('<4sIIII')
+JAHealthMetricsRecord = struct.Struct('<{0}d'.format( len(JAHealthMetricNames) ))
 
 def UTCDateTime():
     return datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f%Z")
@@ -317,6 +335,38 @@ def LogLine(myLines, tempPrintLine, myColors, colorIndex:int, outputFile:str, HT
         if tempPrintLine == True:
             print( line )
 
+def JAYamlParseFlowMapping( paramValue:str ):
+    """
+    JAGlobalLib.JAYamlParseFlowMapping( paramValue:str )
+
+    Converts single line flow mapping like { ProcessCmdLine: 'JAGatherOSStats.py' } to dictionary
+    Used by JAYamlLoad() so that values written in flow form are returned same as yaml.safe_load()
+      Only scalar values are supported, quotes around key or value are removed.
+
+    Returns dictionary if paramValue is a flow mapping, else returns paramValue as is
+    """
+    flowMatch = re.fullmatch(r'\{(.*)\}\s*', paramValue)
+    if flowMatch == None or len(flowMatch.group(1).strip()) == 0:
+        return paramValue
+    flowMapping = {}
+    keyValuePattern = re.compile(
+        r'\s*(\'[^\']*\'|"[^"]*"|[^:,\'"]+?)\s*:\s*(\'[^\']*\'|"[^"]*"|[^,\'"]*?)\s*(,|$)' )
+    position = 0
+    flowItems = flowMatch.group(1).strip()
+    while position < len(flowItems):
+        keyValueMatch = keyValuePattern.match( flowItems, position )
+        if keyValueMatch == None or keyValueMatch.end() == position:
+            ### not a simple flow mapping, leave it as string
+            return paramValue
+        key, value = keyValueMatch.group(1), keyValueMatch.group(2)
+        if len(key) > 1 and key[0] == key[-1] and key[0] in '\'"':
+            key = key[1:-1]
+        if len(value) > 1 and value[0] == value[-1] and value[0] in '\'"':
+            value = value[1:-1]
+        flowMapping[key] = value
+        position = keyValueMatch.end()
+    return flowMapping
+
 def JAYamlLoad(fileName:str ):
     """
     JAGlobalLib.JAYamlLoad(fileName:str )
@@ -363,6 +413,8 @@ def JAYamlLoad(fileName:str ):
                 params = lstripLine.split(':', 1)
                 ## remove leading space from value field
                 params[1] = params[1].lstrip()
+                ### value in flow mapping form is returned as dictionary
+                params[1] = JAYamlParseFlowMapping( params[1] )
 
                 # based on leading spaces, determine depth
                 leadingSpaces = len(tempLine)-len(lstripLine)
@@ -638,90 +690,280 @@ def JAGetOSType():
     """
     return platform.system()
 
-def JAWriteCPUUsageHistory( CPUUsage:int, logFileName=None, debugLevel=0):
+def JAReadCPUTicks():
+    """
+    JAGlobalLib.JAReadCPUTicks()
+
+    Returns total and idle (including iowait) CPU ticks since boot from /proc/stat
     """
-    JAGlobalLib.JAWriteCPUUsageHistory( CPUUsage:int, logFileName=None, debugLevel=0)
+    with open('/proc/stat', 'r') as file:
+        ### cpu  user nice system idle iowait irq softirq steal ...
+        ticks = [ int(value) for value in file.readline().split()[1:9] ]
+    return float(sum(ticks)), float(ticks[3] + ticks[4])
 
-    Write CPU usage data to given file name
-    Keep 10 sample values
+def JAGetHealthMetrics( previousSample=None ):
+    """
+    JAGlobalLib.JAGetHealthMetrics( previousSample=None )
 
-    First line has the average value of max 10 samples 
-    Rest of the lines have values of 10 samples, current CPUUsage passed as last line
+    Collects host health metrics natively on Linux from /proc/stat, /proc/loadavg, /proc/meminfo 
+        and statvfs of root file system, without executing top, free, df, uptime commands.
+    CPUUsage is computed from CPU ticks of previousSample (dictionary returned by earlier call or read from history)
+        If previousSample is not available, CPU ticks are read twice with a short wait
 
-    Returns True up on success, False if file could not be opened
+    Returned values:
+        returnStatus - True on success
+        metrics - dictionary with keys in JAHealthMetricNames
+        errorMsg - error message
     """
-    historyCPUUsage, average = JAReadCPUUsageHistory() 
-    if historyCPUUsage == None:
-        # first time, start with empty list
-        historyCPUUsage = []
-    else:
-        if len( historyCPUUsage ) == 10:
-            # history has 10 samples, drop the oldest sample
-            historyCPUUsage.pop(0)
+    metrics = dict.fromkeys( JAHealthMetricNames, float('nan'))
+    metrics['TimeStamp'] = time.time()
+    try:
+        metrics['CPUTotalTicks'], metrics['CPUIdleTicks'] = JAReadCPUTicks()
+        if previousSample == None or not previousSample['CPUTotalTicks'] < metrics['CPUTotalTicks']:
+            ### no previous sample or host rebooted since, take another sample after short wait
+            previousTotal, previousIdle = metrics['CPUTotalTicks'], metrics['CPUIdleTicks']
+            time.sleep(0.25)
+            metrics['CPUTotalTicks'], metrics['CPUIdleTicks'] = JAReadCPUTicks()
+        else:
+            previousTotal, previousIdle = previousSample['CPUTotalTicks'], previousSample['CPUIdleTicks']
+        deltaTotal = metrics['CPUTotalTicks'] - previousTotal
+        if deltaTotal > 0:
+            metrics['CPUUsage'] = round( 100.0 * (deltaTotal - (metrics['CPUIdleTicks'] - previousIdle)) / deltaTotal, 2)
+
+        with open('/proc/loadavg', 'r') as file:
+            ### 0.52 0.58 0.59 2/1234 56789
+            loadFields = file.readline().split()
+        metrics['Load1'], metrics['Load5'], metrics['Load15'] = [ float(value) for value in loadFields[0:3] ]
+        metrics['ProcessesRunning'], metrics['ProcessesTotal'] = [ float(value) for value in loadFields[3].split('/') ]
+
+        memInfo = {}
+        with open('/proc/meminfo', 'r') as file:
+            for line in file:
+                ### MemTotal:       16318480 kB
+                fields = line.split()
+                memInfo[fields[0].rstrip(':')] = int(fields[1])
+        metrics['MemTotalMB'] = round( memInfo['MemTotal'] / 1024, 2)
+        memAvailable = memInfo.get('MemAvailable', memInfo['MemFree'] + memInfo.get('Buffers', 0) + memInfo.get('Cached', 0))
+        metrics['MemAvailableMB'] = round( memAvailable / 1024, 2)
+        metrics['MemUsedPercent'] = round( 100.0 * (memInfo['MemTotal'] - memAvailable) / memInfo['MemTotal'], 2)
+        if memInfo.get('SwapTotal', 0) > 0:
+            metrics['SwapUsedPercent'] = round( 100.0 * (memInfo['SwapTotal'] - memInfo['SwapFree']) / memInfo['SwapTotal'], 2)
+        else:
+            metrics['SwapUsedPercent'] = 0.0
+
+        returnStatus, metrics['DiskUsedPercent'], errorMsg = JAGetDiskUsedPercent('/')
+
+        with open('/proc/self/stat', 'r') as file:
+            ### fields after process name in (), utime and stime are 12th and 13th fields after it
+            selfStatFields = file.readline().rsplit(')', 1)[1].split()
+        metrics['SelfCPUSeconds'] = round( (int(selfStatFields[11]) + int(selfStatFields[12])) / os.sysconf('SC_CLK_TCK'), 2)
+        metrics['SelfRSSMB'] = round( int(selfStatFields[21]) * os.sysconf('SC_PAGE_SIZE') / 1048576, 2)
 
-    # append current CPU Usage to the list
-    historyCPUUsage.append( float(CPUUsage) )
-    average = sum(historyCPUUsage) / len( historyCPUUsage)
+    except (OSError, ValueError, IndexError, KeyError, AttributeError) as err:
+        return False, metrics, "ERROR JAGetHealthMetrics() Can't collect health metrics, error:{0}".format(err)
+    return True, metrics, ''
 
+def JAGetDiskUsedPercent( pathName:str ):
+    """
+    JAGlobalLib.JAGetDiskUsedPercent( pathName:str )
+
+    Returns used percentage of the file system having pathName, same as Use% of df command
+
+    Returned values:
+        returnStatus - True on success
+        usedPercent - used percentage
+        errorMsg - error message
+    """
     try:
-        with open( JACPUUsageFileName, "w") as file:
-            file.write( '{:.2f}\n'.format( average) )
-            for value in historyCPUUsage:
-                file.write('{:.2f}\n'.format( value ))
-            file.close()
-            return True
+        fileSystemStat = os.statvfs( pathName )
+    except (OSError, AttributeError) as err:
+        return False, float('nan'), "ERROR JAGetDiskUsedPercent() Can't get file system stats of:|{0}|, error:{1}".format(pathName, err)
+    usedBlocks = fileSystemStat.f_blocks - fileSystemStat.f_bfree
+    availableBlocks = usedBlocks + fileSystemStat.f_bavail
+    if availableBlocks == 0:
+        return True, 0.0, ''
+    return True, round( 100.0 * usedBlocks / availableBlocks, 2), ''
 
-    except OSError as err:
-        errorMsg = 'ERROR - JAWriteCPUUsageStats() Can not open file: {0} to save CPU usage info, error:{1}\n'.format(
-             JACPUUsageFileName, err)
+def JAWriteHealthMetricsHistory( fileName:str, metrics:dict, historySize=JAHealthMetricsHistorySize ):
+    """
+    JAGlobalLib.JAWriteHealthMetricsHistory( fileName:str, metrics:dict, historySize=JAHealthMetricsHistorySize )
+
+    Writes metrics as fixed width record to the ring buffer file, oldest record is overwritten once historySize records are written.
+    File is memory mapped, only the record and header are written, file is not rewritten.
+    File is created (or re-created if layout changed) with historySize records.
+
+    Returned values:
+        returnStatus - True on success
+        errorMsg - error message
+    """
+    import mmap
+    recordStruct = JAHealthMetricsRecord
+    fileSize = JAHealthMetricsHeader.size + recordStruct.size * historySize
+    try:
+        if os.path.exists( fileName ) == False or os.path.getsize( fileName ) != fileSize:
+            with open( fileName, 'wb') as file:
+                file.write( JAHealthMetricsHeader.pack( JAHealthMetricsMagic, len(JAHealthMetricNames), historySize, 0, 0))
+                file.truncate( fileSize )
+
+        with open( fileName, 'r+b') as file:
+            with mmap.mmap( file.fileno(), fileSize) as history:
+                magic, numberOfFields, capacity, count, nextIndex = JAHealthMetricsHeader.unpack_from( history, 0)
+                if magic != JAHealthMetricsMagic or numberOfFields != len(JAHealthMetricNames) or capacity != historySize:
+                    count = nextIndex = 0
+                recordStruct.pack_into( history, JAHealthMetricsHeader.size + recordStruct.size * nextIndex,
+                    *[ float(metrics.get(metricName, float('nan'))) for metricName in JAHealthMetricNames ])
+                JAHealthMetricsHeader.pack_into( history, 0, JAHealthMetricsMagic, len(JAHealthMetricNames), historySize,
+                    min(count + 1, historySize), (nextIndex + 1) % historySize)
+                history.flush()
+    except (OSError, ValueError) as err:
+        return False, "ERROR JAWriteHealthMetricsHistory() Can't write health metrics to file:|{0}|, error:{1}".format(fileName, err)
+    return True, ''
+
+def JAReadHealthMetricsHistory( fileName:str, numberOfSamples=None ):
+    """
+    JAGlobalLib.JAReadHealthMetricsHistory( fileName:str, numberOfSamples=None )
+
+    Reads most recent samples from ring buffer file written by JAWriteHealthMetricsHistory()
+    Records are unpacked directly from memory mapped file, no text parsing.
+
+    Returned values:
+        returnStatus - True on success, False if file is not present or not in expected layout
+        samples - list of metrics dictionaries, oldest first, max numberOfSamples (all if None)
+        errorMsg - error message
+    """
+    import mmap
+    samples = []
+    try:
+        with open( fileName, 'rb') as file:
+            with mmap.mmap( file.fileno(), 0, access=mmap.ACCESS_READ) as history:
+                magic, numberOfFields, capacity, count, nextIndex = JAHealthMetricsHeader.unpack_from( history, 0)
+                if magic != JAHealthMetricsMagic or numberOfFields != len(JAHealthMetricNames):
+                    return False, samples, "ERROR JAReadHealthMetricsHistory() Unexpected layout of file:|{0}|".format(fileName)
+                if numberOfSamples == None or numberOfSamples > count:
+                    numberOfSamples = count
+                for sampleNumber in range( numberOfSamples, 0, -1):
+                    recordIndex = (nextIndex - sampleNumber) % capacity
+                    samples.append( dict( zip( JAHealthMetricNames, JAHealthMetricsRecord.unpack_from( 
+                        history, JAHealthMetricsHeader.size + JAHealthMetricsRecord.size * recordIndex))))
+    except (OSError, ValueError) as err:
+        return False, samples, "ERROR JAReadHealthMetricsHistory() Can't read health metrics file:|{0}|, error:{1}".format(fileName, err)
+    return True, samples, ''
+
+def JAGetHealthMetricValue( metricName:str, metrics:dict, fileName:str ):
+    """
+    JAGlobalLib.JAGetHealthMetricValue( metricName:str, metrics:dict, fileName:str )
+
+    Returns value of metric referred by name in health spec
+        <metricName> - current value like CPUUsage, MemUsedPercent, Load5
+        DiskUsedPercent:<path> - used percentage of file system having that path
+        <metricName>.(Average|Min|Max)<N> - trend over last N samples in history file, like CPUUsage.Average10
+
+    Returned values:
+        returnStatus - True on success
+        value - metric value
+        errorMsg - error message
+    """
+    if metricName.startswith('DiskUsedPercent:'):
+        return JAGetDiskUsedPercent( metricName.split(':', 1)[1] )
+    if metricName in metrics:
+        return True, metrics[metricName], ''
+
+    myResults = re.match( r'(\w+)\.(Average|Min|Max)(\d+)$', metricName)
+    if myResults == None or myResults.group(1) not in JAHealthMetricNames:
+        return False, None, "ERROR JAGetHealthMetricValue() Unknown metric:|{0}|, supported metrics:{1}".format(
+            metricName, JAHealthMetricNames)
+    returnStatus, samples, errorMsg = JAReadHealthMetricsHistory( fileName, int(myResults.group(3)))
+    ### skip samples without this metric like CPU usage only samples
+    values = [ sample[myResults.group(1)] for sample in samples if sample[myResults.group(1)] == sample[myResults.group(1)] ]
+    if len(values) == 0:
+        return False, None, "ERROR JAGetHealthMetricValue() No samples of metric:|{0}| in history file:|{1}| {2}".format(
+            metricName, fileName, errorMsg)
+    if myResults.group(2) == 'Average':
+        return True, round( sum(values) / len(values), 2), ''
+    elif myResults.group(2) == 'Min':
+        return True, min(values), ''
+    return True, max(values), ''
+
+def JAEvaluateThreshold( value, threshold:str ):
+    """
+    JAGlobalLib.JAEvaluateThreshold( value, threshold:str )
+
+    Compares the value to threshold spec '(>|<|=|!=|>=|<=)(space)(number)', like '< 80'
+    Returns True if value is within threshold, False otherwise
+    Returns None if threshold spec is invalid
+    """
+    myResults = re.match( r'\s*(>=|<=|!=|>|<|=)\s*(-?[\d.]+)\s*$', str(threshold))
+    if myResults == None:
+        return None
+    thresholdValue = float( myResults.group(2) )
+    return { '>=': value >= thresholdValue, '<=': value <= thresholdValue, '!=': value != thresholdValue,
+             '>': value > thresholdValue, '<': value < thresholdValue, '=': value == thresholdValue }[myResults.group(1)]
+
+def JAGetHealthMetricsFileName( logFilePath:str ):
+    """
+    JAGlobalLib.JAGetHealthMetricsFileName( logFilePath:str )
+
+    Returns name of health metrics history file under LogFilePath
+    """
+    return "{0}/{1}".format( logFilePath, JAHealthMetricsFileName )
+
+def JAWriteCPUUsageHistory( CPUUsage:int, logFileName=None, debugLevel=0,
+        healthMetricsFileName=None, historySize=JAHealthMetricsHistorySize):
+    """
+    JAGlobalLib.JAWriteCPUUsageHistory( CPUUsage:int, logFileName=None, debugLevel=0,
+        healthMetricsFileName=None, historySize=JAHealthMetricsHistorySize)
+
+    Write CPU usage sample to health metrics history file
+    If healthMetricsFileName is not passed, JAGetHealthMetricsFileName(JALogFilePath) is used
+    historySize needs to be same as HealthMetricsHistorySize so that samples written by health operation are kept
+    Other metrics of this sample are left as not available
+
+    Returns True up on success, False if file could not be written
+    """
+    if healthMetricsFileName == None:
+        healthMetricsFileName = JAGetHealthMetricsFileName( JALogFilePath )
+    returnStatus, errorMsg = JAWriteHealthMetricsHistory( healthMetricsFileName, 
+        { 'TimeStamp': time.time(), 'CPUUsage': float(CPUUsage) }, historySize )
+    if returnStatus == False:
         print(errorMsg)
         if logFileName != None:
             LogMsg( errorMsg, logFileName, True)
-        return False
+    return returnStatus
 
-def JAReadCPUUsageHistory( logFileName=None, debugLevel=0):
+def JAReadCPUUsageHistory( logFileName=None, debugLevel=0, healthMetricsFileName=None):
     """
-    JAGlobalLib.JAReadCPUUsageHistory( logFileName=None, debugLevel=0)
+    JAGlobalLib.JAReadCPUUsageHistory( logFileName=None, debugLevel=0, healthMetricsFileName=None)
 
-    Read CPU usage data from a file
+    Read last 10 CPU usage samples from health metrics history file
+    If healthMetricsFileName is not passed, JAGetHealthMetricsFileName(JALogFilePath) is used
     Return CPUUsage values in list form, return avarge value separtely
-    Return None if file could not be read
+    Return [0], 0 if file could not be read
 
     """
-    try:
-        if os.path.exists( JACPUUsageFileName ) == False:
-            return [0], 0
-        with open( JACPUUsageFileName, "r") as file:
-            tempLine = file.readline().strip()
-            if len(tempLine) > 0 :
-                average = float( tempLine )
-                CPUUsage = []
-                while True:
-                    tempLine = file.readline()
-                    if not tempLine:
-                        break
-                    if tempLine != '\n':
-                        CPUUsage.append( float( tempLine.strip() ) )
-                file.close()
-                return CPUUsage, average 
-            else:
-                return [0], 0
-    except OSError as err:
-        errorMsg = 'ERROR - JAReadCPUUsageStats() Can not open file: {0} to read CPU usage info, error:{1}\n'.format( 
-            JACPUUsageFileName, err)
+    if healthMetricsFileName == None:
+        healthMetricsFileName = JAGetHealthMetricsFileName( JALogFilePath )
+    if os.path.exists( healthMetricsFileName ) == False:
+        return [0], 0
+    returnStatus, samples, errorMsg = JAReadHealthMetricsHistory( healthMetricsFileName, 10 )
+    if returnStatus == False:
         print(errorMsg)
         if logFileName != None:
             LogMsg( errorMsg, logFileName, True)
         return [0], 0
+    ### skip samples without CPU usage value
+    CPUUsage = [ sample['CPUUsage'] for sample in samples if sample['CPUUsage'] == sample['CPUUsage'] ]
+    if len(CPUUsage) == 0:
+        return [0], 0
+    return CPUUsage, sum(CPUUsage) / len(CPUUsage)
 
-def JAGetAverageCPUUsage( ):
+def JAGetAverageCPUUsage( healthMetricsFileName=None ):
     """
-    JAGlobalLib.JAGetAverageCPUUsage( )
+    JAGlobalLib.JAGetAverageCPUUsage( healthMetricsFileName=None )
 
     Return average cpu usage.
 
     """
-    tempCPUUsage, average = JAReadCPUUsageHistory()
+    tempCPUUsage, average = JAReadCPUUsageHistory( healthMetricsFileName=healthMetricsFileName )
     return average
 
 def JAWriteTimeStamp(fileName:str, currentTime=None):
@@ -786,14 +1028,17 @@ def JAGetUptime(OSType:str):
          uptime_seconds = 0
     return uptime_seconds
 
-def JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", timeoutPassed=30, nowait=False):
+def JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", timeoutPassed=30, nowait=False, commandResult=None):
     """
-    JAGlobalLib.JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", timeoutPassed=30)
+    JAGlobalLib.JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", timeoutPassed=30, nowait=False, commandResult=None)
 
     Execute given command
       If OSType is windows, replace \r with \n, remove [...], 
          normalize the output to standard multiline string similar to output from Unix host
 
+    If commandResult dictionary is passed, exit code of the command is returned in commandResult['ReturnCode']
+      and commandResult['TimedOut'] is set to True if command did not complete within timeoutPassed seconds
+
     Return status
         returnResult - True on success, False on failure
         returnOutput - command execution result
@@ -840,6 +1085,8 @@ def JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", tim
                 shell.append( command )
                 result = subprocess.run( args=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE,timeout=timeoutPassed)
 
+            if commandResult != None:
+                commandResult['ReturnCode'] = result.returncode
             if result.returncode == 0:
                 if OSType == 'Windows':
                     ### replace \r\n with \n
@@ -893,6 +1140,8 @@ def JAExecuteCommand(shell:str, command:str, debugLevel:int, OSType="Linux", tim
         except subprocess.TimeoutExpired as err:
             errorMsg = "WARN JAExecuteCommand() timeout while executing the command:|{0} {1}|, called process error:|{2}|".format(shell, command, err)
             returnOutput = ''
+            if commandResult != None:
+                commandResult['TimedOut'] = True
 
         except ( FileNotFoundError ) as err:
             errorMsg = "INFO JAExecuteCommand() File not found, while executing the command:|{0} {1}|, error:|{2}|".format(shell, command, err)
@@ -1223,6 +1472,748 @@ def JACheckConnectivity(
     return returnStatus, returnOutput, errorMsg
 
 
+def JAParsePortRanges( ports ):
+    """
+    JAGlobalLib.JAParsePortRanges( ports )
+
+    Parses ports given as single port, CSV of ports, port range like startPort-endPort, or CSV of those,
+        to list of range objects so that large port ranges are not expanded to list of ports.
+
+    Returned values
+        returnStatus - True on success, False when port or port range is invalid
+        portRanges - list of range objects
+        errorMsg - error message
+    """
+    portRanges = []
+    for portSpec in str(ports).split(','):
+        portSpec = portSpec.strip()
+        if portSpec == '':
+            continue
+        portMatch = re.match(r'^(\d+)\s*(-\s*(\d+))?$', portSpec)
+        if portMatch == None:
+            return False, portRanges, "ERROR JAParsePortRanges() invalid port:{0} in ports:{1}".format( portSpec, ports )
+        startPort = int( portMatch.group(1) )
+        if portMatch.group(3) != None:
+            endPort = int( portMatch.group(3) )
+        else:
+            endPort = startPort
+        if startPort > endPort or endPort > 65535:
+            return False, portRanges, "ERROR JAParsePortRanges() invalid port range:{0} in ports:{1}".format( portSpec, ports )
+        portRanges.append( range( startPort, endPort + 1 ) )
+    return True, portRanges, ''
+
+### classifier of connectivity check output, compiled once
+###   patterns are checked in this order, outcome of first match is used, UNKNOWN when none match
+###   covers output of nc, telnet, curl, Test-NetConnection (as summarized by JACheckConnectivity()) and built-in prober
+###   host name errors are checked before timeouts since DNS lookup timeout is a host name error
+###   'open' is matched only at the end of nc line like 'host [10.1.1.1] 22 (ssh) open', not in error text
+###     like 'Could not open connection to the host'
+JAConnectivityClassifier = [
+    ('PASS', re.compile(r'succeeded|Connected to|Escape character is|\) open\s*$|TcpTestSucceeded\s*:\s*True', re.MULTILINE)),
+    ('REFUSED', re.compile(r'Connection refused|actively refused')),
+    ('DNS', re.compile(r'host lookup failed|Could not resolve host|Name or service not known|Unknown host|Temporary failure in name resolution|nodename nor servname|Name resolution of .* failed')),
+    ('TIMEOUT', re.compile(r'Connection timed out|timed out: Operation now in progress|Operation timed out|Ncat: TIMEOUT|No route to host|Network is unreachable|TcpTestSucceeded\s*:\s*False')),
+    ('FAILED', re.compile(r'TLS handshake failed|TLS certificate verification failed|Unexpected reply|Connection to .* failed|Connection reset|Failed to connect|Could not open connection')),
+]
+
+def JAClassifyConnectivityOutput( returnOutput, outcomeCounts=None ):
+    """
+    JAGlobalLib.JAClassifyConnectivityOutput( returnOutput, outcomeCounts=None )
+
+    Classifies output of connectivity check command or built-in prober using JAConnectivityClassifier.
+    returnOutput can be string or list of lines.
+    When outcomeCounts dictionary is passed, count of returned outcome is incremented in it.
+
+    Returned values
+        outcome - PASS, REFUSED, DNS, TIMEOUT, FAILED or UNKNOWN
+    """
+    if isinstance( returnOutput, list ):
+        returnOutput = '\n'.join( str(line) for line in returnOutput )
+    outcome = 'UNKNOWN'
+    for tempOutcome, outcomePattern in JAConnectivityClassifier:
+        if outcomePattern.search( str(returnOutput) ):
+            outcome = tempOutcome
+            break
+    if outcomeCounts != None:
+        if outcome in outcomeCounts:
+            outcomeCounts[outcome] += 1
+        else:
+            outcomeCounts[outcome] = 1
+    return outcome
+
+### host name resolution results cached for the duration of the run
+###   key - host name, value - (expiryTime, addresses, errorMsg, dnsTime in ms)
+###   addresses - list of IPv4 and IPv6 addresses in the order returned by resolver
+JADNSCache = {}
+
+def JADNSCacheGet( hostName:str ):
+    """
+    JAGlobalLib.JADNSCacheGet( hostName:str )
+
+    Returns cached resolution result (addresses, errorMsg, dnsTime) of hostName if it is not expired yet,
+    else returns None
+    """
+    if hostName in JADNSCache:
+        expiryTime, addresses, errorMsg, dnsTime = JADNSCache[hostName]
+        if expiryTime > time.time():
+            return addresses, errorMsg, dnsTime
+        del JADNSCache[hostName]
+    return None
+
+def JADNSCacheSet( hostName:str, addresses, errorMsg:str, dnsTime:float, dnsCacheTTL:int ):
+    """
+    JAGlobalLib.JADNSCacheSet( hostName:str, addresses, errorMsg:str, dnsTime:float, dnsCacheTTL:int )
+
+    Saves resolution result of hostName in cache for dnsCacheTTL seconds.
+    Failed resolution is also cached so that host with DNS error is not looked up again for every port.
+    """
+    JADNSCache[hostName] = ( time.time() + dnsCacheTTL, addresses, errorMsg, dnsTime )
+
+def JAGetHostAddress( hostName:str, dnsCacheTTL:int ):
+    """
+    JAGlobalLib.JAGetHostAddress( hostName:str, dnsCacheTTL:int )
+
+    Returns IPv4 address of hostName like socket.gethostbyname(), using cached resolution result when available.
+
+    Returned values
+        returnStatus - True on success
+        ipAddress - IPv4 address, '' on error
+        errorMsg - resolution error
+    """
+    import socket
+    cachedResult = JADNSCacheGet( hostName )
+    if cachedResult != None:
+        addresses, errorMsg, dnsTime = cachedResult
+        for ipAddress in addresses:
+            if re.match(r'\d+\.\d+\.\d+\.\d+$', ipAddress):
+                return True, ipAddress, ''
+
+    startTime = time.perf_counter()
+    try:
+        ipAddress = socket.gethostbyname( hostName )
+    except OSError as err:
+        return False, '', "Could not resolve hostname {0}: {1}".format( hostName, err )
+    dnsTime = (time.perf_counter() - startTime) * 1000
+    if cachedResult == None:
+        JADNSCacheSet( hostName, [ipAddress], '', dnsTime, dnsCacheTTL )
+    return True, ipAddress, ''
+
+async def JAResolveHostName( hostName:str, timeout:float, dnsCacheTTL:int, resolveExecutor ):
+    """
+    JAGlobalLib.JAResolveHostName( hostName:str, timeout:float, dnsCacheTTL:int, resolveExecutor )
+
+    Resolves hostName to IPv4 and IPv6 addresses using getaddrinfo() in resolveExecutor thread pool,
+    waiting at most timeout seconds. Result is cached for dnsCacheTTL seconds.
+
+    Returned values
+        addresses - list of addresses, empty list on error
+        errorMsg - text in the same form as output of connectivity check commands when resolution fails
+        dnsTime - time taken in milli seconds, 0 when result is taken from cache
+    """
+    import asyncio
+    import socket
+
+    cachedResult = JADNSCacheGet( hostName )
+    if cachedResult != None:
+        addresses, errorMsg, dnsTime = cachedResult
+        return addresses, errorMsg, 0
+
+    addresses = []
+    errorMsg = ''
+    startTime = time.perf_counter()
+    try:
+        addressInfo = await asyncio.wait_for( 
+            asyncio.get_running_loop().run_in_executor( 
+                resolveExecutor, socket.getaddrinfo, hostName, None, socket.AF_UNSPEC, socket.SOCK_STREAM ),
+            timeout )
+        for family, socketType, proto, canonName, socketAddress in addressInfo:
+            if socketAddress[0] not in addresses:
+                addresses.append( socketAddress[0] )
+    except asyncio.TimeoutError:
+        errorMsg = "Could not resolve hostname {0}: DNS lookup timed out after {1} sec".format( hostName, timeout )
+    except (OSError, UnicodeError) as err:
+        errorMsg = "Could not resolve hostname {0}: {1}".format( hostName, err )
+    dnsTime = (time.perf_counter() - startTime) * 1000
+    JADNSCacheSet( hostName, addresses, errorMsg, dnsTime, dnsCacheTTL )
+    return addresses, errorMsg, dnsTime
+
+### protocols checked by built-in prober, UDP is checked by built-in prober only when Payload is given
+JAProbeProtocols = ['TCP', 'UDP', 'TLS', 'HTTP', 'HTTPS']
+
+async def JAOpenConnection( hostName:str, addresses, port:str, timeout:float, sslContext ):
+    """
+    JAGlobalLib.JAOpenConnection( hostName:str, addresses, port:str, timeout:float, sslContext )
+
+    Opens TCP connection to port of resolved addresses of hostName, with TLS handshake when sslContext is not None.
+    Addresses are tried in order until connection succeeds, each attempt is limited to timeout seconds.
+
+    Returned values
+        reader, writer - asyncio streams on success, None on error
+        connectTime - time taken in milli seconds including TLS handshake
+        returnOutput - '' on success, else error text in the same form as output of connectivity check commands
+    """
+    import asyncio
+    import ssl
+
+    startTime = time.perf_counter()
+    returnOutput = "Connection to {0} {1} failed: no address".format( hostName, port )
+    for address in addresses:
+        try:
+            if sslContext != None:
+                reader, writer = await asyncio.wait_for( 
+                    asyncio.open_connection( address, int(port), ssl=sslContext, server_hostname=hostName ), timeout )
+            else:
+                reader, writer = await asyncio.wait_for( asyncio.open_connection( address, int(port) ), timeout )
+            return reader, writer, (time.perf_counter() - startTime) * 1000, ''
+        except asyncio.TimeoutError:
+            returnOutput = "Connection timed out after {0} sec to {1} {2}".format( timeout, hostName, port )
+        except ConnectionRefusedError:
+            returnOutput = "Connection refused by {0} {1}".format( hostName, port )
+        except ssl.SSLCertVerificationError as err:
+            ### handshake failed since peer certificate could not be verified
+            returnOutput = "TLS certificate verification failed with {0} {1}: {2}".format( hostName, port, err.verify_message )
+            break
+        except ssl.SSLError as err:
+            ### TCP connection succeeded, handshake failed, no point trying other addresses
+            returnOutput = "TLS handshake failed with {0} {1}: {2}".format( hostName, port, err )
+            break
+        except (OSError, ValueError) as err:
+            returnOutput = "Connection to {0} {1} failed: {2}".format( hostName, port, err )
+    return None, None, (time.perf_counter() - startTime) * 1000, returnOutput
+
+async def JACloseConnection( writer ):
+    """
+    JAGlobalLib.JACloseConnection( writer )
+
+    Closes connection opened by JAOpenConnection(), errors while closing are ignored
+    """
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, AttributeError):
+        pass
+
+async def JAProbeTCPEndpoint( hostName:str, addresses, port:str, timeout:float ):
+    """
+    JAGlobalLib.JAProbeTCPEndpoint( hostName:str, addresses, port:str, timeout:float )
+
+    Opens TCP connection to port of resolved addresses of hostName and closes it.
+
+    Returned values
+        returnOutput - result text in the same form as output of connectivity check commands so that
+            same patterns can be used to classify the result - succeeded, Connection refused, Connection timed out
+        connectTime - time taken in milli seconds
+        probeDetails - empty dictionary, TCP probe has no details other than connect time
+    """
+    reader, writer, connectTime, returnOutput = await JAOpenConnection( hostName, addresses, port, timeout, None )
+    if writer != None:
+        await JACloseConnection( writer )
+        returnOutput = "Connection to {0} {1} port [tcp] succeeded, connect time:{2:.1f} ms".format( hostName, port, connectTime )
+    return returnOutput, connectTime, {}
+
+async def JAProbeTLSEndpoint( hostName:str, addresses, port:str, timeout:float ):
+    """
+    JAGlobalLib.JAProbeTLSEndpoint( hostName:str, addresses, port:str, timeout:float )
+
+    Opens TCP connection, does TLS handshake verifying peer certificate against system trust store, and closes it.
+    When peer certificate can't be verified, handshake is done again without verification so that
+      reachability of the port and details of peer certificate are still reported.
+      Result of verification is reported separately in CertVerification.
+    Peer certificate is decoded in-process using JAOperationCHILT.JACertDecodeDER(), since details
+      are not available from getpeercert() when certificate is not verified.
+
+    Returned values
+        returnOutput - result text, 'TLS handshake failed' when handshake fails
+        connectTime - time taken in milli seconds for connect and handshake
+        probeDetails - dictionary with HandshakeTime, TLSVersion, CertVerification - OK or reason of failure,
+            CertSubject, CertIssuer, CertNotAfter
+    """
+    import ssl
+    import JAOperationCHILT
+
+    probeDetails = {}
+    certVerification = 'OK'
+    reader, writer, connectTime, returnOutput = await JAOpenConnection( 
+        hostName, addresses, port, timeout, ssl.create_default_context() )
+    if writer == None and re.match(r'TLS certificate verification failed', returnOutput):
+        certVerification = returnOutput
+        sslContext = ssl.create_default_context()
+        sslContext.check_hostname = False
+        sslContext.verify_mode = ssl.CERT_NONE
+        reader, writer, connectTime, returnOutput = await JAOpenConnection( 
+            hostName, addresses, port, timeout, sslContext )
+    if writer != None:
+        sslObject = writer.get_extra_info('ssl_object')
+        peerCertDER = sslObject.getpeercert( binary_form=True )
+        probeDetails['HandshakeTime'] = round( connectTime, 1 )
+        probeDetails['TLSVersion'] = sslObject.version()
+        probeDetails['CertVerification'] = certVerification
+        probeDetails['CertNotAfter'] = 'unknown'
+        if peerCertDER != None:
+            try:
+                certDetails = JAOperationCHILT.JACertDecodeDER( peerCertDER )
+                probeDetails['CertSubject'] = certDetails['Subject']
+                probeDetails['CertIssuer'] = certDetails['Issuer']
+                probeDetails['CertNotAfter'] = time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime( certDetails['NotAfter'] ) )
+            except (IndexError, ValueError):
+                ### details are additional info, handshake result is still reported
+                pass
+        await JACloseConnection( writer )
+        returnOutput = "Connection to {0} {1} port [tls] succeeded, handshake time:{2:.1f} ms, version:{3}, notAfter:{4}, verification:{5}".format(
+            hostName, port, connectTime, probeDetails['TLSVersion'], probeDetails['CertNotAfter'], certVerification )
+    return returnOutput, connectTime, probeDetails
+
+async def JAProbeHTTPEndpoint( hostName:str, addresses, port:str, timeout:float, useTLS:bool, urlPath:str, expectedReply:str ):
+    """
+    JAGlobalLib.JAProbeHTTPEndpoint( hostName:str, addresses, port:str, timeout:float, useTLS:bool, urlPath:str, expectedReply:str )
+
+    Opens connection, sends HTTP GET request for urlPath and reads the status line of the response.
+    Status code is matched to expectedReply regular expression, default is 2xx or 3xx.
+
+    Returned values
+        returnOutput - result text, 'Unexpected reply' when status code does not match
+        connectTime - time taken in milli seconds for connect and TLS handshake
+        probeDetails - dictionary with HTTPStatus, TimeToFirstByte in milli seconds
+    """
+    import asyncio
+    import ssl
+
+    if useTLS == True:
+        sslContext = ssl.create_default_context()
+        protocol = 'https'
+    else:
+        sslContext = None
+        protocol = 'http'
+    if urlPath == None:
+        urlPath = '/'
+    if expectedReply == None:
+        expectedReply = r'[23]\d\d'
+
+    probeDetails = {}
+    reader, writer, connectTime, returnOutput = await JAOpenConnection( hostName, addresses, port, timeout, sslContext )
+    if writer == None:
+        return returnOutput, connectTime, probeDetails
+
+    try:
+        startTime = time.perf_counter()
+        writer.write( "GET {0} HTTP/1.1\r\nHost: {1}\r\nUser-Agent: JAAudit\r\nConnection: close\r\n\r\n".format( 
+            urlPath, hostName ).encode() )
+        await writer.drain()
+        statusLine = await asyncio.wait_for( reader.readline(), timeout )
+        timeToFirstByte = (time.perf_counter() - startTime) * 1000
+        statusFields = statusLine.decode('latin-1').split()
+        if len(statusFields) > 1 and re.match(r'HTTP/', statusFields[0]):
+            probeDetails['HTTPStatus'] = statusFields[1]
+            probeDetails['TimeToFirstByte'] = round( timeToFirstByte, 1 )
+            if re.match( expectedReply, statusFields[1] ):
+                returnOutput = "Connection to {0} {1} port [{2}] succeeded, status:{3}, time to first byte:{4:.1f} ms".format(
+                    hostName, port, protocol, statusFields[1], timeToFirstByte )
+            else:
+                returnOutput = "Unexpected reply from {0} {1} port [{2}], status:{3}, expected:{4}".format(
+                    hostName, port, protocol, statusFields[1], expectedReply )
+        else:
+            returnOutput = "Unexpected reply from {0} {1} port [{2}], not a HTTP response:{3}".format(
+                hostName, port, protocol, statusLine[:80] )
+    except asyncio.TimeoutError:
+        returnOutput = "Connection timed out after {0} sec waiting for response from {1} {2}".format( timeout, hostName, port )
+    except (OSError, ValueError) as err:
+        returnOutput = "Connection to {0} {1} failed: {2}".format( hostName, port, err )
+    await JACloseConnection( writer )
+    return returnOutput, connectTime, probeDetails
+
+async def JAProbeUDPEndpoint( hostName:str, addresses, port:str, timeout:float, payload:str, expectedReply:str ):
+    """
+    JAGlobalLib.JAProbeUDPEndpoint( hostName:str, addresses, port:str, timeout:float, payload:str, expectedReply:str )
+
+    Sends payload in UDP datagram to port of first resolved address of hostName and waits for a reply.
+    payload can have escape sequences like \\x00 or \\n for binary requests.
+    Reply is matched to expectedReply regular expression, any reply is accepted when expectedReply is None.
+
+    Returned values
+        returnOutput - result text, 'Connection timed out' when no reply, 'Connection refused' when
+            port unreachable is received, 'Unexpected reply' when reply does not match
+        responseTime - time taken in milli seconds
+        probeDetails - dictionary with ResponseTime, ReplyBytes
+    """
+    import asyncio
+    import codecs
+    import socket
+
+    probeDetails = {}
+    address = addresses[0]
+    if re.search(r':', address):
+        addressFamily = socket.AF_INET6
+    else:
+        addressFamily = socket.AF_INET
+    startTime = time.perf_counter()
+    udpSocket = socket.socket( addressFamily, socket.SOCK_DGRAM )
+    try:
+        udpSocket.setblocking( False )
+        ### connected socket so that port unreachable is reported as connection refused
+        udpSocket.connect( (address, int(port)) )
+        loop = asyncio.get_running_loop()
+        await loop.sock_sendall( udpSocket, codecs.decode( payload, 'unicode_escape' ).encode('latin-1') )
+        reply = await asyncio.wait_for( loop.sock_recv( udpSocket, 65535 ), timeout )
+        responseTime = (time.perf_counter() - startTime) * 1000
+        probeDetails['ResponseTime'] = round( responseTime, 1 )
+        probeDetails['ReplyBytes'] = len(reply)
+        if expectedReply == None or re.search( expectedReply, reply.decode('latin-1') ):
+            returnOutput = "Connection to {0} {1} port [udp] succeeded, reply:{2} bytes, response time:{3:.1f} ms".format(
+                hostName, port, len(reply), responseTime )
+        else:
+            returnOutput = "Unexpected reply from {0} {1} port [udp], reply:{2}, expected:{3}".format(
+                hostName, port, reply[:80], expectedReply )
+    except asyncio.TimeoutError:
+        returnOutput = "Connection timed out after {0} sec waiting for reply from {1} {2} [udp]".format( timeout, hostName, port )
+    except ConnectionRefusedError:
+        returnOutput = "Connection refused by {0} {1} [udp]".format( hostName, port )
+    except (OSError, ValueError, UnicodeError) as err:
+        returnOutput = "Connection to {0} {1} failed: {2}".format( hostName, port, err )
+    finally:
+        udpSocket.close()
+    return returnOutput, (time.perf_counter() - startTime) * 1000, probeDetails
+
+async def JAProbeEndpointOnce( hostName:str, addresses, probeSpec, timeout:float ):
+    """
+    JAGlobalLib.JAProbeEndpointOnce( hostName:str, addresses, probeSpec, timeout:float )
+
+    Probes one endpoint once using the probe of the protocol in probeSpec.
+
+    Returned values
+        returnOutput, connectTime, probeDetails - refer to JAProbe<Protocol>Endpoint()
+    """
+    port, protocol, payload, expectedReply, urlPath, samples, sampleInterval = probeSpec
+    if protocol == 'UDP':
+        return await JAProbeUDPEndpoint( hostName, addresses, port, timeout, payload, expectedReply )
+    elif protocol == 'TLS':
+        return await JAProbeTLSEndpoint( hostName, addresses, port, timeout )
+    elif protocol == 'HTTP' or protocol == 'HTTPS':
+        return await JAProbeHTTPEndpoint( 
+            hostName, addresses, port, timeout, protocol == 'HTTPS', urlPath, expectedReply )
+    else:
+        return await JAProbeTCPEndpoint( hostName, addresses, port, timeout )
+
+async def JAProbeEndpointSamples( hostName:str, addresses, probeSpec, timeout:float, probeLimits ):
+    """
+    JAGlobalLib.JAProbeEndpointSamples( hostName:str, addresses, probeSpec, timeout:float, probeLimits )
+
+    Probes one endpoint samples times, sampleInterval seconds apart, to measure latency and loss.
+    probeLimits['Semaphore'] is acquired for each sample, not for all samples together, 
+        so that samples of all endpoints interleave and total run time stays about samples * sampleInterval.
+
+    Returned values
+        returnOutput - succeeded with latency summary when at least one sample succeeded,
+            else output of last failed sample
+        connectTime - average latency of successful samples in milli seconds
+        probeDetails - protocol details of last successful sample along with
+            Samples, Loss in percentage, LatencyMin, LatencyAvg, LatencyP95, LatencyMax in milli seconds
+    """
+    import asyncio
+    import math
+
+    port, protocol, payload, expectedReply, urlPath, samples, sampleInterval = probeSpec
+    latencies = []
+    probeDetails = {}
+    for sampleNumber in range( samples ):
+        if sampleNumber > 0:
+            await asyncio.sleep( sampleInterval )
+        async with probeLimits['Semaphore']:
+            await JAProbeRateWait( probeLimits )
+            returnOutput, connectTime, sampleDetails = await JAProbeEndpointOnce( hostName, addresses, probeSpec, timeout )
+        if re.search(r'succeeded', returnOutput):
+            latencies.append( connectTime )
+            probeDetails = sampleDetails
+        else:
+            failedOutput = returnOutput
+
+    if len(latencies) == 0:
+        return failedOutput, 0, {'Samples': samples, 'Loss': 100.0}
+
+    latencies.sort()
+    latencyAvg = sum(latencies) / len(latencies)
+    ### nearest rank percentile
+    latencyP95 = latencies[ math.ceil( 0.95 * len(latencies) ) - 1 ]
+    loss = (samples - len(latencies)) * 100.0 / samples
+    probeDetails['Samples'] = samples
+    probeDetails['Loss'] = round( loss, 1 )
+    probeDetails['LatencyMin'] = round( latencies[0], 1 )
+    probeDetails['LatencyAvg'] = round( latencyAvg, 1 )
+    probeDetails['LatencyP95'] = round( latencyP95, 1 )
+    probeDetails['LatencyMax'] = round( latencies[-1], 1 )
+    returnOutput = "Connection to {0} {1} port [{2}] succeeded, samples:{3}, loss:{4:.1f}%, latency min/avg/p95/max:{5:.1f}/{6:.1f}/{7:.1f}/{8:.1f} ms".format(
+        hostName, port, protocol.lower(), samples, loss, latencies[0], latencyAvg, latencyP95, latencies[-1] )
+    return returnOutput, latencyAvg, probeDetails
+
+async def JAProbeRateWait( probeLimits ):
+    """
+    JAGlobalLib.JAProbeRateWait( probeLimits )
+
+    Waits till next probe can be started so that probes are started at most probeLimits['Rate'] per second.
+    No wait when Rate is 0. Start times are spaced evenly instead of in bursts, 
+        so that connection rate protection of firewalls are not tripped.
+    """
+    import asyncio
+    if probeLimits['Rate'] <= 0:
+        return
+    currentTime = asyncio.get_running_loop().time()
+    startTime = max( currentTime, probeLimits['NextStartTime'] )
+    probeLimits['NextStartTime'] = startTime + 1.0 / probeLimits['Rate']
+    if startTime > currentTime:
+        await asyncio.sleep( startTime - currentTime )
+
+async def JAProbeEndpoint( hostName:str, addresses, probeSpec, timeout:float, probeLimits ):
+    """
+    JAGlobalLib.JAProbeEndpoint( hostName:str, addresses, probeSpec, timeout:float, probeLimits )
+
+    Probes one endpoint using the probe of the protocol in probeSpec 
+        (port, protocol, payload, expectedReply, urlPath, samples, sampleInterval).
+    When samples is more than 1, latency and loss are measured using JAProbeEndpointSamples().
+    probeLimits['Semaphore'] limits the number of probes in progress at any time,
+        probeLimits['Rate'] limits the number of probes started per second.
+
+    Returned values
+        returnOutput, connectTime, probeDetails - refer to JAProbe<Protocol>Endpoint()
+    """
+    if probeSpec[5] > 1:
+        return await JAProbeEndpointSamples( hostName, addresses, probeSpec, timeout, probeLimits )
+    async with probeLimits['Semaphore']:
+        await JAProbeRateWait( probeLimits )
+        return await JAProbeEndpointOnce( hostName, addresses, probeSpec, timeout )
+
+def JAExpandEndpoints( endpoints ):
+    """
+    JAGlobalLib.JAExpandEndpoints( endpoints )
+
+    Generator yielding (hostName, probeSpec) for each port of endpoints, port range is expanded one port at a time
+        so that probes of thousands of ports are not created up front.
+    Duplicate endpoints are yielded once.
+    """
+    expandedEndpoints = set()
+    for endpoint in dict.fromkeys( endpoints ):
+        hostName = endpoint[0]
+        if isinstance( endpoint[1], range ):
+            ports = endpoint[1]
+        else:
+            ports = [endpoint[1]]
+        for port in ports:
+            probeSpec = (str(port),) + endpoint[2:]
+            if (hostName,) + probeSpec in expandedEndpoints:
+                continue
+            expandedEndpoints.add( (hostName,) + probeSpec )
+            yield hostName, probeSpec
+
+async def JAProbeWorker( endpointIterator, resolveTasks, timeout:float, probeLimits, connectivityResults ):
+    """
+    JAGlobalLib.JAProbeWorker( endpointIterator, resolveTasks, timeout:float, probeLimits, connectivityResults )
+
+    Takes next endpoint from endpointIterator, waits for name resolution of its host, probes it and
+        saves the result in connectivityResults, till all endpoints are probed.
+    When resolution fails, connection is not attempted, resolution error is saved as result.
+    """
+    for hostName, probeSpec in endpointIterator:
+        addresses, errorMsg, dnsTime = await resolveTasks[hostName]
+        if errorMsg != '' or len(addresses) == 0:
+            if errorMsg == '':
+                errorMsg = "Could not resolve hostname {0}: no address".format( hostName )
+            connectivityResults[(hostName,) + probeSpec] = (errorMsg, 0, dnsTime, {})
+            continue
+        returnOutput, connectTime, probeDetails = await JAProbeEndpoint( hostName, addresses, probeSpec, timeout, probeLimits )
+        connectivityResults[(hostName,) + probeSpec] = (returnOutput, connectTime, dnsTime, probeDetails)
+
+async def JAProbeEndpoints( endpoints, timeout:float, maxConcurrency:int, rateLimit:float, dnsCacheTTL:int, connectivityResults ):
+    """
+    JAGlobalLib.JAProbeEndpoints( endpoints, timeout:float, maxConcurrency:int, rateLimit:float, dnsCacheTTL:int, connectivityResults )
+
+    Resolves all host names concurrently, then maxConcurrency workers take endpoints one at a time and probe those,
+        so that number of sockets and tasks in use stay bounded irrespective of size of port ranges.
+    Results are saved in connectivityResults.
+    """
+    import asyncio
+    import concurrent.futures
+
+    hostNames = list( dict.fromkeys( endpoint[0] for endpoint in endpoints ) )
+    probeLimits = { 'Semaphore': asyncio.Semaphore( maxConcurrency ), 'Rate': rateLimit, 'NextStartTime': 0 }
+    ### dedicated thread pool for getaddrinfo() so that a hung lookup does not hold the event loop at exit
+    resolveExecutor = concurrent.futures.ThreadPoolExecutor( max_workers=min( len(hostNames), 32 ) )
+    try:
+        resolveTasks = {}
+        for hostName in hostNames:
+            resolveTasks[hostName] = asyncio.ensure_future( 
+                JAResolveHostName( hostName, timeout, dnsCacheTTL, resolveExecutor ) )
+        endpointIterator = JAExpandEndpoints( endpoints )
+        await asyncio.gather( 
+            *[ JAProbeWorker( endpointIterator, resolveTasks, timeout, probeLimits, connectivityResults )
+                for workerNumber in range( max( maxConcurrency, 1 ) ) ] )
+    finally:
+        resolveExecutor.shutdown( wait=False )
+
+def JACheckConnectivityNative( endpoints, timeout:float, maxConcurrency:int, rateLimit:float, dnsCacheTTL:int, debugLevel:int ):
+    """
+    JAGlobalLib.JACheckConnectivityNative( endpoints, timeout:float, maxConcurrency:int, rateLimit:float, dnsCacheTTL:int, debugLevel:int )
+
+    Checks connectivity to all endpoints concurrently using asyncio, without executing any command.
+    Each distinct host name is resolved once, all host names are resolved concurrently, duplicate endpoints are probed once.
+    Total time taken is about timeout period for each set of maxConcurrency endpoints, 
+        or number of endpoints / rateLimit seconds when rateLimit is given, whichever is more.
+
+    Parameters passed:
+        endpoints - list of (hostName, ports, protocol, payload, expectedReply, urlPath, samples, sampleInterval)
+            ports - single port or range of ports
+            protocol - one of JAProbeProtocols
+            payload - request to send for UDP, None for other protocols
+            expectedReply - regular expression to match UDP reply or HTTP status code, None to accept any reply or 2xx, 3xx status
+            urlPath - path of HTTP request, None for '/'
+            samples - number of probes to measure latency and loss, 1 for single probe
+            sampleInterval - seconds between samples
+        timeout - timeout in seconds for name resolution and for each connection
+        maxConcurrency - max probes in progress at any time
+        rateLimit - max probes started per second, 0 for no limit
+        dnsCacheTTL - seconds for which resolution result is reused
+
+    Returned values
+        connectivityResults - dictionary keyed by (hostName, port as string, protocol, payload, expectedReply, urlPath, samples, sampleInterval), 
+            value is (returnOutput, connectTime in ms, dnsTime in ms, probeDetails)
+            returnOutput is in the same form as output of connectivity check command, refer to JAProbe<Protocol>Endpoint()
+            probeDetails - dictionary with protocol specific results like TLSVersion, CertNotAfter, HTTPStatus
+    """
+    import asyncio
+    connectivityResults = {}
+    if len(endpoints) == 0:
+        return connectivityResults
+
+    if debugLevel > 1:
+        print("DEBUG-2 JACheckConnectivityNative() probing {0} endpoints, timeout:{1} sec, max concurrency:{2}, rate limit:{3}/sec".format(
+            sum( len(endpoint[1]) if isinstance( endpoint[1], range ) else 1 for endpoint in endpoints ), 
+            timeout, maxConcurrency, rateLimit))
+
+    asyncio.run( JAProbeEndpoints( endpoints, timeout, maxConcurrency, rateLimit, dnsCacheTTL, connectivityResults ) )
+    return connectivityResults
+
+### listen port table collected from /proc/net, cached for the run
+###   list of dictionaries with keys Protocol, Address, Port, Inode, PID, Process
+###   PID and Process are None unless collected with process info
+JAListenPorts = None
+JAListenPortsWithProcess = False
+
+def JAProcNetAddress( hexAddress:str ):
+    """
+    JAGlobalLib.JAProcNetAddress( hexAddress:str )
+
+    Converts address:port in hex form of /proc/net/tcp, tcp6, udp, udp6 to (address, port)
+    Address is stored as 32 bit words in host byte order, converted assuming little endian host.
+    """
+    import socket
+    hexIP, hexPort = hexAddress.split(':')
+    ipBytes = bytes.fromhex( hexIP )
+    ### reverse bytes of each 32 bit word
+    ipBytes = b''.join( ipBytes[i:i+4][::-1] for i in range(0, len(ipBytes), 4) )
+    if len(ipBytes) == 4:
+        address = socket.inet_ntop( socket.AF_INET, ipBytes )
+    else:
+        address = socket.inet_ntop( socket.AF_INET6, ipBytes )
+    return address, int( hexPort, 16 )
+
+def JAGetSocketProcesses( inodes ):
+    """
+    JAGlobalLib.JAGetSocketProcesses( inodes )
+
+    Maps socket inodes to the process holding those sockets by reading /proc/<pid>/fd links.
+    Processes that can't be read due to permissions are skipped, need root access to map sockets of all users.
+
+    Returned values
+        socketProcesses - dictionary keyed by inode, value is (pid, processName)
+    """
+    socketProcesses = {}
+    try:
+        procEntries = os.scandir('/proc')
+    except OSError:
+        return socketProcesses
+    with procEntries:
+        for procEntry in procEntries:
+            if procEntry.name.isdigit() == False:
+                continue
+            try:
+                with os.scandir( '/proc/{0}/fd'.format(procEntry.name) ) as fdEntries:
+                    for fdEntry in fdEntries:
+                        try:
+                            fdLink = os.readlink( fdEntry.path )
+                        except OSError:
+                            continue
+                        if fdLink.startswith('socket:['):
+                            inode = fdLink[8:-1]
+                            if inode in inodes and inode not in socketProcesses:
+                                try:
+                                    with open( '/proc/{0}/comm'.format(procEntry.name), 'r') as commFile:
+                                        processName = commFile.read().strip()
+                                except OSError:
+                                    processName = ''
+                                socketProcesses[inode] = (int(procEntry.name), processName)
+            except OSError:
+                ### process exited or no permission
+                continue
+    return socketProcesses
+
+def JAGetListenPorts( withProcess:bool, debugLevel:int ):
+    """
+    JAGlobalLib.JAGetListenPorts( withProcess:bool, debugLevel:int )
+
+    Collects TCP ports in LISTEN state and UDP ports bound without remote peer by parsing
+    /proc/net/tcp, tcp6, udp and udp6, without executing netstat or ss.
+    When withProcess is True, process id and name holding each socket are also collected from /proc/<pid>/fd.
+    Result is cached for the run in JAListenPorts, so that conn, health and compare operations can use it.
+
+    Returned values
+        returnStatus - True on success, False when /proc/net is not available
+        listenPorts - list of dictionaries with keys Protocol, Address, Port, Inode, PID, Process
+        errorMsg - error message
+    """
+    global JAListenPorts, JAListenPortsWithProcess
+
+    if JAListenPorts != None and (withProcess == False or JAListenPortsWithProcess == True):
+        return True, JAListenPorts, ''
+
+    if os.path.exists('/proc/net/tcp') == False:
+        return False, [], "ERROR JAGetListenPorts() /proc/net/tcp not present, can't collect listen ports"
+
+    listenPorts = []
+    for protocol in ['tcp', 'tcp6', 'udp', 'udp6']:
+        try:
+            with open( '/proc/net/{0}'.format(protocol), 'r' ) as procNetFile:
+                ### skip header line
+                procNetFile.readline()
+                for line in procNetFile:
+                    fields = line.split()
+                    if len(fields) < 10:
+                        continue
+                    ### TCP state 0A is LISTEN, UDP state 07 with remote port 0 is bound, waiting for packets
+                    if protocol.startswith('tcp'):
+                        if fields[3] != '0A':
+                            continue
+                    elif fields[3] != '07' or fields[2].endswith(':0000') == False:
+                        continue
+                    address, port = JAProcNetAddress( fields[1] )
+                    listenPorts.append( {
+                        'Protocol': protocol, 'Address': address, 'Port': port, 'Inode': fields[9],
+                        'PID': None, 'Process': None } )
+        except (OSError, ValueError) as err:
+            ### IPv6 may be disabled, tcp6 and udp6 not present
+            if debugLevel > 1:
+                print("DEBUG-2 JAGetListenPorts() Error reading /proc/net/{0}, error:{1}".format( protocol, err ))
+
+    if withProcess == True:
+        socketProcesses = JAGetSocketProcesses( set( listenPort['Inode'] for listenPort in listenPorts ) )
+        for listenPort in listenPorts:
+            if listenPort['Inode'] in socketProcesses:
+                listenPort['PID'], listenPort['Process'] = socketProcesses[listenPort['Inode']]
+
+    listenPorts.sort( key=lambda listenPort: (listenPort['Protocol'], listenPort['Port'], listenPort['Address']) )
+    if debugLevel > 1:
+        print("DEBUG-2 JAGetListenPorts() collected {0} listen ports, with process info:{1}".format( len(listenPorts), withProcess ))
+
+    JAListenPorts = listenPorts
+    JAListenPortsWithProcess = withProcess
+    return True, listenPorts, ''
+
 def JACheckConnectivityToHosts( 
     defaultParameters, connectivitySpec,
     OSType:str, OSName:str, OSVersion:str, printResults:int, debugLevel:int): 
@@ -1240,7 +2231,8 @@ def JACheckConnectivityToHosts(
         defaultParameters, connectivitySpec, OSType, OSName, OSVersion, printResults, debugLevel
 
     Returned values
-        returnStatus, passCount, failureCount, detailedResults
+        returnStatus, passCount, failureCount, 
+        detailedResults - output of failed checks, one line per host and port
 
     """
     returnStatus = True
@@ -1249,10 +2241,8 @@ def JACheckConnectivityToHosts(
 
     tcpOptions = udpOptions = ''
 
-    connectionErrors = r'Connection timed out|timed out: Operation now in progress|No route to host'
-    hostNameErrors = r'host lookup failed|Could not resolve hostname|Name or service not known'
-    connectivityPassed = r'succeeded|Connected to| open'
-    connectivityUnknown = r'Connection refused'
+    ### count of each connectivity outcome, refer to JAClassifyConnectivityOutput()
+    outcomeCounts = {}
 
     if 'CommandConnCheck' in defaultParameters:
         command = defaultParameters['CommandConnCheck']
@@ -1288,16 +2278,14 @@ def JACheckConnectivityToHosts(
             print("ERROR JACheckConnectivityToHosts() Error executing command:{0}, error msg:{1}".format(
                     command,  errorMsg  ))
         else:
-            ### parse the returnOutput or command output in the list
-            ### 1st item of the list has the result text
-            if re.search(connectivityPassed, returnOutput):
+            ### UNKNOWN outcome is also a failure, connectivity is not confirmed
+            if JAClassifyConnectivityOutput( returnOutput, outcomeCounts ) == 'PASS':
                 passCount += 1
-            elif re.search(connectivityUnknown, returnOutput):
-                failureCount += 1
-            elif re.search(connectionErrors, returnOutput):
-                failureCount += 1
-            elif re.search(hostNameErrors, returnOutput):
+            else:
                 failureCount += 1
+                detailedResults += "{0} {1} {2}: {3}\n".format( hostName, protocol, port, returnOutput )
+    if debugLevel > 1:
+        print("DEBUG-2 JACheckConnectivityToHosts() outcomes:{0}".format( outcomeCounts ))
     if failureCount > 0:
         returnStatus = False    
     return returnStatus, passCount, failureCount, detailedResults
@@ -1337,6 +2325,21 @@ def JAGatherEnvironmentSpecs(storeCurrentValue, values, debugLevel, defaultParam
                 defaultParameters[myKey] = myValue
     return True
 
+def JAParseBool( value, default:bool ):
+    """
+    JAGlobalLib.JAParseBool( value, default:bool )
+
+    Returns boolean value of a parameter read from yml file or passed as argument.
+    Limited yaml reader (used when yaml module is not present) returns the value as string,
+      true or yes in any case is taken as True, any other value as False
+    Returns default if value is None
+    """
+    if value == None:
+        return default
+    if isinstance( value, bool):
+        return value
+    return re.match(r'true|yes', str(value), re.IGNORECASE) != None
+
 def JAIsSupportedCommand( paramValue:str, allowedCommands, OSType:str ):
     """
     JAGlobalLib.JAIsSupportedCommand( paramValue:str, allowedCommands, OSType:str )
@@ -1344,11 +2347,15 @@ def JAIsSupportedCommand( paramValue:str, allowedCommands, OSType:str ):
     searches for the given command in allowed commands list
     If not found, returns False,
     If found, returns True
+    Process query in dictionary form is checked for valid keys, no command is executed for it.
     """
     returnStatus = True
 
     errorMsg = ''
 
+    if isinstance( paramValue, dict):
+        return JAIsValidProcessQuery( paramValue )
+
     ### first mask the contents inside '' and "" so that command separator characters
     ###  inside that string/word is not interpretted as command separators
     commands = re.sub(r'\'(.+)\'|\"(.+)\"', "__JAString__", paramValue)
@@ -1389,6 +2396,124 @@ def JAIsSupportedCommand( paramValue:str, allowedCommands, OSType:str ):
     return returnStatus,errorMsg
 
 
+def JAGetProcessSnapshot( refresh=False ):
+    """
+    JAGlobalLib.JAGetProcessSnapshot( refresh=False )
+
+    Builds process table snapshot from /proc/<pid>/stat and /proc/<pid>/cmdline once per run,
+      shared by all conditions and process queries. Process of current program is not included.
+    Pass refresh=True to build the snapshot again.
+
+    Returned values:
+        returnStatus - True on success
+        processes - list of dictionaries with keys PID, PPID, Name, State, CmdLine
+                    Name is process name from /proc/<pid>/stat (max 15 chars), same as 'ps -e' shows
+        processNameIndex - dictionary, key is process name or executable name (file name of first arg of command line),
+                    value is list of index to processes list
+        errorMsg - error message
+    """
+    global JAProcessSnapshot, JAProcessNameIndex
+    if JAProcessSnapshot != None and refresh == False:
+        return True, JAProcessSnapshot, JAProcessNameIndex, ''
+
+    processes = []
+    processNameIndex = {}
+    thisPID = os.getpid()
+    try:
+        pidNames = [ pidName for pidName in os.listdir('/proc') if pidName.isdigit() ]
+    except OSError as err:
+        return False, processes, processNameIndex, "ERROR JAGetProcessSnapshot() Can't read /proc, error:{0}".format(err)
+
+    for pidName in pidNames:
+        if int(pidName) == thisPID:
+            continue
+        try:
+            with open( '/proc/{0}/stat'.format(pidName), 'r') as file:
+                ### pid (name) state ppid ..., name can have spaces and ()
+                statLine = file.readline()
+            with open( '/proc/{0}/cmdline'.format(pidName), 'rb') as file:
+                cmdLineArgs = file.read().rstrip(b'\0').split(b'\0')
+        except OSError:
+            ### process exited since listing /proc
+            continue
+        processName = statLine[ statLine.index('(') + 1 : statLine.rindex(')') ]
+        statFields = statLine[ statLine.rindex(')') + 2 : ].split()
+        cmdLine = b' '.join(cmdLineArgs).decode('utf-8', errors='replace')
+        processes.append( { 'PID': int(pidName), 'PPID': int(statFields[1]), 'Name': processName,
+                            'State': statFields[0], 'CmdLine': cmdLine } )
+
+        processIndex = len(processes) - 1
+        processNameIndex.setdefault( processName, []).append( processIndex )
+        if cmdLine != '':
+            execName = os.path.basename( cmdLineArgs[0].decode('utf-8', errors='replace').split(' ')[0] )
+            if execName != processName:
+                processNameIndex.setdefault( execName, []).append( processIndex )
+
+    JAProcessSnapshot = processes
+    JAProcessNameIndex = processNameIndex
+    return True, processes, processNameIndex, ''
+
+def JAInvalidateProcessSnapshot():
+    """
+    JAGlobalLib.JAInvalidateProcessSnapshot()
+
+    Discards process table snapshot so that next JAGetProcessSnapshot() builds it again.
+    Called at the start of each operation and after executing HealAction or Task, 
+      since those can start or stop processes.
+    """
+    global JAProcessSnapshot, JAProcessNameIndex
+    JAProcessSnapshot = None
+    JAProcessNameIndex = None
+
+def JACountProcesses( processQuery:dict ):
+    """
+    JAGlobalLib.JACountProcesses( processQuery:dict )
+
+    Counts processes in process snapshot matching to the query
+        processQuery - dictionary with one or both keys
+            ProcessName - process name or executable name, exact match
+            ProcessCmdLine - string present in command line of the process
+        When both are specified, process needs to match to both.
+
+    Returned values:
+        returnStatus - True on success
+        processCount - number of matching processes
+        errorMsg - error message
+    """
+    returnStatus, errorMsg = JAIsValidProcessQuery( processQuery )
+    if returnStatus == False:
+        return False, 0, errorMsg
+    returnStatus, processes, processNameIndex, errorMsg = JAGetProcessSnapshot()
+    if returnStatus == False:
+        return False, 0, errorMsg
+
+    if 'ProcessName' in processQuery:
+        ### same process can be indexed under process name and executable name
+        candidates = [ processes[processIndex] for processIndex in 
+            sorted(set( processNameIndex.get( str(processQuery['ProcessName']), [] ))) ]
+    else:
+        candidates = processes
+    if 'ProcessCmdLine' in processQuery:
+        cmdLineString = str(processQuery['ProcessCmdLine'])
+        candidates = [ process for process in candidates if cmdLineString in process['CmdLine'] ]
+    return True, len(candidates), ''
+
+def JAIsValidProcessQuery( processQuery ):
+    """
+    JAGlobalLib.JAIsValidProcessQuery( processQuery )
+
+    Checks the process query spec used in place of Command to evaluate Condition
+
+    Returned values:
+        returnStatus - True if valid
+        errorMsg - error message
+    """
+    if isinstance( processQuery, dict) == False or len(processQuery) == 0 or \
+            len( set(processQuery.keys()) - set(['ProcessName', 'ProcessCmdLine']) ) > 0:
+        return False, "ERROR JAIsValidProcessQuery() Invalid process query:|{0}|, expected in the form {{ ProcessName: <name>, ProcessCmdLine: <string> }}".format(
+            processQuery)
+    return True, ''
+
 def JAEvaluateCondition(serviceName, serviceAttributes, defaultParameters, debugLevel:int,
     interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType):
 
@@ -1414,25 +2539,38 @@ def JAEvaluateCondition(serviceName, serviceAttributes, defaultParameters, debug
         conditionPresent = True
         conditionMet = False
 
-        ### now execute the command to get result 
-        ###   command was checked for allowed command while reading the config spec
-        if OSType == "Windows":
-            #tempCommandToEvaluateCondition = '{0} {1}'.format( defaultParameters['CommandShell'], tempCommand) 
-            tempCommandToEvaluateCondition = tempCommand 
+        if isinstance( tempCommand, dict):
+            ### structured process query, count of matching processes is answered from process snapshot
+            ###   instead of running ps and grep for each item
+            tempCommandToEvaluateCondition = tempCommand
+            returnResult, processCount, errorMsg = JACountProcesses( tempCommand )
+            returnOutput = [ str(processCount) ]
+            if debugLevel > 2:
+                LogLine(
+                    "DEBUG-3 JAEvaluateCondition() name:|{0}|, process query:|{1}|, matching processes:{2}".format(
+                        serviceName, tempCommand, processCount),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
         else:
-            tempCommandToEvaluateCondition =  tempCommand
-        tempCommandToEvaluateCondition = os.path.expandvars( tempCommandToEvaluateCondition ) 
+            ### now execute the command to get result 
+            ###   command was checked for allowed command while reading the config spec
+            if OSType == "Windows":
+                #tempCommandToEvaluateCondition = '{0} {1}'.format( defaultParameters['CommandShell'], tempCommand) 
+                tempCommandToEvaluateCondition = tempCommand 
+            else:
+                tempCommandToEvaluateCondition =  tempCommand
+            tempCommandToEvaluateCondition = os.path.expandvars( tempCommandToEvaluateCondition ) 
 
-        if debugLevel > 2:
-            LogLine(
-                "DEBUG-3 JAEvaluateCondition() name:|{0}|, executing command:|{1}|".format(
-                    serviceName, tempCommandToEvaluateCondition),
-                interactiveMode,
-                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            if debugLevel > 2:
+                LogLine(
+                    "DEBUG-3 JAEvaluateCondition() name:|{0}|, executing command:|{1}|".format(
+                        serviceName, tempCommandToEvaluateCondition),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
-        returnResult, returnOutput, errorMsg = JAExecuteCommand(
-                                            defaultParameters['CommandShell'],
-                                            tempCommandToEvaluateCondition, debugLevel, OSType)
+            returnResult, returnOutput, errorMsg = JAExecuteCommand(
+                                                defaultParameters['CommandShell'],
+                                                tempCommandToEvaluateCondition, debugLevel, OSType)
         if returnResult == False:
             numberOfErrors += 1
             if re.match(r'File not found', errorMsg) != True:
@@ -1652,69 +2790,176 @@ def JADatamaskMaskLine(line, datamaskSpec, debugLevel, interactiveMode, myColors
 
     return line
 
-def JADataMaskFile(fileName, datamaskSpec, debugLevel, interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType):
+### compiled ignore patterns, key - tuple of patterns, value - compiled regular expression 
+###   same ignore patterns are used for many files, compile it once per run
+JAIgnorePatternsCache = {}
+
+def JACompileIgnorePatterns( ignorePatterns ):
     """
-    JADatamaskMaskFile(fileName, logFilePath, datamaskSpec, debugLevel, interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+    JAGlobalLib.JACompileIgnorePatterns( ignorePatterns )
 
-    This function applies datamask, translates given file to a temporary file with xlated strings.
+    Compiles list of ignore patterns into single regular expression with alternation like (?:pattern1)|(?:pattern2)
+    Compiled expression is cached so that it is compiled once per run.
 
-    """
-    returnStatus = True
-    newFileName = "{0}.datamasked".format(fileName)
+    Returned values
+        returnStatus - True on success, False if pattern could not be compiled
+        compiledPattern - None if no pattern passed or upon error
+        errorMsg
+    """
+    if ignorePatterns == None or len(ignorePatterns) == 0:
+        return True, None, ''
+    if isinstance(ignorePatterns, str):
+        ignorePatterns = [ignorePatterns]
+    cacheKey = tuple(ignorePatterns)
+    if cacheKey in JAIgnorePatternsCache:
+        return True, JAIgnorePatternsCache[cacheKey], ''
     try:
-        with open(newFileName, "w") as newFile:
-            try:
-                with open( fileName, "r") as origFile:
-                    while True:
-                        ### reach each line from origFile, xlate the string and write to new file
-                        oldLine = line = origFile.readline()
-                        if not line:
-                            break
+        compiledPattern = re.compile( '|'.join( '(?:{0})'.format(pattern) for pattern in ignorePatterns ) )
+    except re.error as err:
+        return False, None, "ERROR JACompileIgnorePatterns() Invalid ignore pattern in:|{0}|, error:{1}".format(ignorePatterns, err)
+    JAIgnorePatternsCache[cacheKey] = compiledPattern
+    return True, compiledPattern, ''
 
-                        for datamaskWord in datamaskSpec:
-                            line = re.sub(r'{0}'.format(datamaskWord), '__JADatamask__', line)
+def JADataMaskLines( fileHandle, compiledPattern ):
+    """
+    JAGlobalLib.JADataMaskLines( fileHandle, compiledPattern )
 
-                        newFile.write(line)
+    Generator that reads lines from fileHandle, replaces the strings matching to compiledPattern with __JADatamask__
+    Leading and trailing white space is removed, run of white spaces within the line is replaced with single space
+      and blank lines are skipped (similar to diff -b -B)
 
-                        if debugLevel > 3:
-                            LogLine(
-                                "DEBUG-4 JADatamaskMaskFile() oldLine:|{0}\n, datamased line:|{1}|".format( oldLine, line ),
-                                interactiveMode,
-                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+    """
+    for line in fileHandle:
+        if compiledPattern != None:
+            line = compiledPattern.sub('__JADatamask__', line)
+        line = ' '.join( line.split() )
+        if line != '':
+            yield line
 
-                    origFile.close()
-            except OSError as err:
-                LogLine(
-                    "ERROR JADatamaskMaskFile() Can't open file:|{0}|, OSError:{1}".format( fileName, err ),
-                    interactiveMode,
-                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
-                returnStatus = False
-            newFile.close()
+def JADiffDataMaskedFiles( currentFileName:str, previousFileName:str, ignorePatterns, debugLevel:int ):
+    """
+    JAGlobalLib.JADiffDataMaskedFiles( currentFileName:str, previousFileName:str, ignorePatterns, debugLevel:int )
+
+    Compares two text files after masking the strings matching to ignorePatterns.
+    Lines are masked while reading the files, compared in memory, no temporary files are written.
+
+    Returned values
+        returnStatus - True on success, False if file could not be read or ignore pattern is invalid
+        diffLines - list of lines in unified diff format, [''] if files match after masking
+        errorMsg
+    """
+    import difflib
 
+    returnStatus, compiledPattern, errorMsg = JACompileIgnorePatterns( ignorePatterns )
+    if returnStatus == False:
+        return returnStatus, [], errorMsg
+
+    try:
+        with open( currentFileName, "r", errors='replace') as currentFile:
+            currentLines = list( JADataMaskLines( currentFile, compiledPattern ) )
+            currentFile.close()
+        with open( previousFileName, "r", errors='replace') as previousFile:
+            previousLines = list( JADataMaskLines( previousFile, compiledPattern ) )
+            previousFile.close()
     except OSError as err:
-        LogLine(
-            "ERROR JADatamaskMaskFile() Can't write new file:|{0}|, OSError:{1}".format( newFileName, err ),
-            interactiveMode,
-            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
-        returnStatus = False
-    
-    return returnStatus, newFileName
+        return False, [], "ERROR JADiffDataMaskedFiles() Can't read file, OSError:{0}".format( err )
+
+    ### prior versions wrote masked copy of both files as <fileName>.datamasked, remove those left behind
+    for fileName in ( currentFileName, previousFileName ):
+        if os.path.exists( fileName + '.datamasked' ):
+            try:
+                os.remove( fileName + '.datamasked' )
+            except OSError as err:
+                if debugLevel > 0:
+                    print("DEBUG-1 JADiffDataMaskedFiles() Can't remove file:|{0}.datamasked|, OSError:{1}".format( fileName, err ))
+
+    diffLines = list( difflib.unified_diff( 
+        currentLines, previousLines, fromfile=currentFileName, tofile=previousFileName, lineterm='', n=0) )
+    if debugLevel > 3:
+        print("DEBUG-4 JADiffDataMaskedFiles() current file:|{0}|, previous file:|{1}|, diff lines:{2}".format(
+            currentFileName, previousFileName, len(diffLines) ))
+    if len(diffLines) == 0:
+        ### same as compare command output when files match
+        diffLines = ['']
+    return True, diffLines, ''
+
+def JACompileComparePatterns(
+        itemName, comparePatterns:dict,
+        interactiveMode, debugLevel,
+        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType):
+    """
+    JACompileComparePatterns(
+        itemName, comparePatterns,
+        interactiveMode, debugLevel,
+        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+
+    Compiles ComparePatterns spec once at config read time, after group values are evaluated,
+        so that patterns are not formatted and compiled again for each comparison.
+
+    Returned values:
+        compiledPatterns - list of dictionaries with keys
+            Pattern - pattern string as specified
+            Regex - compiled pattern, None if pattern is invalid
+            Groups - list of (groupNumber, expectedValue), expectedValue is int, float or str
+                    as specified in spec, group number starts with 1
+    """
+    compiledPatterns = []
+    for comparePattern, conditions in comparePatterns.items():
+        try:
+            regex = re.compile( r'{0}'.format(comparePattern), re.MULTILINE)
+        except re.error as err:
+            LogLine(
+                "ERROR JACompileComparePatterns() item:{0}, invalid comparePattern:|{1}|, error:{2}".format( 
+                    itemName, comparePattern, err ),
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+            regex = None
+
+        groups = []
+        if conditions != None:
+            for findAllGroupNumber, compareValue in conditions.items():
+                try:
+                    findAllGroupNumber = int(findAllGroupNumber)
+                except ValueError:
+                    LogLine(
+                        "ERROR JACompileComparePatterns() item:{0}, comparePattern:|{1}|, invalid group number:|{2}|".format( 
+                            itemName, comparePattern, findAllGroupNumber ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+                    findAllGroupNumber = 0
+                if isinstance(compareValue, int) == True:
+                    compareValue = int(compareValue)
+                elif isinstance(compareValue, float) == False:
+                    compareValue = str(compareValue)
+                groups.append( (findAllGroupNumber, compareValue) )
+
+        compiledPatterns.append( { 'Pattern': comparePattern, 'Regex': regex, 'Groups': groups } )
+    return compiledPatterns
 
 def JAComparePatterns(
         itemName,
-        comparePatterns:dict, fileName:str, textBuffer:str,
+        comparePatterns, fileName:str, textBuffer:str,
         interactiveMode, debugLevel,
         myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType):
     """
     JAComparePatterns(
         itemName,
-        comparePatterns, saveFileName,
+        comparePatterns, saveFileName, textBuffer,
         interactiveMode, debugLevel,
         myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
 
-    This function searches for a presence of compare patterns in line(s) within a file.
-    If all patterns are found, returns True
-    If any pattern is not found, returns False
+    This function searches for a presence of compare patterns in line(s) within a file or text buffer.
+    comparePatterns is the list returned by JACompileComparePatterns(), 
+        ComparePatterns spec in dictionary form is also accepted, compiled for current call.
+    Each pattern is searched once for it's first match, group values of that match are compared to expected values.
+
+    Returned values
+        returnStatus - True if all patterns are found, False if any pattern is not found
+        numberOfPatternsFound, numberOfPatternsNotFound
+        patternResults - list with result of each pattern in the form
+            { 'Pattern': , 'Found': True|False, 
+              'Groups': [ {'Group': , 'Expected': , 'Current': , 'Matched': True|False}, ... ] }
+        errorMsg
 
     """
     returnStatus = True
@@ -1724,15 +2969,16 @@ def JAComparePatterns(
     ### text printed along with error message when pattern not found
     linesFileNameMsg = ''
 
+    if isinstance(comparePatterns, dict):
+        comparePatterns = JACompileComparePatterns(
+            itemName, comparePatterns,
+            interactiveMode, debugLevel,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+
     if fileName != None:
         try:
             with open( fileName, "r") as file:
-                while True:
-                    tempLine = file.readline()
-                    if not tempLine:
-                        break
-                    lines += tempLine
-                file.close()
+                lines = file.read()
                 linesFileNameMsg = fileName
         except OSError as err:
             LogLine(
@@ -1743,94 +2989,84 @@ def JAComparePatterns(
     elif textBuffer != None:
         ### if textBuffer is list, make a multi-line string to be used for search later.
         if isinstance(textBuffer, list):
-            for line in textBuffer:
-                lines += (line + '\n')
+            lines = '\n'.join(textBuffer) + '\n'
         else:
             lines = textBuffer
         linesFileNameMsg = lines
 
     numberOfPatternsToFind = numberOfPatternsFound = 0
+    patternResults = []
     if returnStatus == True:
         numberOfPatternsToFind = len(comparePatterns)
         
-        ### search for each pattern in lineS   
-        for comparePattern, conditions in comparePatterns.items():
+        ### search for each pattern in lines
+        for compiledPattern in comparePatterns:
+            comparePattern = compiledPattern['Pattern']
             if debugLevel > 1:
                 LogLine(
                     "DEBUG-2 JAComparePatterns() item:{0}, searching for ComparePattern:|{1}| in file or text:|{2}|".format( 
                         itemName, comparePattern, linesFileNameMsg ),
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
-            myResults =  re.findall(r'{0}'.format(comparePattern), lines, re.MULTILINE)
-            if len(myResults) > 0:
-                numberOfMatchedPatterns = len(myResults[0])
-                myResults = myResults[0]
-            else:
-                numberOfMatchedPatterns = 0
-            if numberOfMatchedPatterns > 0:
-                ### for group values matching to the patterns,
-                ###    check conditions one by one in the conditions list
-                ### group number spec uses index starting from 1, myResults[] index starts with 0
+            groupResults = []
+            patternFound = False
+            match = None
+            if compiledPattern['Regex'] != None:
+                match = compiledPattern['Regex'].search(lines)
+
+            if match != None:
+                ### for group values of first match, check conditions one by one
+                ### group number spec uses index starting from 1, same as match.group()
+                currentValues = match.groups()
                 conditionsMet = 0
-                numberOfConditions = len(conditions)
                 if debugLevel > 2:
                     LogLine(
                         "DEBUG-3 JAComparePatterns()\t\tcomparing expected group values:|{0}| to current group values:|{1}|".format( 
-                            conditions, myResults ),
+                            compiledPattern['Groups'], currentValues ),
                         interactiveMode,
                         myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
 
-                for findAllGroupNumber, compareValue in conditions.items():
-                    if numberOfMatchedPatterns >= findAllGroupNumber:
+                for findAllGroupNumber, compareValue in compiledPattern['Groups']:
+                    tempConditionsMet = False
+                    currentValue = None
+                    if 0 < findAllGroupNumber <= len(currentValues):
+                        currentValue = currentValues[findAllGroupNumber-1]
                         try:
-                            tempConditionsMet = False
-                            if isinstance(compareValue,int) == True:
-                                ### group number spec uses index starting from 1, myResults[] index starts with 0
-                                ###   thus doing findAllGroupNumber-1 to pick up desired value from myResults
-                                if int(myResults[findAllGroupNumber-1]) == int(compareValue):
-                                    conditionsMet += 1
-                                    tempConditionsMet = True
-                            elif isinstance(compareValue,float) == True:
-                                ### group number spec uses index starting from 1, myResults[] index starts with 0
-                                ###   thus doing findAllGroupNumber-1 to pick up desired value from myResults
-                                if float(myResults[findAllGroupNumber-1]) == float(compareValue):
-                                    conditionsMet += 1
-                                    tempConditionsMet = True
-                            else:
-                                ### group number spec uses index starting from 1, myResults[] index starts with 0
-                                ###   thus doing findAllGroupNumber-1 to pick up desired value from myResults
-                                if str(myResults[findAllGroupNumber-1]) == str(compareValue):
-                                    conditionsMet += 1
-                                    tempConditionsMet = True
-
-                            if tempConditionsMet == True:
-                                if debugLevel > 2:
-                                    LogLine(
-                                        "DEBUG-3 JAComparePatterns()\t\tregex group:{0}, expected value:|{1}| matched to current value:|{2}|".format( 
-                                            findAllGroupNumber, compareValue, myResults[findAllGroupNumber-1] ),
-                                        interactiveMode,
-                                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+                            if isinstance(compareValue, int) == True:
+                                tempConditionsMet = int(currentValue) == compareValue
+                            elif isinstance(compareValue, float) == True:
+                                tempConditionsMet = float(currentValue) == compareValue
                             else:
-                                LogLine(
-                                    "ERROR JAComparePatterns() item:{0}, regex group:{1}, expected value:|{2}| is NOT matching to current value:|{3}| in the file or text:|{4}|".format( 
-                                        itemName, findAllGroupNumber, compareValue, myResults[findAllGroupNumber-1], linesFileNameMsg ),
-                                    interactiveMode,
-                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+                                tempConditionsMet = str(currentValue) == compareValue
+                        except (TypeError, ValueError):
+                            ### current value could not be converted to expected value type
+                            tempConditionsMet = False
 
-                        except:
+                    groupResults.append( { 'Group': findAllGroupNumber, 'Expected': compareValue,
+                                           'Current': currentValue, 'Matched': tempConditionsMet } )
+                    if tempConditionsMet == True:
+                        conditionsMet += 1
+                        if debugLevel > 2:
                             LogLine(
-                                "ERROR JAComparePatterns() item:{0}, current value type conversion exception, regex group:{1}, expected value:|{2}| is NOT matching to current value:|{3}| in the file or text:|{4}| ".format( 
-                                    itemName, findAllGroupNumber, compareValue, myResults[findAllGroupNumber-1], linesFileNameMsg ),
+                                "DEBUG-3 JAComparePatterns()\t\tregex group:{0}, expected value:|{1}| matched to current value:|{2}|".format( 
+                                    findAllGroupNumber, compareValue, currentValue ),
                                 interactiveMode,
                                 myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
+                    else:
+                        LogLine(
+                            "ERROR JAComparePatterns() item:{0}, regex group:{1}, expected value:|{2}| is NOT matching to current value:|{3}| in the file or text:|{4}|".format( 
+                                itemName, findAllGroupNumber, compareValue, currentValue, linesFileNameMsg ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
 
-                if conditionsMet == numberOfConditions:
-                    ### all patterns found in current conditions
+                if conditionsMet == len(compiledPattern['Groups']):
+                    ### all groups matched for current pattern
                     numberOfPatternsFound += 1
+                    patternFound = True
                 else:
                     LogLine(
                         "ERROR JAComparePatterns() item:{0}, NOT all regex groups matched from the comparePattern:|{1}|, expected regex groups to match:{2}, regex groups matched:{3} in the file or text:|{4}|".format( 
-                            itemName, comparePattern, numberOfConditions, conditionsMet, linesFileNameMsg ),
+                            itemName, comparePattern, len(compiledPattern['Groups']), conditionsMet, linesFileNameMsg ),
                         interactiveMode,
                         myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
 
@@ -1840,20 +3076,40 @@ def JAComparePatterns(
                         itemName, comparePattern, linesFileNameMsg ),
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
-                    
-            if numberOfPatternsToFind == numberOfPatternsFound:
-                ### found all items, get out of the loop
-                break
+
+            patternResults.append( { 'Pattern': comparePattern, 'Found': patternFound, 'Groups': groupResults } )
 
         if numberOfPatternsToFind != numberOfPatternsFound:
             LogLine(
                 "ERROR  JAComparePatterns() item:{0}, ComparePatterns:|{1}|, expected pattern matches:{2}, actual pattern matches:{3} in the file or text:|{4}|".format(
-                     itemName, comparePatterns, numberOfPatternsToFind, numberOfPatternsFound, linesFileNameMsg  ),
+                     itemName, [ compiledPattern['Pattern'] for compiledPattern in comparePatterns ], 
+                     numberOfPatternsToFind, numberOfPatternsFound, linesFileNameMsg  ),
                 interactiveMode,
                 myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType) 
             returnStatus = False
 
-    return returnStatus, numberOfPatternsFound, (numberOfPatternsToFind-numberOfPatternsFound), errorMsg
+    return returnStatus, numberOfPatternsFound, (numberOfPatternsToFind-numberOfPatternsFound), patternResults, errorMsg
+
+def JAFormatPatternResults( patternResults:list ):
+    """
+    JAFormatPatternResults( patternResults:list )
+
+    Returns report lines for patterns not found in the patternResults list returned by JAComparePatterns(),
+      one line per pattern with expected and current value of each regex group
+    """
+    reportLines = []
+    for patternResult in patternResults:
+        if patternResult['Found'] == True:
+            continue
+        if len(patternResult['Groups']) == 0:
+            reportLines.append( "Pattern:|{0}| NOT found".format( patternResult['Pattern'] ) )
+        else:
+            reportLines.append( "Pattern:|{0}| NOT matched, {1}".format( patternResult['Pattern'],
+                ", ".join( [ "group:{0} expected:|{1}| current:|{2}|{3}".format(
+                    groupResult['Group'], groupResult['Expected'], groupResult['Current'],
+                    '' if groupResult['Matched'] == True else ' NOT matched' )
+                    for groupResult in patternResult['Groups'] ] ) ) )
+    return reportLines
 
 def JASetSystemVariables( defaultParameters, thisHostName, variables):
     """
@@ -1879,9 +3135,16 @@ def JASetSystemVariables( defaultParameters, thisHostName, variables):
     variables['JASiteName'] = defaultParameters['SiteName'] 
 
     import uuid
-    import socket
     variables['JAMACAddress'] = (':'.join(re.findall('..', '%012x' % uuid.getnode())))
-    variables['JAIPAddress'] = socket.gethostbyname(thisHostName)
+    ### resolve once per run instead of each time a config file is read
+    if 'DNSCacheTTL' in defaultParameters:
+        dnsCacheTTL = defaultParameters['DNSCacheTTL']
+    else:
+        dnsCacheTTL = 300
+    tempReturnStatus, variables['JAIPAddress'], tempErrorMsg = JAGetHostAddress( thisHostName, dnsCacheTTL )
+    if tempReturnStatus == False:
+        returnStatus = False
+        errorMsg = "ERROR JASetSystemVariables() {0}".format( tempErrorMsg )
 
     """
     TBD Add code to handle multiple interface info 
@@ -2116,4 +3379,116 @@ def JAPrintFile( fileName:str, pattern:str ):
         errorMsg = "ERROR could not open the file:{0}, errorMsg:{1}".format( fileName, err)
         returnStatus = False
 
-    return returnStatus, errorMsg
\ No newline at end of file
+    return returnStatus, errorMsg
+### checksum algorithms supported by JAComputeFileDigest()
+### checksum saved in .checksum file is prefixed with algorithm name like sha256:<hexdigest>
+### checksum saved without algorithm tag by prior versions is treated as md5 checksum
+JAChecksumAlgorithms = ['blake2b', 'sha256', 'xxh64', 'xxh3_64', 'xxh128', 'md5']
+JAChecksumDefaultAlgorithm = 'sha256'
+JAChecksumLegacyAlgorithm = 'md5'
+### read size used while computing checksum of large files like jar/war files
+JAChecksumBufferSize = 1048576
+
+def JAGetChecksumAlgorithm( algorithm:str ):
+    """
+    JAGlobalLib.JAGetChecksumAlgorithm( algorithm:str )
+
+    Validates the algorithm name passed.
+    If algorithm is None or empty, returns default algorithm
+    Another algorithm is NOT substituted when the algorithm is not usable, since checksum computed with 
+      another algorithm never matches the checksum saved with the given algorithm.
+
+    Returned values
+        algorithm - algorithm name in lower case, None if not supported 
+                    or if xxhash type (xxh64, xxh3_64, xxh128) and xxhash module is not present
+        errorMsg
+    """
+    if algorithm == None or algorithm == '':
+        return JAChecksumDefaultAlgorithm, ''
+    algorithm = algorithm.lower()
+    if algorithm not in JAChecksumAlgorithms:
+        return None, "ERROR JAGetChecksumAlgorithm() Unsupported checksum algorithm:|{0}|, supported algorithms:{1}".format(
+            algorithm, JAChecksumAlgorithms)
+    if re.match(r'xxh', algorithm):
+        from importlib import util
+        if util.find_spec("xxhash") == None:
+            return None, "ERROR JAGetChecksumAlgorithm() Checksum algorithm:|{0}| needs python module xxhash, not installed".format(
+                algorithm)
+    return algorithm, ''
+
+def JAComputeFileDigest( fileName:str, algorithm:str, bufferSize=JAChecksumBufferSize ):
+    """
+    JAGlobalLib.JAComputeFileDigest( fileName:str, algorithm:str, bufferSize=JAChecksumBufferSize )
+
+    Computes checksum of given file using the algorithm passed.
+    Uses hashlib.file_digest() if available (python 3.11 or above),
+    else reads the file in chunks of bufferSize into a reusable buffer and updates the checksum.
+
+    Parameters passed:
+        fileName - file to compute checksum
+        algorithm - one of JAChecksumAlgorithms, if not usable, checksum is not computed
+        bufferSize - read size in bytes
+
+    Returned values
+        returnStatus - True on success, False if file could not be read
+        digest - hex digest in the form <algorithm>:<hexdigest>, '' on failure
+        errorMsg
+
+    """
+    import hashlib
+
+    algorithm, errorMsg = JAGetChecksumAlgorithm( algorithm )
+    if algorithm == None:
+        return False, '', errorMsg
+    if re.match(r'xxh', algorithm):
+        import xxhash
+        checksumObject = getattr(xxhash, algorithm)()
+    elif algorithm == 'blake2b':
+        checksumObject = hashlib.blake2b()
+    else:
+        checksumObject = hashlib.new(algorithm)
+
+    try:
+        with open(fileName, "rb", buffering=0) as file:
+            if hasattr(hashlib, 'file_digest'):
+                checksumObject = hashlib.file_digest(file, lambda: checksumObject)
+            else:
+                ### read into the same buffer to avoid allocating new bytes object for each read
+                readBuffer = bytearray(bufferSize)
+                readBufferView = memoryview(readBuffer)
+                while True:
+                    bytesRead = file.readinto(readBuffer)
+                    if not bytesRead:
+                        break
+                    checksumObject.update(readBufferView[:bytesRead])
+            file.close()
+    except OSError as err:
+        errorMsg = "ERROR JAComputeFileDigest() Not able to read file:|{0}|, error:{1}".format(fileName, err)
+        return False, '', errorMsg
+
+    return True, JAFormatChecksum( algorithm, checksumObject.hexdigest()), ''
+
+def JAFormatChecksum( algorithm:str, hexDigest:str ):
+    """
+    JAGlobalLib.JAFormatChecksum( algorithm:str, hexDigest:str )
+
+    Returns checksum in the form <algorithm>:<hexdigest> 
+    This form is stored in .checksum file so that the algorithm can be identified while comparing
+    """
+    return "{0}:{1}".format(algorithm, hexDigest)
+
+def JAParseChecksum( checksum:str ):
+    """
+    JAGlobalLib.JAParseChecksum( checksum:str )
+
+    Parses the checksum in the form <algorithm>:<hexdigest>
+    If algorithm tag is not present (checksum saved by prior version), algorithm is returned as md5
+
+    Returned values
+        algorithm, hexDigest
+    """
+    checksum = checksum.strip()
+    tempValues = checksum.split(':', 1)
+    if len(tempValues) == 2 and tempValues[0] in JAChecksumAlgorithms:
+        return tempValues[0], tempValues[1]
+    return JAChecksumLegacyAlgorithm, checksum
@@ -16,10 +16,11 @@ Execution Flow
     For inventory,
         Execute commands to get health info
     For test,
-        Execute commands, save the results to temp file
+        Execute commands of independent tests in parallel, with timeout, tests with DependsOn after those tests complete
         Apply IgnorePatterns to mask patters/text in result that is to be ignored before comparison
         If ComparePatterns is specified, search for those in result.
-        Else, compare the result file to the expected result file, whose file name is same as item name.
+        Else, compare the result in memory to the expected result file, whose file name is same as item name.
+        Write JUnit XML and JSON reports with status and duration of each test
 
     If interactive mode, display results
     Else, store the results to a JAAudit.<operation>.log.YYYYMMDD file
@@ -37,7 +38,771 @@ import time
 #import signal
 from collections import defaultdict
 import JAGlobalLib
-import JAOperationSaveCompare
+
+### X.509 attribute type OIDs to short names used in subject and issuer display, same as openssl
+JACertNameOIDs = {
+    '2.5.4.3': 'CN', '2.5.4.4': 'SN', '2.5.4.5': 'serialNumber', '2.5.4.6': 'C', '2.5.4.7': 'L',
+    '2.5.4.8': 'ST', '2.5.4.9': 'street', '2.5.4.10': 'O', '2.5.4.11': 'OU', '2.5.4.12': 'title',
+    '2.5.4.42': 'GN', '0.9.2342.19200300.100.1.25': 'DC', '1.2.840.113549.1.9.1': 'emailAddress' }
+
+### subjectAltName extension OID
+JACertSANOID = '2.5.29.17'
+
+def JADERReadTLV( data, offset ):
+    """
+    JADERReadTLV( data, offset )
+    Reads one DER tag-length-value starting at offset
+
+    Returned values:
+        tag - tag byte
+        valueStart - offset of first value byte
+        valueEnd - offset after last value byte
+    """
+    tag = data[offset]
+    length = data[offset+1]
+    offset += 2
+    if length & 0x80:
+        numberOfBytes = length & 0x7f
+        length = int.from_bytes( data[offset:offset+numberOfBytes], 'big')
+        offset += numberOfBytes
+    if offset + length > len(data):
+        raise ValueError("DER length exceeds available data at offset:{0}".format(offset))
+    return tag, offset, offset + length
+
+def JADERChildren( data, valueStart, valueEnd ):
+    """
+    JADERChildren( data, valueStart, valueEnd )
+    Returns list of (tag, valueStart, valueEnd) of the DER elements within given constructed value
+    """
+    children = []
+    offset = valueStart
+    while offset < valueEnd:
+        tag, childStart, childEnd = JADERReadTLV( data, offset )
+        children.append( (tag, childStart, childEnd) )
+        offset = childEnd
+    return children
+
+def JADERDecodeOID( value ):
+    """
+    JADERDecodeOID( value )
+    Returns dotted string form of DER encoded object identifier
+    """
+    parts = []
+    number = 0
+    for byte in value:
+        number = (number << 7) | (byte & 0x7f)
+        if byte & 0x80 == 0:
+            parts.append(number)
+            number = 0
+    if parts[0] >= 80:
+        parts = [2, parts[0] - 80] + parts[1:]
+    else:
+        parts = [parts[0] // 40, parts[0] % 40] + parts[1:]
+    return '.'.join( str(part) for part in parts)
+
+def JADERDecodeString( tag, value ):
+    """
+    JADERDecodeString( tag, value )
+    Returns string value of DER encoded string types
+    """
+    if tag == 0x1e:
+        ### BMPString
+        return value.decode('utf-16-be', errors='replace')
+    elif tag == 0x1c:
+        ### UniversalString
+        return value.decode('utf-32-be', errors='replace')
+    elif tag == 0x0c:
+        return value.decode('utf-8', errors='replace')
+    else:
+        ### PrintableString, IA5String, T61String, VisibleString
+        return value.decode('latin-1')
+
+def JADERDecodeName( data, valueStart, valueEnd ):
+    """
+    JADERDecodeName( data, valueStart, valueEnd )
+    Returns X.509 Name in openssl display form like 'C = US, O = havembha, CN = havembha'
+    """
+    nameParts = []
+    for setTag, setStart, setEnd in JADERChildren( data, valueStart, valueEnd):
+        for seqTag, seqStart, seqEnd in JADERChildren( data, setStart, setEnd):
+            typeAndValue = JADERChildren( data, seqStart, seqEnd)
+            oid = JADERDecodeOID( data[typeAndValue[0][1]:typeAndValue[0][2]] )
+            valueTag, nameValueStart, nameValueEnd = typeAndValue[1]
+            nameParts.append( "{0} = {1}".format(
+                JACertNameOIDs.get(oid, oid), 
+                JADERDecodeString( valueTag, data[nameValueStart:nameValueEnd]) ) )
+    return ', '.join(nameParts)
+
+def JADERDecodeTime( tag, value ):
+    """
+    JADERDecodeTime( tag, value )
+    Returns time in seconds (UTC) of DER encoded UTCTime or GeneralizedTime
+    """
+    import calendar
+    timeString = value.decode('ascii').rstrip('Z')
+    if tag == 0x17:
+        ### UTCTime YYMMDDHHMMSS, years 50 to 99 are 19xx
+        year = int(timeString[0:2])
+        timeString = "{0}{1}".format( 1900 + year if year >= 50 else 2000 + year, timeString[2:])
+    return calendar.timegm( time.strptime( timeString[0:14], "%Y%m%d%H%M%S") )
+
+def JADERDecodeSubjectAltNames( data, valueStart, valueEnd ):
+    """
+    JADERDecodeSubjectAltNames( data, valueStart, valueEnd )
+    Returns list of subject alternate names in openssl display form like DNS:host.havembha.com, IP Address:10.1.1.1
+    """
+    import ipaddress
+    subjectAltNames = []
+    tag, seqStart, seqEnd = JADERReadTLV( data, valueStart)
+    for nameTag, nameStart, nameEnd in JADERChildren( data, seqStart, seqEnd):
+        nameValue = data[nameStart:nameEnd]
+        if nameTag == 0x82:
+            subjectAltNames.append( "DNS:{0}".format( nameValue.decode('latin-1')))
+        elif nameTag == 0x87:
+            subjectAltNames.append( "IP Address:{0}".format( ipaddress.ip_address(nameValue)))
+        elif nameTag == 0x81:
+            subjectAltNames.append( "email:{0}".format( nameValue.decode('latin-1')))
+        elif nameTag == 0x86:
+            subjectAltNames.append( "URI:{0}".format( nameValue.decode('latin-1')))
+    return subjectAltNames
+
+def JACertDecodeDER( certDER ):
+    """
+    JACertDecodeDER( certDER )
+    Decodes DER encoded X.509 certificate in-process
+
+    Returned values:
+        certDetails - dictionary with Subject, Issuer, SubjectAltNames, SerialNumber,
+                        NotBefore, NotAfter (time in seconds), Fingerprint (SHA256)
+    """
+    import hashlib
+    tag, certStart, certEnd = JADERReadTLV( certDER, 0)
+    tag, tbsStart, tbsEnd = JADERChildren( certDER, certStart, certEnd)[0]
+    tbsFields = JADERChildren( certDER, tbsStart, tbsEnd)
+    if tbsFields[0][0] == 0xa0:
+        ### skip explicit version
+        tbsFields = tbsFields[1:]
+    ### tbsFields - serialNumber, signature, issuer, validity, subject, subjectPublicKeyInfo, optional fields
+    validity = JADERChildren( certDER, tbsFields[3][1], tbsFields[3][2])
+    fingerprint = hashlib.sha256(certDER).hexdigest().upper()
+    certDetails = {
+        'Subject': JADERDecodeName( certDER, tbsFields[4][1], tbsFields[4][2]),
+        'Issuer': JADERDecodeName( certDER, tbsFields[2][1], tbsFields[2][2]),
+        'SubjectAltNames': [],
+        'SerialNumber': certDER[tbsFields[0][1]:tbsFields[0][2]].hex().upper(),
+        'NotBefore': JADERDecodeTime( validity[0][0], certDER[validity[0][1]:validity[0][2]]),
+        'NotAfter': JADERDecodeTime( validity[1][0], certDER[validity[1][1]:validity[1][2]]),
+        'Fingerprint': ':'.join( fingerprint[i:i+2] for i in range(0, len(fingerprint), 2))
+        }
+    for fieldTag, fieldStart, fieldEnd in tbsFields[6:]:
+        if fieldTag != 0xa3:
+            continue
+        ### extensions
+        tag, extensionsStart, extensionsEnd = JADERReadTLV( certDER, fieldStart)
+        for tag, extensionStart, extensionEnd in JADERChildren( certDER, extensionsStart, extensionsEnd):
+            extension = JADERChildren( certDER, extensionStart, extensionEnd)
+            if JADERDecodeOID( certDER[extension[0][1]:extension[0][2]]) == JACertSANOID:
+                ### value is last element, critical flag is optional
+                certDetails['SubjectAltNames'] = JADERDecodeSubjectAltNames(
+                    certDER, extension[-1][1], extension[-1][2])
+    return certDetails
+
+def JACertReadFile( certFileName, certPassword ):
+    """
+    JACertReadFile( certFileName, certPassword )
+    Reads PEM, DER or PKCS#12 cert file and returns DER encoded certificates in it
+    PKCS#12 files are decoded using cryptography module if present.
+
+    Returned values:
+        returnStatus - True on success
+        fileDigest - sha256 of file contents, used as cache key
+        certsDER - list of DER encoded certs
+        errorMsg - error message
+    """
+    import hashlib
+    import ssl
+    try:
+        with open( certFileName, 'rb') as file:
+            fileContents = file.read()
+    except OSError as err:
+        return False, None, [], "File not found or can't read cert file:|{0}|, OSError:{1}".format(certFileName, err)
+
+    fileDigest = hashlib.sha256( fileContents ).hexdigest()
+    if certPassword != None:
+        fileDigest = hashlib.sha256( fileContents + certPassword.encode()).hexdigest()
+
+    pemBlocks = re.findall( rb'-----BEGIN CERTIFICATE-----.+?-----END CERTIFICATE-----', fileContents, re.DOTALL)
+    if len(pemBlocks) > 0:
+        try:
+            return True, fileDigest, [ ssl.PEM_cert_to_DER_cert(pemBlock.decode('ascii')) for pemBlock in pemBlocks ], ''
+        except ValueError as err:
+            return False, fileDigest, [], "Invalid PEM cert in file:|{0}|, error:{1}".format(certFileName, err)
+
+    if re.search(r'\.(p12|pfx)$', certFileName, re.IGNORECASE) or certPassword != None:
+        try:
+            from cryptography.hazmat.primitives.serialization import pkcs12, Encoding
+        except ImportError:
+            return False, fileDigest, [], "PKCS#12 cert file:|{0}| needs python cryptography module, not installed".format(certFileName)
+        try:
+            password = certPassword.encode() if certPassword != None else None
+            privateKey, cert, additionalCerts = pkcs12.load_key_and_certificates( fileContents, password)
+            certs = ([cert] if cert != None else []) + list(additionalCerts)
+            return True, fileDigest, [ tempCert.public_bytes(Encoding.DER) for tempCert in certs ], ''
+        except (ValueError, TypeError) as err:
+            return False, fileDigest, [], "Can't decode PKCS#12 cert file:|{0}|, error:{1}".format(certFileName, err)
+
+    ### treat as DER encoded single cert
+    return True, fileDigest, [ fileContents ], ''
+
+def JACertInspectFiles( certFileNames, certPassword, certCache, usedCertCache, debugLevel ):
+    """
+    JACertInspectFiles( certFileNames, certPassword, certCache, usedCertCache, debugLevel )
+    Decodes cert files in-process without running openssl or keytool.
+    Decoded details are cached by file digest, cert file is decoded again only when contents change.
+
+    Parameters passed:
+        certFileNames - list of cert file names
+        certPassword - password for PKCS#12 files, None if not applicable
+        certCache - cache read from previous run, key is file digest, value is list of cert details
+        usedCertCache - cache entries used in current run are stored here, saved at the end of the run
+
+    Returned values:
+        returnStatus - True if all files decoded, False if any file could not be decoded
+        returnOutput - lines in openssl display form, same as openssl x509 -dates -subject -issuer -fingerprint -ext subjectAltName
+        certsDetails - list of (certFileName, certDetails)
+        errorMsg - error message
+    """
+    returnStatus = True
+    returnOutput = []
+    certsDetails = []
+    errorMsg = ''
+    for certFileName in certFileNames:
+        readStatus, fileDigest, certsDER, tempErrorMsg = JACertReadFile( certFileName, certPassword)
+        if readStatus == False:
+            returnStatus = False
+            errorMsg += tempErrorMsg
+            continue
+        if fileDigest in certCache:
+            fileCertsDetails = certCache[fileDigest]
+            if debugLevel > 2:
+                print("DEBUG-3 JACertInspectFiles() cert file:|{0}|, using cached details".format(certFileName))
+        else:
+            try:
+                fileCertsDetails = [ JACertDecodeDER(certDER) for certDER in certsDER ]
+            except (IndexError, ValueError) as err:
+                returnStatus = False
+                errorMsg += "Can't decode cert file:|{0}|, error:{1}".format(certFileName, err)
+                continue
+        usedCertCache[fileDigest] = fileCertsDetails
+
+        for certDetails in fileCertsDetails:
+            certsDetails.append( (certFileName, certDetails) )
+            returnOutput.append( "file={0}".format( certFileName ))
+            returnOutput.append( "notBefore={0}".format(
+                time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime(certDetails['NotBefore']) )))
+            returnOutput.append( "notAfter={0}".format(
+                time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime(certDetails['NotAfter']) )))
+            returnOutput.append( "subject={0}".format( certDetails['Subject'] ))
+            returnOutput.append( "issuer={0}".format( certDetails['Issuer'] ))
+            returnOutput.append( "serial={0}".format( certDetails['SerialNumber'] ))
+            returnOutput.append( "sha256 Fingerprint={0}".format( certDetails['Fingerprint'] ))
+            if len(certDetails['SubjectAltNames']) > 0:
+                returnOutput.append( "subjectAltName={0}".format( ', '.join(certDetails['SubjectAltNames']) ))
+
+    return returnStatus, returnOutput, certsDetails, errorMsg
+
+def JACertGetFileNames( certFiles ):
+    """
+    JACertGetFileNames( certFiles )
+    Returns the list of file names of CertFiles attribute, comma separated list of cert file names 
+        or glob patterns with absolute path, so that certs are decoded in-process.
+
+    Returned values:
+        returnStatus - True if all file names are absolute and all glob patterns matched some files
+        certFileNames - list of file names
+        errorMsg - error message
+    """
+    import glob
+    certFileNames = []
+    errorMsg = ''
+    for certFileSpec in certFiles.split(','):
+        certFileSpec = os.path.expanduser( certFileSpec.strip() )
+        if os.path.isabs( certFileSpec ) == False:
+            errorMsg += "Cert file:|{0}| needs to be absolute path ".format(certFileSpec)
+        elif glob.has_magic( certFileSpec ):
+            matchedFileNames = sorted(glob.glob( certFileSpec ))
+            if len(matchedFileNames) == 0:
+                errorMsg += "No cert file matched:|{0}| ".format(certFileSpec)
+            certFileNames.extend( matchedFileNames )
+        else:
+            certFileNames.append( certFileSpec )
+    return errorMsg == '', certFileNames, errorMsg.strip()
+
+def JACertCheckDates( certName, notBefore, notAfter, currentTime, dueInDays ):
+    """
+    JACertCheckDates( certName, notBefore, notAfter, currentTime, dueInDays )
+    Checks cert validity dates (time in seconds)
+
+    Returned values:
+        status - PASS, WARN when cert expires within dueInDays, FAIL when cert is not yet valid or expired
+        details - details for summary
+        errorMsg - error message
+    """
+    if notBefore > currentTime:
+        return 'FAIL', 'Future NotBefore date', "ERROR JAOperationCHILT() Cert {0} has future 'notBefore date' {1}".format(
+            certName, time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime(notBefore)))
+    if notAfter < currentTime:
+        return 'FAIL', 'Expired cert', "ERROR JAOperationCHILT() Cert {0} expired already, 'notAfter date' {1}".format(
+            certName, time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime(notAfter)))
+    daysToExpire = int( (notAfter - currentTime) / 86400 )
+    if daysToExpire <= dueInDays:
+        return 'WARN', "Cert expires in {0} days".format(daysToExpire), "WARN JAOperationCHILT() Cert {0} expires in {1} days, 'notAfter date' {2}".format(
+            certName, daysToExpire, time.strftime( "%b %d %H:%M:%S %Y GMT", time.gmtime(notAfter)))
+    return 'PASS', '', ''
+
+def JACertDiscover( discoveryRoots, fileTypes, maxFileSize, certIndex, debugLevel ):
+    """
+    JACertDiscover( discoveryRoots, fileTypes, maxFileSize, certIndex, debugLevel )
+    Searches discovery roots for cert files and updates the index.
+    Only the files whose size or modification time changed since last run are read and decoded.
+    Files that are not certs (like private keys) are also indexed so that those are not read again.
+
+    Parameters passed:
+        discoveryRoots - comma separated list of directories
+        fileTypes - regex pattern of file names to read
+        maxFileSize - files larger than this are not read
+        certIndex - index read from previous run, 
+                    key is file name, value is { 'MTime': , 'Size': , 'LastSeen': , 'Certs': [certDetails...] }
+                    on return, contains entries of the files seen in current run only
+
+    Returned values:
+        numberOfFiles - number of cert files seen
+        numberOfFilesRead - number of cert files read in current run
+        errorMsg - error message
+    """
+    numberOfFiles = numberOfFilesRead = 0
+    errorMsg = ''
+    lastSeen = time.time()
+    previousIndex = certIndex.copy()
+    certIndex.clear()
+    fileTypesRegex = re.compile( fileTypes, re.IGNORECASE)
+
+    directories = [ os.path.expanduser( os.path.expandvars(root.strip())) for root in discoveryRoots.split(',') if root.strip() != '' ]
+    while len(directories) > 0:
+        directory = directories.pop()
+        try:
+            with os.scandir( directory ) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir( follow_symlinks=False ):
+                            directories.append( entry.path )
+                            continue
+                        if fileTypesRegex.search( entry.name ) == None or entry.is_file() == False:
+                            continue
+                        fileStat = entry.stat()
+                    except OSError:
+                        continue
+                    if fileStat.st_size > maxFileSize:
+                        continue
+                    numberOfFiles += 1
+                    previousEntry = previousIndex.get( entry.path )
+                    if previousEntry != None and previousEntry['MTime'] == fileStat.st_mtime_ns and previousEntry['Size'] == fileStat.st_size:
+                        previousEntry['LastSeen'] = lastSeen
+                        certIndex[entry.path] = previousEntry
+                        continue
+
+                    ### new or changed file, decode it
+                    numberOfFilesRead += 1
+                    certs = []
+                    readStatus, fileDigest, certsDER, tempErrorMsg = JACertReadFile( entry.path, None)
+                    for certDER in certsDER:
+                        try:
+                            certDetails = JACertDecodeDER( certDER )
+                        except (IndexError, ValueError):
+                            ### not a cert, like private key file
+                            continue
+                        certs.append( { key: certDetails[key] for key in ('Subject', 'NotBefore', 'NotAfter', 'Fingerprint') } )
+                    if debugLevel > 2:
+                        print("DEBUG-3 JACertDiscover() read file:|{0}|, certs:{1}, {2}".format( entry.path, len(certs), tempErrorMsg))
+                    certIndex[entry.path] = { 'MTime': fileStat.st_mtime_ns, 'Size': fileStat.st_size, 'LastSeen': lastSeen, 'Certs': certs }
+        except OSError as err:
+            errorMsg += "WARN JACertDiscover() Can't read directory:|{0}|, error:{1}\n".format( directory, err)
+
+    return numberOfFiles, numberOfFilesRead, errorMsg
+
+### regex to parse package name (group 1) and version (group 2) from each line of inventory output
+###   groups - name, version and optional architecture
+###   same package can be installed for more than one architecture, like glibc.x86_64 and glibc.i686,
+###     such packages are keyed by name.architecture
+JAInventoryParsers = {
+    ### rpm -qa, openssl-libs-3.0.7-24.el9.x86_64, gpg-pubkey-fd431d51-4ae0493b
+    'rpm': re.compile(r'^(\S+)-([^-\s]+-[^-\s]+?)(?:\.(x86_64|i[3-6]86|noarch|aarch64|ppc64le|ppc64|s390x|armv7hl|src))?$'),
+    ### apt list --installed, openssl/jammy-updates,now 3.0.2-0ubuntu1.10 amd64 [installed]
+    'apt': re.compile(r'^([^/\s]+)/\S+\s+(\S+)(?:\s+(\S+))?'),
+    ### dpkg-query -W, name<tab>version
+    'dpkg': re.compile(r'^(\S+)\s+(\S+)$'),
+    ### pip list or pip freeze, name version or name==version
+    'pip': re.compile(r'^([A-Za-z0-9_.\-]+)(?:==|\s+)(\d\S*)$'),
+    }
+
+def JAGetInventoryChangeSignal( changeSignal:str ):
+    """
+    JAGetInventoryChangeSignal( changeSignal:str )
+    Returns change signal of inventory item, list of [fileName, modification time, size]
+      for each file or directory (wild card allowed) in comma separated changeSignal spec.
+    Files not present are included with modification time and size as None, 
+      so that file appearing or going away is also seen as change.
+    """
+    import glob
+    signal = []
+    for signalSpec in str(changeSignal).split(','):
+        signalSpec = os.path.expandvars( signalSpec.strip() )
+        if signalSpec == '':
+            continue
+        fileNames = sorted( glob.glob(signalSpec) ) if glob.has_magic(signalSpec) else [signalSpec]
+        if len(fileNames) == 0:
+            signal.append( [signalSpec, None, None] )
+        for fileName in fileNames:
+            try:
+                fileStat = os.stat( fileName )
+                signal.append( [fileName, fileStat.st_mtime_ns, fileStat.st_size] )
+            except OSError:
+                signal.append( [fileName, None, None] )
+    return signal
+
+def JAParseInventory( itemName:str, inventoryType, returnOutput ):
+    """
+    JAParseInventory( itemName:str, inventoryType, returnOutput )
+    Parses inventory output to name:version dictionary, name is name.architecture when architecture is
+        present in rpm or apt output
+        inventoryType - one of JAInventoryParsers keys, to parse package list output
+                        if None, single line output is taken as version of itemName
+    Returns empty dictionary if output can't be parsed
+    """
+    packages = {}
+    if inventoryType in JAInventoryParsers:
+        parser = JAInventoryParsers[inventoryType]
+        for line in returnOutput:
+            myResults = parser.match( line.strip() )
+            if myResults != None:
+                if parser.groups > 2 and myResults.group(3) != None:
+                    packages["{0}.{1}".format( myResults.group(1), myResults.group(3) )] = myResults.group(2)
+                else:
+                    packages[myResults.group(1)] = myResults.group(2)
+    else:
+        lines = [ line.strip() for line in returnOutput if line.strip() != '' ]
+        if len(lines) == 1:
+            packages[itemName] = lines[0]
+    return packages
+
+def JAInventoryDelta( previousPackages:dict, currentPackages:dict ):
+    """
+    JAInventoryDelta( previousPackages:dict, currentPackages:dict )
+    Returns list of delta lines between previous and current name:version dictionaries in the form
+        Added: name: version
+        Removed: name: version
+        Changed: name: previousVersion -> currentVersion
+    """
+    deltaLines = []
+    for name in sorted( set(previousPackages) | set(currentPackages) ):
+        if name not in previousPackages:
+            deltaLines.append( "Added: {0}: {1}".format( name, currentPackages[name] ))
+        elif name not in currentPackages:
+            deltaLines.append( "Removed: {0}: {1}".format( name, previousPackages[name] ))
+        elif previousPackages[name] != currentPackages[name]:
+            deltaLines.append( "Changed: {0}: {1} -> {2}".format( name, previousPackages[name], currentPackages[name] ))
+    return deltaLines
+
+def JARunTest(
+    testName:str, testAttributes:dict, defaultParameters:dict, debugLevel:int,
+    interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ):
+    """
+    JARunTest( testName, testAttributes, defaultParameters, debugLevel,
+        interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+    Runs one test, evaluates Condition if specified, executes Test command with timeout and 
+      compares the output to ComparePatterns if specified, else to the reference file <LocalRepositoryCustom>/<testName>.
+    Output and reference file contents are compared in memory after masking IgnorePatterns.
+    When output differs from reference file, output is saved to <LogFilePath>/<testName>.current for later analysis.
+    Called in parallel for independent tests by JARunTests()
+
+    Returned values
+        testResult - dictionary with
+            Condition - None, Met, Not Met
+            Status - PASS, FAIL, DIFF, ERROR, SKIPPED
+            Details - short description of the status for summary
+            Output - test output lines
+            DiffLines - unified diff lines when output differ from reference file
+            ErrorMsg
+            PatternsMatched, PatternsNotMatched - counts of ComparePatterns matched and not matched
+            PatternResults - result of each ComparePatterns returned by JAGlobalLib.JAComparePatterns()
+            StartTime, Duration - test start time and duration in seconds
+    """
+    import difflib
+
+    startTime = time.time()
+    testResult = { 
+        'Condition': 'None', 'Status': 'PASS', 'Details': '', 'Output': [], 'DiffLines': [], 'ErrorMsg': '',
+        'PatternsMatched': 0, 'PatternsNotMatched': 0, 'PatternResults': [], 'StartTime': startTime, 'Duration': 0 }
+
+    conditionPresent, conditionMet = JAGlobalLib.JAEvaluateCondition(
+                        testName, testAttributes, defaultParameters, debugLevel,
+                        interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+    if conditionPresent == True:
+        if conditionMet == False:
+            testResult['Condition'] = 'Not Met'
+            testResult['Status'] = 'SKIPPED'
+            testResult['Details'] = 'Skipped, condition not met'
+            testResult['Duration'] = time.time() - startTime
+            return testResult
+        testResult['Condition'] = 'Met'
+
+    testTimeout = defaultParameters['TestTimeoutInSec']
+    if testAttributes.get('Timeout') != None:
+        testTimeout = testAttributes['Timeout']
+
+    commandResult = {}
+    returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+        defaultParameters['CommandShell'],
+        os.path.expandvars( testAttributes['Test'] ), debugLevel, OSType, float(testTimeout), False, commandResult)
+    if isinstance( returnOutput, list):
+        testResult['Output'] = returnOutput
+
+    if returnResult == False:
+        testResult['Status'] = 'ERROR'
+        testResult['ErrorMsg'] = "ERROR JARunTest() test:{0}, error running test, errorMsg:|{1}|".format( testName, errorMsg )
+        if commandResult.get('TimedOut') == True:
+            testResult['Details'] = "Timeout after {0} sec".format( testTimeout )
+        else:
+            testResult['Details'] = errorMsg
+
+    elif testAttributes['ComparePatterns'] != None:
+        ### check whether the test output has search patterns
+        returnStatus, testResult['PatternsMatched'], testResult['PatternsNotMatched'], testResult['PatternResults'], errorMsg = \
+            JAGlobalLib.JAComparePatterns(
+                testName,
+                testAttributes['CompiledComparePatterns'], None, returnOutput,
+                interactiveMode, debugLevel,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+        if returnStatus == False:
+            testResult['Status'] = 'FAIL'
+            testResult['Details'] = "One or more pattern not present"
+            testResult['ErrorMsg'] = "ERROR JARunTest() Test:{0} ComparePatterns:|{1}| NOT matched".format(
+                testName, testAttributes['ComparePatterns'] )
+
+    else:
+        ### expect reference file in custom path with test name; as specified in test yml file, as file name. 
+        referenceFileName = "{0}/{1}/{2}".format(
+            defaultParameters['LocalRepositoryHome'], 
+            defaultParameters['LocalRepositoryCustom'],
+            testName )
+        try:
+            with open( referenceFileName, "r", errors='replace') as file:
+                referenceOutput = file.read().splitlines()
+        except OSError as err:
+            referenceOutput = None
+            testResult['Status'] = 'FAIL'
+            testResult['Details'] = "Error comparing current result to expected result file"
+            testResult['ErrorMsg'] = "ERROR JARunTest() test:{0}, can't read expected result file:|{1}|, OSError:|{2}|".format(
+                testName, referenceFileName, err )
+
+        if referenceOutput != None:
+            ### mask ignore patterns, white space differences and blank lines are ignored (like diff -b -B)
+            currentLines = list( JAGlobalLib.JADataMaskLines( returnOutput, testAttributes['CompiledIgnorePatterns']) )
+            referenceLines = list( JAGlobalLib.JADataMaskLines( referenceOutput, testAttributes['CompiledIgnorePatterns']) )
+            if len(currentLines) == 0:
+                testResult['Status'] = 'FAIL'
+                testResult['Details'] = "Test output is empty"
+                testResult['ErrorMsg'] = "ERROR JARunTest() test:{0}, test output is empty".format( testName )
+            elif currentLines != referenceLines:
+                currentResponseFileName = "{0}/{1}.current".format( defaultParameters['LogFilePath'], testName )
+                testResult['Status'] = 'DIFF'
+                testResult['Details'] = "Current result differ from expected result"
+                testResult['ErrorMsg'] = "ERROR JARunTest() test:|{0}|, current result:|{1}| differs from expected result:|{2}|".format(
+                    testName, currentResponseFileName, referenceFileName )
+                testResult['DiffLines'] = list( difflib.unified_diff(
+                    currentLines, referenceLines, fromfile=currentResponseFileName, tofile=referenceFileName, lineterm='', n=0) )
+                ### save the current results for later analysis
+                try:
+                    with open( currentResponseFileName, "w") as file:
+                        for line in returnOutput:
+                            file.write(line+'\n')
+                except OSError as err:
+                    testResult['ErrorMsg'] += ", can't save current result, OSError:|{0}|".format( err )
+            elif list( JAGlobalLib.JADataMaskLines( returnOutput, None)) != list( JAGlobalLib.JADataMaskLines( referenceOutput, None)):
+                testResult['Details'] = "Seen ignorable differences only"
+
+    testResult['Duration'] = time.time() - startTime
+    if debugLevel > 1:
+        JAGlobalLib.LogLine(
+            "DEBUG-2 JARunTest() test:{0}, status:{1}, duration:{2:.3f} sec".format(
+                testName, testResult['Status'], testResult['Duration']),
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    return testResult
+
+def JARunTests(
+    testParameters:dict, defaultParameters:dict, debugLevel:int,
+    interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ):
+    """
+    JARunTests( testParameters, defaultParameters, debugLevel,
+        interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+    Runs tests in parallel, up to defaultParameters['MaxParallelTests'] tests at a time.
+    Test with DependsOn attribute is started after all tests it depends on are complete,
+      it is skipped if any of those tests did not pass, or are not defined, or depend on each other.
+
+    Returned values
+        testResults - dictionary keyed by test name, value as returned by JARunTest()
+    """
+    import concurrent.futures
+
+    ### tests each test depends on, in list form
+    testDependencies = {}
+    for testName, testAttributes in testParameters.items():
+        dependsOn = testAttributes.get('DependsOn')
+        if dependsOn == None:
+            testDependencies[testName] = []
+        elif isinstance( dependsOn, list):
+            testDependencies[testName] = [ str(dependencyName).strip() for dependencyName in dependsOn ]
+        else:
+            testDependencies[testName] = [ dependencyName.strip() for dependencyName in str(dependsOn).split(',') if dependencyName.strip() != '' ]
+
+    testResults = {}
+    pendingTests = list( testParameters )
+    runningTests = {}
+
+    if debugLevel > 0:
+        JAGlobalLib.LogLine(
+            "DEBUG-1 JARunTests() running {0} tests using max parallel tests:{1}".format(
+                len(pendingTests), defaultParameters['MaxParallelTests']),
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers=max( 1, defaultParameters['MaxParallelTests'] ) ) as executor:
+        while len(pendingTests) > 0 or len(runningTests) > 0:
+            ### start the tests whose dependencies are complete, skip the tests whose dependencies did not pass
+            testsScheduled = False
+            for testName in list(pendingTests):
+                skipReason = ''
+                waitForDependency = False
+                for dependencyName in testDependencies[testName]:
+                    if dependencyName not in testParameters:
+                        skipReason = "Skipped, dependency {0} not defined".format( dependencyName )
+                        break
+                    if dependencyName not in testResults:
+                        waitForDependency = True
+                    elif testResults[dependencyName]['Status'] != 'PASS':
+                        skipReason = "Skipped, dependency {0} status {1}".format( dependencyName, testResults[dependencyName]['Status'] )
+                        break
+                if skipReason == '' and waitForDependency == True:
+                    continue
+
+                pendingTests.remove( testName )
+                testsScheduled = True
+                if skipReason != '':
+                    testResults[testName] = { 
+                        'Condition': 'None', 'Status': 'SKIPPED', 'Details': skipReason, 'Output': [], 'DiffLines': [], 'ErrorMsg': '',
+                        'PatternsMatched': 0, 'PatternsNotMatched': 0, 'PatternResults': [], 'StartTime': time.time(), 'Duration': 0 }
+                else:
+                    runningTests[ executor.submit(
+                        JARunTest,
+                        testName, testParameters[testName], defaultParameters, debugLevel,
+                        interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ) ] = testName
+
+            if len(runningTests) == 0:
+                if testsScheduled == False:
+                    ### remaining tests depend on each other, none can start
+                    for testName in pendingTests:
+                        testResults[testName] = { 
+                            'Condition': 'None', 'Status': 'SKIPPED', 'Details': "Skipped, dependency cycle in DependsOn",
+                            'Output': [], 'DiffLines': [], 'ErrorMsg': '',
+                            'PatternsMatched': 0, 'PatternsNotMatched': 0, 'PatternResults': [], 'StartTime': time.time(), 'Duration': 0 }
+                    pendingTests = []
+                continue
+
+            ### wait for any one test to complete, it may allow dependent tests to start
+            testsCompleted, testsRunning = concurrent.futures.wait( runningTests, return_when=concurrent.futures.FIRST_COMPLETED)
+            for testCompleted in testsCompleted:
+                testName = runningTests.pop(testCompleted)
+                try:
+                    testResults[ testName ] = testCompleted.result()
+                except Exception as err:
+                    ### unexpected error in one test is reported as ERROR of that test, other tests continue
+                    testResults[ testName ] = { 
+                        'Condition': 'None', 'Status': 'ERROR', 'Details': "Error running the test, {0}".format( err ),
+                        'Output': [], 'DiffLines': [], 'ErrorMsg': "{0}: {1}".format( type(err).__name__, err ),
+                        'PatternsMatched': 0, 'PatternsNotMatched': 0, 'PatternResults': [], 'StartTime': time.time(), 'Duration': 0 }
+                    JAGlobalLib.LogLine(
+                        "ERROR JARunTests() test:{0}, {1}".format( testName, testResults[testName]['ErrorMsg'] ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    ### return results in the order of tests in spec
+    return { testName: testResults[testName] for testName in testParameters }
+
+def JAWriteTestReports( reportFileName:str, testResults:dict, suiteName:str, thisHostName:str, startTime:float ):
+    """
+    JAWriteTestReports( reportFileName, testResults, suiteName, thisHostName, startTime )
+
+    Writes test results in JUnit XML format to <reportFileName>.xml and in JSON format to <reportFileName>.json
+      with status and duration of each test, so that CI tools can display the results.
+    Files are overwritten each time, contain results of latest run.
+
+    Returned values
+        returnStatus - True on success, False on failure
+        errorMsg
+    """
+    import json
+    import xml.etree.ElementTree as ElementTree
+
+    suiteDuration = time.time() - startTime
+    statusCounts = defaultdict(int)
+    for testResult in testResults.values():
+        statusCounts[ testResult['Status'] ] += 1
+
+    testSuite = ElementTree.Element( 'testsuite', {
+        'name': suiteName,
+        'hostname': thisHostName,
+        'timestamp': time.strftime( '%Y-%m-%dT%H:%M:%S', time.gmtime(startTime)),
+        'tests': str( len(testResults) ),
+        'failures': str( statusCounts['FAIL'] + statusCounts['DIFF'] ),
+        'errors': str( statusCounts['ERROR'] ),
+        'skipped': str( statusCounts['SKIPPED'] ),
+        'time': "{0:.3f}".format( suiteDuration ) })
+    for testName, testResult in testResults.items():
+        testCase = ElementTree.SubElement( testSuite, 'testcase', {
+            'name': testName, 'classname': suiteName, 'time': "{0:.3f}".format( testResult['Duration'] ) })
+        if testResult['Status'] == 'ERROR':
+            ElementTree.SubElement( testCase, 'error', { 'message': str(testResult['Details']) }).text = testResult['ErrorMsg']
+        elif testResult['Status'] in ('FAIL', 'DIFF'):
+            ElementTree.SubElement( testCase, 'failure', { 'message': testResult['Details'], 'type': testResult['Status'] }).text = \
+                '\n'.join( [testResult['ErrorMsg']] + JAGlobalLib.JAFormatPatternResults( testResult['PatternResults'] ) + testResult['DiffLines'] )
+        elif testResult['Status'] == 'SKIPPED':
+            ElementTree.SubElement( testCase, 'skipped', { 'message': testResult['Details'] })
+        if len(testResult['Output']) > 0:
+            ElementTree.SubElement( testCase, 'system-out').text = '\n'.join( testResult['Output'] )
+
+    testReport = {
+        'Suite': suiteName,
+        'HostName': thisHostName,
+        'TimeStamp': time.strftime( '%Y-%m-%dT%H:%M:%S', time.gmtime(startTime)),
+        'Duration': round( suiteDuration, 3),
+        'Counts': dict(statusCounts),
+        'Tests': { testName: { 
+            'Status': testResult['Status'], 'Condition': testResult['Condition'], 'Details': str(testResult['Details']),
+            'StartTime': time.strftime( '%Y-%m-%dT%H:%M:%S', time.gmtime(testResult['StartTime'])),
+            'Duration': round( testResult['Duration'], 3),
+            'PatternResults': testResult['PatternResults'] } for testName, testResult in testResults.items() }
+        }
+
+    try:
+        ElementTree.ElementTree( testSuite ).write( reportFileName + ".xml", encoding='utf-8', xml_declaration=True )
+        with open( reportFileName + ".json", "w") as file:
+            json.dump( testReport, file, indent=2)
+    except OSError as err:
+        return False, "ERROR JAWriteTestReports() Can't write test report:|{0}|, OSError:|{1}|".format( reportFileName, err)
+    return True, ''
 
 def JAReadConfigCHILT(
         operation, 
@@ -194,9 +959,12 @@ def JAReadConfigCHILT(
                         'Command',
                         'Condition',
                         'Cert',
+                        'CertFiles',
                         'License',
                         'Health',
-                        'Inventory'
+                        'Inventory',
+                        'ChangeSignal',
+                        'InventoryType',
                         'IgnorePatterns',
                         'Test'
                         ]
@@ -244,6 +1012,37 @@ def JAReadConfigCHILT(
                     numberOfWarnings += 1
                     continue
 
+                if operation == 'health' and 'Metrics' in CHILTParams:
+                    if isinstance( CHILTParams['Metrics'], dict) == False:
+                        JAGlobalLib.LogLine(
+                            "WARN JAReadConfigCHILT() Item name:{0}, Metrics:|{1}| needs to be in the form {{ 'metricName': '< 80', ...}}, Skipped this definition".format(
+                                CHILTName, CHILTParams['Metrics'] ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                        numberOfWarnings += 1
+                        continue
+                    if mandatoryAttribute not in CHILTParams:
+                        ### health item with metrics only, no command to execute
+                        CHILTParams[mandatoryAttribute] = None
+
+                if operation == 'cert' and 'CertFiles' in CHILTParams:
+                    if mandatoryAttribute not in CHILTParams:
+                        ### cert files decoded in-process, no command to execute
+                        CHILTParams[mandatoryAttribute] = None
+                    returnStatus, returnedAttribute = JAGlobalLib.JASubstituteVariableValues( variables, CHILTParams['CertFiles'])
+                    if returnStatus == True:
+                        CHILTParams['CertFiles'] = returnedAttribute
+
+                if operation == 'inventory' and CHILTParams.get('InventoryType') != None:
+                    if CHILTParams['InventoryType'] not in JAInventoryParsers:
+                        JAGlobalLib.LogLine(
+                            "WARN JAReadConfigCHILT() Item name:{0}, InventoryType:|{1}| is not one of supported types:{2}, Skipped this definition".format(
+                                CHILTName, CHILTParams['InventoryType'], list(JAInventoryParsers) ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                        numberOfWarnings += 1
+                        continue
+
                 if mandatoryAttribute not in CHILTParams:
                     JAGlobalLib.LogLine(
                         "WARN JAReadConfigCHILT() Item name:{0}, mandatory attribute:{1} is NOT specified, Skipped this definition".format(
@@ -258,7 +1057,9 @@ def JAReadConfigCHILT(
                 ###   Cert, License, Health, Inventory spec line can refer to variables
                 ###   variable values will be substituted here                
                 originalAttribute = CHILTParams[mandatoryAttribute]
-                returnStatus, returnedAttribute = JAGlobalLib.JASubstituteVariableValues( variables, originalAttribute)
+                returnStatus = False
+                if originalAttribute != None:
+                    returnStatus, returnedAttribute = JAGlobalLib.JASubstituteVariableValues( variables, originalAttribute)
                 if returnStatus == True:
                     ### variable found and replaced it with variable value,
                     ###  use new value of the attribute
@@ -276,16 +1077,51 @@ def JAReadConfigCHILT(
                 if 'ComparePatterns' not in CHILTParams:
                     ### set default value
                     CHILTParameters[CHILTName]['ComparePatterns'] = None
+                    CHILTParameters[CHILTName]['CompiledComparePatterns'] = None
                 else: 
                     ### evaluate group values using current variable values if group values have any variable spec
                     returnStatus = JAGlobalLib.JAEvaluateComparePatternGroupValues(
                             CHILTName, CHILTParams['ComparePatterns'], variables,
                             interactiveMode, debugLevel,
                             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType )
+                    ### compile once here, used for each comparison later
+                    CHILTParameters[CHILTName]['CompiledComparePatterns'] = JAGlobalLib.JACompileComparePatterns(
+                            CHILTName, CHILTParams['ComparePatterns'],
+                            interactiveMode, debugLevel,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
 
                 if 'IgnorePatterns' not in CHILTParams:
                     CHILTParameters[CHILTName]['IgnorePatterns'] = None   
 
+                if operation == 'test':
+                    ### compile once here, used to mask the test output and reference file contents before comparison
+                    returnStatus, CHILTParameters[CHILTName]['CompiledIgnorePatterns'], errorMsg = JAGlobalLib.JACompileIgnorePatterns(
+                        CHILTParameters[CHILTName]['IgnorePatterns'] )
+                    if returnStatus == False:
+                        JAGlobalLib.LogLine(
+                            "WARN JAReadConfigCHILT() Item name:{0}, {1}, Skipped this definition".format( CHILTName, errorMsg ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                        numberOfWarnings += 1
+                        del CHILTParameters[CHILTName]
+                        continue
+                    if CHILTParams.get('Timeout') != None:
+                        ### limited yaml reader returns the value as string
+                        try:
+                            testTimeout = float( CHILTParams['Timeout'] )
+                        except (TypeError, ValueError):
+                            testTimeout = 0
+                        if testTimeout <= 0:
+                            JAGlobalLib.LogLine(
+                                "WARN JAReadConfigCHILT() Item name:{0}, Timeout:|{1}| needs to be number of seconds more than 0, Skipped this definition".format(
+                                    CHILTName, CHILTParams['Timeout'] ),
+                                interactiveMode,
+                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                            numberOfWarnings += 1
+                            del CHILTParameters[CHILTName]
+                            continue
+                        CHILTParameters[CHILTName]['Timeout'] = testTimeout
+
                 ### put default value of None for command and condition if not present
                 if 'Condition' not in CHILTParams:
                     CHILTParameters[CHILTName]['Condition'] = None
@@ -387,6 +1223,75 @@ TimeStamp: {0}\n\
 
         currentTime = time.time()
 
+        if operation == 'cert':
+            ### decoded cert details of previous run, cert files with same contents are not decoded again
+            ###   only the entries used in current run are saved back so that cache does not grow over time
+            certCache = {}
+            usedCertCache = {}
+            certCacheFileName = "{0}/JACertCache.json".format( defaultParameters['LogFilePath'] )
+            if os.path.exists( certCacheFileName ):
+                try:
+                    import json
+                    with open( certCacheFileName, "r") as file:
+                        certCache = json.load(file)
+                except (OSError, ValueError) as err:
+                    JAGlobalLib.LogLine(
+                        "WARN JAOperationCHILT() Can't read cert cache file:|{0}|, error:{1}, decoding all cert files".format(
+                            certCacheFileName, err),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                    certCache = {}
+
+        if operation == 'inventory':
+            ### inventory of previous run, used to reuse the output when change signal is same
+            ###   and to report delta compared to previous inventory
+            inventoryCache = {}
+            inventoryCacheFileName = "{0}/JAInventoryCache.json".format( defaultParameters['LogFilePath'] )
+            if os.path.exists( inventoryCacheFileName ):
+                try:
+                    import json
+                    with open( inventoryCacheFileName, "r") as file:
+                        inventoryCache = json.load(file)
+                except (OSError, ValueError) as err:
+                    JAGlobalLib.LogLine(
+                        "WARN JAOperationCHILT() Can't read inventory cache file:|{0}|, error:{1}, gathering all inventory".format(
+                            inventoryCacheFileName, err),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                    inventoryCache = {}
+            ### items no longer in spec are not carried forward
+            inventoryCache = { CHILTName: inventoryCache[CHILTName] for CHILTName in inventoryCache if CHILTName in CHILTParameters }
+
+        if operation == 'health' and OSType == 'Linux':
+            ### collect host health metrics natively and add them to history, 
+            ###    CPU usage is computed from CPU ticks of previous sample
+            healthMetricsFileName = JAGlobalLib.JAGetHealthMetricsFileName( defaultParameters['LogFilePath'] )
+            returnStatus, previousSamples, errorMsg = JAGlobalLib.JAReadHealthMetricsHistory( healthMetricsFileName, 1)
+            previousSample = None
+            if len(previousSamples) > 0 and previousSamples[0]['CPUTotalTicks'] == previousSamples[0]['CPUTotalTicks']:
+                previousSample = previousSamples[0]
+            healthMetricsStatus, healthMetrics, errorMsg = JAGlobalLib.JAGetHealthMetrics( previousSample )
+            if healthMetricsStatus == True:
+                returnStatus, errorMsg = JAGlobalLib.JAWriteHealthMetricsHistory(
+                    healthMetricsFileName, healthMetrics, defaultParameters['HealthMetricsHistorySize'] )
+            if errorMsg != '':
+                JAGlobalLib.LogLine(
+                    errorMsg,
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            if debugLevel > 1:
+                JAGlobalLib.LogLine(
+                    "DEBUG-2 JAOperationCHILT() health metrics:{0}".format( healthMetrics ),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+        if operation == 'test':
+            ### run all tests in parallel first, results are reported below in the order of tests in spec
+            testsStartTime = time.time()
+            testResults = JARunTests(
+                CHILTParameters, defaultParameters, debugLevel,
+                interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
         for CHILTName in CHILTParameters:
             numberOfItems += 1
             CHILTAttributes = CHILTParameters[CHILTName]
@@ -394,6 +1299,11 @@ TimeStamp: {0}\n\
             summaryResults[CHILTName]['Condition'] = 'Unknown'
             summaryResults[CHILTName]['Status'] = 'Unknown'
             summaryResults[CHILTName]['Details'] = 'Unknown'
+
+            ### heading and value of operation specific attribute written to report
+            attributeHeading = CHILTHeadings[operation]
+            if operation == 'cert' and CHILTAttributes.get('CertFiles') != None:
+                attributeHeading = 'CertFiles'
             
             reportFile.write("\
             {0}:\n\
@@ -405,8 +1315,8 @@ TimeStamp: {0}\n\
                 CHILTName,
                 CHILTAttributes['Command'],
                 CHILTAttributes['Condition'],
-                CHILTHeadings[operation],
-                CHILTAttributes[ CHILTHeadings[operation] ],
+                attributeHeading,
+                CHILTAttributes[ attributeHeading ],
                 CHILTAttributes['ComparePatterns'],
                 CHILTAttributes['IgnorePatterns']
             ))
@@ -424,6 +1334,56 @@ TimeStamp: {0}\n\
                 'Cert', 'Inventory', 'License', 'Health','Test'
                 'ComparePatterns', 'IgnorePatterns'
             """
+            if operation == 'test':
+                ### test is already run, report the result
+                testResult = testResults[CHILTName]
+                summaryResults[CHILTName]['Condition'] = testResult['Condition']
+                summaryResults[CHILTName]['Details'] = testResult['Details']
+                numberOfComparePatternMatched += testResult['PatternsMatched']
+                numberOfComparePatternNotMatched += testResult['PatternsNotMatched']
+                if testResult['Condition'] == 'Not Met':
+                    numberOfConditionsNotMet += 1
+                elif testResult['Condition'] == 'Met':
+                    numberOfConditionsMet += 1
+
+                if testResult['Status'] == 'SKIPPED':
+                    ### align strat of text to follow yaml file space format
+                    ###  leading space before printing the message below is intentional
+                    reportFile.write("\
+                {0}\n".format( testResult['Details'] ))
+                    summaryResults[CHILTName]['Status'] = 'INFO'
+                    continue
+
+                for line in testResult['Output']:
+                    reportFile.write("\
+                {0}\n".format(line))
+                for line in JAGlobalLib.JAFormatPatternResults( testResult['PatternResults'] ):
+                    reportFile.write("\
+                {0}\n".format(line))
+                for line in testResult['DiffLines']:
+                    reportFile.write("\
+                {0}\n".format(line))
+                if testResult['ErrorMsg'] != '':
+                    reportFile.write("\
+                {0}\n".format( testResult['ErrorMsg'] ))
+                    JAGlobalLib.LogLine(
+                        testResult['ErrorMsg'],
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                reportFile.write("\
+                Duration: {0:.3f} sec\n".format( testResult['Duration'] ))
+
+                if testResult['Status'] == 'PASS':
+                    numberOfPasses += 1
+                    summaryResults[CHILTName]['Status'] = 'PASS'
+                elif testResult['Status'] == 'ERROR':
+                    numberOfErrors += 1
+                    summaryResults[CHILTName]['Status'] = 'FAIL'
+                else:
+                    numberOfFailures += 1
+                    summaryResults[CHILTName]['Status'] = testResult['Status']
+                continue
+
             conditionPresent, conditionMet = JAGlobalLib.JAEvaluateCondition(
                                 CHILTName, CHILTAttributes, defaultParameters, debugLevel,
                                 interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
@@ -451,11 +1411,39 @@ TimeStamp: {0}\n\
 
             resultCounterUpdated = False
             ### operation specific command, expand any environment variables used in that command
-            tempCommand = os.path.expandvars( CHILTAttributes[ CHILTHeadings[operation] ])
-
-            returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
-                defaultParameters['CommandShell'],
-                tempCommand, debugLevel, OSType)
+            tempCommand = None
+            if CHILTAttributes[ CHILTHeadings[operation] ] != None:
+                tempCommand = os.path.expandvars( CHILTAttributes[ CHILTHeadings[operation] ])
+
+            certFileNames = []
+            if operation == 'cert' and CHILTAttributes.get('CertFiles') != None:
+                ### decode cert files in-process, no need to run openssl or keytool
+                returnResult, certFileNames, errorMsg = JACertGetFileNames( os.path.expandvars( CHILTAttributes['CertFiles'] ))
+                if returnResult == True:
+                    returnResult, returnOutput, certsDetails, errorMsg = JACertInspectFiles( 
+                        certFileNames, CHILTAttributes.get('CertPassword'), certCache, usedCertCache, debugLevel)
+            elif CHILTAttributes[ CHILTHeadings[operation] ] == None:
+                ### health item with Metrics only
+                returnResult, returnOutput, errorMsg = True, [], ''
+            else:
+                inventoryCached = False
+                if operation == 'inventory' and CHILTAttributes.get('ChangeSignal') != None:
+                    ### reuse previous output if command and change signal are same as previous run
+                    changeSignal = JAGetInventoryChangeSignal( CHILTAttributes['ChangeSignal'] )
+                    previousInventory = inventoryCache.get( CHILTName, {})
+                    if previousInventory.get('Command') == tempCommand and previousInventory.get('ChangeSignal') == changeSignal:
+                        inventoryCached = True
+                        returnResult, returnOutput, errorMsg = True, previousInventory['Output'], ''
+                        if debugLevel > 1:
+                            JAGlobalLib.LogLine(
+                                "DEBUG-2 JAOperationCHILT() item:{0}, change signal:{1} same as previous run, using previous inventory".format(
+                                    CHILTName, changeSignal),
+                                interactiveMode,
+                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                if inventoryCached == False:
+                    returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+                        defaultParameters['CommandShell'],
+                        tempCommand, debugLevel, OSType)
             if returnResult == False:
                 if re.match(r'File not found', errorMsg) != True:
                     JAGlobalLib.LogLine(
@@ -473,7 +1461,37 @@ TimeStamp: {0}\n\
                 errorMsg = ''
                 if operation == 'cert':
                     ### parse the output for out of range dates
-                    if OSType == 'Windows':
+                    if CHILTAttributes.get('CertFiles') != None:
+                        for line in returnOutput:
+                            ### align strat of text to follow yaml file space format
+                            ###  leading space before printing the message below is intentional                                    
+                            reportFile.write("\
+                {0}\n".format(line))
+                        ### check validity dates of all certs in the files, report the worst one
+                        worstCertStatus = 'PASS'
+                        for certFileName, certDetails in certsDetails:
+                            certStatus, certStatusDetails, tempErrorMsg = JACertCheckDates(
+                                "{0} file:{1} subject:{2}".format( CHILTName, certFileName, certDetails['Subject']),
+                                certDetails['NotBefore'], certDetails['NotAfter'], 
+                                currentTime, defaultParameters['DueInDaysForCert'])
+                            if certStatus == 'PASS':
+                                continue
+                            errorMsg += tempErrorMsg
+                            reportFile.write("\
+                {0}\n".format(tempErrorMsg))
+                            if worstCertStatus == 'FAIL' or (worstCertStatus == 'WARN' and certStatus == 'WARN'):
+                                continue
+                            worstCertStatus = certStatus
+                            summaryResults[CHILTName]['Status'] = certStatus
+                            summaryResults[CHILTName]['Details'] = certStatusDetails
+                        if worstCertStatus == 'FAIL':
+                            numberOfErrors += 1
+                            resultCounterUpdated = True
+                        elif worstCertStatus == 'WARN':
+                            numberOfFailures += 1
+                            resultCounterUpdated = True
+
+                    elif OSType == 'Windows':
                         JAGlobalLib.LogLine(
                             "ERROR JAOperationCHILT() parsing output in windows platform not ready yet, returnOutput:{0}".format(returnOutput), 
                             interactiveMode,
@@ -504,121 +1522,95 @@ TimeStamp: {0}\n\
                             ###    Not Before:Nov 13 15:42:21 2022 GMT
                             ###    Not After:Nov 13 15:42:21 2023 GMT
                             ###
-                            dates = line.split(r'=|:')
+                            dates = re.split(r'=|:', line.strip(), maxsplit=1)
                             
                             if len(dates) > 1:
-                                if re.match(r'^notBefore|Not Before', dates[0]):
-                                    ### convert not before date to seconds
-                                    timeInSec = JAGlobalLib.JAConvertStringTimeToTimeInMicrosec( 
-                                        dates[1], "%b %d %H:%M:%S %Y %Z")
-                                    if timeInSec > currentTime:
-                                        ### cert notBefore date is in future, declare error
-                                        numberOfErrors += 1
-                                        resultCounterUpdated = True
-                                        errorMsg += "ERROR JAOperationCHILT() Cert {0} has future 'notBefore date' {1}".format(CHILTName, dates[1] )
-                                        line = "ERROR {0}".format(line)
-
-                                        summaryResults[CHILTName]['Status'] = 'FAIL'
-                                        summaryResults[CHILTName]['Details'] = 'Future NotBefore date'
-
-                                elif re.match(r'^notAfter|Not After', dates[0]):
-                                    ### convert not After date to seconds
-                                    timeInSec = JAGlobalLib.JAConvertStringTimeToTimeInMicrosec( 
-                                        dates[1], "%b %d %H:%M:%S %Y %Z")
-                                    if timeInSec < currentTime:
-                                        ### cert notAfter date is in the past, declare error
-                                        numberOfErrors += 1
-                                        summaryResults[CHILTName]['Status'] = 'FAIL'
-                                        summaryResults[CHILTName]['Details'] = 'Expired cert'
-
-                                        resultCounterUpdated = True
-                                        errorMsg += "ERROR JAOperationCHILT() Cert {0} expired already, 'notAfter date' {1}".format(CHILTName, dates[1] )
-                                        line = "ERROR {0}".format(line)
+                                dates[0] = dates[0].strip()
+                                dates[1] = dates[1].strip()
+                                ### convert date to seconds, 0 if date could not be parsed
+                                timeInSec = JAGlobalLib.JAConvertStringTimeToTimeInMicrosec( 
+                                    dates[1], "%b %d %H:%M:%S %Y %Z") / 1000000
+                                if timeInSec != 0:
+                                    if re.match(r'^notBefore|Not Before', dates[0]):
+                                        if timeInSec > currentTime:
+                                            ### cert notBefore date is in future, declare error
+                                            numberOfErrors += 1
+                                            resultCounterUpdated = True
+                                            errorMsg += "ERROR JAOperationCHILT() Cert {0} has future 'notBefore date' {1}".format(CHILTName, dates[1] )
+                                            line = "ERROR {0}".format(line)
+
+                                            summaryResults[CHILTName]['Status'] = 'FAIL'
+                                            summaryResults[CHILTName]['Details'] = 'Future NotBefore date'
+
+                                    elif re.match(r'^notAfter|Not After', dates[0]):
+                                        if timeInSec < currentTime:
+                                            ### cert notAfter date is in the past, declare error
+                                            numberOfErrors += 1
+                                            summaryResults[CHILTName]['Status'] = 'FAIL'
+                                            summaryResults[CHILTName]['Details'] = 'Expired cert'
+
+                                            resultCounterUpdated = True
+                                            errorMsg += "ERROR JAOperationCHILT() Cert {0} expired already, 'notAfter date' {1}".format(CHILTName, dates[1] )
+                                            line = "ERROR {0}".format(line)
+                                        elif timeInSec < currentTime + defaultParameters['DueInDaysForCert'] * 86400:
+                                            ### cert expires within DueInDaysForCert days, declare warning
+                                            numberOfFailures += 1
+                                            summaryResults[CHILTName]['Status'] = 'WARN'
+                                            summaryResults[CHILTName]['Details'] = "Cert expires in {0} days".format(
+                                                int( (timeInSec - currentTime) / 86400 ))
+
+                                            resultCounterUpdated = True
+                                            errorMsg += "WARN JAOperationCHILT() Cert {0} expires in {1} days, 'notAfter date' {2}".format(
+                                                CHILTName, int( (timeInSec - currentTime) / 86400 ), dates[1] )
+                                            line = "WARN {0}".format(line)
                             ### align strat of text to follow yaml file space format
                             ###  leading space before printing the message below is intentional                                    
                             reportFile.write("\
                 {0}\n".format(line))
 
 
-                elif operation == 'test':
-
-                    ### if ComparePatterns is not present, compare current result to the expected result file
-                    if 'ComparePatterns' in CHILTAttributes:
-                        if CHILTAttributes['ComparePatterns'] == None:
-                            compareResults = True
-                            ### expect reference file in custom path with test name; as specified in test yml file, as file name. 
-                            referenceFileName = "{0}/{1}/{2}".format(
-                                defaultParameters['LocalRepositoryHome'], 
-                                defaultParameters['LocalRepositoryCustom'],
-                                CHILTName )
-                            ### current result in Logs directory with <testName>.current as file name
-                            currentResponseFileName = "{0}/{1}.current".format(
-                                defaultParameters['LogFilePath'], 
-                                CHILTName )
-                            ### save the current results
-                            try:
-                                with open( currentResponseFileName, "w") as file:
-                                    for line in returnOutput:
-                                        file.write(line+'\n')
-                                    file.close()
-                            except OSError as err:
-                                errorMsg += "ERROR JAOperationCHILT() Can't write test:|{0}| result to temporary file:|{1}|, OSError:|{2}|".format(
-                                    CHILTName, currentResponseFileName, err)
-                                compareResults = False
-                                numberOfErrors += 1
-                                resultCounterUpdated = True
-                                summaryResults[CHILTName]['Status'] = 'FAIL'
-                                summaryResults[CHILTName]['Details'] = "Can't save results to a file for comparison"
-
-                            if compareResults == True:
-                                ### compare current result with reference reference file
-                                returnStatus, fileDiffer, errorMsg = JAOperationSaveCompare.JAOperationCompareFiles(
-                                    currentResponseFileName, referenceFileName, 
-                                    defaultParameters['BinaryFileTypes'],
-                                    'text', # compareType
-                                    defaultParameters['CommandCompare'],
-                                    False, ### not H2H compare scenario
-                                    CHILTAttributes['IgnorePatterns'],  
-                                    "{0}".format(CHILTAttributes['Test']), ### logAdditionalInfo - command used to run test
-                                    interactiveMode, debugLevel,
-                                    myColors, colorIndex, outputFileHandle, HTMLBRTag,
-                                    OSType,
-                                    defaultParameters['CommandShell'],
-                                    defaultParameters['LogFilePath'])
-                                if returnStatus == True:
-                                    if fileDiffer == True:
-                                        JAGlobalLib.LogLine(
-                                            "ERROR JAOperationCHILT() test:|{0}|, current result:|{1}| differs from expected result:|{2}|".format(
-                                            CHILTName, currentResponseFileName, referenceFileName ), 
-                                            interactiveMode,
-                                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                                        numberOfFailures += 1
-                                        summaryResults[CHILTName]['Status'] = 'DIFF'
-                                        summaryResults[CHILTName]['Details'] = "Current result differ from expected result"
-
-                                        resultCounterUpdated = True
-                                        ### below is to ensure that numberOfPasses is not incremented later for this case.
-                                    else:
-                                        ### treat ignorable difference as pass
-                                        numberOfPasses += 1
-                                        resultCounterUpdated = True
-                                        summaryResults[CHILTName]['Status'] = 'PASS'
-                                        summaryResults[CHILTName]['Details'] = "Seen ignorable differences only"
-                                else:
-                                    numberOfFailures += 1
-                                    resultCounterUpdated = True
-                                    summaryResults[CHILTName]['Status'] = 'FAIL'
-                                    summaryResults[CHILTName]['Details'] = "Error comparing current result to expected result file"
-
-                    for line in returnOutput:
-                        ### align strat of text to follow yaml file space format
-                        ###  leading space before printing the message below is intentional                                    
+                elif operation == 'inventory':
+                    ### structured name:version table and delta compared to previous inventory
+                    inventoryType = CHILTAttributes.get('InventoryType')
+                    packages = JAParseInventory( CHILTName, inventoryType, returnOutput )
+                    previousInventory = inventoryCache.get( CHILTName, {})
+                    if inventoryType in JAInventoryParsers and len(packages) > 0:
+                        ### package list output is written as name:version table instead of raw output
                         reportFile.write("\
+                Packages:\n")
+                        for name in sorted(packages):
+                            reportFile.write("\
+                    {0}: {1}\n".format( name, packages[name] ))
+                    else:
+                        for line in returnOutput:
+                            ### align strat of text to follow yaml file space format
+                            ###  leading space before printing the message below is intentional                                    
+                            reportFile.write("\
                 {0}\n".format(line))
-                    if errorMsg != '':
+
+                    deltaLines = []
+                    if 'Packages' in previousInventory:
+                        deltaLines = JAInventoryDelta( previousInventory['Packages'], packages )
                         reportFile.write("\
-                {0}\n".format(errorMsg))
-                    errorMsg = ''
+                Delta: {0}\n".format( 'None' if len(deltaLines) == 0 else '' ))
+                        for line in deltaLines:
+                            reportFile.write("\
+                    {0}\n".format(line))
+                    if inventoryCached == True:
+                        reportFile.write("\
+                Cached: unchanged since {0}\n".format( previousInventory['TimeStamp'] ))
+                    if 'Packages' in previousInventory:
+                        summaryResults[CHILTName]['Details'] = "{0}{1} changes since previous inventory".format( 
+                            'cached, ' if inventoryCached == True else '', len(deltaLines))
+                    else:
+                        summaryResults[CHILTName]['Details'] = "First inventory"
+
+                    inventoryCache[CHILTName] = { 
+                        'Command': tempCommand,
+                        'ChangeSignal': changeSignal if CHILTAttributes.get('ChangeSignal') != None else None,
+                        'Output': returnOutput if CHILTAttributes.get('ChangeSignal') != None else None,
+                        'Packages': packages,
+                        'TimeStamp': previousInventory['TimeStamp'] if inventoryCached == True else JAGlobalLib.UTCDateTime() }
 
                 else:
                     ### for license, health operations, log the output to result file
@@ -628,15 +1620,50 @@ TimeStamp: {0}\n\
                         reportFile.write("\
                 {0}\n".format(line))
 
+                    if operation == 'health' and CHILTAttributes.get('Metrics') != None:
+                        ### compare health metrics to thresholds, no command executed
+                        for metricName, threshold in CHILTAttributes['Metrics'].items():
+                            if OSType != 'Linux' or healthMetricsStatus == False:
+                                returnStatus, metricValue = False, None
+                                tempErrorMsg = "ERROR JAOperationCHILT() health metrics not available on this host"
+                            else:
+                                returnStatus, metricValue, tempErrorMsg = JAGlobalLib.JAGetHealthMetricValue( 
+                                    str(metricName), healthMetrics, healthMetricsFileName )
+                            thresholdMet = None
+                            if returnStatus == True and metricValue == metricValue:
+                                thresholdMet = JAGlobalLib.JAEvaluateThreshold( metricValue, threshold )
+                                if thresholdMet == None:
+                                    tempErrorMsg = "ERROR JAOperationCHILT() item:{0}, metric:{1}, invalid threshold:|{2}|, expected in the form '(>|<|=|!=|>=|<=) number'".format(
+                                        CHILTName, metricName, threshold)
+                            elif tempErrorMsg == '':
+                                tempErrorMsg = "ERROR JAOperationCHILT() item:{0}, metric:{1} value not available".format( CHILTName, metricName)
+
+                            if thresholdMet == True:
+                                reportFile.write("\
+                {0}={1}, threshold:{2}, PASS\n".format( metricName, metricValue, threshold))
+                                continue
+                            if thresholdMet == False:
+                                tempErrorMsg = "ERROR JAOperationCHILT() item:{0}, metric:{1}={2} NOT within threshold:|{3}|".format(
+                                    CHILTName, metricName, metricValue, threshold)
+                            reportFile.write("\
+                {0}\n".format( tempErrorMsg))
+                            errorMsg += tempErrorMsg + '\n'
+                            if summaryResults[CHILTName]['Status'] != 'FAIL':
+                                numberOfFailures += 1
+                                resultCounterUpdated = True
+                                summaryResults[CHILTName]['Status'] = 'FAIL'
+                                summaryResults[CHILTName]['Details'] = "Metric {0}={1} NOT within {2}".format(
+                                    metricName, metricValue, threshold)
+
 
                 ### common processing for cert, license, inventory, and health operations
                 ### for all other lines, try to match using  compare patterns if present 
                 if 'ComparePatterns' in CHILTAttributes:
                     if CHILTAttributes['ComparePatterns'] != None:
                         ### check whether the command output has search patterns
-                        returnStatus, patternsMatched, patternsNotMatched, errorMsg = JAGlobalLib.JAComparePatterns(
+                        returnStatus, patternsMatched, patternsNotMatched, patternResults, errorMsg = JAGlobalLib.JAComparePatterns(
                                 CHILTName,
-                                CHILTAttributes['ComparePatterns'], None, returnOutput,
+                                CHILTAttributes['CompiledComparePatterns'], None, returnOutput,
                                 interactiveMode, debugLevel,
                                 myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
                         if returnStatus == False:
@@ -654,6 +1681,9 @@ TimeStamp: {0}\n\
                             ###  leading space before printing the message below is intentional
                             reportFile.write("\
                 {0}\n".format(errorMsg))
+                            for line in JAGlobalLib.JAFormatPatternResults( patternResults ):
+                                reportFile.write("\
+                {0}\n".format(line))
 
                         ### even under partial match, these variables will be set.
                         numberOfComparePatternMatched += patternsMatched 
@@ -669,7 +1699,80 @@ TimeStamp: {0}\n\
                 if resultCounterUpdated == False:
                     numberOfPasses += 1
                     summaryResults[CHILTName]['Status'] = 'PASS'
-                    summaryResults[CHILTName]['Details'] = ""
+                    if operation != 'inventory':
+                        summaryResults[CHILTName]['Details'] = ""
+
+        if operation == 'cert' and defaultParameters['CertDiscoveryRoots'] not in ('', None):
+            ### report every expiring cert under discovery roots, not only those listed in cert spec
+            certIndex = {}
+            certIndexFileName = "{0}/JACertIndex.json".format( defaultParameters['LogFilePath'] )
+            if os.path.exists( certIndexFileName ):
+                try:
+                    import json
+                    with open( certIndexFileName, "r") as file:
+                        certIndex = json.load(file)
+                except (OSError, ValueError) as err:
+                    JAGlobalLib.LogLine(
+                        "WARN JAOperationCHILT() Can't read cert index file:|{0}|, error:{1}, reading all cert files".format(
+                            certIndexFileName, err),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                    certIndex = {}
+
+            numberOfFiles, numberOfFilesRead, errorMsg = JACertDiscover( 
+                defaultParameters['CertDiscoveryRoots'], defaultParameters['CertDiscoveryFileTypes'],
+                defaultParameters['CertDiscoveryMaxFileSize'], certIndex, debugLevel)
+            if errorMsg != '':
+                JAGlobalLib.LogLine(
+                    errorMsg,
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+            numberOfCerts = sum( len(certIndex[certFileName]['Certs']) for certFileName in certIndex )
+            reportFile.write("\
+            CertDiscovery:\n\
+            Roots: {0}\n\
+            Results:\n\
+                Files: {1}, FilesRead: {2}, Certs: {3}\n".format(
+                defaultParameters['CertDiscoveryRoots'], numberOfFiles, numberOfFilesRead, numberOfCerts))
+
+            ### one summary line per cert file that has expired or expiring cert, report the worst one
+            for certFileName in sorted(certIndex):
+                worstCertStatus = 'PASS'
+                for certDetails in certIndex[certFileName]['Certs']:
+                    certStatus, certStatusDetails, tempErrorMsg = JACertCheckDates(
+                        "file:{0} subject:{1}".format( certFileName, certDetails['Subject']),
+                        certDetails['NotBefore'], certDetails['NotAfter'], 
+                        currentTime, defaultParameters['DueInDaysForCert'])
+                    if certStatus == 'PASS':
+                        continue
+                    reportFile.write("\
+                {0}, sha256 Fingerprint={1}\n".format(tempErrorMsg, certDetails['Fingerprint']))
+                    if worstCertStatus == 'FAIL' or (worstCertStatus == 'WARN' and certStatus == 'WARN'):
+                        continue
+                    worstCertStatus = certStatus
+                    summaryResults[certFileName]['Condition'] = 'None'
+                    summaryResults[certFileName]['Status'] = certStatus
+                    summaryResults[certFileName]['Details'] = "{0}, subject:{1}".format(
+                        certStatusDetails, certDetails['Subject'])
+                if worstCertStatus == 'FAIL':
+                    numberOfItems += 1
+                    numberOfErrors += 1
+                elif worstCertStatus == 'WARN':
+                    numberOfItems += 1
+                    numberOfFailures += 1
+
+            try:
+                import json
+                with open( certIndexFileName + ".tmp", "w") as file:
+                    json.dump( certIndex, file)
+                os.replace( certIndexFileName + ".tmp", certIndexFileName)
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                    "WARN JAOperationCHILT() Can't save cert index file:|{0}|, error:{1}".format(
+                        certIndexFileName, err),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
         JAGlobalLib.LogLine(
             "SummaryStart++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++\n\
@@ -706,8 +1809,8 @@ all passed:{3}, failed:{4}, ComparePatterns matched:{5}, ComparePatterns NOT mat
             {0:6s} {1:48s} {2:12s} {3}\n".format(
             "Status", "Item", "Condition", "Details" ) )
 
-        ### Now, write concise report line per item
-        for CHILTName in CHILTParameters:
+        ### Now, write concise report line per item, including discovered certs
+        for CHILTName in summaryResults:
             JAGlobalLib.LogLine(
             "{0:6s} {1:48s} {2:12s} {3}".format(
                 summaryResults[CHILTName]['Status'], 
@@ -740,6 +1843,44 @@ all passed:{3}, failed:{4}, ComparePatterns matched:{5}, ComparePatterns NOT mat
             defaultParameters['ReportFileNames'].append(reportFileNameWithoutPath)
 
         
+    if operation == 'test':
+        ### JUnit XML and JSON reports with status and duration of each test
+        returnStatus, errorMsg = JAWriteTestReports( 
+            reportFileName, testResults, "JAAudit.test.{0}".format(subsystem), thisHostName, testsStartTime)
+        if returnStatus == False:
+            JAGlobalLib.LogLine(
+                errorMsg,
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    if operation == 'inventory':
+        ### save inventory for next run
+        try:
+            import json
+            with open( inventoryCacheFileName + ".tmp", "w") as file:
+                json.dump( inventoryCache, file)
+            os.replace( inventoryCacheFileName + ".tmp", inventoryCacheFileName)
+        except OSError as err:
+            JAGlobalLib.LogLine(
+                "WARN JAOperationCHILT() Can't save inventory cache file:|{0}|, error:{1}".format(
+                    inventoryCacheFileName, err),
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    if operation == 'cert':
+        ### save decoded cert details for next run
+        try:
+            import json
+            with open( certCacheFileName + ".tmp", "w") as file:
+                json.dump( usedCertCache, file)
+            os.replace( certCacheFileName + ".tmp", certCacheFileName)
+        except OSError as err:
+            JAGlobalLib.LogLine(
+                "WARN JAOperationCHILT() Can't save cert cache file:|{0}|, error:{1}".format(
+                    certCacheFileName, err),
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
     ### write history file
     JAGlobalLib.JAUpdateHistoryFileName(subsystem, operation, defaultParameters )
 
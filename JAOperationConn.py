@@ -169,8 +169,13 @@ def JAReadConfigConn(
                         'Command',
                         'Condition',
                         'HostNames',
+                        'ExpectedReply',
+                        'Payload',
                         'Ports',
-                        'Protocol'
+                        'Protocol',
+                        'SampleInterval',
+                        'Samples',
+                        'URLPath'
                         ]
                 """
                 if overridePrevValue == False:
@@ -204,8 +209,8 @@ def JAReadConfigConn(
                     
                     if attribute == 'HostNames':
                         originalAttributeValue = attributeValue
-                        returnStatus, attributeValue = JAGlobalLib.JASubstituteVariableValues( variables, attributeValue)
-                        if returnStatus == True:
+                        substituteStatus, attributeValue = JAGlobalLib.JASubstituteVariableValues( variables, attributeValue)
+                        if substituteStatus == True:
                             if debugLevel > 2:
                                 JAGlobalLib.LogLine(
                                     "DEBUG-3 JAReadConfigConn() Service Name:|{0}|, original HostNames:|{1}|, HostNames after substituting the variable values:|{2}|".format(
@@ -218,6 +223,41 @@ def JAReadConfigConn(
                 if 'Protocol' not in serviceParams:
                     ### set default protocol
                     connParameters[serviceName]['Protocol'] = 'TCP'
+                else:
+                    connParameters[serviceName]['Protocol'] = str(serviceParams['Protocol']).strip().upper()
+                    if connParameters[serviceName]['Protocol'] not in JAGlobalLib.JAProbeProtocols:
+                        JAGlobalLib.LogLine(
+                            "WARN JAReadConfigConn() Service name:{0}, unsupported Protocol:{1}, supported protocols are:{2}, Skipped this definition".format(
+                                serviceName, serviceParams['Protocol'], JAGlobalLib.JAProbeProtocols ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                        numberOfWarnings += 1
+                        del connParameters[serviceName]
+                        continue
+
+                ### put default value of None for protocol probe attributes if not present
+                for attribute in ['Payload', 'ExpectedReply', 'URLPath']:
+                    if attribute not in serviceParams:
+                        connParameters[serviceName][attribute] = None
+                    else:
+                        connParameters[serviceName][attribute] = str(serviceParams[attribute])
+
+                ### number of probes per endpoint and seconds between probes to measure latency and loss
+                connParameters[serviceName]['Samples'] = 1
+                connParameters[serviceName]['SampleInterval'] = 0.5
+                try:
+                    if 'Samples' in serviceParams:
+                        connParameters[serviceName]['Samples'] = max( int(serviceParams['Samples']), 1 )
+                    if 'SampleInterval' in serviceParams:
+                        connParameters[serviceName]['SampleInterval'] = max( float(serviceParams['SampleInterval']), 0 )
+                except ValueError:
+                    JAGlobalLib.LogLine(
+                        "WARN JAReadConfigConn() Service name:{0}, invalid Samples:{1} or SampleInterval:{2}, using Samples:{3}, SampleInterval:{4}".format(
+                            serviceName, serviceParams.get('Samples'), serviceParams.get('SampleInterval'),
+                            connParameters[serviceName]['Samples'], connParameters[serviceName]['SampleInterval'] ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                    numberOfWarnings += 1
 
                 ### put default value of None for command and condition if not present
                 if 'Condition' not in serviceParams:
@@ -291,10 +331,8 @@ def JAOperationConn(
     ### environment spec has command with all options
     tcpOptions = udpOptions = ''
 
-    connectionErrors = r"Connection timed out|timed out: Operation now in progress|No route to host"
-    hostNameErrors = r"host lookup failed|Could not resolve hostname|Name or service not known"
-    connectivityPassed = r"succeeded|Connected to| open"
-    connectivityUnknown = r"Connection refused"
+    ### count of each connectivity outcome, refer to JAGlobalLib.JAClassifyConnectivityOutput()
+    outcomeCounts = {}
 
     if 'CommandConnCheck' in defaultParameters:
         command = defaultParameters['CommandConnCheck']
@@ -337,6 +375,48 @@ TimeStamp: {0}\n\
     JAGlobalLib.UTCDateTime(), defaultParameters['Platform'], defaultParameters['Component'],
     thisHostName, defaultParameters['Environment']) )
 
+        ### evaluate conditions and derive host names, ports of all services first,
+        ###   so that TCP connectivity to all services can be checked concurrently
+        serviceConditions = {}
+        serviceEndpoints = {}
+        nativeEndpoints = []
+        for serviceName in connParameters:
+            serviceAttributes = connParameters[serviceName]
+            serviceConditions[serviceName] = JAGlobalLib.JAEvaluateCondition(
+                                serviceName, serviceAttributes, defaultParameters, debugLevel,
+                                interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+
+            ### if multiple hostnames, make a list to iterate later
+            tempHostNames = serviceAttributes['HostNames'].split(',')
+
+            ### if multiple ports or port range, make a list of port ranges to iterate later
+            ###   port range in the form startPort-endPort is kept as range, not expanded to list of ports
+            portStatus, tempPortRanges, portErrorMsg = JAGlobalLib.JAParsePortRanges( serviceAttributes['Ports'] )
+            if portStatus == False:
+                JAGlobalLib.LogLine(
+                    "{0}, service name:{1}, skipped connectivity test".format( portErrorMsg, serviceName ),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                numberOfErrors += 1
+                tempPortRanges = []
+            serviceEndpoints[serviceName] = (tempHostNames, tempPortRanges)
+
+            conditionPresent, conditionMet = serviceConditions[serviceName]
+            ### UDP without Payload is checked using CommandConnCheck, only sends the packet
+            if defaultParameters['ConnCheckBuiltIn'] == True \
+                and (serviceAttributes['Protocol'] != 'UDP' or serviceAttributes['Payload'] != None) \
+                and (conditionPresent == False or conditionMet == True):
+                for tempHostName in tempHostNames:
+                    for tempPortRange in tempPortRanges:
+                        nativeEndpoints.append( (tempHostName.strip(), tempPortRange, serviceAttributes['Protocol'], 
+                            serviceAttributes['Payload'], serviceAttributes['ExpectedReply'], serviceAttributes['URLPath'],
+                            serviceAttributes['Samples'], serviceAttributes['SampleInterval']) )
+
+        ### check connectivity to all services concurrently, without executing any command
+        connectivityResults = JAGlobalLib.JACheckConnectivityNative( 
+            nativeEndpoints, defaultParameters['ConnCheckTimeout'], defaultParameters['ConnCheckMaxConcurrency'], 
+            defaultParameters['ConnCheckRate'], defaultParameters['DNSCacheTTL'], debugLevel )
+
         ### save or compare information of each object
         for serviceName in connParameters:
             numberOfItems += 1
@@ -353,12 +433,15 @@ TimeStamp: {0}\n\
                 'Command',
                 'Condition',
                 'HostNames',
+                'ExpectedReply',
+                'Payload',
                 'Ports',
-                'Protocol'
+                'Protocol',
+                'SampleInterval',
+                'Samples',
+                'URLPath'
             """
-            conditionPresent, conditionMet = JAGlobalLib.JAEvaluateCondition(
-                                serviceName, serviceAttributes, defaultParameters, debugLevel,
-                                interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+            conditionPresent, conditionMet = serviceConditions[serviceName]
 
             if conditionPresent == True:
                 if conditionMet == False:
@@ -393,29 +476,21 @@ TimeStamp: {0}\n\
                 else:
                     numberOfConditionsMet += 1
 
-            ### if multiple hostnames, make a list to iterate later
-            tempHostNames = serviceAttributes['HostNames'].split(',')
-
-            ### if multiple ports or port range, make a list to iterate later
-            tempPorts = []
-            if re.search(r'-', str(serviceAttributes['Ports'])):
-                ### port range specified in the form startPort-endPort
-                ###  get all port numbers inclusive of start and end ports
-                tempPortRange = serviceAttributes['Ports'].split(r'-')
-                for tempPort in range(int(tempPortRange[0]), int(tempPortRange[1])+1):
-                    tempPorts.append(str(tempPort))
-            else:
-                ### if ports are in CSV form, get those in to a list
-                tempPorts = str(serviceAttributes['Ports']).split(',')
+            tempHostNames, tempPortRanges = serviceEndpoints[serviceName]
 
             if debugLevel > 1:
                 JAGlobalLib.LogLine(
                     "DEBUG-2 JAOperationConn() service name:|{0}|, service attributes:|{1}|, hosts:|{2}|, ports:|{3}|".format(
-                    serviceName, serviceAttributes, tempHostNames, tempPorts),
+                    serviceName, serviceAttributes, tempHostNames, tempPortRanges),
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
             tempProtocol = serviceAttributes['Protocol']
+            ### TLS, HTTP, HTTPS are checked as TCP when CommandConnCheck is used
+            if tempProtocol == 'UDP':
+                commandProtocol = 'UDP'
+            else:
+                commandProtocol = 'TCP'
 
             ### below are temp counters for current HostNames, Ports set only to iterate through
             passCount = failureCount = numberOfConnectivityTestsPerService = 0
@@ -423,7 +498,7 @@ TimeStamp: {0}\n\
             ### While testing single host and for single port, when it fails, declare ERROR.
             ### while testing multiple hosts or multiple ports, when single test fails, declare FAIL.
             numberOfHostNames = len(tempHostNames)
-            numberOfPorts = len(tempPorts)
+            numberOfPorts = sum( len(tempPortRange) for tempPortRange in tempPortRanges )
             if numberOfHostNames > 1 or numberOfPorts > 1:
                 errorString = 'FAIL '
             else:
@@ -448,13 +523,26 @@ TimeStamp: {0}\n\
 
             ### now check the conectivity for each destination host and each port
             for tempHostName in tempHostNames:
-                for tempPort in tempPorts:
+                for tempPort in ( str(port) for tempPortRange in tempPortRanges for port in tempPortRange ):
                     numberOfConnectivityTests += 1
                     numberOfConnectivityTestsPerService += 1
                     tempResult = 'TBD'
-                    tempReturnStatus,returnOutput, errorMsg = JAGlobalLib.JACheckConnectivity( 
-                        tempHostName, tempPort, tempProtocol, command, tcpOptions, udpOptions, OSType, OSName, OSVersion, debugLevel,
-                        defaultParameters['CommandShell'])
+                    outcome = 'UNKNOWN'
+                    ### DNS lookup time in ms, known only when checked by built-in prober
+                    dnsTime = None
+                    probeKey = (tempHostName.strip(), tempPort.strip(), tempProtocol, 
+                        serviceAttributes['Payload'], serviceAttributes['ExpectedReply'], serviceAttributes['URLPath'],
+                        serviceAttributes['Samples'], serviceAttributes['SampleInterval'])
+                    if probeKey in connectivityResults:
+                        ### connectivity checked already by built-in prober
+                        tempReturnStatus = True
+                        returnOutput, connectTime, dnsTime, probeDetails = connectivityResults[probeKey]
+                        returnOutput = "{0}, dns time:{1:.1f} ms".format( returnOutput, dnsTime )
+                        errorMsg = ''
+                    else:
+                        tempReturnStatus,returnOutput, errorMsg = JAGlobalLib.JACheckConnectivity( 
+                            tempHostName, tempPort, commandProtocol, command, tcpOptions, udpOptions, OSType, OSName, OSVersion, debugLevel,
+                            defaultParameters['CommandShell'])
                     if tempReturnStatus == False:
                         failureCount += 1
                         JAGlobalLib.LogLine(
@@ -465,18 +553,16 @@ TimeStamp: {0}\n\
                         tempResult = 'ERROR'
                         break
                     else:
-                        # parse the returnOutput or command output
-                        if re.search(connectivityPassed, returnOutput):
+                        # classify the returnOutput or command output
+                        outcome = JAGlobalLib.JAClassifyConnectivityOutput( returnOutput, outcomeCounts )
+                        if outcome == 'PASS':
                             passCount += 1
                             tempResult = "PASS "
-                        elif re.search(connectivityUnknown, returnOutput):
+                        elif outcome == 'UNKNOWN':
+                            ### output not recognized, connectivity is not confirmed, count it as failure
                             failureCount += 1
-                            
-                            tempResult = errorString
-                        elif re.search(connectionErrors, returnOutput):
-                            failureCount += 1
-                            tempResult = errorString
-                        elif re.search(hostNameErrors, returnOutput):
+                            tempResult = "UNKNOWN"
+                        else:
                             failureCount += 1
                             tempResult = errorString
                     JAGlobalLib.LogLine(
@@ -490,7 +576,15 @@ TimeStamp: {0}\n\
                 - Name: {0}\n\
                 Port: {1}\n\
                 Result: {2}\n\
-                Details: {3}\n".format(tempHostName, tempPort, tempResult, returnOutput) )
+                Details: {3}\n\
+                Outcome: {4}\n".format(tempHostName, tempPort, tempResult, returnOutput, outcome) )
+                    if dnsTime != None:
+                        reportFile.write("\
+                DNSTime: {0:.1f}\n\
+                ConnectTime: {1:.1f}\n".format(dnsTime, connectTime) )
+                        for detailName in probeDetails:
+                            reportFile.write("\
+                {0}: {1}\n".format(detailName, probeDetails[detailName]) )
 
             tempResult = 'TBD'
             if numberOfConnectivityTestsPerService > 1:
@@ -528,8 +622,8 @@ TimeStamp: {0}\n\
 
         JAGlobalLib.LogLine(
             "INFO JAOperationConn() Total Services:{0}, conditions met:{1}, conditions NOT met:{2}, \
-    all passed:{3}, failed:{4}, errors:{5}".format(
-            numberOfItems, numberOfConditionsMet, numberOfConditionsNotMet, numberOfPasses, numberOfFailures, numberOfErrors ),
+    all passed:{3}, failed:{4}, errors:{5}, outcomes:{6}".format(
+            numberOfItems, numberOfConditionsMet, numberOfConditionsNotMet, numberOfPasses, numberOfFailures, numberOfErrors, outcomeCounts ),
             interactiveMode,
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
@@ -542,11 +636,37 @@ TimeStamp: {0}\n\
         Pass: {3}\n\
         Fail: {4}\n\
         Error: {5}\n\
+        Outcomes:\n\
 ".format( numberOfItems, numberOfConditionsMet, numberOfConditionsNotMet, numberOfPasses, numberOfFailures, numberOfErrors ) )
+        for outcome in outcomeCounts:
+            reportFile.write("\
+            {0}: {1}\n".format( outcome, outcomeCounts[outcome] ) )
+
 
+        ### on Linux, collect listen port info from /proc/net without executing any command
+        listenPortsCollected = False
+        if OSType == 'Linux' and defaultParameters['ListenPortsBuiltIn'] == True:
+            listenPortsCollected, listenPorts, errorMsg = JAGlobalLib.JAGetListenPorts( 
+                defaultParameters['ListenPortsProcessInfo'], debugLevel )
+            if listenPortsCollected == True:
+                reportFile.write("ListenPorts:\n")
+                for listenPort in listenPorts:
+                    reportFile.write("\
+        - Protocol: {0}\n\
+          Address: {1}\n\
+          Port: {2}\n".format( listenPort['Protocol'], listenPort['Address'], listenPort['Port'] ) )
+                    if listenPort['PID'] != None:
+                        reportFile.write("\
+          PID: {0}\n\
+          Process: {1}\n".format( listenPort['PID'], listenPort['Process'] ) )
+            else:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
         ### if command present to get listen port info, collect it.
-        if 'CommandToGetListenPorts' in defaultParameters:
+        if listenPortsCollected == False and 'CommandToGetListenPorts' in defaultParameters:
             if debugLevel > 1:
                 JAGlobalLib.LogLine(
                     "DEBUG-2 JAOperationConn() Executing command:|{0} {1}| to get ports in LISTEN state".format(
@@ -554,6 +554,8 @@ def JAOperationHeal(
             returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
                 defaultParameters['CommandShell'], serviceAttributes['HealAction'], debugLevel, OSType,
                 None, True ) ### DO NOT wait for command execution to complete
+            ### heal action can start or stop processes, conditions of next items need current process table
+            JAGlobalLib.JAInvalidateProcessSnapshot()
             if returnResult == False:
                 if re.match(r'File not found', errorMsg) != True:
                     JAGlobalLib.LogLine(
@@ -704,6 +706,8 @@ def JAOperationTask(
         returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
             defaultParameters['CommandShell'], serviceAttributes['Task'], debugLevel, OSType,
             None, True ) ### DO NOT wait for command execution to complete
+        ### task can start or stop processes, conditions of next items need current process table
+        JAGlobalLib.JAInvalidateProcessSnapshot()
         if returnResult == False:
             if re.match(r'File not found', errorMsg) != True:
                 JAGlobalLib.LogLine(
@@ -8,8 +8,11 @@ import re
 import os
 import JAGlobalLib
 from collections import defaultdict
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import shutil
+import time
+import errno
+import threading
 
 def JAReadConfigCompare( 
         baseConfigFileName, 
@@ -59,8 +62,12 @@ def JAReadConfigCompare(
         'CompareType',
         'FileNames',
         'ComparePatterns',
+        'IgnoreKeys',
         'IgnorePatterns',
-        'SkipH2H'
+        'InputFingerprint',
+        'InputProbe',
+        'SkipH2H',
+        'StructuredFormat'
         ]
     baseConfigFileNameParts = baseConfigFileName.split('.')
     if len(baseConfigFileNameParts) != 2:
@@ -164,7 +171,10 @@ def JAReadConfigCompare(
                 ### default attributes
                 tempAttributes['SkipH2H'] = 'no'
                 tempAttributes['FileNames'] = tempAttributes['Command'] = tempAttributes['IgnorePatterns'] = tempAttributes['ComparePatterns'] = None
+                tempAttributes['CompiledComparePatterns'] = None
                 tempAttributes['CompareType'] = 'text'
+                tempAttributes['InputFingerprint'] = tempAttributes['InputProbe'] = tempAttributes['IgnoreKeys'] = None
+                tempAttributes['StructuredFormat'] = None
                 
                 if overridePrevValue == False:
                     if itemName in saveCompareParameters:
@@ -183,7 +193,7 @@ def JAReadConfigCompare(
 
                 for paramName, paramValue in attributes.items():
                     ### if the value is True or False type, it is treated as boolean, can't use .strip() on that paramValue
-                    if paramName != "SkipH2H" and paramName != 'IgnorePatterns' and paramName != 'ComparePatterns':
+                    if paramName != "SkipH2H" and paramName != 'IgnorePatterns' and paramName != 'ComparePatterns' and paramName != 'InputFingerprint' and paramName != 'IgnoreKeys':
                         try:
                             paramValue = paramValue.strip()
                         except:
@@ -220,12 +230,48 @@ def JAReadConfigCompare(
                         elif paramName == 'CompareType' :
                             paramValue = paramValue.lower()
 
+                        elif paramName == 'StructuredFormat':
+                            paramValue = paramValue.lower()
+                            if paramValue not in JAStructuredFormats.values():
+                                numberOfWarnings += 1
+                                JAGlobalLib.LogLine(
+                                    "WARN JAReadConfigCompare() Unsupported StructuredFormat:|{0}| for itemName:|{1}|, supported formats:|{2}|, Skipping this object definition".format(
+                                        paramValue, itemName, ','.join( sorted(set(JAStructuredFormats.values())) )),
+                                    interactiveMode,
+                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                                saveParamValue = False
+                                ### discard the current object spec
+                                break
+
                         elif paramName == 'ComparePatterns':
                             ### evaluate group values using current variable values if group values have any variable spec
                             returnStatus = JAGlobalLib.JAEvaluateComparePatternGroupValues(
                                     itemName, paramValue, variables,
                                     interactiveMode, debugLevel,
                                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType )
+                            ### compile once here, used for each comparison later
+                            tempAttributes['CompiledComparePatterns'] = JAGlobalLib.JACompileComparePatterns(
+                                    itemName, paramValue,
+                                    interactiveMode, debugLevel,
+                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+                        elif paramName == 'InputFingerprint':
+                            ### list of files/directories or CSV of files/directories
+                            if isinstance( paramValue, list ):
+                                paramValue = [ str(inputName).strip() for inputName in paramValue if len(str(inputName).strip()) > 0 ]
+                            else:
+                                paramValue = [ inputName.strip() for inputName in str(paramValue).split(',') if len(inputName.strip()) > 0 ]
+
+                        elif paramName == 'InputProbe':
+                            ### probe command whose output changes when inputs change
+                            if JAGlobalLib.JAIsSupportedCommand( paramValue, allowedCommands, OSType ) == False:
+                                numberOfWarnings += 1
+                                JAGlobalLib.LogLine(
+                                    "WARN JAReadConfigCompare() Unsupported probe command:|{0}| in parameter:|{1}| and itemName:|{2}|, input probe not used".format(
+                                        paramValue, paramName, itemName),
+                                    interactiveMode,
+                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                                continue
 
                         if saveParamValue == True:   
                             tempAttributes[paramName] = paramValue
@@ -240,6 +286,9 @@ def JAReadConfigCompare(
                         saveCompareParameters[itemName]['CompareType'] = tempAttributes['CompareType']
                         saveCompareParameters[itemName]['IgnorePatterns'] = tempAttributes['IgnorePatterns']
                         saveCompareParameters[itemName]['ComparePatterns'] = tempAttributes['ComparePatterns']
+                        saveCompareParameters[itemName]['CompiledComparePatterns'] = tempAttributes['CompiledComparePatterns']
+                        saveCompareParameters[itemName]['InputFingerprint'] = tempAttributes['InputFingerprint']
+                        saveCompareParameters[itemName]['InputProbe'] = tempAttributes['InputProbe']
 
                         saveCompareParameters[itemName]['FileNames'] = None
 
@@ -311,6 +360,9 @@ def JAReadConfigCompare(
                                                 saveCompareParameters[tempitemName]['CompareType'] = tempAttributes['CompareType']
                                                 saveCompareParameters[tempitemName]['IgnorePatterns'] = tempAttributes['IgnorePatterns']
                                                 saveCompareParameters[tempitemName]['ComparePatterns'] = tempAttributes['ComparePatterns']
+                                                saveCompareParameters[tempitemName]['CompiledComparePatterns'] = tempAttributes['CompiledComparePatterns']
+                                                saveCompareParameters[tempitemName]['IgnoreKeys'] = tempAttributes['IgnoreKeys']
+                                                saveCompareParameters[tempitemName]['StructuredFormat'] = tempAttributes['StructuredFormat']
                                                 saveCompareParameters[tempitemName]['Command'] = None
                                                 
                                         continue
@@ -335,6 +387,9 @@ def JAReadConfigCompare(
                                     saveCompareParameters[tempitemName]['CompareType'] = tempAttributes['CompareType']
                                     saveCompareParameters[tempitemName]['IgnorePatterns'] = tempAttributes['IgnorePatterns']
                                     saveCompareParameters[tempitemName]['ComparePatterns'] = tempAttributes['ComparePatterns']
+                                    saveCompareParameters[tempitemName]['CompiledComparePatterns'] = tempAttributes['CompiledComparePatterns']
+                                    saveCompareParameters[tempitemName]['IgnoreKeys'] = tempAttributes['IgnoreKeys']
+                                    saveCompareParameters[tempitemName]['StructuredFormat'] = tempAttributes['StructuredFormat']
                                     saveCompareParameters[tempitemName]['Command'] = None
                                     
                     else:
@@ -423,9 +478,17 @@ def JAPrepareUploadFileList(
     for itemName in saveCompareParameters:
         attributes = saveCompareParameters[itemName]
         if attributes['SkipH2H'] == 'no' or attributes['SkipH2H'] == 'No' or attributes['SkipH2H'] == None:
-            if attributes['CompareType'] == 'text' or attributes['CompareType'] == 'Text':
+            if attributes['CompareType'] == 'text' or attributes['CompareType'] == 'Text' or attributes['CompareType'] == 'structured':
                 ### include this file for upload/download
                 fileList.append(itemName)
+            elif attributes['CompareType'] == 'metadata':
+                ### metadata of all objects is saved in single file
+                metadataFileName = JAMetadataDeriveFileName( baseConfigFileName, subsystem )
+                if metadataFileName not in fileList:
+                    fileList.append( metadataFileName )
+            elif attributes['CompareType'] == 'tree':
+                ### include tree file name
+                fileList.append(itemName + ".tree")
             else:
                 ### include checksum file name
                 fileList.append(itemName + ".checksum")
@@ -435,9 +498,228 @@ def JAPrepareUploadFileList(
                     "DEBUG-2 JAPrepareUploadFileList() SkipH2H is True, skipping the object:{0}".format(itemName),
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    if defaultParameters['SaveSnapshot'] == True:
+        ### files are packed in single snapshot file, upload or download the snapshot file only
+        defaultParameters['SnapshotMemberNames'] = fileList
+        fileList = [ JASnapshotDeriveFileName( baseConfigFileName, subsystem ) ]
     defaultParameters['UploadFileNames'] = fileList
     return len(defaultParameters['UploadFileNames'])
  
+def JASnapshotDeriveFileName( baseConfigFileName:str, subsystem:str ):
+    """
+    JASnapshotDeriveFileName( baseConfigFileName:str, subsystem:str )
+
+    Returns snapshot file name in the form <baseConfigFileName>.<subsystem>.snapshot
+    """
+    return "{0}.{1}.snapshot".format( baseConfigFileName, subsystem )
+
+def JASnapshotGetCompression( compression:str ):
+    """
+    JASnapshotGetCompression( compression:str )
+
+    Returns zipfile compression type for the compression name passed - zstd, gzip, bzip2, lzma, none
+    zstd is supported on python 3.14 or above, if not supported, gzip (deflate) is used
+    """
+    import zipfile
+    if compression == None:
+        compression = 'gzip'
+    compression = compression.lower()
+    if compression == 'zstd':
+        return getattr(zipfile, 'ZIP_ZSTANDARD', zipfile.ZIP_DEFLATED)
+    elif compression == 'bzip2':
+        return zipfile.ZIP_BZIP2
+    elif compression == 'lzma':
+        return zipfile.ZIP_LZMA
+    elif compression == 'none':
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+def JASnapshotWrite( snapshotFileName:str, saveDir:str, memberNames, compression:str ):
+    """
+    JASnapshotWrite( snapshotFileName:str, saveDir:str, memberNames, compression:str )
+
+    Packs the files saveDir/<memberName> into single snapshot file.
+    Snapshot is in zip format, each member is compressed individually and index of members is at the end of the file,
+        so that individual member can be read without reading entire snapshot.
+    Files not present under saveDir are skipped.
+    Snapshot is written to temporary file first and renamed, so that partial snapshot is not seen by compare or upload.
+
+    Returned values
+        returnStatus - True on success, False on failure
+        packedMemberNames - list of member names packed
+        errorMsg
+    """
+    import zipfile
+    packedMemberNames = []
+    tempSnapshotFileName = "{0}.{1}.tmp".format( snapshotFileName, os.getpid())
+    try:
+        with zipfile.ZipFile( tempSnapshotFileName, "w", compression=JASnapshotGetCompression(compression)) as snapshotFile:
+            for memberName in memberNames:
+                memberFileName = "{0}/{1}".format( saveDir, memberName )
+                if os.path.exists( memberFileName ) == False:
+                    continue
+                snapshotFile.write( memberFileName, arcname=memberName )
+                packedMemberNames.append( memberName )
+            snapshotFile.close()
+        os.replace( tempSnapshotFileName, snapshotFileName )
+    except (OSError, zipfile.BadZipFile, RuntimeError) as err:
+        if os.path.exists( tempSnapshotFileName ):
+            os.remove( tempSnapshotFileName )
+        return False, [], "ERROR JASnapshotWrite() Not able to write snapshot file:|{0}|, error:|{1}|".format(
+            snapshotFileName, err)
+    return True, packedMemberNames, ''
+
+def JASnapshotReadMember( snapshotFileName:str, memberName:str ):
+    """
+    JASnapshotReadMember( snapshotFileName:str, memberName:str )
+
+    Reads the content of a member from snapshot file
+
+    Returned values
+        returnStatus - True on success, False if snapshot or member is not present
+        content - member content in bytes
+        errorMsg
+    """
+    import zipfile
+    try:
+        with zipfile.ZipFile( snapshotFileName, "r") as snapshotFile:
+            content = snapshotFile.read( memberName )
+            snapshotFile.close()
+    except (OSError, KeyError, zipfile.BadZipFile) as err:
+        return False, b'', "ERROR JASnapshotReadMember() Not able to read member:|{0}| from snapshot file:|{1}|, error:|{2}|".format(
+            memberName, snapshotFileName, err)
+    return True, content, ''
+
+def JASnapshotGetReferenceFile( saveDir:str, fileName:str, snapshotFileName:str, logFilePath:str ):
+    """
+    JASnapshotGetReferenceFile( saveDir:str, fileName:str, snapshotFileName:str, logFilePath:str )
+
+    Returns the path of reference file to be used by compare operation.
+    If saveDir/fileName is present, returns that file name.
+    Else if the file is a member of snapshot file, extracts that member to temporary file under logFilePath
+        and returns temporary file name. Caller needs to delete the temporary file after compare.
+
+    Returned values
+        referenceFileName - file name to use for compare
+        tempFile - True if referenceFileName is a temporary file
+    """
+    referenceFileName = "{0}/{1}".format( saveDir, fileName )
+    if os.path.exists( referenceFileName ) == True or os.path.exists( snapshotFileName ) == False:
+        return referenceFileName, False
+
+    returnStatus, content, errorMsg = JASnapshotReadMember( snapshotFileName, fileName )
+    if returnStatus == False:
+        return referenceFileName, False
+
+    tempFileName = "{0}/JAAudit.snapshot.{1}.{2}".format( logFilePath, os.getpid(), fileName )
+    try:
+        with open( tempFileName, "wb") as file:
+            file.write( content )
+            file.close()
+    except OSError:
+        return referenceFileName, False
+    return tempFileName, True
+
+def JAInputFingerprintDeriveFileName( saveDir:str, itemName:str ):
+    """
+    JAInputFingerprintDeriveFileName( saveDir:str, itemName:str )
+
+    Returns input fingerprint file name in the form <saveDir>/<itemName>.fingerprint
+    """
+    return "{0}/{1}.fingerprint".format( saveDir, itemName )
+
+def JAInputFingerprintCompute( inputFingerprint, inputProbe, shell:str, debugLevel:int, OSType:str ):
+    """
+    JAInputFingerprintCompute( inputFingerprint, inputProbe, shell:str, debugLevel:int, OSType:str )
+
+    Computes the fingerprint of inputs of a Command object.
+    inputFingerprint - None or list of file or directory names
+        For file, name, modified time in nano seconds and size are used.
+        For directory, name, modified time of the directory and
+            name, modified time, size of each entry under that directory (one level) are used.
+        File or directory not present is included as missing, so that it's creation is detected.
+    inputProbe - None or probe command, output of that command is used.
+    Only stat info or probe command output is hashed, contents of files are not read.
+
+    Returned values
+        returnStatus - True on success, False if probe command failed
+        fingerprint - sha256 hex digest of the inputs
+        errorMsg
+    """
+    import hashlib
+    fingerprintHash = hashlib.sha256()
+
+    if inputFingerprint != None:
+        for inputName in inputFingerprint:
+            inputName = os.path.expandvars( inputName )
+            try:
+                inputStat = os.stat( inputName )
+            except OSError:
+                fingerprintHash.update( "{0}|missing\n".format(inputName).encode() )
+                continue
+            fingerprintHash.update( "{0}|{1}|{2}\n".format(
+                inputName, inputStat.st_mtime_ns, inputStat.st_size).encode() )
+            if os.path.isdir( inputName ):
+                try:
+                    with os.scandir( inputName ) as dirEntries:
+                        entryInfo = []
+                        for dirEntry in dirEntries:
+                            try:
+                                entryStat = dirEntry.stat( follow_symlinks=False )
+                                entryInfo.append( "{0}|{1}|{2}\n".format(
+                                    dirEntry.name, entryStat.st_mtime_ns, entryStat.st_size) )
+                            except OSError:
+                                entryInfo.append( "{0}|missing\n".format(dirEntry.name) )
+                    ### scandir order is file system dependent, sort to get same fingerprint
+                    for entry in sorted( entryInfo ):
+                        fingerprintHash.update( entry.encode() )
+                except OSError as err:
+                    fingerprintHash.update( "{0}|{1}\n".format(inputName, err).encode() )
+    if inputProbe != None:
+        returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+            shell, os.path.expandvars(inputProbe), debugLevel, OSType)
+        if returnResult == False:
+            return False, '', "ERROR JAInputFingerprintCompute() Error executing probe command:|{0}|, error:|{1}|".format(
+                inputProbe, errorMsg)
+        if isinstance( returnOutput, list ):
+            returnOutput = '\n'.join( returnOutput )
+        fingerprintHash.update( returnOutput.encode() )
+
+    return True, fingerprintHash.hexdigest(), ''
+
+def JAInputFingerprintRead( saveDir:str, itemName:str ):
+    """
+    JAInputFingerprintRead( saveDir:str, itemName:str )
+
+    Returns fingerprint saved before for the object, '' if not present
+    """
+    try:
+        with open( JAInputFingerprintDeriveFileName( saveDir, itemName ), "r") as file:
+            fingerprint = file.readline().strip()
+            file.close()
+    except OSError:
+        fingerprint = ''
+    return fingerprint
+
+def JACountDiffHunks( diffLines ):
+    """
+    JACountDiffHunks( diffLines )
+
+    Returns number of hunks in output of compare command or JAGlobalLib.JADiffDataMaskedFiles()
+        unified diff - lines starting with @@
+        normal diff - change command lines like 5c5, 10,12d9, 3a4,6
+        compare-object on windows - each line with => or <=
+    """
+    numberOfHunks = numberOfDiffLines = 0
+    for line in diffLines:
+        if line.startswith('@@') or re.match(r'\d+(,\d+)?[acd]\d+(,\d+)?$', line):
+            numberOfHunks += 1
+        elif re.search(r'=>|<=', line):
+            numberOfDiffLines += 1
+    if numberOfHunks == 0:
+        numberOfHunks = numberOfDiffLines
+    return numberOfHunks
+
 def JAOperationCompareFiles(
     currentFileName:str, previousFileName:str, 
     binFileTypes:str, compareType:str, CommandCompare:str,
@@ -445,11 +727,15 @@ def JAOperationCompareFiles(
     logAdditionalInfo:str,
     interactiveMode:bool, debugLevel:int,
     myColors, colorIndex:int, outputFileHandle, HTMLBRTag:str,
-    OSType, shell, logFilePath):
+    OSType, shell, logFilePath,
+    checksumAlgorithm=JAGlobalLib.JAChecksumDefaultAlgorithm,
+    compareDetails=None):
     """
     If files passed is binary type, computes the checksum and compares the checksum
     If files passed is text type, first computes the check sum to see whethey are same.
     If not same, compares two files using diff
+    checksumAlgorithm - algorithm used to compute checksum, refer to JAGlobalLib.JAChecksumAlgorithms
+    compareDetails - if dictionary is passed, DigestNew, DigestOld, BytesRead and DiffHunks are returned in it
     """
     returnStatus = True
     fileDiffer = False
@@ -503,46 +789,35 @@ def JAOperationCompareFiles(
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
         return returnStatus, False, errorMsg
 
-    ### compute MD5 checksum and compare 
-    try:
-        ### compute checksum of two files and compare
-        with open(currentFileName,"rb") as f:
-            md5_hash = hashlib.md5()
-            # Read and update hash in chunks of 8K
-            for byte_block in iter(lambda: f.read(32768),b""):
-                md5_hash.update(byte_block)
-            currentFileMD5Digest = md5_hash.hexdigest()
-            f.close()
-
-    except OSError as err:
+    ### compute checksum of two files and compare 
+    tempStatus, currentFileDigest, tempErrorMsg = JAGlobalLib.JAComputeFileDigest(currentFileName, checksumAlgorithm)
+    if tempStatus == False:
         JAGlobalLib.LogLine(
-			"ERROR JAOperationCompareFiles() Not able to open file:{0}".format(currentFileName), 
+			"ERROR JAOperationCompareFiles() Not able to compute checksum of file:{0}, {1}".format(currentFileName, tempErrorMsg), 
             interactiveMode,
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-        return returnStatus, True, errorMsg
+        return False, True, tempErrorMsg
 
-    try:
-        ### previous file has data contents, compute checksum
-        with open(previousFileName,"rb") as f:            
-            md5_hash = hashlib.md5()
-            # Read and update hash in chunks of 8K
-            for byte_block in iter(lambda: f.read(32768),b""):
-                md5_hash.update(byte_block)
-            previousFileMD5Digest = md5_hash.hexdigest()
-            f.close()
-            
-    except OSError as err:
+    ### previous file has data contents, compute checksum
+    tempStatus, previousFileDigest, tempErrorMsg = JAGlobalLib.JAComputeFileDigest(previousFileName, checksumAlgorithm)
+    if tempStatus == False:
         JAGlobalLib.LogLine(
-			"ERROR JAOperationCompareFiles() Not able to open file:{0}".format(previousFileName), 
+			"ERROR JAOperationCompareFiles() Not able to compute checksum of file:{0}, {1}".format(previousFileName, tempErrorMsg), 
             interactiveMode,
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-        return returnStatus, True, errorMsg
+        return False, True, tempErrorMsg
+
+    if compareDetails != None:
+        compareDetails['DigestNew'] = currentFileDigest
+        compareDetails['DigestOld'] = previousFileDigest
+        compareDetails['BytesRead'] = os.path.getsize(currentFileName) + os.path.getsize(previousFileName)
+        compareDetails['DiffHunks'] = 0
 
-    if currentFileMD5Digest != previousFileMD5Digest:
+    if currentFileDigest != previousFileDigest:
         if debugLevel > 1:
             JAGlobalLib.LogLine(
-                "DEBUG-2 JAOperationCompareFiles() MD5 checksum differ, current file:|{0}|, currentFileMD5Digest:{1}, prevFile:|{2}, previousFileMD5Digest:{3}".format(
-                        currentFileName, currentFileMD5Digest, previousFileName, previousFileMD5Digest ), 
+                "DEBUG-2 JAOperationCompareFiles() checksum differ, current file:|{0}|, currentFileDigest:{1}, prevFile:|{2}, previousFileDigest:{3}".format(
+                        currentFileName, currentFileDigest, previousFileName, previousFileDigest ), 
                 interactiveMode,
                 myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
@@ -569,32 +844,22 @@ def JAOperationCompareFiles(
                 return returnStatus, fileDiffer, errorMsg
 
         tempCommandCompare = ''
-        ### for host to host compare, use H2H compare specific command and sed command
+        ### for host to host compare, mask ignore patterns and compare in memory
         if compareH2H == True and ignorePatterns != None:
-            ### prepare temporary files containing lines masked with ignore patterns.
-            returnStatus, currentFileNameDataMasked = JAGlobalLib.JADataMaskFile( 
-                currentFileName, 
-                ignorePatterns, debugLevel, interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
-            if returnStatus == False:
+            tempCommandCompare = "JADiffDataMaskedFiles {0} {1}".format(currentFileName, previousFileName)
+            if debugLevel > 1:
+                JAGlobalLib.LogLine(
+                    "DEBUG-2 JAOperationCompareFiles() comparing files after masking ignore patterns:|{0}|".format(ignorePatterns), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            returnResult, returnOutput, errorMsg = JAGlobalLib.JADiffDataMaskedFiles(
+                currentFileName, previousFileName, ignorePatterns, debugLevel)
+            if returnResult == False:
                 JAGlobalLib.LogLine(
                     errorMsg, 
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-            else:
-                returnStatus, previousFileNameDataMasked = JAGlobalLib.JADataMaskFile( 
-                    previousFileName,  
-                    ignorePatterns, debugLevel, interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
-                if returnStatus == False:
-                    JAGlobalLib.LogLine(
-                        errorMsg, 
-                        interactiveMode,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-            if returnStatus == True:
-                if OSType == "Windows":
-                    tempCommandCompare = "{0} (cat {1}) (cat {2})".format(CommandCompare, currentFileNameDataMasked, previousFileNameDataMasked )
-                else:
-                    # host to host compare scenario
-                    tempCommandCompare = "{0} {1} {2}".format( CommandCompare, currentFileNameDataMasked, previousFileNameDataMasked  )
+                return returnResult, True, errorMsg
         else:
             # regular compare scenario
             if OSType == "Windows":
@@ -603,18 +868,15 @@ def JAOperationCompareFiles(
                 ### Unix/Linux
                 tempCommandCompare = "{0} {1} {2}".format(CommandCompare, currentFileName, previousFileName )
 
-        if debugLevel > 1:
-            JAGlobalLib.LogLine(
-                "DEBUG-2 JAOperationCompareFiles() comparing files with command:|{0}|".format(tempCommandCompare), 
-                interactiveMode,
-                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            if debugLevel > 1:
+                JAGlobalLib.LogLine(
+                    "DEBUG-2 JAOperationCompareFiles() comparing files with command:|{0}|".format(tempCommandCompare), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
-        if tempCommandCompare == '':
-            return returnStatus, True, errorMsg
-            
-        returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
-                shell,
-                tempCommandCompare, debugLevel, OSType)
+            returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+                    shell,
+                    tempCommandCompare, debugLevel, OSType)
 
         if returnResult == False:
             returnStatus = False
@@ -660,11 +922,14 @@ def JAOperationCompareFiles(
                         interactiveMode,
                         myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
                 
-                ### treat windows output 
-                if OSType == 'Windows':
+                ### treat windows output of compare command
+                if OSType == 'Windows' and (compareH2H == False or ignorePatterns == None):
                     ### delete first three lines
                     del returnOutput[:3]
 
+                if compareDetails != None:
+                    compareDetails['DiffHunks'] = JACountDiffHunks( returnOutput )
+
                 ### returnOutputLines is a list, can't pass it to LogLine directly.
                 for line in returnOutput:
                     JAGlobalLib.LogLine(
@@ -694,152 +959,1671 @@ def JAOperationCompareFiles(
 
     return returnStatus, fileDiffer, errorMsg
 
-def JAOperationSaveCompare( 
-    baseConfigFileName, 
-    subsystem, 
-    myPlatform, 
-    version,
-    OSType, OSName, OSVersion,  
-    outputFileHandle, colorIndex, HTMLBRTag, myColors,
-    interactiveMode, operations, thisHostName, yamlModulePresent,
-    defaultParameters, debugLevel, currentTime,
-    allowedCommands,
-    operation ):
+### first line of tree file, followed by checksum algorithm used for file digests
+JATreeFileHeader = '#JAAuditTree'
 
+def JATreeBuildDir( dirName:str, relDirName:str, treeNodes:dict, previousNodes:dict, checksumAlgorithm:str, errorMsgs:list ):
     """
-    This function can be called to perform operations like 'backup, 'compare' and 'save'
-    For 'save' operation, it
-        Reads the environment spec file for the given subsystem
-        For Command type of object, executes commands to gather environment info and saves in file name specified under saveDir
-        For FileNames type of object, 
-            if checksum is to be stored, it computes the checksum and stores it in filename <itemName>.checksum
-            else, copies the contents of the file to saveDir/<itemName>
+    JATreeBuildDir( dirName:str, relDirName:str, treeNodes:dict, previousNodes:dict, checksumAlgorithm:str, errorMsgs:list )
+
+    Walks the directory dirName, adds a node for each entry to treeNodes, recursively for sub-directories.
+    Node is stored as treeNodes[<relative path>] = (type, mode, size, mtime_ns, digest)
+        type - d for directory, f for file, l for symbolic link, o for other types
+        digest - for file, <algorithm>:<hexdigest> of content
+                 for symbolic link, link:<target>
+                 for directory, tree:<hexdigest> computed from name, type, mode and digest of the entries under it
+    If previousNodes has a file node with same size and mtime, digest of previous node is used without reading the file.
+
+    Returned values
+        digest of dirName
+    """
+    import hashlib
+    import stat
 
-    For 'backup' operation, it
-        Deletes any BackupYYYYMMDD directories that are older than specified retency period in param 'BackupRetencyDurationInDays'
-        Derives the saveDir name in the form BackupYYYYMMDD using current time
-        Performs all the tasks of 'save' operation with derived saveDir.
+    childLines = []
+    try:
+        with os.scandir( dirName ) as dirEntries:
+            entries = sorted( dirEntries, key=lambda dirEntry: dirEntry.name )
+    except OSError as err:
+        errorMsgs.append( "ERROR JATreeBuildDir() Not able to read directory:|{0}|, error:|{1}|".format( dirName, err) )
+        entries = []
 
-    for 'compare' operation, it
-        Reads the environment spec file for the given subsystem
-        For Command type of object, executes commands to gather environment info and saves in temp file
-        For FileNames type of object, 
-            if checksum is to be compared, it computes the checksum, reads the saved checksum from a saveDir/<itemName>.checksum 
-                and compares the two checksums
-            else, compares current file to the file saved in saveDir/<itemName>
+    for dirEntry in entries:
+        if relDirName == '.':
+            relName = dirEntry.name
+        else:
+            relName = "{0}/{1}".format( relDirName, dirEntry.name )
+        try:
+            entryStat = dirEntry.stat( follow_symlinks=False )
+        except OSError as err:
+            errorMsgs.append( "ERROR JATreeBuildDir() Not able to stat:|{0}|, error:|{1}|".format( dirEntry.path, err) )
+            continue
+        entryMode = stat.S_IMODE( entryStat.st_mode )
+        entrySize = entryStat.st_size
+        if dirEntry.is_symlink():
+            entryType = 'l'
+            try:
+                entryDigest = "link:{0}".format( os.readlink( dirEntry.path ) )
+            except OSError as err:
+                errorMsgs.append( "ERROR JATreeBuildDir() Not able to read link:|{0}|, error:|{1}|".format( dirEntry.path, err) )
+                entryDigest = 'link:'
+        elif dirEntry.is_dir( follow_symlinks=False ):
+            entryType = 'd'
+            ### size of directory depends on file system, not used
+            entrySize = 0
+            entryDigest = JATreeBuildDir(
+                dirEntry.path, relName, treeNodes, previousNodes, checksumAlgorithm, errorMsgs )
+        elif dirEntry.is_file( follow_symlinks=False ):
+            entryType = 'f'
+            previousNode = previousNodes.get( relName )
+            if previousNode != None and previousNode[0] == 'f' and previousNode[2] == entrySize \
+                and previousNode[3] == entryStat.st_mtime_ns and previousNode[4].startswith( checksumAlgorithm + ':' ):
+                ### file not changed since previous tree was built, reuse the digest
+                entryDigest = previousNode[4]
+            else:
+                returnStatus, entryDigest, errorMsg = JAGlobalLib.JAComputeFileDigest( dirEntry.path, checksumAlgorithm )
+                if returnStatus == False:
+                    errorMsgs.append( errorMsg )
+        else:
+            entryType = 'o'
+            entryDigest = ''
 
+        treeNodes[relName] = ( entryType, entryMode, entrySize, entryStat.st_mtime_ns, entryDigest )
+        childLines.append( "{0}\t{1}\t{2:o}\t{3}\n".format( dirEntry.name, entryType, entryMode, entryDigest ) )
+
+    return "tree:{0}".format( hashlib.sha256( ''.join(childLines).encode() ).hexdigest() )
+
+def JATreeBuild( rootDirName:str, previousNodes:dict, checksumAlgorithm:str ):
     """
-    returnStatus = True
-    numberOfItems = 0
+    JATreeBuild( rootDirName:str, previousNodes:dict, checksumAlgorithm:str )
 
-    errorMsg = ''
+    Builds Merkle tree of rootDirName, node of rootDirName itself is stored with relative path '.'
+    Refer to JATreeBuildDir() for node details.
 
-    if debugLevel > 0:
-        JAGlobalLib.LogLine(
-            "DEBUG-1 JAOperationSaveCompare()  AppConfig:{0}, subsystem:{1}, version:{2}".format(
-                 baseConfigFileName, subsystem, version),
-            interactiveMode,
-            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    Returned values
+        returnStatus - True on success, False if rootDirName is not a directory
+        treeNodes - dictionary of nodes keyed by relative path
+        errorMsg - errors encountered while reading entries under the tree, one per line
+    """
+    import stat
+    treeNodes = {}
+    errorMsgs = []
+    try:
+        rootStat = os.stat( rootDirName )
+    except OSError as err:
+        return False, treeNodes, "ERROR JATreeBuild() Not able to stat directory:|{0}|, error:|{1}|".format( rootDirName, err)
+    if os.path.isdir( rootDirName ) == False:
+        return False, treeNodes, "ERROR JATreeBuild() Not a directory:|{0}|".format( rootDirName )
 
-    ### dictionary to hold object definitions
-    saveCompareParameters = defaultdict(dict)
+    rootDigest = JATreeBuildDir( rootDirName, '.', treeNodes, previousNodes, checksumAlgorithm, errorMsgs )
+    treeNodes['.'] = ( 'd', stat.S_IMODE( rootStat.st_mode ), 0, rootStat.st_mtime_ns, rootDigest )
+    return True, treeNodes, '\n'.join( errorMsgs )
 
-    ### read the object spec file contents
-    returnStatus, numberOfItems = JAReadConfigCompare( 
-        baseConfigFileName, 
-        subsystem, 
-        version, 
-        OSType,
-        outputFileHandle, colorIndex, HTMLBRTag, myColors,
-        interactiveMode, yamlModulePresent,
-        defaultParameters, debugLevel,
-        saveCompareParameters, allowedCommands, thisHostName )
-    if returnStatus == False:
-        ### fatal error, can't proceed.
-        return returnStatus, errorMsg
+def JATreeWrite( treeFileName:str, treeNodes:dict, checksumAlgorithm:str ):
+    """
+    JATreeWrite( treeFileName:str, treeNodes:dict, checksumAlgorithm:str )
 
-    if operation == 'backup':
-        ### first delete older backup directories, older than 'BackupRetencyDurationInDays'
-    
-        backupRetencyDurationInDays = defaultParameters['BackupRetencyDurationInDays']
+    Writes tree nodes to treeFileName, one node per line in the form
+        <type>\\t<mode in octal>\\t<size>\\t<mtime_ns>\\t<digest>\\t<relative path>
+    File is written to temporary file first and renamed.
 
-        if OSType == 'Windows':
-            ### get list of files older than retency period
-            filesToDelete = JAGlobalLib.JAFindModifiedFiles(
-                    '{0}/Backup*'.format(defaultParameters['LocalRepositoryHome']), 
-                    currentTime - (backupRetencyDurationInDays*3600*24), ### get files modified before this time
-                    debugLevel, thisHostName)
-            if len(filesToDelete) > 0:
-                for fileName in filesToDelete:
-                    if fileName != '' and fileName != None:
-                        try:
-                            os.remove(fileName)
-                            if debugLevel > 3:
-                                JAGlobalLib.LogLine(
-                                    "DEBUG-4 JAOperationSaveCompare() Deleting the file:{0}".format(fileName), 
-                                    interactiveMode,
-                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    Returned values
+        returnStatus - True on success, False on failure
+        errorMsg
+    """
+    tempTreeFileName = "{0}.{1}.tmp".format( treeFileName, os.getpid())
+    try:
+        with open( tempTreeFileName, "w") as file:
+            file.write( "{0} {1}\n".format( JATreeFileHeader, checksumAlgorithm) )
+            for relName in sorted( treeNodes ):
+                node = treeNodes[relName]
+                file.write( "{0}\t{1:o}\t{2}\t{3}\t{4}\t{5}\n".format( node[0], node[1], node[2], node[3], node[4], relName ) )
+            file.close()
+        os.replace( tempTreeFileName, treeFileName )
+    except OSError as err:
+        if os.path.exists( tempTreeFileName ):
+            os.remove( tempTreeFileName )
+        return False, "ERROR JATreeWrite() Not able to write tree file:|{0}|, error:|{1}|".format( treeFileName, err)
+    return True, ''
 
-                        except OSError as err:
-                            JAGlobalLib.LogLine(
-                                "ERROR JAOperationSaveCompare() Error deleting old backup file:{0}, errorMsg:{1}".format(fileName, err), 
-                                interactiveMode,
-                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                        
-        else:
-            # delete directories older than retency period
-            command = 'find {0} -name "Backup*" -mtime +{1} -type d'.format(
-                defaultParameters['LocalRepositoryHome'], backupRetencyDurationInDays)
-            if debugLevel > 1:
-                JAGlobalLib.LogLine(
-                    "DEBUG-2 JAOperationSaveCompare() purging files with command:{0}".format(command), 
-                    interactiveMode,
-                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+def JATreeRead( treeFileName:str ):
+    """
+    JATreeRead( treeFileName:str )
 
-            returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
-                    defaultParameters['CommandShell'],
-                    command, debugLevel, OSType)
-            if returnResult == False:
-                if errorMsg != '':
-                    if re.match(r'File not found', errorMsg) != True:
-                        JAGlobalLib.LogLine(
-                            "INFO JAOperationSaveCompare() File not found, Error deleting backup directory:{0} older than:{1}".format(
-                                returnOutput, backupRetencyDurationInDays), 
-                            interactiveMode,
-                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-            else:
-                if len(returnOutput) > 0:                    
-                    for fileName in returnOutput:
-                        if len(fileName) > 0:
-                            try:
-                                shutil.rmtree(fileName)
-                                if debugLevel > 3:
-                                    JAGlobalLib.LogLine(
-                                        "DEBUG-4 JAOperationSaveCompare() Deleting the directory:{0}".format(fileName), 
-                                        interactiveMode,
-                                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    Reads tree nodes written by JATreeWrite()
 
-                            except OSError as err:
-                                JAGlobalLib.LogLine(
-                                    "ERROR JAOperationSaveCompare() Error deleting backup directory:{0} older than:{1} days, errorMsg:{2}".format(
-                                        fileName, backupRetencyDurationInDays, err), 
-                                    interactiveMode,
-                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    Returned values
+        returnStatus - True on success, False on failure
+        treeNodes - dictionary of nodes keyed by relative path
+        checksumAlgorithm - algorithm used for file digests
+        errorMsg
+    """
+    treeNodes = {}
+    checksumAlgorithm = JAGlobalLib.JAChecksumDefaultAlgorithm
+    try:
+        with open( treeFileName, "r") as file:
+            for line in file:
+                line = line.rstrip('\n')
+                if line.startswith( JATreeFileHeader ):
+                    checksumAlgorithm = line[len(JATreeFileHeader):].strip()
+                    continue
+                nodeParts = line.split( '\t', 5 )
+                if len(nodeParts) != 6:
+                    continue
+                treeNodes[nodeParts[5]] = (
+                    nodeParts[0], int(nodeParts[1], 8), int(nodeParts[2]), int(nodeParts[3]), nodeParts[4] )
+            file.close()
+    except (OSError, ValueError) as err:
+        return False, treeNodes, checksumAlgorithm, "ERROR JATreeRead() Not able to read tree file:|{0}|, error:|{1}|".format(
+            treeFileName, err)
+    return True, treeNodes, checksumAlgorithm, ''
+
+def JATreeCollect( relName:str, treeChildren:dict, names:list ):
+    """
+    JATreeCollect( relName:str, treeChildren:dict, names:list )
 
-        ### derive the saveDir using current time in the form BackupYYYYMMDD
-        defaultParameters['SaveDir'] = saveDir = "{0}/Backup{1}".format( 
-            defaultParameters['LocalRepositoryHome'],
-            JAGlobalLib.UTCDateForFileName() )
+    Appends relName and relative path of all entries under it to names
+    """
+    pendingNames = [relName]
+    while len(pendingNames) > 0:
+        tempName = pendingNames.pop()
+        names.append( tempName )
+        pendingNames.extend( treeChildren.get( tempName, [] ) )
 
-    elif re.search(r'save|compare', operation) :
-        saveDir = defaultParameters['SaveDir']
+def JATreeCompare( currentNodes:dict, previousNodes:dict ):
+    """
+    JATreeCompare( currentNodes:dict, previousNodes:dict )
 
-    if os.path.exists(saveDir) :
-        if operation == "save":
-            ### if saveDir present and it starts with 'Pre', skip save operation
-            tempBaseFileName = os.path.basename(saveDir)
-            if re.match(r'^Pre', tempBaseFileName):
-                JAGlobalLib.LogLine(
+    Compares two trees starting from root, sub-tree whose directory digest did not change is not traversed.
+
+    Returned values
+        addedNames - relative path of entries present in current tree only
+        removedNames - relative path of entries present in previous tree only
+        modifiedNames - relative path of entries whose type, mode or digest changed
+    """
+    addedNames = []
+    removedNames = []
+    modifiedNames = []
+
+    ### index of entries under each directory
+    currentChildren = defaultdict(list)
+    previousChildren = defaultdict(list)
+    for treeNodes, treeChildren in ( (currentNodes, currentChildren), (previousNodes, previousChildren) ):
+        for relName in treeNodes:
+            if relName != '.':
+                parentName = relName.rpartition('/')[0]
+                if parentName == '':
+                    parentName = '.'
+                treeChildren[parentName].append( relName )
+
+    if '.' not in currentNodes or '.' not in previousNodes:
+        return addedNames, removedNames, modifiedNames
+
+    pendingNames = ['.']
+    while len(pendingNames) > 0:
+        relName = pendingNames.pop()
+        currentNode = currentNodes[relName]
+        previousNode = previousNodes[relName]
+        if currentNode[0] != previousNode[0]:
+            ### type changed, like file replaced by directory
+            JATreeCollect( relName, previousChildren, removedNames )
+            JATreeCollect( relName, currentChildren, addedNames )
+            continue
+        if currentNode[1] != previousNode[1]:
+            modifiedNames.append( relName )
+        if currentNode[4] == previousNode[4]:
+            ### same content, for directory, entries under it are same, skip sub-tree
+            continue
+        if currentNode[0] != 'd':
+            if currentNode[1] == previousNode[1]:
+                modifiedNames.append( relName )
+            continue
+
+        currentNames = set( currentChildren.get( relName, [] ) )
+        previousNames = set( previousChildren.get( relName, [] ) )
+        for childName in currentNames - previousNames:
+            JATreeCollect( childName, currentChildren, addedNames )
+        for childName in previousNames - currentNames:
+            JATreeCollect( childName, previousChildren, removedNames )
+        pendingNames.extend( currentNames & previousNames )
+
+    return sorted(addedNames), sorted(removedNames), sorted(modifiedNames)
+
+### attributes of file captured for CompareType metadata, in the order stored in metadata file
+JAMetadataAttributes = ['Type', 'Mode', 'UID', 'GID', 'Size', 'MTime', 'LinkTarget']
+JAMetadataFileHeader = '#JAAuditMetadata'
+
+def JAMetadataDeriveFileName( baseConfigFileName:str, subsystem:str ):
+    """
+    JAMetadataDeriveFileName( baseConfigFileName:str, subsystem:str )
+
+    Returns metadata file name in the form <baseConfigFileName>.<subsystem>.metadata
+    """
+    return "{0}.{1}.metadata".format( baseConfigFileName, subsystem )
+
+def JAMetadataCollect( itemFileNames:dict ):
+    """
+    JAMetadataCollect( itemFileNames:dict )
+
+    Captures metadata of files using single lstat() call per file, symbolic link is not followed.
+    Parameters passed:
+        itemFileNames - dictionary of file names keyed by itemName
+
+    Returned values
+        itemsMetadata - dictionary keyed by itemName, value is dictionary with keys in JAMetadataAttributes
+            Type - f for file, d for directory, l for symbolic link, o for other types, missing if file is not present
+            Mode - permissions including setuid, setgid and sticky bits in octal
+            LinkTarget - target of symbolic link, '' for others
+    """
+    import stat
+    itemsMetadata = {}
+    for itemName, fileName in itemFileNames.items():
+        try:
+            fileStat = os.lstat( fileName )
+        except OSError:
+            itemsMetadata[itemName] = { 'Type': 'missing', 'Mode': '', 'UID': '', 'GID': '', 'Size': '', 'MTime': '', 'LinkTarget': '' }
+            continue
+        linkTarget = ''
+        if stat.S_ISLNK( fileStat.st_mode ):
+            fileType = 'l'
+            try:
+                linkTarget = os.readlink( fileName )
+            except OSError:
+                linkTarget = ''
+        elif stat.S_ISDIR( fileStat.st_mode ):
+            fileType = 'd'
+        elif stat.S_ISREG( fileStat.st_mode ):
+            fileType = 'f'
+        else:
+            fileType = 'o'
+        itemsMetadata[itemName] = {
+            'Type': fileType,
+            'Mode': "{0:o}".format( stat.S_IMODE( fileStat.st_mode ) ),
+            'UID': str( fileStat.st_uid ),
+            'GID': str( fileStat.st_gid ),
+            ### size of directory depends on file system, not compared
+            'Size': str( fileStat.st_size ) if fileType != 'd' else '0',
+            'MTime': str( fileStat.st_mtime_ns ),
+            'LinkTarget': linkTarget }
+    return itemsMetadata
+
+def JAMetadataWrite( metadataFileName:str, itemsMetadata:dict ):
+    """
+    JAMetadataWrite( metadataFileName:str, itemsMetadata:dict )
+
+    Writes metadata of all items to metadataFileName, one item per line in the form
+        <itemName>\t<Type>\t<Mode>\t<UID>\t<GID>\t<Size>\t<MTime>\t<LinkTarget>
+    File is written to temporary file first and renamed.
+
+    Returned values
+        returnStatus - True on success, False on failure
+        errorMsg
+    """
+    tempMetadataFileName = "{0}.{1}.tmp".format( metadataFileName, os.getpid())
+    try:
+        with open( tempMetadataFileName, "w") as file:
+            file.write( "{0}\n".format( JAMetadataFileHeader ) )
+            for itemName in sorted( itemsMetadata ):
+                file.write( "{0}\t{1}\n".format( 
+                    itemName, '\t'.join( [ itemsMetadata[itemName][attribute] for attribute in JAMetadataAttributes ] ) ) )
+            file.close()
+        os.replace( tempMetadataFileName, metadataFileName )
+    except OSError as err:
+        if os.path.exists( tempMetadataFileName ):
+            os.remove( tempMetadataFileName )
+        return False, "ERROR JAMetadataWrite() Not able to write metadata file:|{0}|, error:|{1}|".format( metadataFileName, err)
+    return True, ''
+
+def JAMetadataRead( metadataFileName:str ):
+    """
+    JAMetadataRead( metadataFileName:str )
+
+    Reads metadata written by JAMetadataWrite()
+
+    Returned values
+        returnStatus - True on success, False on failure
+        itemsMetadata - dictionary keyed by itemName, value is dictionary with keys in JAMetadataAttributes
+        errorMsg
+    """
+    itemsMetadata = {}
+    try:
+        with open( metadataFileName, "r") as file:
+            for line in file:
+                line = line.rstrip('\n')
+                if line.startswith( JAMetadataFileHeader ):
+                    continue
+                lineParts = line.split( '\t' )
+                if len(lineParts) != len(JAMetadataAttributes) + 1:
+                    continue
+                itemsMetadata[lineParts[0]] = dict( zip( JAMetadataAttributes, lineParts[1:] ) )
+            file.close()
+    except OSError as err:
+        return False, itemsMetadata, "ERROR JAMetadataRead() Not able to read metadata file:|{0}|, error:|{1}|".format(
+            metadataFileName, err)
+    return True, itemsMetadata, ''
+
+def JAMetadataCompare( currentMetadata:dict, previousMetadata:dict, compareH2H:bool ):
+    """
+    JAMetadataCompare( currentMetadata:dict, previousMetadata:dict, compareH2H:bool )
+
+    Compares metadata of an item attribute by attribute.
+    While doing host to host compare, MTime is not compared.
+
+    Returned values
+        changedAttributes - list of (attribute, current value, previous value), empty list if metadata is same
+    """
+    changedAttributes = []
+    for attribute in JAMetadataAttributes:
+        if compareH2H == True and attribute == 'MTime':
+            continue
+        if currentMetadata.get(attribute) != previousMetadata.get(attribute):
+            changedAttributes.append( (attribute, currentMetadata.get(attribute), previousMetadata.get(attribute)) )
+    return changedAttributes
+
+### file name extensions of structured files, used when CompareType is structured
+###   .conf is used by many formats (nginx, sshd...), StructuredFormat needs to be specified for those
+JAStructuredFormats = {
+    '.json': 'json',
+    '.yml': 'yaml', '.yaml': 'yaml',
+    '.properties': 'properties',
+    '.ini': 'ini', '.cfg': 'ini' }
+JAStructuredKeysFileHeader = '#JAAuditKeys'
+
+def JAStructuredGetFormat( fileName:str, structuredFormat=None ):
+    """
+    JAStructuredGetFormat( fileName:str, structuredFormat=None )
+
+    Returns structuredFormat if specified, else format of structured file based on file name extension - json, yaml, properties, ini
+    Returns None if extension is not known
+    """
+    if structuredFormat != None:
+        return structuredFormat
+    fileExtension = os.path.splitext( fileName )[1].lower()
+    return JAStructuredFormats.get( fileExtension )
+
+def JAStructuredFlatten( data, keyPath:str, keyValues:dict ):
+    """
+    JAStructuredFlatten( data, keyPath:str, keyValues:dict )
+
+    Flattens nested dictionary and list into key paths like a.b[0].c, stores value in keyValues[keyPath]
+    Values are stored in string form, order of keys in dictionary does not matter.
+    """
+    if isinstance( data, dict ):
+        if len(data) == 0 and keyPath != '':
+            keyValues[keyPath] = '{}'
+        for key, value in data.items():
+            if keyPath == '':
+                JAStructuredFlatten( value, "{0}".format(key), keyValues )
+            else:
+                JAStructuredFlatten( value, "{0}.{1}".format(keyPath, key), keyValues )
+    elif isinstance( data, list ):
+        if len(data) == 0:
+            keyValues[keyPath] = '[]'
+        for index, value in enumerate( data ):
+            JAStructuredFlatten( value, "{0}[{1}]".format(keyPath, index), keyValues )
+    else:
+        keyValues[keyPath] = "{0}".format( data )
+
+def JAStructuredParseFile( fileName:str, fileFormat:str, yamlModulePresent:bool ):
+    """
+    JAStructuredParseFile( fileName:str, fileFormat:str, yamlModulePresent:bool )
+
+    Parses the file in given format - json, yaml, properties or ini, and returns flattened key paths
+        For ini, key path is <section>.<key>
+        For properties, key path is the property name, continuation lines ending with \\ are joined
+
+    Returned values
+        returnStatus - True on success, False on parse error
+        keyValues - dictionary of values keyed by key path
+        errorMsg
+    """
+    keyValues = {}
+    try:
+        if fileFormat == 'json':
+            import json
+            with open( fileName, "r") as file:
+                data = json.load( file )
+                file.close()
+            JAStructuredFlatten( data, '', keyValues )
+
+        elif fileFormat == 'yaml':
+            if yamlModulePresent == True:
+                import yaml
+                with open( fileName, "r") as file:
+                    data = yaml.load( file, Loader=yaml.SafeLoader )
+                    file.close()
+            else:
+                data = JAGlobalLib.JAYamlLoad( fileName )
+            JAStructuredFlatten( data, '', keyValues )
+
+        elif fileFormat == 'ini':
+            import configparser
+            iniParser = configparser.ConfigParser( interpolation=None, strict=False )
+            ### keep case of keys
+            iniParser.optionxform = str
+            with open( fileName, "r") as file:
+                iniParser.read_file( file )
+                file.close()
+            for sectionName in [iniParser.default_section] + iniParser.sections():
+                for key, value in iniParser[sectionName].items():
+                    keyValues["{0}.{1}".format( sectionName, key )] = value
+
+        elif fileFormat == 'properties':
+            with open( fileName, "r") as file:
+                logicalLine = ''
+                for line in file:
+                    line = line.strip()
+                    if logicalLine == '' and ( line == '' or line.startswith('#') or line.startswith('!') ):
+                        continue
+                    if line.endswith('\\') and not line.endswith('\\\\'):
+                        logicalLine += line[:-1]
+                        continue
+                    logicalLine += line
+                    propertyParts = re.split( r'\s*[=:]\s*|\s+', logicalLine, maxsplit=1 )
+                    keyValues[propertyParts[0]] = propertyParts[1] if len(propertyParts) > 1 else ''
+                    logicalLine = ''
+                file.close()
+        else:
+            return False, keyValues, "ERROR JAStructuredParseFile() Unknown format:|{0}| of file:|{1}|".format( fileFormat, fileName )
+
+    except Exception as err:
+        return False, keyValues, "ERROR JAStructuredParseFile() Not able to parse file:|{0}| as {1}, error:|{2}|".format(
+            fileName, fileFormat, err )
+
+    return True, keyValues, ''
+
+def JAStructuredGetKeys( fileName:str, fileDigest:str, fileFormat:str, keysFileName:str, yamlModulePresent:bool ):
+    """
+    JAStructuredGetKeys( fileName:str, fileDigest:str, fileFormat:str, keysFileName:str, yamlModulePresent:bool )
+
+    Returns flattened key paths of the file.
+    If keysFileName was written before for the same content (same fileDigest), key paths are read from it
+        without parsing the file, else the file is parsed and keysFileName is written with fileDigest.
+    Pass keysFileName as None to skip the cache.
+
+    Returned values
+        returnStatus - True on success, False on parse error
+        keyValues - dictionary of values keyed by key path
+        errorMsg
+    """
+    import json
+    if keysFileName != None and os.path.exists( keysFileName ):
+        try:
+            with open( keysFileName, "r") as file:
+                if file.readline().strip() == "{0} {1}".format( JAStructuredKeysFileHeader, fileDigest ):
+                    keyValues = json.load( file )
+                    file.close()
+                    return True, keyValues, ''
+                file.close()
+        except (OSError, ValueError):
+            pass
+
+    returnStatus, keyValues, errorMsg = JAStructuredParseFile( fileName, fileFormat, yamlModulePresent )
+    if returnStatus == True and keysFileName != None:
+        try:
+            with open( keysFileName, "w") as file:
+                file.write( "{0} {1}\n".format( JAStructuredKeysFileHeader, fileDigest ) )
+                json.dump( keyValues, file, sort_keys=True, indent=0 )
+                file.close()
+        except OSError:
+            ### cache is optimization only, ignore write error
+            pass
+    return returnStatus, keyValues, errorMsg
+
+def JAStructuredCompare( currentKeyValues:dict, previousKeyValues:dict, ignoreKeys ):
+    """
+    JAStructuredCompare( currentKeyValues:dict, previousKeyValues:dict, ignoreKeys )
+
+    Compares key paths of two files.
+    ignoreKeys - list of key path patterns in shell wildcard form like 'server.*.host' or 'logging.level'
+        keys matching any of these patterns are not compared
+
+    Returned values
+        addedKeys - list of (key path, current value)
+        removedKeys - list of (key path, previous value)
+        changedKeys - list of (key path, current value, previous value)
+    """
+    import fnmatch
+    if ignoreKeys == None:
+        ignoreKeys = []
+    elif isinstance( ignoreKeys, str ):
+        ignoreKeys = [ keyPattern.strip() for keyPattern in ignoreKeys.split(',') ]
+
+    addedKeys = []
+    removedKeys = []
+    changedKeys = []
+    for keyPath in sorted( set(currentKeyValues) | set(previousKeyValues) ):
+        ignoreKey = False
+        for keyPattern in ignoreKeys:
+            if fnmatch.fnmatchcase( keyPath, keyPattern ):
+                ignoreKey = True
+                break
+        if ignoreKey == True:
+            continue
+        if keyPath not in previousKeyValues:
+            addedKeys.append( (keyPath, currentKeyValues[keyPath]) )
+        elif keyPath not in currentKeyValues:
+            removedKeys.append( (keyPath, previousKeyValues[keyPath]) )
+        elif currentKeyValues[keyPath] != previousKeyValues[keyPath]:
+            changedKeys.append( (keyPath, currentKeyValues[keyPath], previousKeyValues[keyPath]) )
+    return addedKeys, removedKeys, changedKeys
+
+### file name of manifest written in each BackupYYYYMMDD directory when backup object store is enabled
+###  each line is in the form <itemName>: <algorithm>:<hexdigest>
+JABackupManifestFileName = 'JAAudit.backup.manifest'
+### errors returned by os.link() when hardlink is not possible, file is copied instead
+###   cross device link, not permitted, not supported by file system, too many links
+JABackupStoreLinkErrors = ( errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EMLINK )
+
+def JABackupStoreDeriveBlobFileName( objectStoreDir:str, fileDigest:str ):
+    """
+    JABackupStoreDeriveBlobFileName( objectStoreDir:str, fileDigest:str )
+
+    Returns blob file name in the form <objectStoreDir>/<algorithm>/<first two chars of hexdigest>/<hexdigest>
+    """
+    checksumAlgorithm, hexDigest = JAGlobalLib.JAParseChecksum( fileDigest )
+    return "{0}/{1}/{2}/{3}".format( objectStoreDir, checksumAlgorithm, hexDigest[:2], hexDigest)
+
+def JABackupStoreSaveFile( 
+    sourceFileName:str, saveFileName:str, objectStoreDir:str, checksumAlgorithm:str, sourceIsSaveFile:bool ):
+    """
+    JABackupStoreSaveFile( 
+        sourceFileName:str, saveFileName:str, objectStoreDir:str, checksumAlgorithm:str, sourceIsSaveFile:bool )
+
+    Saves the file content in content addressed object store and hardlinks saveFileName to the blob.
+    If blob with same checksum is already present (file not changed since prior backup), 
+        file is not copied again, saveFileName is hardlinked to existing blob.
+    If hardlink is not supported (different file system or file system not supporting hardlinks),
+        file is copied to saveFileName as is.
+
+    Parameters passed:
+        sourceFileName - file to save
+        saveFileName - file name under BackupYYYYMMDD directory
+        objectStoreDir - path of object store
+        checksumAlgorithm - refer to JAGlobalLib.JAChecksumAlgorithms
+        sourceIsSaveFile - True if sourceFileName is already written under BackupYYYYMMDD directory like command output
+
+    Returned values
+        returnStatus - True on success, False on failure
+        fileDigest - checksum in the form <algorithm>:<hexdigest>, used in manifest file
+        errorMsg
+    """
+    returnStatus, fileDigest, errorMsg = JAGlobalLib.JAComputeFileDigest( sourceFileName, checksumAlgorithm )
+    if returnStatus == False:
+        return returnStatus, fileDigest, errorMsg
+
+    blobFileName = JABackupStoreDeriveBlobFileName( objectStoreDir, fileDigest )
+    try:
+        if os.path.exists( blobFileName ) == False:
+            os.makedirs( os.path.dirname(blobFileName), exist_ok=True)
+            if sourceIsSaveFile == False:
+                ### saveFileName may be a hardlink to a blob from prior run, unlink it before writing
+                if os.path.exists( saveFileName ):
+                    os.remove( saveFileName )
+                shutil.copy2( sourceFileName, saveFileName)
+            ### add saved file to object store, write to temp file and rename so that
+            ###   partially written blob is not seen by other threads
+            ###   temp file name is unique per thread, objects with same content may be saved by two threads at the same time
+            tempBlobFileName = "{0}.{1}.{2}.tmp".format( blobFileName, os.getpid(), threading.get_ident())
+            try:
+                os.link( saveFileName, tempBlobFileName)
+            except OSError as err:
+                if err.errno not in JABackupStoreLinkErrors:
+                    raise
+                ### hardlink not supported, keep the saved file as is
+                return True, fileDigest, ''
+            os.replace( tempBlobFileName, blobFileName )
+        else:
+            ### content is already present in object store, link to it
+            if os.path.exists( saveFileName ):
+                os.remove( saveFileName )
+            try:
+                os.link( blobFileName, saveFileName )
+            except OSError as err:
+                if err.errno not in JABackupStoreLinkErrors:
+                    raise
+                shutil.copy2( blobFileName if sourceIsSaveFile == True else sourceFileName, saveFileName)
+
+    except OSError as err:
+        errorMsg = "ERROR JABackupStoreSaveFile() Not able to save file:|{0}| to object store:|{1}|, error:|{2}|".format(
+            sourceFileName, objectStoreDir, err)
+        returnStatus = False
+
+    return returnStatus, fileDigest, errorMsg
+
+def JABackupStoreWriteManifest( saveDir:str, itemDigests:dict ):
+    """
+    JABackupStoreWriteManifest( saveDir:str, itemDigests:dict )
+
+    Writes manifest file under saveDir in the form <itemName>: <algorithm>:<hexdigest>
+    Items are written in the order present in itemDigests so that manifest contents are deterministic.
+
+    Returns True on success, False on failure along with errorMsg
+    """
+    manifestFileName = "{0}/{1}".format( saveDir, JABackupManifestFileName)
+    try:
+        with open( manifestFileName, "w") as file:
+            for itemName, fileDigest in itemDigests.items():
+                file.write("{0}: {1}\n".format( itemName, fileDigest))
+            file.close()
+    except OSError as err:
+        return False, "ERROR JABackupStoreWriteManifest() Not able to write manifest file:|{0}|, error:|{1}|".format(
+            manifestFileName, err)
+    return True, ''
+
+def JABackupStoreGarbageCollect( 
+    localRepositoryHome:str, objectStoreDir:str, 
+    interactiveMode, debugLevel, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ):
+    """
+    JABackupStoreGarbageCollect( 
+        localRepositoryHome:str, objectStoreDir:str, 
+        interactiveMode, debugLevel, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+    Call this after deleting backup directories older than 'BackupRetencyDurationInDays'.
+    Reads manifests of remaining BackupYYYYMMDD directories, deletes blobs from object store that are 
+        not referenced by any manifest.
+
+    Returned values
+        numberOfBlobsDeleted, numberOfBlobsKept
+    """
+    numberOfBlobsDeleted = numberOfBlobsKept = 0
+    if os.path.isdir( objectStoreDir ) == False:
+        return numberOfBlobsDeleted, numberOfBlobsKept
+
+    ### gather blob names referenced by backups within retency period
+    referencedBlobs = {}
+    for backupDirEntry in os.scandir( localRepositoryHome ):
+        if backupDirEntry.is_dir() == False or re.match(r'^Backup', backupDirEntry.name) == None:
+            continue
+        manifestFileName = "{0}/{1}".format( backupDirEntry.path, JABackupManifestFileName)
+        if os.path.exists( manifestFileName ) == False:
+            continue
+        try:
+            with open( manifestFileName, "r") as file:
+                for line in file:
+                    tempValues = line.strip().split(': ', 1)
+                    if len(tempValues) == 2 and tempValues[1] != '':
+                        referencedBlobs[ JABackupStoreDeriveBlobFileName( objectStoreDir, tempValues[1]) ] = True
+                file.close()
+        except OSError as err:
+            ### can't determine what is referenced, skip garbage collection
+            JAGlobalLib.LogLine(
+                "ERROR JABackupStoreGarbageCollect() Not able to read manifest file:|{0}|, error:|{1}|, skipped garbage collection".format(
+                    manifestFileName, err), 
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            return numberOfBlobsDeleted, numberOfBlobsKept
+
+    ### object store layout is <objectStoreDir>/<algorithm>/<xx>/<hexdigest>
+    for algorithmDirEntry in os.scandir( objectStoreDir ):
+        if algorithmDirEntry.is_dir() == False:
+            continue
+        for prefixDirEntry in os.scandir( algorithmDirEntry.path ):
+            if prefixDirEntry.is_dir() == False:
+                continue
+            for blobEntry in os.scandir( prefixDirEntry.path ):
+                blobFileName = "{0}/{1}/{2}/{3}".format( 
+                    objectStoreDir, algorithmDirEntry.name, prefixDirEntry.name, blobEntry.name)
+                if blobFileName in referencedBlobs:
+                    numberOfBlobsKept += 1
+                    continue
+                try:
+                    os.remove( blobEntry.path )
+                    numberOfBlobsDeleted += 1
+                    if debugLevel > 3:
+                        JAGlobalLib.LogLine(
+                            "DEBUG-4 JABackupStoreGarbageCollect() Deleted unreferenced blob:{0}".format(blobEntry.path), 
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                except OSError as err:
+                    JAGlobalLib.LogLine(
+                        "ERROR JABackupStoreGarbageCollect() Error deleting blob:{0}, errorMsg:{1}".format(blobEntry.path, err), 
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    if debugLevel > 0:
+        JAGlobalLib.LogLine(
+            "DEBUG-1 JABackupStoreGarbageCollect() object store:{0}, deleted blobs:{1}, blobs in use:{2}".format(
+                objectStoreDir, numberOfBlobsDeleted, numberOfBlobsKept), 
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    return numberOfBlobsDeleted, numberOfBlobsKept
+
+def JAOperationSaveItem(
+    itemName, objectAttributes, saveDir, objectStoreDir,
+    defaultParameters, interactiveMode, debugLevel,
+    myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ):
+    """
+    JAOperationSaveItem(
+        itemName, objectAttributes, saveDir, objectStoreDir,
+        defaultParameters, interactiveMode, debugLevel,
+        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+    This function saves one object for 'save' and 'backup' operations. 
+    It is called from thread pool of JAOperationSaveCompare(), thus, it does not update any shared data.
+        For Command type of object, executes command and saves the output in saveDir/<itemName>
+            if InputFingerprint is specified, fingerprint of inputs is saved in saveDir/<itemName>.fingerprint
+        For FileNames type of object, 
+            if checksum is to be stored, it computes the checksum and stores it in saveDir/<itemName>.checksum
+            if CompareType is tree, it stores Merkle tree of the directory in saveDir/<itemName>.tree
+            if CompareType is metadata, nothing is done here, caller saves metadata of all such objects in single file
+            else, copies the contents of the file to saveDir/<itemName>
+    If objectStoreDir is not None (backup operation with 'BackupObjectStore' enabled), 
+        command output and file contents are stored in object store and hardlinked to saveDir/<itemName>
+
+    Returned values
+        itemCounters - dictionary with keys Errors, ComparePatternsNotMatched, CommandOutputSaved, ChecksumsSaved, FilesSaved, TreesSaved
+            and Digest - checksum of content saved in object store, '' if object store is not used
+    """
+    itemCounters = {
+        'Errors': 0, 'ComparePatternsNotMatched': 0, 
+        'CommandOutputSaved': 0, 'ChecksumsSaved': 0, 'FilesSaved': 0, 'TreesSaved': 0, 'Digest': '' }
+
+    if debugLevel > 1:
+        JAGlobalLib.LogLine(
+            "DEBUG-2 JAOperationSaveItem() processing itemName:|{0}|, Command:|{1}|, FileNames:|{2}|, CompareType:|{3}|, ComparePatterns:|{4}|, IgnorePatterns:|{5}|, SkipH2H:|{6}|".format(
+                itemName,
+                objectAttributes['Command'],
+                objectAttributes['FileNames'],
+                objectAttributes['CompareType'],
+                objectAttributes['ComparePatterns'],
+                objectAttributes['IgnorePatterns'],
+                objectAttributes['SkipH2H'] ), 
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    ### need to save the output of command with object name in save directory
+    ### 'Command' takes precedence over FileNames if present
+    if objectAttributes['Command'] != None:
+        saveFileName = "{0}/{1}".format(saveDir,itemName) 
+        tempCommand = '{0} > {1}'.format( 
+            objectAttributes['Command'],
+            saveFileName)
+
+        ### expand any environment variables used in that command
+        tempCommand = os.path.expandvars(tempCommand)
+
+        inputFingerprint = ''
+        if objectAttributes.get('InputFingerprint') != None or objectAttributes.get('InputProbe') != None:
+            ### compute fingerprint of inputs before executing the command so that 
+            ###   any change to inputs while the command is running is seen by next compare
+            returnStatus, inputFingerprint, errorMsg = JAInputFingerprintCompute(
+                objectAttributes['InputFingerprint'], objectAttributes.get('InputProbe'), defaultParameters['CommandShell'], debugLevel, OSType)
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    "WARN JAOperationSaveItem() {0}, input fingerprint not saved for itemName:|{1}|".format(errorMsg, itemName), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            ### remove fingerprint saved before, it is written again after saving the command output
+            if os.path.exists( JAInputFingerprintDeriveFileName(saveDir, itemName) ):
+                os.remove( JAInputFingerprintDeriveFileName(saveDir, itemName) )
+
+        if objectStoreDir != None and os.path.exists( saveFileName ):
+            ### saveFileName may be a hardlink to a blob from prior run, 
+            ###   unlink it so that output redirection does not overwrite the blob
+            try:
+                os.remove( saveFileName )
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Not able to remove prior save file:|{0}|, error:|{1}|".format(
+                        saveFileName, err), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                return itemCounters
+
+        if debugLevel > 1:
+            JAGlobalLib.LogLine(
+                "DEBUG-2 JAOperationSaveItem() saving object:|{0}| with command:|{1}|".format(
+                    saveFileName, tempCommand),
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+        ### now execute the command to save the environment
+        returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+            defaultParameters['CommandShell'],
+            tempCommand, debugLevel, OSType)
+        if returnResult == False:
+            itemCounters['Errors'] += 1
+            if re.match(r'File not found', errorMsg) != True:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() File not found, error saving environment by executing command:|{0}|, error:|{1}|".format(
+                            tempCommand, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            else:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Error executing command:|{0}|, error:|{1}|".format(
+                            tempCommand, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            return itemCounters
+
+        itemCounters['CommandOutputSaved'] += 1
+
+        if inputFingerprint != '':
+            try:
+                with open( JAInputFingerprintDeriveFileName(saveDir, itemName), "w") as file:
+                    file.write( inputFingerprint )
+                    file.close()
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Not able to save input fingerprint of itemName:|{0}|, error:|{1}|".format(
+                        itemName, err), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+
+        if objectStoreDir != None:
+            ### move command output to object store, hardlink to existing blob if output did not change
+            returnStatus, itemCounters['Digest'], errorMsg = JABackupStoreSaveFile(
+                saveFileName, saveFileName, objectStoreDir, defaultParameters['ChecksumAlgorithm'], True)
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    elif objectAttributes['FileNames'] != None:
+        referenceFileName = objectAttributes['FileNames']
+        if objectAttributes['CompareType'] == 'metadata':
+            ### metadata of all objects is captured in one pass and saved by JAOperationSaveCompare()
+            return itemCounters
+
+        elif objectAttributes['CompareType'] == 'tree':
+            ### if CompareType is tree, save Merkle tree of the directory with .tree as part of file name
+            saveFileName = '{0}/{1}.tree'.format( saveDir, itemName)
+
+            ### reuse digests of files not changed since prior save
+            previousNodes = {}
+            if os.path.exists( saveFileName ):
+                returnStatus, previousNodes, checksumAlgorithm, errorMsg = JATreeRead( saveFileName )
+                if checksumAlgorithm != defaultParameters['ChecksumAlgorithm']:
+                    previousNodes = {}
+
+            returnStatus, treeNodes, errorMsg = JATreeBuild( 
+                referenceFileName, previousNodes, defaultParameters['ChecksumAlgorithm'] )
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                return itemCounters
+            if errorMsg != '':
+                ### some entries under the tree could not be read, save the tree with remaining entries
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+
+            returnStatus, errorMsg = JATreeWrite( saveFileName, treeNodes, defaultParameters['ChecksumAlgorithm'] )
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+            else:
+                itemCounters['TreesSaved'] += 1
+            ### tree file is not searched for compare patterns
+            return itemCounters
+
+        elif objectAttributes['CompareType'] == 'checksum':
+            ### if CompareType is checksum, save checksum with .checksum as part of file name
+            saveFileName = '{0}/{1}.checksum'.format( saveDir, itemName)
+
+            ### compute checksum and store it in fileName ending with .checksum
+            returnStatus, currentFileDigest, errorMsg = JAGlobalLib.JAComputeFileDigest(
+                referenceFileName, defaultParameters['ChecksumAlgorithm'])
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Not able to compute checksum of reference file:|{0}|, {1}".format(
+                        referenceFileName, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                return itemCounters
+
+            ### save current checksum computed in save file name
+            ###   checksum is saved with algorithm tag like sha256:<hexdigest>
+            try:
+                with open(saveFileName,"w") as file:
+                    file.write(currentFileDigest)
+                    file.close()
+                    itemCounters['ChecksumsSaved'] += 1
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Not able to save checksum in the file:|{0}|".format(saveFileName), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+            ### checksum file is not searched for compare patterns
+            return itemCounters
+
+        ### if CompareType is not checksum, copy the file to save directory
+        saveFileName = '{0}/{1}'.format( saveDir, itemName)
+        if objectStoreDir != None:
+            ### copy file content to object store only if not present already, hardlink to blob
+            returnStatus, itemCounters['Digest'], errorMsg = JABackupStoreSaveFile(
+                referenceFileName, saveFileName, objectStoreDir, defaultParameters['ChecksumAlgorithm'], False)
+            if returnStatus == True:
+                itemCounters['FilesSaved'] += 1
+            else:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                return itemCounters
+        else:
+            try:
+                shutil.copy2(referenceFileName, saveFileName)
+                itemCounters['FilesSaved'] += 1
+
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveItem() Not able to save reference file:|{0}| as save file:|{1}|, error:|{2}|".format(
+                        referenceFileName, saveFileName, err), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                return itemCounters
+    else:
+        return itemCounters
+
+    if objectAttributes['ComparePatterns'] != None:
+        ### check whether the saved content has ComparePatterns
+        returnStatus, patternMatched, patternNotMatched, patternResults, errorMsg = JAGlobalLib.JAComparePatterns(
+                itemName,
+                objectAttributes['CompiledComparePatterns'], saveFileName, None,
+                interactiveMode, debugLevel,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+        itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+
+    return itemCounters
+
+def JAOperationCompareItem(
+    itemName, objectAttributes, saveDir, snapshotFileName, compareH2H,
+    previousItemsMetadata, currentItemsMetadata, itemReport,
+    defaultParameters, yamlModulePresent, interactiveMode, debugLevel,
+    myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ):
+    """
+    JAOperationCompareItem(
+        itemName, objectAttributes, saveDir, snapshotFileName, compareH2H,
+        previousItemsMetadata, currentItemsMetadata, itemReport,
+        defaultParameters, yamlModulePresent, interactiveMode, debugLevel,
+        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+    This function compares one object for 'compare' operation with the object saved before.
+        For Command type of object, executes command, saves the output in saveDir/<itemName>.current and 
+            compares it with saved output. If inputs of the command did not change since last save, 
+            command is not executed.
+        For FileNames type of object, compares metadata, key paths of structured file, Merkle tree of directory,
+            checksum or contents of the file depending on CompareType
+    Digests, diff hunks, bytes read and return code of the command are updated in itemReport
+
+    Returned values
+        itemCounters - dictionary with keys Errors, Matches, ItemsSkipped, InputsUnchanged, ComparePatternsNotMatched,
+            CommandOutputSaved, ChecksumsSaved, FilesSaved, TreesSaved, MetadataSaved,
+            ChangedCommandOutput, ChangedChecksum, ChangedFiles, ChangedTrees, ChangedMetadata,
+            Status - match, changed, unchanged (input fingerprint matched), skipped or error
+            and CurrentFileName - file with current command output, '' for FileNames type of object
+    """
+    itemCounters = {
+        'Errors': 0, 'Matches': 0, 'ItemsSkipped': 0, 'InputsUnchanged': 0, 'ComparePatternsNotMatched': 0,
+        'CommandOutputSaved': 0, 'ChecksumsSaved': 0, 'FilesSaved': 0, 'TreesSaved': 0, 'MetadataSaved': 0,
+        'ChangedCommandOutput': 0, 'ChangedChecksum': 0, 'ChangedFiles': 0, 'ChangedTrees': 0, 'ChangedMetadata': 0,
+        'Status': '', 'CurrentFileName': '' }
+
+
+    ### while doing host to host compare, SKIP any object that has SkipH2H set to True
+    if compareH2H == True and objectAttributes['SkipH2H'] == True:
+        if debugLevel > 0:
+            JAGlobalLib.LogLine(
+                "DEBUG-1 JAOperationSaveCompare() Skipping itemName:|{0}|, Command:|{1}|, FileNames:|{2}|, CompareType:|{3}|, ComparePatterns:|{4}|, IgnorePatterns:|{5}|, SkipH2H:|{6}|".format(
+                itemName,
+                objectAttributes['Command'],
+                objectAttributes['FileNames'],
+                objectAttributes['CompareType'],
+                objectAttributes['ComparePatterns'],
+                objectAttributes['IgnorePatterns'],
+                objectAttributes['SkipH2H'] ), 
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+        itemCounters['ItemsSkipped'] += 1
+        itemCounters['Status'] = 'skipped'
+        return itemCounters
+
+    if debugLevel > 1:
+        JAGlobalLib.LogLine(
+            "DEBUG-2 JAOperationSaveCompare() processing itemName:|{0}|, Command:|{1}|, FileNames:|{2}|, CompareType:|{3}|, ComparePatterns:|{4}|, IgnorePatterns:|{5}|, SkipH2H:|{6}|".format(
+               itemName,
+               objectAttributes['Command'],
+               objectAttributes['FileNames'],
+               objectAttributes['CompareType'],
+               objectAttributes['ComparePatterns'],
+               objectAttributes['IgnorePatterns'],
+               objectAttributes['SkipH2H'] ), 
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    ### need to save the output of command with object name in save directory
+    ### 'Command' takes precedence over FileNames if present
+    if objectAttributes['Command'] != None:
+        if compareH2H == False and ( objectAttributes.get('InputFingerprint') != None or objectAttributes.get('InputProbe') != None ):
+            ### if inputs of the command did not change since last save, command output is taken as unchanged
+            ###   without executing the command
+            previousFingerprint = JAInputFingerprintRead( saveDir, itemName )
+            if previousFingerprint != '':
+                returnStatus, currentFingerprint, errorMsg = JAInputFingerprintCompute(
+                    objectAttributes['InputFingerprint'], objectAttributes.get('InputProbe'), defaultParameters['CommandShell'], debugLevel, OSType)
+                if returnStatus == False:
+                    JAGlobalLib.LogLine(
+                        "WARN JAOperationSaveCompare() {0}, executing the command of itemName:|{1}|".format(errorMsg, itemName), 
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                elif currentFingerprint == previousFingerprint:
+                    itemReport['DigestOld'] = previousFingerprint
+                    itemReport['DigestNew'] = currentFingerprint
+                    if debugLevel > 0:
+                        JAGlobalLib.LogLine(
+                            "DEBUG-1 JAOperationSaveCompare() input fingerprint matched, command output of itemName:|{0}| is unchanged, skipped the command:|{1}|".format(
+                                itemName, objectAttributes['Command']), 
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                    itemCounters['InputsUnchanged'] += 1
+                    itemCounters['Status'] = 'unchanged'
+                    itemCounters['Matches'] += 1
+                    ### done processing current object
+                    return itemCounters
+
+        saveFileName, tempFile = JASnapshotGetReferenceFile(
+            saveDir, itemName, snapshotFileName, defaultParameters['LogFilePath'])
+
+        currentFileName = itemCounters['CurrentFileName'] = '{0}/{1}.current'.format(saveDir, itemName)
+        comparePatternsFileName = ''
+
+        ### for compare operation, need to take current environment data in separate file and
+        ###   compare it with saveFileName (data saved before)
+        tempCommand = '{0} > {1}'.format( 
+            objectAttributes['Command'],
+            currentFileName)
+        comparePatternsFileName = currentFileName
+
+        ### expand any environment variables used in that command
+        tempCommand = os.path.expandvars(tempCommand)
+
+        if debugLevel > 1:
+            JAGlobalLib.LogLine(
+                "DEBUG-2 JAOperationSaveCompare() {0} object:|{1}| with command:|{2}|".format(
+                    'compare', saveFileName, tempCommand),
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+        ### now execute the command to save the environment
+        returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+            defaultParameters['CommandShell'],
+            tempCommand, debugLevel, OSType, commandResult=itemReport)
+        if returnResult == False:
+            itemCounters['Errors'] += 1
+            itemCounters['Status'] = 'error'
+            if re.match(r'File not found', errorMsg) != True:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveCompare() File not found, error saving environment by executing command:|{0}|, error:|{1}|".format(
+                            tempCommand, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            else:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveCompare() Error executing command:|{0}|, error:|{1}|".format(
+                            tempCommand, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            if tempFile == True:
+                os.remove( saveFileName )
+            ### done processing current object
+            return itemCounters
+        else:
+            if objectAttributes['ComparePatterns'] != None:
+                ### check whether the command output has ComparePatterns
+                returnStatus, patternMatched, patternNotMatched, patternResults, errorMsg = JAGlobalLib.JAComparePatterns(
+                        itemName,
+                        objectAttributes['CompiledComparePatterns'], comparePatternsFileName, None,
+                        interactiveMode, debugLevel,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+                if returnStatus == False: 
+                    itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+                else:
+                    itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+                itemReport['PatternResults'] = patternResults
+
+            itemCounters['CommandOutputSaved'] += 1
+            ### compare currentDataFileName content with saveFileName content
+            returnStatus, fileDiffer, errorMsg = JAOperationCompareFiles(
+                currentFileName, saveFileName, 
+                defaultParameters['BinaryFileTypes'],
+                objectAttributes['CompareType'],
+                defaultParameters['CommandCompare'],
+                compareH2H, objectAttributes['IgnorePatterns'],
+                "{0}".format(objectAttributes['Command']), ### logAdditionalInfo - command used to get environment details
+                interactiveMode, debugLevel,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag,
+                OSType,
+                defaultParameters['CommandShell'],
+                defaultParameters['LogFilePath'],
+                defaultParameters['ChecksumAlgorithm'],
+                compareDetails=itemReport)
+
+            if fileDiffer == True:
+                itemCounters['ChangedCommandOutput'] += 1
+                itemCounters['Status'] = 'changed'
+            else:
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+
+            if returnStatus == False:
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+
+            if tempFile == True:
+                ### delete reference file extracted from snapshot
+                os.remove( saveFileName )
+
+            ### done processing current object
+            return itemCounters
+
+    elif objectAttributes['FileNames'] != None:
+        referenceFileName = objectAttributes['FileNames']
+        if objectAttributes['CompareType'] == 'metadata':
+            if itemName not in previousItemsMetadata:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveCompare() Saved metadata not present for itemName:|{0}|, file:|{1}|".format(
+                        itemName, referenceFileName), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                ### done processing current object
+                return itemCounters
+
+            itemCounters['MetadataSaved'] += 1
+            changedAttributes = JAMetadataCompare( 
+                currentItemsMetadata[itemName], previousItemsMetadata[itemName], compareH2H )
+            itemReport['DiffHunks'] = len(changedAttributes)
+            if len(changedAttributes) > 0:
+                JAGlobalLib.LogLine(
+                    "DIFF  JAOperationSaveCompare() metadata differ, file:|{0}|, {1}".format(
+                        referenceFileName, 
+                        ', '.join( [ "{0} current:|{1}| saved:|{2}|".format( attribute, currentValue, previousValue ) 
+                            for attribute, currentValue, previousValue in changedAttributes ] ) ),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                itemCounters['ChangedMetadata'] += 1
+                itemCounters['Status'] = 'changed'
+            else:
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+            ### done processing current object
+            return itemCounters
+
+        elif objectAttributes['CompareType'] == 'structured':
+            ### compare key paths of structured file with key paths of the file saved before
+            saveFileName, tempFile = JASnapshotGetReferenceFile(
+                saveDir, itemName, snapshotFileName, defaultParameters['LogFilePath'])
+            fileFormat = JAStructuredGetFormat( referenceFileName, objectAttributes.get('StructuredFormat') )
+            if fileFormat == None:
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveCompare() Unknown structured file format, file:|{0}|, supported file extensions:|{1}|, specify StructuredFormat for other files".format(
+                        referenceFileName, ','.join(JAStructuredFormats) ), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                if tempFile == True:
+                    os.remove( saveFileName )
+                ### done processing current object
+                return itemCounters
+
+            if objectAttributes['ComparePatterns'] != None:
+                ### check whether the saved file has ComparePatterns
+                returnStatus, patternMatched, patternNotMatched, patternResults, errorMsg = JAGlobalLib.JAComparePatterns(
+                        itemName,
+                        objectAttributes['CompiledComparePatterns'], saveFileName, None,
+                        interactiveMode, debugLevel,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+                itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+                itemReport['PatternResults'] = patternResults
+
+            itemCounters['FilesSaved'] += 1
+            ### files with same content need not be parsed
+            returnStatus, currentFileDigest, errorMsg = JAGlobalLib.JAComputeFileDigest(
+                referenceFileName, defaultParameters['ChecksumAlgorithm'])
+            if returnStatus == True:
+                returnStatus, previousFileDigest, errorMsg = JAGlobalLib.JAComputeFileDigest(
+                    saveFileName, defaultParameters['ChecksumAlgorithm'])
+            if returnStatus == True and currentFileDigest != previousFileDigest:
+                ### key paths of saved file are cached in saveDir/<itemName>.keys along with checksum of saved file
+                returnStatus, previousKeyValues, errorMsg = JAStructuredGetKeys(
+                    saveFileName, previousFileDigest, fileFormat, 
+                    "{0}/{1}.keys".format(saveDir, itemName), yamlModulePresent )
+                if returnStatus == True:
+                    returnStatus, currentKeyValues, errorMsg = JAStructuredGetKeys(
+                        referenceFileName, currentFileDigest, fileFormat, None, yamlModulePresent )
+            if tempFile == True:
+                ### delete reference file extracted from snapshot
+                os.remove( saveFileName )
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                ### done processing current object
+                return itemCounters
+            itemReport['DigestOld'] = previousFileDigest
+            itemReport['DigestNew'] = currentFileDigest
+            itemReport['BytesRead'] = os.path.getsize( referenceFileName )
+            if currentFileDigest == previousFileDigest:
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+                ### done processing current object
+                return itemCounters
+
+            addedKeys, removedKeys, changedKeys = JAStructuredCompare( 
+                currentKeyValues, previousKeyValues, objectAttributes.get('IgnoreKeys') )
+            itemReport['DiffHunks'] = len(addedKeys) + len(removedKeys) + len(changedKeys)
+            if len(addedKeys) > 0 or len(removedKeys) > 0 or len(changedKeys) > 0:
+                for keyPath, currentValue in addedKeys:
+                    JAGlobalLib.LogLine(
+                        "DIFF  JAOperationSaveCompare() file:|{0}|, added key:|{1}|, current value:|{2}|".format(
+                            referenceFileName, keyPath, currentValue ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                for keyPath, previousValue in removedKeys:
+                    JAGlobalLib.LogLine(
+                        "DIFF  JAOperationSaveCompare() file:|{0}|, removed key:|{1}|, saved value:|{2}|".format(
+                            referenceFileName, keyPath, previousValue ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                for keyPath, currentValue, previousValue in changedKeys:
+                    JAGlobalLib.LogLine(
+                        "DIFF  JAOperationSaveCompare() file:|{0}|, changed key:|{1}|, current value:|{2}|, saved value:|{3}|".format(
+                            referenceFileName, keyPath, currentValue, previousValue ),
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                itemCounters['ChangedFiles'] += 1
+                itemCounters['Status'] = 'changed'
+            else:
+                ### only formatting or order of keys changed
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+            ### done processing current object
+            return itemCounters
+
+        elif objectAttributes['CompareType'] == 'tree':
+            ### compare Merkle tree of the directory with the tree saved before
+            saveFileName, tempFile = JASnapshotGetReferenceFile(
+                saveDir, "{0}.tree".format(itemName), snapshotFileName, defaultParameters['LogFilePath'])
+            returnStatus, previousNodes, checksumAlgorithm, errorMsg = JATreeRead( saveFileName )
+            if tempFile == True:
+                ### delete reference file extracted from snapshot
+                os.remove( saveFileName )
+            if returnStatus == False:
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                ### done processing current object
+                return itemCounters
+
+            ### compute file digests using the same algorithm used to save the tree
+            ### on the same host, digests of files whose size and mtime did not change are reused
+            if compareH2H == True:
+                returnStatus, currentNodes, errorMsg = JATreeBuild( referenceFileName, {}, checksumAlgorithm )
+            else:
+                returnStatus, currentNodes, errorMsg = JATreeBuild( referenceFileName, previousNodes, checksumAlgorithm )
+            if errorMsg != '':
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                if returnStatus == False:
+                    itemCounters['Status'] = 'error'
+                    ### done processing current object
+                    return itemCounters
+
+            itemCounters['TreesSaved'] += 1
+            addedNames, removedNames, modifiedNames = JATreeCompare( currentNodes, previousNodes )
+            itemReport['DigestOld'] = previousNodes['.'][4] if '.' in previousNodes else ''
+            itemReport['DigestNew'] = currentNodes['.'][4]
+            itemReport['DiffHunks'] = len(addedNames) + len(removedNames) + len(modifiedNames)
+            if len(addedNames) > 0 or len(removedNames) > 0 or len(modifiedNames) > 0:
+                for changeType, changedNames in ( ('added', addedNames), ('removed', removedNames), ('modified', modifiedNames) ):
+                    for relName in changedNames:
+                        JAGlobalLib.LogLine(
+                            "DIFF  JAOperationSaveCompare() directory:|{0}|, {1}:|{2}|".format(
+                                referenceFileName, changeType, relName ),
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                JAGlobalLib.LogLine(
+                    "DIFF  JAOperationSaveCompare() directory:|{0}| differs from saved tree, added:{1}, removed:{2}, modified:{3}".format(
+                        referenceFileName, len(addedNames), len(removedNames), len(modifiedNames) ),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+                itemCounters['ChangedTrees'] += 1
+                itemCounters['Status'] = 'changed'
+            else:
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+            if itemCounters['Errors'] > 0:
+                ### some files of the directory could not be read, compare result is partial
+                itemCounters['Status'] = 'error'
+            ### done processing current object
+            return itemCounters
+
+        elif objectAttributes['CompareType'] == 'checksum':
+
+            ### if CompareType is checksum, save checksum with .checksum as part of file name
+            saveFileName = '{0}/{1}.checksum'.format( saveDir, itemName)
+
+            ### compare operation, compare current checksum with checksum stored before
+            try:
+                if os.path.exists(saveFileName) == False and os.path.exists(snapshotFileName) == True:
+                    ### checksum file is packed in snapshot, read it from snapshot directly
+                    returnStatus, previousFileDigest, errorMsg = JASnapshotReadMember(
+                        snapshotFileName, "{0}.checksum".format(itemName))
+                    if returnStatus == False:
+                        raise OSError(errorMsg)
+                    previousFileDigest = previousFileDigest.decode().strip()
+                    itemCounters['ChecksumsSaved'] += 1
+                else:
+                    ### previous file has checksum stored, read it directly          
+                    with open(saveFileName,"r") as f: 
+                        previousFileDigest = f.readline()
+                        previousFileDigest = previousFileDigest.strip()
+                        f.close()
+                        itemCounters['ChecksumsSaved'] += 1
+            except OSError as err:
+                JAGlobalLib.LogLine(
+                        "ERROR JAOperationCompareFiles() Not able to open file:{0}".format(saveFileName), 
+                        interactiveMode,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                ### done processing current object
+                return itemCounters
+
+            ### compute current checksum using the same algorithm used to save the checksum before
+            ###   checksum saved without algorithm tag is md5 checksum
+            checksumAlgorithm, previousFileHexDigest = JAGlobalLib.JAParseChecksum( previousFileDigest )
+            returnStatus, currentFileDigest, errorMsg = JAGlobalLib.JAComputeFileDigest(
+                referenceFileName, checksumAlgorithm)
+            if returnStatus == False:
+                ### algorithm of saved checksum not usable on this host, or reference file not readable
+                JAGlobalLib.LogLine(
+                    "ERROR JAOperationSaveCompare() Not able to compute checksum of reference file:|{0}|, {1}".format(
+                        referenceFileName, errorMsg), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+                ### done processing current object
+                return itemCounters
+
+            itemReport['DigestOld'] = previousFileDigest
+            itemReport['DigestNew'] = currentFileDigest
+            itemReport['BytesRead'] = os.path.getsize( referenceFileName )
+            if currentFileDigest != JAGlobalLib.JAFormatChecksum( checksumAlgorithm, previousFileHexDigest):
+                JAGlobalLib.LogLine(
+                    "DIFF  JAOperationSaveCompare() {0} checksum differ, current file:|{1}| checksum:{2}, saved file:|{3}|, checksum:{4}".format(
+                    checksumAlgorithm, referenceFileName, currentFileDigest, saveFileName, previousFileDigest ),
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
+
+                fileDiffer = True
+                itemCounters['ChangedChecksum'] += 1
+                itemCounters['Status'] = 'changed'
+            else:
+                itemCounters['Matches'] += 1
+                itemCounters['Status'] = 'match'
+
+            ### done processing current object
+            return itemCounters
+        else:
+            ### if CompareType is not checksum, reference file contents are saved as is
+            saveFileName, tempFile = JASnapshotGetReferenceFile(
+                saveDir, itemName, snapshotFileName, defaultParameters['LogFilePath'])
+
+            if objectAttributes['ComparePatterns'] != None:
+                ### check whether the command output has ComparePatterns
+                returnStatus, patternMatched, patternNotMatched, patternResults, errorMsg = JAGlobalLib.JAComparePatterns(
+                        itemName,
+                        objectAttributes['CompiledComparePatterns'], saveFileName, None,
+                        interactiveMode, debugLevel,
+                        myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
+                if returnStatus == False: 
+                    itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+                else:
+                    itemCounters['ComparePatternsNotMatched'] += patternNotMatched
+                itemReport['PatternResults'] = patternResults
+
+            itemCounters['FilesSaved'] += 1
+            ### compare two files 
+            ### compare reference file content with saveFileName content
+            returnStatus, fileDiffer, errorMsg = JAOperationCompareFiles(
+                referenceFileName, saveFileName, 
+                defaultParameters['BinaryFileTypes'],
+                objectAttributes['CompareType'],
+                defaultParameters['CommandCompare'],
+                compareH2H, objectAttributes['IgnorePatterns'],
+                '', ### file comparison, no additional info to print
+                interactiveMode, debugLevel,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag,
+                OSType,
+                defaultParameters['CommandShell'],
+                defaultParameters['LogFilePath'],
+                defaultParameters['ChecksumAlgorithm'],
+                compareDetails=itemReport)
+            if returnStatus == False:
+                itemCounters['Errors'] += 1
+                itemCounters['Status'] = 'error'
+            else:
+                if fileDiffer == True:
+                    itemCounters['ChangedFiles'] += 1
+                    itemCounters['Status'] = 'changed'
+                else:
+                    itemCounters['Matches'] += 1
+                    itemCounters['Status'] = 'match'
+
+            if tempFile == True:
+                ### delete reference file extracted from snapshot
+                os.remove( saveFileName )
+
+    return itemCounters
+
+def JACompareReportWrite( compareReportFile, itemReport:dict, thisHostName:str ):
+    """
+    JACompareReportWrite( compareReportFile, itemReport:dict, thisHostName:str )
+
+    Writes compare result of one object as one line in JSON form to compare report file
+        TimeStamp, HostName, ItemName, Type, Status - match, changed, unchanged (input fingerprint matched), skipped or error,
+        DigestOld, DigestNew, DiffHunks, BytesRead, ElapsedMs, ReturnCode - exit code of Command,
+        PatternResults - result of each ComparePatterns returned by JAGlobalLib.JAComparePatterns()
+    """
+    import json
+    compareRecord = { 'TimeStamp': JAGlobalLib.UTCDateTime(), 'HostName': thisHostName }
+    compareRecord.update( itemReport )
+    try:
+        compareReportFile.write( "{0}\n".format( json.dumps( compareRecord ) ) )
+    except OSError:
+        ### report is additional info, errors are ignored
+        pass
+
+def JAOperationSaveCompare( 
+    baseConfigFileName, 
+    subsystem, 
+    myPlatform, 
+    version,
+    OSType, OSName, OSVersion,  
+    outputFileHandle, colorIndex, HTMLBRTag, myColors,
+    interactiveMode, operations, thisHostName, yamlModulePresent,
+    defaultParameters, debugLevel, currentTime,
+    allowedCommands,
+    operation ):
+
+    """
+    This function can be called to perform operations like 'backup, 'compare' and 'save'
+    For 'save' operation, it
+        Reads the environment spec file for the given subsystem
+        For Command type of object, executes commands to gather environment info and saves in file name specified under saveDir
+        For FileNames type of object, 
+            if checksum is to be stored, it computes the checksum and stores it in filename <itemName>.checksum
+            else, copies the contents of the file to saveDir/<itemName>
+
+    For 'backup' operation, it
+        Deletes any BackupYYYYMMDD directories that are older than specified retency period in param 'BackupRetencyDurationInDays'
+        Derives the saveDir name in the form BackupYYYYMMDD using current time
+        Performs all the tasks of 'save' operation with derived saveDir.
+
+    for 'compare' operation, it
+        Reads the environment spec file for the given subsystem
+        For Command type of object, executes commands to gather environment info and saves in temp file
+        For FileNames type of object, 
+            if checksum is to be compared, it computes the checksum, reads the saved checksum from a saveDir/<itemName>.checksum 
+                and compares the two checksums
+            else, compares current file to the file saved in saveDir/<itemName>
+
+    """
+    returnStatus = True
+    numberOfItems = 0
+
+    errorMsg = ''
+
+    if debugLevel > 0:
+        JAGlobalLib.LogLine(
+            "DEBUG-1 JAOperationSaveCompare()  AppConfig:{0}, subsystem:{1}, version:{2}".format(
+                 baseConfigFileName, subsystem, version),
+            interactiveMode,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+    ### dictionary to hold object definitions
+    saveCompareParameters = defaultdict(dict)
+
+    ### read the object spec file contents
+    returnStatus, numberOfItems = JAReadConfigCompare( 
+        baseConfigFileName, 
+        subsystem, 
+        version, 
+        OSType,
+        outputFileHandle, colorIndex, HTMLBRTag, myColors,
+        interactiveMode, yamlModulePresent,
+        defaultParameters, debugLevel,
+        saveCompareParameters, allowedCommands, thisHostName )
+    if returnStatus == False:
+        ### fatal error, can't proceed.
+        return returnStatus, errorMsg
+
+    ### object store is used for backup operation only
+    objectStoreDir = None
+
+    if operation == 'backup':
+        ### first delete older backup directories, older than 'BackupRetencyDurationInDays'
+    
+        backupRetencyDurationInDays = defaultParameters['BackupRetencyDurationInDays']
+
+        if OSType == 'Windows':
+            ### get list of files older than retency period
+            filesToDelete = JAGlobalLib.JAFindModifiedFiles(
+                    '{0}/Backup*'.format(defaultParameters['LocalRepositoryHome']), 
+                    currentTime - (backupRetencyDurationInDays*3600*24), ### get files modified before this time
+                    debugLevel, thisHostName)
+            if len(filesToDelete) > 0:
+                for fileName in filesToDelete:
+                    if fileName != '' and fileName != None:
+                        try:
+                            os.remove(fileName)
+                            if debugLevel > 3:
+                                JAGlobalLib.LogLine(
+                                    "DEBUG-4 JAOperationSaveCompare() Deleting the file:{0}".format(fileName), 
+                                    interactiveMode,
+                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+                        except OSError as err:
+                            JAGlobalLib.LogLine(
+                                "ERROR JAOperationSaveCompare() Error deleting old backup file:{0}, errorMsg:{1}".format(fileName, err), 
+                                interactiveMode,
+                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+                        
+        else:
+            # delete directories older than retency period
+            command = 'find {0} -name "Backup*" -mtime +{1} -type d'.format(
+                defaultParameters['LocalRepositoryHome'], backupRetencyDurationInDays)
+            if debugLevel > 1:
+                JAGlobalLib.LogLine(
+                    "DEBUG-2 JAOperationSaveCompare() purging files with command:{0}".format(command), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+            returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
+                    defaultParameters['CommandShell'],
+                    command, debugLevel, OSType)
+            if returnResult == False:
+                if errorMsg != '':
+                    if re.match(r'File not found', errorMsg) != True:
+                        JAGlobalLib.LogLine(
+                            "INFO JAOperationSaveCompare() File not found, Error deleting backup directory:{0} older than:{1}".format(
+                                returnOutput, backupRetencyDurationInDays), 
+                            interactiveMode,
+                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            else:
+                if len(returnOutput) > 0:                    
+                    for fileName in returnOutput:
+                        if len(fileName) > 0:
+                            try:
+                                shutil.rmtree(fileName)
+                                if debugLevel > 3:
+                                    JAGlobalLib.LogLine(
+                                        "DEBUG-4 JAOperationSaveCompare() Deleting the directory:{0}".format(fileName), 
+                                        interactiveMode,
+                                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+                            except OSError as err:
+                                JAGlobalLib.LogLine(
+                                    "ERROR JAOperationSaveCompare() Error deleting backup directory:{0} older than:{1} days, errorMsg:{2}".format(
+                                        fileName, backupRetencyDurationInDays, err), 
+                                    interactiveMode,
+                                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+
+        if defaultParameters['BackupObjectStore'] == True:
+            ### backup directories older than retency period are deleted, 
+            ###   delete the blobs that are not referenced by remaining backups
+            objectStoreDir = "{0}/{1}".format( 
+                defaultParameters['LocalRepositoryHome'], defaultParameters['BackupObjectStoreDir'])
+            JABackupStoreGarbageCollect(
+                defaultParameters['LocalRepositoryHome'], objectStoreDir,
+                interactiveMode, debugLevel, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+
+        ### derive the saveDir using current time in the form BackupYYYYMMDD
+        defaultParameters['SaveDir'] = saveDir = "{0}/Backup{1}".format( 
+            defaultParameters['LocalRepositoryHome'],
+            JAGlobalLib.UTCDateForFileName() )
+
+    elif re.search(r'save|compare', operation) :
+        saveDir = defaultParameters['SaveDir']
+
+    if os.path.exists(saveDir) :
+        if operation == "save":
+            ### if saveDir present and it starts with 'Pre', skip save operation
+            tempBaseFileName = os.path.basename(saveDir)
+            if re.match(r'^Pre', tempBaseFileName):
+                JAGlobalLib.LogLine(
                     "ERROR JAOperationSaveCompare() save directory:|{0}| starting with 'Pre' is already present, Skipped save operation".format(saveDir),
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
@@ -899,9 +2683,20 @@ def JAOperationSaveCompare(
                     attributes['SkipH2H']
                 ))
         file.close()
+    ### saved files are packed in this file if 'SaveSnapshot' is True
+    snapshotFileName = "{0}/{1}".format( saveDir, JASnapshotDeriveFileName( baseConfigFileName, subsystem ))
+    ### metadata of objects with CompareType metadata are saved in this file
+    metadataFileName = "{0}/{1}".format( saveDir, JAMetadataDeriveFileName( baseConfigFileName, subsystem ))
+    metadataFileNames = {}
+    for itemName in saveCompareParameters:
+        if saveCompareParameters[itemName]['FileNames'] != None and saveCompareParameters[itemName]['CompareType'] == 'metadata':
+            metadataFileNames[itemName] = saveCompareParameters[itemName]['FileNames']
+
     if operation == 'compare':
-        discoveredSpecSaveFileName = "{0}/{1}.{2}.save".format(
-            saveDir, baseConfigFileName, subsystem  )
+        ### saved files may be packed in snapshot file, extract individual file when needed
+        discoveredSpecSaveFileName, tempFile = JASnapshotGetReferenceFile(
+            saveDir, "{0}.{1}.save".format( baseConfigFileName, subsystem ),
+            snapshotFileName, defaultParameters['LogFilePath'])
         ### compare two files as text files to find delta between the two
         returnStatus, fileDiffer, errorMsg = JAOperationCompareFiles(
             discoveredSpecFileName, discoveredSpecSaveFileName, 
@@ -915,7 +2710,8 @@ def JAOperationSaveCompare(
             myColors, colorIndex, outputFileHandle, HTMLBRTag,
             OSType,
             defaultParameters['CommandShell'],
-            defaultParameters['LogFilePath'])
+            defaultParameters['LogFilePath'],
+            defaultParameters['ChecksumAlgorithm'])
         if returnStatus == True:
             if fileDiffer == True:
                 JAGlobalLib.LogLine(
@@ -923,281 +2719,215 @@ def JAOperationSaveCompare(
                     discoveredSpecFileName, discoveredSpecSaveFileName ), 
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+        if tempFile == True:
+            os.remove( discoveredSpecSaveFileName )
         
 
     ### initialize counters to track summary
     numberOfItems = numberOfErrors = numberOfMatches = numberOfComparePatternsNotMatched = 0
     numberOfCommandOutputSaved = numberOfChecksumsSaved = numberOfFilesSaved = 0
     numberOfChangedFiles = numberOfChangedCommandOutput = numberOfChangedChecksum = numberOfItemsSkipped = 0
+    numberOfInputsUnchanged = numberOfTreesSaved = numberOfChangedTrees = 0
+    numberOfMetadataSaved = numberOfChangedMetadata = 0
+    ### temporary file with current command output, deleted at the end of compare
+    currentFileName = ''
 
-    ### save or compare information of each object
-    for itemName in saveCompareParameters:
-        numberOfItems += 1
-        objectAttributes = saveCompareParameters[itemName]
-
-        ### while doing host to host compare, SKIP any object that has SkipH2H set to True
-        if operation == 'compare' and compareH2H == True and objectAttributes['SkipH2H'] == True:
-            if debugLevel > 0:
-                JAGlobalLib.LogLine(
-                    "DEBUG-1 JAOperationSaveCompare() Skipping itemName:|{0}|, Command:|{1}|, FileNames:|{2}|, CompareType:|{3}|, ComparePatterns:|{4}|, IgnorePatterns:|{5}|, SkipH2H:|{6}|".format(
-                    itemName,
-                    objectAttributes['Command'],
-                    objectAttributes['FileNames'],
-                    objectAttributes['CompareType'],
-                    objectAttributes['ComparePatterns'],
-                    objectAttributes['IgnorePatterns'],
-                    objectAttributes['SkipH2H'] ), 
-                    interactiveMode,
-                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-            numberOfItemsSkipped += 1
-            continue
-
-        if debugLevel > 1:
+    if operation == 'save' or operation == 'backup':
+        ### save information of objects in parallel, commands and file copy/checksum are I/O bound
+        ### results are gathered in the order of objects in saveCompareParameters so that summary counters
+        ###   are same as serial execution
+        itemsToCompare = []
+        maxThreads = defaultParameters['MaxThreadsForSave']
+        if debugLevel > 0:
             JAGlobalLib.LogLine(
-                "DEBUG-2 JAOperationSaveCompare() processing itemName:|{0}|, Command:|{1}|, FileNames:|{2}|, CompareType:|{3}|, ComparePatterns:|{4}|, IgnorePatterns:|{5}|, SkipH2H:|{6}|".format(
-                   itemName,
-                   objectAttributes['Command'],
-                   objectAttributes['FileNames'],
-                   objectAttributes['CompareType'],
-                   objectAttributes['ComparePatterns'],
-                   objectAttributes['IgnorePatterns'],
-                   objectAttributes['SkipH2H'] ), 
+                "DEBUG-1 JAOperationSaveCompare() saving {0} objects using max threads:{1}".format(
+                    len(saveCompareParameters), maxThreads),
                 interactiveMode,
                 myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
-        ### need to save the output of command with object name in save directory
-        ### 'Command' takes precedence over FileNames if present
-        if objectAttributes['Command'] != None:
-            saveFileName = "{0}/{1}".format(saveDir,itemName) 
-
-            currentFileName = '{0}.current'.format(saveFileName)
-            comparePatternsFileName = ''
-
-            if operation == 'compare':
-                ### for compare operation, need to take current environment data in separate file and
-                ###   compare it with saveFileName (data saved before)
-                tempCommand = '{0} > {1}'.format( 
-                    objectAttributes['Command'],
-                    currentFileName)
-                comparePatternsFileName = currentFileName
+        ### checksum of each object saved in object store, written to manifest in the order of objects
+        itemDigests = {}
+        with ThreadPoolExecutor( max_workers=maxThreads ) as executor:
+            saveResults = []
+            for itemName in saveCompareParameters:
+                saveResults.append( executor.submit(
+                    JAOperationSaveItem,
+                    itemName, saveCompareParameters[itemName], saveDir, objectStoreDir,
+                    defaultParameters, interactiveMode, debugLevel,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType ) )
+
+            for itemName, saveResult in zip( saveCompareParameters, saveResults):
+                itemCounters = saveResult.result()
+                if itemCounters['Digest'] != '':
+                    itemDigests[itemName] = itemCounters['Digest']
+                numberOfItems += 1
+                numberOfErrors += itemCounters['Errors']
+                numberOfComparePatternsNotMatched += itemCounters['ComparePatternsNotMatched']
+                numberOfCommandOutputSaved += itemCounters['CommandOutputSaved']
+                numberOfChecksumsSaved += itemCounters['ChecksumsSaved']
+                numberOfFilesSaved += itemCounters['FilesSaved']
+                numberOfTreesSaved += itemCounters['TreesSaved']
+
+        if len(metadataFileNames) > 0:
+            ### capture metadata of all objects in one pass, save in single file
+            returnStatus, errorMsg = JAMetadataWrite( metadataFileName, JAMetadataCollect( metadataFileNames ) )
+            if returnStatus == False:
+                numberOfErrors += 1
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
             else:
-                ### for save operation, save current data in saveFileName
-                tempCommand = '{0} > {1}'.format( 
-                    objectAttributes['Command'],
-                    saveFileName)
-                comparePatternsFileName = saveFileName
-
-            ### expand any environment variables used in that command
-            tempCommand = os.path.expandvars(tempCommand)
+                numberOfMetadataSaved = len(metadataFileNames)
 
-            if debugLevel > 1:
+        if objectStoreDir != None:
+            returnStatus, errorMsg = JABackupStoreWriteManifest( saveDir, itemDigests )
+            if returnStatus == False:
+                numberOfErrors += 1
                 JAGlobalLib.LogLine(
-                    "DEBUG-2 JAOperationSaveCompare() {0} object:|{1}| with command:|{2}|".format(
-                        operation, saveFileName, tempCommand),
+                    errorMsg, 
                     interactiveMode,
                     myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-
-            ### now execute the command to save the environment
-            returnResult, returnOutput, errorMsg = JAGlobalLib.JAExecuteCommand(
-                defaultParameters['CommandShell'],
-                tempCommand, debugLevel, OSType)
-            if returnResult == False:
+    else:
+        itemsToCompare = saveCompareParameters
+
+        previousItemsMetadata = {}
+        currentItemsMetadata = {}
+        if len(metadataFileNames) > 0:
+            ### read metadata saved before and capture current metadata of all objects in one pass
+            savedMetadataFileName, tempFile = JASnapshotGetReferenceFile(
+                saveDir, os.path.basename(metadataFileName), snapshotFileName, defaultParameters['LogFilePath'])
+            returnStatus, previousItemsMetadata, errorMsg = JAMetadataRead( savedMetadataFileName )
+            if tempFile == True:
+                os.remove( savedMetadataFileName )
+            if returnStatus == False:
                 numberOfErrors += 1
-                if re.match(r'File not found', errorMsg) != True:
-                    JAGlobalLib.LogLine(
-                        "ERROR JAOperationSaveCompare() File not found, error saving environment by executing command:|{0}|, error:|{1}|".format(
-                                tempCommand, errorMsg), 
-                        interactiveMode,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                else:
-                    JAGlobalLib.LogLine(
-                        "ERROR JAOperationSaveCompare() Error executing command:|{0}|, error:|{1}|".format(
-                                tempCommand, errorMsg), 
-                        interactiveMode,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                ### done processing current object
-                continue
-            else:
-                if objectAttributes['ComparePatterns'] != None:
-                    ### check whether the command output has ComparePatterns
-                    returnStatus, patternMatched, patternNotMatched, errorMsg = JAGlobalLib.JAComparePatterns(
-                            itemName,
-                            objectAttributes['ComparePatterns'], comparePatternsFileName, None,
-                            interactiveMode, debugLevel,
-                            myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
-                    if returnStatus == False: 
-                        numberOfComparePatternsNotMatched += patternNotMatched
-                    else:
-                        numberOfComparePatternsNotMatched += patternNotMatched
-
-                numberOfCommandOutputSaved += 1
-                ### if operation is compare, compare currentDataFileName content with saveFileName content
-                if operation == 'compare':
-                    returnStatus, fileDiffer, errorMsg = JAOperationCompareFiles(
-                        currentFileName, saveFileName, 
-                        defaultParameters['BinaryFileTypes'],
-                        objectAttributes['CompareType'],
-                        defaultParameters['CommandCompare'],
-                        compareH2H, objectAttributes['IgnorePatterns'],
-                        "{0}".format(objectAttributes['Command']), ### logAdditionalInfo - command used to get environment details
-                        interactiveMode, debugLevel,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag,
-                        OSType,
-                        defaultParameters['CommandShell'],
-                        defaultParameters['LogFilePath'])
-
-                    if returnStatus == False:
-                        numberOfErrors += 1
-
-                    if fileDiffer == True:
-                        numberOfChangedCommandOutput += 1
-                    else:
-                        numberOfMatches += 1
-
-                ### done processing current object
-                continue
-
-        elif objectAttributes['FileNames'] != None:
-            referenceFileName = objectAttributes['FileNames']
-            if objectAttributes['CompareType'] == 'checksum':
-
-                ### if CompareType is checksum, save checksum with .checksum as part of file name
-                saveFileName = '{0}/{1}.checksum'.format( saveDir, itemName)
-
-                ### compute MD5 checksum and compare 
-                try:
-                    ### compute checksum and store it in fileName ending with .checksum
-                    with open(referenceFileName,"rb") as f:
-                        md5_hash = hashlib.md5()
-                        # Read and update hash in chunks of 8K
-                        for byte_block in iter(lambda: f.read(32768),b""):
-                            md5_hash.update(byte_block)
-                        currentFileMD5Digest = md5_hash.hexdigest()
-                        f.close()
-                except OSError as err:
-                    JAGlobalLib.LogLine(
-                        "ERROR JAOperationSaveCompare() Not able to open reference file:|{0}|".format(referenceFileName), 
-                        interactiveMode,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                    numberOfErrors += 1
-                    ### done processing current object
-                    continue
-
-                if operation == 'save' or operation == 'backup':
-                    ### save current checksum computed in save file name
-                    try:
-                        with open(saveFileName,"w") as file:
-                            file.write(currentFileMD5Digest)
-                            file.close()
-                            numberOfChecksumsSaved += 1
-                    except OSError as err:
-                        JAGlobalLib.LogLine(
-                            "ERROR JAOperationSaveCompare() Not able to save checksum in the file:|{0}|".format(saveFileName), 
-                            interactiveMode,
-                            myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                        numberOfErrors += 1
-                    ### done processing current object
-                    continue
-                else:
-                    ### compare operation, compare current checksum with checksum stored before
-                    try:
-                        ### previous file has checksum stored, read it directly          
-                        with open(saveFileName,"r") as f: 
-                            previousFileMD5Digest = f.readline()
-                            previousFileMD5Digest = previousFileMD5Digest.strip()
-                            f.close()
-                            numberOfChecksumsSaved += 1
-                        if currentFileMD5Digest != previousFileMD5Digest:
-                            JAGlobalLib.LogLine(
-                                "DIFF  JAOperationSaveCompare() MD5 checksum differ, current file:|{0}| checksum:{1}, saved file:|{2}|, checksum:{3}".format(
-                                referenceFileName, currentFileMD5Digest, saveFileName, previousFileMD5Digest ),
-                                interactiveMode,
-                                myColors, colorIndex, outputFileHandle, HTMLBRTag, True, OSType)
-
-                            fileDiffer = True
-                            numberOfChangedChecksum += 1
-                        else:
-                            numberOfMatches += 1
+                JAGlobalLib.LogLine(
+                    errorMsg, 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+            currentItemsMetadata = JAMetadataCollect( metadataFileNames )
 
-                    except OSError as err:
-                        JAGlobalLib.LogLine(
-                                "ERROR JAOperationCompareFiles() Not able to open file:{0}".format(saveFileName), 
-                                interactiveMode,
-                                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+    ### one JSON record per object is written to compare report
+    compareReportFile = None
+    if operation == 'compare' and defaultParameters['CompareReport'] == True:
+        compareReportFileNameWithoutPath = "JAAudit.compare.{0}.jsonl".format( JAGlobalLib.UTCDateForFileName() )
+        try:
+            compareReportFile = open( "{0}/{1}".format( defaultParameters['ReportsPath'], compareReportFileNameWithoutPath), "a")
+        except OSError as err:
+            JAGlobalLib.LogLine(
+                "ERROR JAOperationSaveCompare() Not able to open compare report file:|{0}|, error:|{1}|".format(
+                    compareReportFileNameWithoutPath, err), 
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
-                    ### done processing current object
-                    continue
-            else:
-                ### if CompareType is not checksum, save reference file contents as is
-                saveFileName = '{0}/{1}'.format( saveDir, itemName)
-
-                if objectAttributes['ComparePatterns'] != None:
-                    ### check whether the command output has ComparePatterns
-                    returnStatus, patternMatched, patternNotMatched, errorMsg = JAGlobalLib.JAComparePatterns(
-                            itemName,
-                            objectAttributes['ComparePatterns'], saveFileName, None,
-                            interactiveMode, debugLevel,
-                            myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType)
-                    if returnStatus == False: 
-                        numberOfComparePatternsNotMatched += patternNotMatched
-                    else:
-                        numberOfComparePatternsNotMatched += patternNotMatched
+    ### compare information of each object
+    for itemName in itemsToCompare:
+        numberOfItems += 1
+        objectAttributes = saveCompareParameters[itemName]
 
-                ### copy the file to save directory
-                if operation == 'save' or operation == 'backup':
+        ### details of current object written to compare report
+        if objectAttributes['Command'] != None:
+            itemType = 'command'
+        else:
+            itemType = objectAttributes['CompareType']
+        itemReport = {
+            'ItemName': itemName, 'Type': itemType, 'Status': '', 
+            'DigestOld': '', 'DigestNew': '', 'DiffHunks': 0, 'BytesRead': 0, 'ElapsedMs': 0, 'ReturnCode': None }
+        itemStartTime = time.perf_counter()
+        itemCounters = JAOperationCompareItem(
+            itemName, objectAttributes, saveDir, snapshotFileName, compareH2H,
+            previousItemsMetadata, currentItemsMetadata, itemReport,
+            defaultParameters, yamlModulePresent, interactiveMode, debugLevel,
+            myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType )
+        if itemCounters['CurrentFileName'] != '':
+            currentFileName = itemCounters['CurrentFileName']
+        numberOfErrors += itemCounters['Errors']
+        numberOfMatches += itemCounters['Matches']
+        numberOfItemsSkipped += itemCounters['ItemsSkipped']
+        numberOfInputsUnchanged += itemCounters['InputsUnchanged']
+        numberOfComparePatternsNotMatched += itemCounters['ComparePatternsNotMatched']
+        numberOfCommandOutputSaved += itemCounters['CommandOutputSaved']
+        numberOfChecksumsSaved += itemCounters['ChecksumsSaved']
+        numberOfFilesSaved += itemCounters['FilesSaved']
+        numberOfTreesSaved += itemCounters['TreesSaved']
+        numberOfMetadataSaved += itemCounters['MetadataSaved']
+        numberOfChangedCommandOutput += itemCounters['ChangedCommandOutput']
+        numberOfChangedChecksum += itemCounters['ChangedChecksum']
+        numberOfChangedFiles += itemCounters['ChangedFiles']
+        numberOfChangedTrees += itemCounters['ChangedTrees']
+        numberOfChangedMetadata += itemCounters['ChangedMetadata']
+
+        if compareReportFile != None:
+            itemReport['Status'] = itemCounters['Status']
+            itemReport['ElapsedMs'] = round( (time.perf_counter() - itemStartTime) * 1000, 3 )
+            JACompareReportWrite( compareReportFile, itemReport, thisHostName )
+
+    if compareReportFile != None:
+        compareReportFile.close()
+        ### add current report file to upload list if upload is opted
+        if re.search(r'upload', defaultParameters['Operations']):
+            if compareReportFileNameWithoutPath not in defaultParameters['ReportFileNames']:
+                defaultParameters['ReportFileNames'].append( compareReportFileNameWithoutPath )
+
+    if (operation == 'save' or operation == 'backup') and objectStoreDir == None and defaultParameters['SaveSnapshot'] == True:
+        ### pack saved files in single snapshot file, files with SkipH2H are kept as individual files
+        JAPrepareUploadFileList(
+            baseConfigFileName, 
+            subsystem, 
+            OSType, 
+            outputFileHandle, colorIndex, HTMLBRTag, myColors,
+            interactiveMode,
+            defaultParameters, saveCompareParameters,
+            debugLevel )
+        returnStatus, packedMemberNames, errorMsg = JASnapshotWrite(
+            snapshotFileName, saveDir, defaultParameters['SnapshotMemberNames'], defaultParameters['SnapshotCompression'])
+        if returnStatus == False:
+            numberOfErrors += 1
+            JAGlobalLib.LogLine(
+                errorMsg, 
+                interactiveMode,
+                myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
+        else:
+            ### delete individual files packed in snapshot, keep spec file for compare on this host
+            for memberName in packedMemberNames:
+                if re.search(r'\.save$', memberName) == None:
                     try:
-                        shutil.copy2(referenceFileName, saveFileName)
-                        numberOfFilesSaved += 1
-
+                        os.remove( "{0}/{1}".format( saveDir, memberName))
                     except OSError as err:
                         JAGlobalLib.LogLine(
-                            "ERROR JAOperationSaveCompare() Not able to save reference file:|{0}| as save file:|{1}|, error:|{2}|".format(
-                                referenceFileName, saveFileName, err), 
+                            "ERROR JAOperationSaveCompare() Not able to delete file:|{0}| packed in snapshot, error:|{1}|".format(
+                                memberName, err), 
                             interactiveMode,
                             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
-                        numberOfErrors += 1
-                else:
-                    numberOfFilesSaved += 1
-                    ### compare two files 
-                    ### compare reference file content with saveFileName content
-                    returnStatus, fileDiffer, errorMsg = JAOperationCompareFiles(
-                        referenceFileName, saveFileName, 
-                        defaultParameters['BinaryFileTypes'],
-                        objectAttributes['CompareType'],
-                        defaultParameters['CommandCompare'],
-                        compareH2H, objectAttributes['IgnorePatterns'],
-                        '', ### file comparison, no additional info to print
-                        interactiveMode, debugLevel,
-                        myColors, colorIndex, outputFileHandle, HTMLBRTag,
-                        OSType,
-                        defaultParameters['CommandShell'],
-                        defaultParameters['LogFilePath'])
-                    if returnStatus == False:
-                        numberOfErrors += 1
-                    else:
-                        if fileDiffer == True:
-                            numberOfChangedFiles += 1
-                        else:
-                            numberOfMatches += 1
+            if debugLevel > 0:
+                JAGlobalLib.LogLine(
+                    "DEBUG-1 JAOperationSaveCompare() Packed {0} files in snapshot file:|{1}|".format(
+                        len(packedMemberNames), snapshotFileName), 
+                    interactiveMode,
+                    myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
     if operation == 'save' or operation == 'backup':
         JAGlobalLib.LogLine(
-            "INFO JAOperationSaveCompare() total objects:{0}, Saved objects of commands:{1}, checksums of files:{2}, contents of files:{3} with compare patterns not found:{4}, and with errors:{5}".format(
-                numberOfItems, numberOfCommandOutputSaved, numberOfChecksumsSaved,numberOfFilesSaved, numberOfComparePatternsNotMatched, numberOfErrors), 
+            "INFO JAOperationSaveCompare() total objects:{0}, Saved objects of commands:{1}, checksums of files:{2}, contents of files:{3}, directory trees:{4}, metadata of files:{5} with compare patterns not found:{6}, and with errors:{7}".format(
+                numberOfItems, numberOfCommandOutputSaved, numberOfChecksumsSaved,numberOfFilesSaved, numberOfTreesSaved, numberOfMetadataSaved,
+                numberOfComparePatternsNotMatched, numberOfErrors), 
             interactiveMode,
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
     else:
         ### compare scenario
-        if os.path.exists(currentFileName):
+        if currentFileName != '' and os.path.exists(currentFileName):
             ### delete temporary file that was created during the compare operation 
             os.remove(currentFileName)
         JAGlobalLib.LogLine(
             "INFO JAOperationSaveCompare() compare summary - total objects:{0}, compared output of commands:{1}, checksums of files:{2}, contents of files:{3}, \
-with compare patterns not found:{4} and with errors:{5} matches: {6}, changed command outputs:{7}, changed checksums:{8}, changed files:{9}, skipped objects:{9}".format(
+with compare patterns not found:{4} and with errors:{5} matches: {6}, changed command outputs:{7}, changed checksums:{8}, changed files:{9}, skipped objects:{10}, commands skipped with unchanged inputs:{11}, \
+compared directory trees:{12}, changed directory trees:{13}, compared metadata of files:{14}, changed metadata:{15}".format(
                 numberOfItems, 
                 numberOfCommandOutputSaved, numberOfChecksumsSaved, numberOfFilesSaved, numberOfComparePatternsNotMatched, numberOfErrors,
                 numberOfMatches,
-                numberOfChangedCommandOutput, numberOfChangedChecksum, numberOfChangedFiles, numberOfItemsSkipped), 
+                numberOfChangedCommandOutput, numberOfChangedChecksum, numberOfChangedFiles, numberOfItemsSkipped,
+                numberOfInputsUnchanged, numberOfTreesSaved, numberOfChangedTrees, numberOfMetadataSaved, numberOfChangedMetadata), 
             interactiveMode,
             myColors, colorIndex, outputFileHandle, HTMLBRTag, False, OSType)
 
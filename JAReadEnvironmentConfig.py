@@ -50,14 +50,15 @@ def JAReadEnvironmentConfig(
     # this list contains the parameter names in JAEnvornment.yml file that needs to be converted to integer and store
     #  in defaultParameters{}
     integerParameters = [
-        'BackupRetencyDurationInDays',
+        'BackupRetencyDurationInDays', 'CertDiscoveryMaxFileSize', 'ConnCheckMaxConcurrency', 'DNSCacheTTL',
         'DebugLevel','DueInDaysForCert', 'FileRetencyDurationInDays','FileExecPermission', 
-        'DueInDaysForLicence', 'RandomizationWindowForHealthInSec', 'RandomizationWindowForOtherInSec',
-        'RandomizationWindowForTaskInSec', 'SitePrefixLength',
+        'DueInDaysForLicence', 'HealthMetricsHistorySize', 'MaxParallelTests', 'MaxThreadsForSave', 'RandomizationWindowForHealthInSec', 'RandomizationWindowForOtherInSec',
+        'RandomizationWindowForTaskInSec', 'SitePrefixLength', 'TestTimeoutInSec',
         ]
     # this list contains the parameter names in JAEnvornment.yml file that needs to be converted to float and store
     #  in defaultParameters{}
     floatParameters = [
+        'ConnCheckRate', 'ConnCheckTimeout',
         'OperationCert', 'OperationConn',
         'OperationCompare', 'OperationHeal', 'OperationHealth', 'OperationInventory', 'OperationLicense', 'OperationLogs',
         'OperationPerfStatsApp', 'OperationPerfStatsOS', 'OperationSave', 'OperationStats', 'OperationSync', 
@@ -192,6 +193,15 @@ def JAReadEnvironmentConfig(
     if 'BinaryFileTypes' not in defaultParameters:
         defaultParameters['BinaryFileTypes'] = '(\.jar)|(\.war)|(\.)tar|(\.).gz|(\.)zip|(\.)gzip|logfilter(.*)'
 
+    ### checksum algorithm used for CompareType checksum, refer to JAGlobalLib.JAChecksumAlgorithms
+    checksumAlgorithm, tempErrorMsg = JAGlobalLib.JAGetChecksumAlgorithm( defaultParameters.get('ChecksumAlgorithm') )
+    if checksumAlgorithm == None:
+        ### checksums saved earlier keep their algorithm tag, those are compared using that algorithm
+        errorMsg += "WARN JAReadEnvironmentConfig() {0}, using {1} to compute new checksums\n".format(
+            tempErrorMsg, JAGlobalLib.JAChecksumDefaultAlgorithm)
+        checksumAlgorithm = JAGlobalLib.JAChecksumDefaultAlgorithm
+    defaultParameters['ChecksumAlgorithm'] = checksumAlgorithm
+
     if 'RandomizationWindowInSec' not in defaultParameters:
         defaultParameters['RandomizationWindowInSec'] = 600
         if debugLevel > 0:
@@ -210,6 +220,70 @@ def JAReadEnvironmentConfig(
     if 'MaxWaitTime' not in defaultParameters:
         defaultParameters['MaxWaitTime'] = 600
 
+    ### max threads used to save objects in parallel during save and backup operations
+    if 'MaxThreadsForSave' not in defaultParameters:
+        defaultParameters['MaxThreadsForSave'] = 8
+    elif defaultParameters['MaxThreadsForSave'] < 1:
+        errorMsg += "WARN JAReadEnvironmentConfig() MaxThreadsForSave:{0} needs to be 1 or more, using 1\n".format(
+            defaultParameters['MaxThreadsForSave'])
+        defaultParameters['MaxThreadsForSave'] = 1
+
+    ### check connectivity with built-in prober instead of CommandConnCheck
+    defaultParameters['ConnCheckBuiltIn'] = JAGlobalLib.JAParseBool( defaultParameters.get('ConnCheckBuiltIn'), True )
+    ### timeout in seconds for each connection, max connections in progress at any time
+    if 'ConnCheckTimeout' not in defaultParameters:
+        defaultParameters['ConnCheckTimeout'] = 5.0
+    elif defaultParameters['ConnCheckTimeout'] <= 0:
+        errorMsg += "WARN JAReadEnvironmentConfig() ConnCheckTimeout:{0} needs to be more than 0, using 5\n".format(
+            defaultParameters['ConnCheckTimeout'])
+        defaultParameters['ConnCheckTimeout'] = 5.0
+    if 'ConnCheckMaxConcurrency' not in defaultParameters:
+        defaultParameters['ConnCheckMaxConcurrency'] = 200
+    elif defaultParameters['ConnCheckMaxConcurrency'] < 1:
+        errorMsg += "WARN JAReadEnvironmentConfig() ConnCheckMaxConcurrency:{0} needs to be 1 or more, using 1\n".format(
+            defaultParameters['ConnCheckMaxConcurrency'])
+        defaultParameters['ConnCheckMaxConcurrency'] = 1
+    ### max connections started per second, 0 for no limit
+    if 'ConnCheckRate' not in defaultParameters:
+        defaultParameters['ConnCheckRate'] = 0
+    elif defaultParameters['ConnCheckRate'] < 0:
+        errorMsg += "WARN JAReadEnvironmentConfig() ConnCheckRate:{0} needs to be 0 or more, using 0 (no limit)\n".format(
+            defaultParameters['ConnCheckRate'])
+        defaultParameters['ConnCheckRate'] = 0
+    ### seconds for which host name resolution results are reused within the run
+    if 'DNSCacheTTL' not in defaultParameters:
+        defaultParameters['DNSCacheTTL'] = 300
+
+    ### on Linux, collect listen ports from /proc/net instead of executing CommandToGetListenPorts
+    defaultParameters['ListenPortsBuiltIn'] = JAGlobalLib.JAParseBool( defaultParameters.get('ListenPortsBuiltIn'), True )
+    ### map listen ports to process id and name
+    defaultParameters['ListenPortsProcessInfo'] = JAGlobalLib.JAParseBool( defaultParameters.get('ListenPortsProcessInfo'), False )
+
+    ### warn when cert expires within these many days
+    if 'DueInDaysForCert' not in defaultParameters:
+        defaultParameters['DueInDaysForCert'] = 30
+    ### directories to search for cert files during cert operation, empty to disable discovery
+    if 'CertDiscoveryRoots' not in defaultParameters:
+        defaultParameters['CertDiscoveryRoots'] = ''
+    if 'CertDiscoveryFileTypes' not in defaultParameters:
+        defaultParameters['CertDiscoveryFileTypes'] = r'\.(pem|crt|cer|der|p12|pfx)$'
+    if 'CertDiscoveryMaxFileSize' not in defaultParameters:
+        defaultParameters['CertDiscoveryMaxFileSize'] = 1048576
+
+    ### number of health metrics samples kept in history file
+    if 'HealthMetricsHistorySize' not in defaultParameters:
+        defaultParameters['HealthMetricsHistorySize'] = JAGlobalLib.JAHealthMetricsHistorySize
+    elif defaultParameters['HealthMetricsHistorySize'] < 1:
+        errorMsg += "WARN JAReadEnvironmentConfig() HealthMetricsHistorySize:{0} needs to be 1 or more, using 1\n".format(
+            defaultParameters['HealthMetricsHistorySize'])
+        defaultParameters['HealthMetricsHistorySize'] = 1
+
+    if 'MaxParallelTests' not in defaultParameters:
+        defaultParameters['MaxParallelTests'] = 8
+
+    if 'TestTimeoutInSec' not in defaultParameters:
+        defaultParameters['TestTimeoutInSec'] = 30
+
     if 'FilesToExcludeInWget' not in defaultParameters:
         ### default skip files
         defaultParameters['FilesToExcludeInWget'] = '(\.swp$)|(\.log$)|^__pycache__/$'
@@ -234,6 +308,21 @@ def JAReadEnvironmentConfig(
     if 'BackupRetencyDurationInDays' not in defaultParameters:
         defaultParameters['BackupRetencyDurationInDays'] = 60
 
+    ### save backup contents in content addressed object store, unchanged contents are hardlinked
+    defaultParameters['BackupObjectStore'] = JAGlobalLib.JAParseBool( defaultParameters.get('BackupObjectStore'), True )
+    ### object store directory name under LocalRepositoryHome, 
+    ###   DO NOT start the name with 'Backup', those directories are deleted after 'BackupRetencyDurationInDays'
+    if 'BackupObjectStoreDir' not in defaultParameters:
+        defaultParameters['BackupObjectStoreDir'] = 'ObjectStore'
+
+    ### pack saved files in single snapshot file during save operation
+    defaultParameters['SaveSnapshot'] = JAGlobalLib.JAParseBool( defaultParameters.get('SaveSnapshot'), False )
+    if 'SnapshotCompression' not in defaultParameters:
+        defaultParameters['SnapshotCompression'] = 'gzip'
+
+    ### write compare result of each object in JSON Lines form under ReportsPath
+    defaultParameters['CompareReport'] = JAGlobalLib.JAParseBool( defaultParameters.get('CompareReport'), True )
+
     if OSType == "Windows":
         if 'CommandShell' not in defaultParameters:
             ### chekc if powershell 7 is present
@@ -286,6 +375,8 @@ def JAReadEnvironmentConfig(
     if re.match(r'/$', logFilePath) == None:
         logFilePath = '{0}/'.format(logFilePath)
     defaultParameters['LogFilePath'] = logFilePath
+    ### health metrics helpers called without file name use this path
+    JAGlobalLib.JALogFilePath = logFilePath
 
     if os.path.exists(logFilePath) == False:
         try:
@@ -0,0 +1,94 @@
+"""
+Checks of content addressed backup object store
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+import JAOperationSaveCompare
+
+### color codes are not used with colorIndex 0
+myColors = {
+    'red': [''], 'green': [''], 'yellow': [''], 'blue': [''], 'magenta': [''], 'cyan': [''], 'clear': [''] }
+
+
+class TestBackupStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.objectStoreDir = os.path.join(self.tempDir.name, 'ObjectStore')
+        self.sourceFileName = os.path.join(self.tempDir.name, 'source.txt')
+        with open(self.sourceFileName, 'w') as file:
+            file.write('same content\n')
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def MakeBackupDir(self, backupName):
+        backupDir = os.path.join(self.tempDir.name, backupName)
+        os.mkdir(backupDir)
+        return backupDir
+
+    def test_blob_file_name(self):
+        self.assertEqual(
+            JAOperationSaveCompare.JABackupStoreDeriveBlobFileName('/store', 'sha256:abcdef'),
+            '/store/sha256/ab/abcdef')
+
+    def test_unchanged_file_is_stored_once(self):
+        saveFileNames = []
+        for backupName in ('Backup20260101', 'Backup20260102'):
+            saveFileName = os.path.join(self.MakeBackupDir(backupName), 'item')
+            returnStatus, fileDigest, errorMsg = JAOperationSaveCompare.JABackupStoreSaveFile(
+                self.sourceFileName, saveFileName, self.objectStoreDir, 'sha256', False)
+            self.assertTrue(returnStatus, errorMsg)
+            saveFileNames.append(saveFileName)
+
+        blobFileName = JAOperationSaveCompare.JABackupStoreDeriveBlobFileName(self.objectStoreDir, fileDigest)
+        self.assertTrue(os.path.samefile(saveFileNames[0], blobFileName))
+        self.assertTrue(os.path.samefile(saveFileNames[1], blobFileName))
+        with open(saveFileNames[1]) as file:
+            self.assertEqual(file.read(), 'same content\n')
+        ### no temp blob is left behind
+        self.assertEqual(os.listdir(os.path.dirname(blobFileName)), [os.path.basename(blobFileName)])
+
+    def test_garbage_collect_keeps_referenced_blobs(self):
+        backupDir = self.MakeBackupDir('Backup20260101')
+        returnStatus, fileDigest, errorMsg = JAOperationSaveCompare.JABackupStoreSaveFile(
+            self.sourceFileName, os.path.join(backupDir, 'item'), self.objectStoreDir, 'sha256', False)
+        self.assertTrue(returnStatus, errorMsg)
+        returnStatus, errorMsg = JAOperationSaveCompare.JABackupStoreWriteManifest(backupDir, {'item': fileDigest})
+        self.assertTrue(returnStatus, errorMsg)
+
+        ### blob of a backup directory removed after retency period
+        with open(self.sourceFileName, 'w') as file:
+            file.write('old content\n')
+        returnStatus, oldDigest, errorMsg = JAOperationSaveCompare.JABackupStoreSaveFile(
+            self.sourceFileName, os.path.join(self.tempDir.name, 'old'), self.objectStoreDir, 'sha256', False)
+        self.assertTrue(returnStatus, errorMsg)
+
+        numberOfBlobsDeleted, numberOfBlobsKept = JAOperationSaveCompare.JABackupStoreGarbageCollect(
+            self.tempDir.name, self.objectStoreDir, False, 0, myColors, 0, None, '', 'Linux')
+        self.assertEqual((numberOfBlobsDeleted, numberOfBlobsKept), (1, 1))
+        self.assertTrue(os.path.exists(
+            JAOperationSaveCompare.JABackupStoreDeriveBlobFileName(self.objectStoreDir, fileDigest)))
+        self.assertFalse(os.path.exists(
+            JAOperationSaveCompare.JABackupStoreDeriveBlobFileName(self.objectStoreDir, oldDigest)))
+
+    def test_parse_bool(self):
+        self.assertTrue(JAGlobalLib.JAParseBool(None, True))
+        self.assertFalse(JAGlobalLib.JAParseBool(None, False))
+        self.assertTrue(JAGlobalLib.JAParseBool(True, False))
+        self.assertTrue(JAGlobalLib.JAParseBool('Yes', False))
+        self.assertTrue(JAGlobalLib.JAParseBool('TRUE', False))
+        self.assertFalse(JAGlobalLib.JAParseBool('False', True))
+        self.assertFalse(JAGlobalLib.JAParseBool('no', True))
+
+
+if __name__ == '__main__':
+    unittest.main()
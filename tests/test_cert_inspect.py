@@ -0,0 +1,117 @@
+"""
+Checks of in-process X.509 certificate inspector of cert operation
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import ssl
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationCHILT
+
+### self signed EC cert generated with
+###   openssl req -x509 -newkey ec -pkeyopt ec_paramgen_curve:prime256v1 -nodes -days 3650
+###     -subj "/C=US/O=JaaduAudit/CN=test.jaaudit.local" -addext "subjectAltName=DNS:test.jaaudit.local,IP:10.1.2.3"
+###     -set_serial 0x1234ABCD
+JATestCertPEM = """\
+-----BEGIN CERTIFICATE-----
+MIIB5zCCAY6gAwIBAgIEEjSrzTAKBggqhkjOPQQDAjA/MQswCQYDVQQGEwJVUzET
+MBEGA1UECgwKSmFhZHVBdWRpdDEbMBkGA1UEAwwSdGVzdC5qYWF1ZGl0LmxvY2Fs
+MB4XDTI2MTAxOTE1NTAyOFoXDTM2MTAxNjE1NTAyOFowPzELMAkGA1UEBhMCVVMx
+EzARBgNVBAoMCkphYWR1QXVkaXQxGzAZBgNVBAMMEnRlc3QuamFhdWRpdC5sb2Nh
+bDBZMBMGByqGSM49AgEGCCqGSM49AwEHA0IABKNJNSLGNvvKYF2+9GGsQKgWlS64
+5e4F+ASrd6ZICf+8nE8+mSeZxvzNakiwbOolgQA5tvT5aehioHhu6nLgbIijeDB2
+MB0GA1UdDgQWBBQXqD0Y5CwdUie4d7wG7OulrLciXjAfBgNVHSMEGDAWgBQXqD0Y
+5CwdUie4d7wG7OulrLciXjAPBgNVHRMBAf8EBTADAQH/MCMGA1UdEQQcMBqCEnRl
+c3QuamFhdWRpdC5sb2NhbIcECgECAzAKBggqhkjOPQQDAgNHADBEAiAWM4T+JlwN
+hfDs1ROI5BNsZxkt5fnG/ub/3+D1khMhnwIgVTs2E2xB2oMIdh+jRKUJOW4/1M7A
+bfVxa424cRhfvxo=
+-----END CERTIFICATE-----
+"""
+
+
+class TestCertInspect(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.pemFileName = os.path.join(self.tempDir.name, 'server.pem')
+        self.derFileName = os.path.join(self.tempDir.name, 'server.der')
+        with open(self.pemFileName, 'w') as file:
+            file.write('leading text\n' + JATestCertPEM)
+        with open(self.derFileName, 'wb') as file:
+            file.write(ssl.PEM_cert_to_DER_cert(JATestCertPEM))
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_decode_der(self):
+        certDetails = JAOperationCHILT.JACertDecodeDER(ssl.PEM_cert_to_DER_cert(JATestCertPEM))
+        ### expected values are from openssl x509 -noout -dates -subject -issuer -fingerprint -sha256 -ext subjectAltName -serial
+        self.assertEqual(certDetails['Subject'], 'C = US, O = JaaduAudit, CN = test.jaaudit.local')
+        self.assertEqual(certDetails['Issuer'], certDetails['Subject'])
+        self.assertEqual(certDetails['SubjectAltNames'], ['DNS:test.jaaudit.local', 'IP Address:10.1.2.3'])
+        self.assertEqual(certDetails['SerialNumber'], '1234ABCD')
+        ### Oct 19 15:50:28 2026 GMT, Oct 16 15:50:28 2036 GMT
+        self.assertEqual(certDetails['NotBefore'], 1792425028)
+        self.assertEqual(certDetails['NotAfter'], 2107785028)
+        self.assertEqual(
+            certDetails['Fingerprint'],
+            '66:FD:EB:D0:03:CA:1B:72:B4:4D:3D:B2:A8:B4:11:B3:F6:29:E1:B2:07:6F:C9:35:2E:BF:61:83:FC:E8:A9:75')
+
+    def test_decode_invalid_der(self):
+        with self.assertRaises((IndexError, ValueError)):
+            JAOperationCHILT.JACertDecodeDER(b'\x30\x82\x01')
+
+    def test_read_pem_and_der_files(self):
+        for certFileName in (self.pemFileName, self.derFileName):
+            returnStatus, fileDigest, certsDER, errorMsg = JAOperationCHILT.JACertReadFile(certFileName, None)
+            self.assertTrue(returnStatus, errorMsg)
+            self.assertEqual(certsDER, [ssl.PEM_cert_to_DER_cert(JATestCertPEM)])
+        returnStatus, fileDigest, certsDER, errorMsg = JAOperationCHILT.JACertReadFile(
+            os.path.join(self.tempDir.name, 'missing.pem'), None)
+        self.assertFalse(returnStatus)
+
+    def test_inspect_files_uses_cache(self):
+        certCache = {}
+        usedCertCache = {}
+        returnStatus, returnOutput, certsDetails, errorMsg = JAOperationCHILT.JACertInspectFiles(
+            [self.pemFileName], None, certCache, usedCertCache, 0)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertIn('notAfter=Oct 16 15:50:28 2036 GMT', returnOutput)
+        self.assertIn('subjectAltName=DNS:test.jaaudit.local, IP Address:10.1.2.3', returnOutput)
+
+        ### cached details are used for same file contents
+        fileDigest = list(usedCertCache)[0]
+        cachedDetails = dict(usedCertCache[fileDigest][0], Subject='CN = cached')
+        returnStatus, returnOutput, certsDetails, errorMsg = JAOperationCHILT.JACertInspectFiles(
+            [self.pemFileName], None, {fileDigest: [cachedDetails]}, {}, 0)
+        self.assertIn('subject=CN = cached', returnOutput)
+
+    def test_get_file_names(self):
+        returnStatus, certFileNames, errorMsg = JAOperationCHILT.JACertGetFileNames(
+            '{0}, {1}/*.der'.format(self.pemFileName, self.tempDir.name))
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(certFileNames, [self.pemFileName, self.derFileName])
+
+        returnStatus, certFileNames, errorMsg = JAOperationCHILT.JACertGetFileNames(
+            'certs/server.pem, {0}/*.crt'.format(self.tempDir.name))
+        self.assertFalse(returnStatus)
+        self.assertIn('Cert file:|certs/server.pem| needs to be absolute path', errorMsg)
+        self.assertIn('No cert file matched:|{0}/*.crt|'.format(self.tempDir.name), errorMsg)
+
+    def test_check_dates(self):
+        notBefore = 1792425028
+        notAfter = 2107785028
+        self.assertEqual(JAOperationCHILT.JACertCheckDates('c1', notBefore, notAfter, notBefore + 86400, 30)[0], 'PASS')
+        self.assertEqual(JAOperationCHILT.JACertCheckDates('c1', notBefore, notAfter, notAfter - 86400 * 10, 30)[0], 'WARN')
+        self.assertEqual(JAOperationCHILT.JACertCheckDates('c1', notBefore, notAfter, notAfter + 1, 30)[1], 'Expired cert')
+        self.assertEqual(
+            JAOperationCHILT.JACertCheckDates('c1', notBefore, notAfter, notBefore - 1, 30)[1], 'Future NotBefore date')
+
+
+if __name__ == '__main__':
+    unittest.main()
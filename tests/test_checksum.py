@@ -0,0 +1,59 @@
+"""
+Checks of checksum helpers used by checksum CompareType
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestChecksum(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.tempDir.name, 'data.txt')
+        self.fileContent = b'line1\nline2\n' * 1000
+        with open(self.fileName, 'wb') as file:
+            file.write(self.fileContent)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_default_algorithm(self):
+        algorithm, errorMsg = JAGlobalLib.JAGetChecksumAlgorithm(None)
+        self.assertEqual(algorithm, JAGlobalLib.JAChecksumDefaultAlgorithm)
+        self.assertEqual(errorMsg, '')
+
+    def test_unsupported_algorithm_is_not_substituted(self):
+        algorithm, errorMsg = JAGlobalLib.JAGetChecksumAlgorithm('crc32')
+        self.assertIsNone(algorithm)
+        self.assertIn('Unsupported', errorMsg)
+
+    def test_digest_matches_hashlib(self):
+        for algorithm in ('md5', 'sha256', 'blake2b'):
+            returnStatus, digest, errorMsg = JAGlobalLib.JAComputeFileDigest(self.fileName, algorithm, bufferSize=512)
+            self.assertTrue(returnStatus, errorMsg)
+            self.assertEqual(digest, "{0}:{1}".format(algorithm, hashlib.new(algorithm, self.fileContent).hexdigest()))
+
+    def test_digest_of_missing_file(self):
+        returnStatus, digest, errorMsg = JAGlobalLib.JAComputeFileDigest(
+            os.path.join(self.tempDir.name, 'missing'), 'sha256')
+        self.assertFalse(returnStatus)
+        self.assertEqual(digest, '')
+
+    def test_parse_checksum(self):
+        self.assertEqual(JAGlobalLib.JAParseChecksum('sha256:abcd'), ('sha256', 'abcd'))
+        ### checksum saved without algorithm tag is md5 checksum
+        self.assertEqual(JAGlobalLib.JAParseChecksum('abcd\n'), ('md5', 'abcd'))
+        self.assertEqual(JAGlobalLib.JAParseChecksum(JAGlobalLib.JAFormatChecksum('blake2b', 'ff')), ('blake2b', 'ff'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Checks of compiled classifier of connectivity check output
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestClassifier(unittest.TestCase):
+
+    def test_command_outputs(self):
+        for returnOutput, expectedOutcome in (
+                ('Connection to host1 22 port [tcp/ssh] succeeded!', 'PASS'),
+                ('host1 [10.1.1.1] 22 (ssh) open', 'PASS'),
+                (['Trying 10.1.1.1...', 'Connected to host1.', "Escape character is '^]'."], 'PASS'),
+                ('TcpTestSucceeded : True', 'PASS'),
+                ('nc: connect to host1 port 22 (tcp) failed: Connection refused', 'REFUSED'),
+                ('nc: getaddrinfo for host "host1" port 22: Name or service not known', 'DNS'),
+                ('Could not resolve hostname host1: DNS lookup timed out after 5 sec', 'DNS'),
+                ('nc: connect to host1 port 22 (tcp) failed: Connection timed out', 'TIMEOUT'),
+                ('TcpTestSucceeded : False', 'TIMEOUT'),
+                ('TLS handshake failed with host1 443: EOF', 'FAILED'),
+                ('TLS certificate verification failed with host1 443: self-signed certificate', 'FAILED'),
+                ('some other output', 'UNKNOWN'),
+                ('', 'UNKNOWN')):
+            self.assertEqual(
+                JAGlobalLib.JAClassifyConnectivityOutput(returnOutput), expectedOutcome, returnOutput)
+
+    def test_telnet_error_is_not_pass(self):
+        ### 'open' within error text is not a successful nc line
+        self.assertEqual(
+            JAGlobalLib.JAClassifyConnectivityOutput(
+                'Connecting To host1...Could not open connection to the host, on port 22: Connect failed'),
+            'FAILED')
+        self.assertNotEqual(JAGlobalLib.JAClassifyConnectivityOutput('file open error'), 'PASS')
+
+    def test_outcome_counts(self):
+        outcomeCounts = {}
+        for returnOutput in ('Connection refused', 'Connection refused', 'succeeded'):
+            JAGlobalLib.JAClassifyConnectivityOutput(returnOutput, outcomeCounts)
+        self.assertEqual(outcomeCounts, {'REFUSED': 2, 'PASS': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Checks of compiled ComparePatterns
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+### color codes are not used with colorIndex 0
+myColors = {
+    'red': [''], 'green': [''], 'yellow': [''], 'blue': [''], 'magenta': [''], 'cyan': [''], 'clear': [''] }
+
+JATestText = [
+    'version: 3.2.1',
+    'port = 8080',
+    'ratio = 0.75',
+    'mode = enforcing' ]
+
+
+class TestComparePatterns(unittest.TestCase):
+
+    def setUp(self):
+        self.outputFileHandle = io.StringIO()
+
+    def Compile(self, comparePatterns):
+        return JAGlobalLib.JACompileComparePatterns(
+            'item1', comparePatterns, False, 0, myColors, 0, self.outputFileHandle, '', 'Linux')
+
+    def Compare(self, comparePatterns, fileName=None, textBuffer=JATestText):
+        return JAGlobalLib.JAComparePatterns(
+            'item1', comparePatterns, fileName, textBuffer, False, 0, myColors, 0, self.outputFileHandle, '', 'Linux')
+
+    def test_compile(self):
+        compiledPatterns = self.Compile({r'port = (\d+)': {1: 8080}, r'mode = (\w+)': {'1': 'enforcing'}, 'version': None})
+        self.assertEqual(compiledPatterns[0]['Groups'], [(1, 8080)])
+        self.assertEqual(compiledPatterns[1]['Groups'], [(1, 'enforcing')])
+        self.assertEqual(compiledPatterns[2]['Groups'], [])
+        self.assertIsNotNone(compiledPatterns[2]['Regex'])
+
+    def test_invalid_pattern_and_group_number(self):
+        compiledPatterns = self.Compile({'port = (': None, r'mode = (\w+)': {'x': 'enforcing'}})
+        self.assertIsNone(compiledPatterns[0]['Regex'])
+        self.assertEqual(compiledPatterns[1]['Groups'], [(0, 'enforcing')])
+        self.assertIn('invalid comparePattern', self.outputFileHandle.getvalue())
+        self.assertIn('invalid group number', self.outputFileHandle.getvalue())
+        returnStatus, patternsFound, patternsNotFound, patternResults, errorMsg = self.Compare(compiledPatterns)
+        self.assertFalse(returnStatus)
+        self.assertEqual((patternsFound, patternsNotFound), (0, 2))
+
+    def test_all_patterns_match(self):
+        compiledPatterns = self.Compile({
+            r'^version: (\d+)\.(\d+)': {1: 3, 2: '2'},
+            r'port = (\d+)': {1: 8080},
+            r'ratio = ([\d.]+)': {1: 0.75},
+            '^mode': None })
+        returnStatus, patternsFound, patternsNotFound, patternResults, errorMsg = self.Compare(compiledPatterns)
+        self.assertEqual((returnStatus, patternsFound, patternsNotFound, errorMsg), (True, 4, 0, ''))
+        self.assertEqual(patternResults[0], {'Pattern': r'^version: (\d+)\.(\d+)', 'Found': True, 'Groups': [
+            {'Group': 1, 'Expected': 3, 'Current': '3', 'Matched': True},
+            {'Group': 2, 'Expected': '2', 'Current': '2', 'Matched': True}]})
+        self.assertEqual(patternResults[3], {'Pattern': '^mode', 'Found': True, 'Groups': []})
+        self.assertEqual(JAGlobalLib.JAFormatPatternResults(patternResults), [])
+        ### spec in dictionary form is compiled for the call
+        self.assertEqual(
+            self.Compare({r'port = (\d+)': {1: 8080}}, textBuffer='\n'.join(JATestText))[:3], (True, 1, 0))
+
+    def test_group_value_mismatch(self):
+        compiledPatterns = self.Compile({r'port = (\d+)': {1: 80}, r'mode = (\w+)': {1: 1}, r'ratio = ([\d.]+)': {2: 0.75}})
+        returnStatus, patternsFound, patternsNotFound, patternResults, errorMsg = self.Compare(compiledPatterns)
+        self.assertFalse(returnStatus)
+        self.assertEqual((patternsFound, patternsNotFound), (0, 3))
+        self.assertIn('expected value:|80| is NOT matching to current value:|8080|', self.outputFileHandle.getvalue())
+        self.assertEqual(patternResults[0], {'Pattern': r'port = (\d+)', 'Found': False, 'Groups': [
+            {'Group': 1, 'Expected': 80, 'Current': '8080', 'Matched': False}]})
+        ### group number beyond groups of the pattern has no current value
+        self.assertEqual(patternResults[2]['Groups'], [{'Group': 2, 'Expected': 0.75, 'Current': None, 'Matched': False}])
+        self.assertEqual(JAGlobalLib.JAFormatPatternResults(patternResults)[0],
+            r'Pattern:|port = (\d+)| NOT matched, group:1 expected:|80| current:|8080| NOT matched')
+
+    def test_pattern_in_file(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = os.path.join(tempDir, 'app.conf')
+            with open(fileName, 'w') as file:
+                file.write('\n'.join(JATestText))
+            compiledPatterns = self.Compile({'^port': None, '^missing': None})
+            returnStatus, patternsFound, patternsNotFound, patternResults, errorMsg = self.Compare(
+                compiledPatterns, fileName=fileName)
+            self.assertEqual((returnStatus, patternsFound, patternsNotFound), (False, 1, 1))
+            self.assertEqual([patternResult['Found'] for patternResult in patternResults], [True, False])
+            self.assertEqual(JAGlobalLib.JAFormatPatternResults(patternResults), ['Pattern:|^missing| NOT found'])
+            returnStatus, patternsFound, patternsNotFound, patternResults, errorMsg = self.Compare(
+                compiledPatterns, fileName=os.path.join(tempDir, 'missing.conf'))
+            self.assertFalse(returnStatus)
+            self.assertIn("can't open file", self.outputFileHandle.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
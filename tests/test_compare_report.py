@@ -0,0 +1,69 @@
+"""
+Checks of machine readable compare report
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+### color codes are not used with colorIndex 0
+myColors = {
+    'red': [''], 'green': [''], 'yellow': [''], 'blue': [''], 'magenta': [''], 'cyan': [''], 'clear': [''] }
+
+
+class TestCompareReport(unittest.TestCase):
+
+    def test_report_line(self):
+        compareReportFile = io.StringIO()
+        JAOperationSaveCompare.JACompareReportWrite(
+            compareReportFile, {'ItemName': 'item1', 'Status': 'changed', 'DiffHunks': 2, 'ElapsedMs': 5}, 'host1')
+        JAOperationSaveCompare.JACompareReportWrite(
+            compareReportFile, {'ItemName': 'item2', 'Status': 'match'}, 'host1')
+        compareRecords = [json.loads(line) for line in compareReportFile.getvalue().splitlines()]
+        self.assertEqual(len(compareRecords), 2)
+        self.assertEqual(compareRecords[0]['HostName'], 'host1')
+        self.assertEqual(compareRecords[0]['ItemName'], 'item1')
+        self.assertEqual(compareRecords[0]['DiffHunks'], 2)
+        self.assertIn('TimeStamp', compareRecords[0])
+        self.assertEqual(compareRecords[1]['Status'], 'match')
+
+    def test_count_diff_hunks(self):
+        self.assertEqual(JAOperationSaveCompare.JACountDiffHunks([
+            '--- a', '+++ b', '@@ -1 +1 @@', '-x', '+y', '@@ -5 +5 @@', '-z', '+w']), 2)
+        self.assertEqual(JAOperationSaveCompare.JACountDiffHunks(['5c5', '< a', '---', '> b', '10,12d9', '< c']), 2)
+        self.assertEqual(JAOperationSaveCompare.JACountDiffHunks(['a  =>', 'b  <=', 'c  =>']), 3)
+        self.assertEqual(JAOperationSaveCompare.JACountDiffHunks(['']), 0)
+
+    def test_compare_details(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            currentFileName = os.path.join(tempDir, 'item.current')
+            previousFileName = os.path.join(tempDir, 'item')
+            with open(currentFileName, 'w') as file:
+                file.write('a\nb\nc\n')
+            with open(previousFileName, 'w') as file:
+                file.write('a\nB\nc\n')
+            compareDetails = {}
+            ### host to host compare with ignore patterns compares in memory without compare command
+            returnStatus, fileDiffer, errorMsg = JAOperationSaveCompare.JAOperationCompareFiles(
+                currentFileName, previousFileName, r'\.so$', None, 'diff',
+                True, ['pid=\\d+'], '',
+                False, 0, myColors, 0, None, '', 'Linux', '/bin/sh -c', tempDir + '/',
+                'sha256', compareDetails)
+            self.assertTrue(returnStatus, errorMsg)
+            self.assertTrue(fileDiffer)
+            self.assertTrue(compareDetails['DigestNew'].startswith('sha256:'))
+            self.assertNotEqual(compareDetails['DigestNew'], compareDetails['DigestOld'])
+            self.assertEqual(compareDetails['BytesRead'], 12)
+            self.assertEqual(compareDetails['DiffHunks'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Checks of connectivity matrix built from uploaded conn reports
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAConnMatrix
+
+### one run of conn report in the layout written by JAOperationConn
+JAConnReportTemplate = """\
+TimeStamp: {0}
+    Platform: Platform1
+    Component: App
+    HostName: {1}
+    Environment: Test
+    Items:
+        DB:
+            Command: None
+            Condition: None
+            HostNames: {2}
+            Ports: 5432
+            Protocol: TCP
+            Results:
+                - Name: {2}
+                Port: 5432
+                Result: {3}
+                Details: {4}
+                Outcome: {5}
+                DNSTime: 1.0
+                ConnectTime: 2.0
+        Web:
+            Command: None
+            Condition: None
+            HostNames: {2}
+            Ports: 80-81
+            Protocol: TCP
+            Results:
+                - Name: {2}
+                Port: 80
+                Result: PASS
+                Details: Connection to {2} 80 port [tcp] succeeded
+                - Name: {2}
+                Port: 80-81
+                Result: PASS
+                Details: Overall Result for all hosts
+    Summary:
+        Total: 2
+"""
+
+
+class TestConnMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def AppendReport(self, sourceHost, timeStamp, destinationHost, result, details, outcome):
+        reportDir = os.path.join(self.tempDir.name, 'Platform1', sourceHost)
+        os.makedirs(reportDir, exist_ok=True)
+        with open(os.path.join(reportDir, 'JAAudit.conn.20260101'), 'a') as reportFile:
+            reportFile.write(JAConnReportTemplate.format(
+                timeStamp, sourceHost, destinationHost, result, details, outcome))
+
+    def test_update_keeps_latest_outcome(self):
+        matrix = JAConnMatrix.JAMatrixNew()
+        JAConnMatrix.JAMatrixUpdate(matrix, 'app01', 'db01', 5432, 'PASS', 200.0)
+        JAConnMatrix.JAMatrixUpdate(matrix, 'app01', 'db01', 5432, 'TIMEOUT', 100.0)
+        self.assertEqual(
+            JAConnMatrix.JAMatrixQuery(matrix, None, None, None, False),
+            [('app01', 'db01', 5432, 'PASS', 200.0, '-')])
+        JAConnMatrix.JAMatrixUpdate(matrix, 'app01', 'db01', 5432, 'REFUSED', 300.0)
+        self.assertEqual(JAConnMatrix.JAMatrixQuery(matrix, None, 'db01', None, True)[0][3], 'REFUSED')
+
+    def test_reverse_outcome(self):
+        matrix = JAConnMatrix.JAMatrixNew()
+        JAConnMatrix.JAMatrixUpdate(matrix, 'app01', 'db01', 5432, 'TIMEOUT', 1.0)
+        JAConnMatrix.JAMatrixUpdate(matrix, 'db01', 'app01', 22, 'PASS', 1.0)
+        queryResults = JAConnMatrix.JAMatrixQuery(matrix, 'app01', None, None, True)
+        self.assertEqual(queryResults, [('app01', 'db01', 5432, 'TIMEOUT', 1.0, 'PASS')])
+
+    def test_scan_reports_incrementally(self):
+        self.AppendReport('app01', '2026-01-01T10:00:00.000000', 'db01', 'ERROR',
+            'nc: connect to db01 port 5432 (tcp) failed: Connection refused', 'REFUSED')
+        self.AppendReport('app02', '2026-01-01T10:00:00.000000', 'db01', 'PASS',
+            'Connection to db01 5432 port [tcp] succeeded', 'PASS')
+        matrix = JAConnMatrix.JAMatrixNew()
+        numberOfReports, numberOfResults = JAConnMatrix.JAMatrixScanReports(matrix, self.tempDir.name, 0)
+        ### results of port range and overall result are not saved
+        self.assertEqual((numberOfReports, numberOfResults), (2, 4))
+        self.assertEqual(
+            [queryResult[:4] for queryResult in JAConnMatrix.JAMatrixQuery(matrix, None, 'db01', None, True)],
+            [('app01', 'db01', 5432, 'REFUSED')])
+
+        ### saved matrix is read back, only new run appended to report is read
+        matrixFileName = os.path.join(self.tempDir.name, JAConnMatrix.JAMatrixFileName)
+        returnStatus, errorMsg = JAConnMatrix.JAMatrixWrite(matrix, matrixFileName)
+        self.assertTrue(returnStatus, errorMsg)
+        matrix = JAConnMatrix.JAMatrixRead(matrixFileName)
+        self.assertEqual(JAConnMatrix.JAMatrixScanReports(matrix, self.tempDir.name, 0), (0, 0))
+        self.AppendReport('app01', '2026-01-01T11:00:00.000000', 'db01', 'PASS',
+            'Connection to db01 5432 port [tcp] succeeded', 'PASS')
+        self.assertEqual(JAConnMatrix.JAMatrixScanReports(matrix, self.tempDir.name, 0), (1, 2))
+        self.assertEqual(JAConnMatrix.JAMatrixQuery(matrix, None, 'db01', None, True), [])
+
+    def test_outcome_classified_for_old_reports(self):
+        matrix = JAConnMatrix.JAMatrixNew()
+        self.assertTrue(JAConnMatrix.JAMatrixSaveResult(matrix, 'app01', 1.0, {
+            'Name': 'db01', 'Port': '5432', 'Details': 'Connection timed out'}))
+        self.assertEqual(JAConnMatrix.JAMatrixQuery(matrix, None, None, None, True)[0][3], 'TIMEOUT')
+
+
+if __name__ == '__main__':
+    unittest.main()
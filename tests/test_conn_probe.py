@@ -0,0 +1,67 @@
+"""
+Checks of built-in asyncio TCP connectivity prober
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import socket
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestConnProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.listenSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listenSocket.bind(('127.0.0.1', 0))
+        self.listenSocket.listen(16)
+        self.openPort = self.listenSocket.getsockname()[1]
+        ### port not in use, connection is refused
+        closedSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closedSocket.bind(('127.0.0.1', 0))
+        self.closedPort = closedSocket.getsockname()[1]
+        closedSocket.close()
+
+    def tearDown(self):
+        self.listenSocket.close()
+
+    def test_open_and_refused_ports(self):
+        endpoints = [
+            ('127.0.0.1', self.openPort, 'TCP', None, None, None, 1, 0),
+            ('127.0.0.1', self.closedPort, 'TCP', None, None, None, 1, 0),
+            ### duplicate endpoint is probed once
+            ('127.0.0.1', self.openPort, 'TCP', None, None, None, 1, 0) ]
+        connectivityResults = JAGlobalLib.JACheckConnectivityNative(endpoints, 2.0, 4, 0, 60, 0)
+        self.assertEqual(len(connectivityResults), 2)
+
+        returnOutput, connectTime, dnsTime, probeDetails = connectivityResults[
+            ('127.0.0.1', str(self.openPort), 'TCP', None, None, None, 1, 0)]
+        self.assertRegex(returnOutput, r'port \[tcp\] succeeded')
+        self.assertGreaterEqual(connectTime, 0)
+
+        returnOutput, connectTime, dnsTime, probeDetails = connectivityResults[
+            ('127.0.0.1', str(self.closedPort), 'TCP', None, None, None, 1, 0)]
+        self.assertRegex(returnOutput, r'Connection refused')
+
+    def test_port_range(self):
+        endpoints = [('127.0.0.1', range(self.openPort, self.openPort + 1), 'TCP', None, None, None, 1, 0)]
+        connectivityResults = JAGlobalLib.JACheckConnectivityNative(endpoints, 2.0, 1, 0, 60, 0)
+        self.assertEqual(list(connectivityResults), [('127.0.0.1', str(self.openPort), 'TCP', None, None, None, 1, 0)])
+
+    def test_unresolved_host(self):
+        endpoints = [('host.invalid', 80, 'TCP', None, None, None, 1, 0)]
+        connectivityResults = JAGlobalLib.JACheckConnectivityNative(endpoints, 2.0, 1, 0, 60, 0)
+        returnOutput, connectTime, dnsTime, probeDetails = connectivityResults[
+            ('host.invalid', '80', 'TCP', None, None, None, 1, 0)]
+        self.assertNotRegex(returnOutput, r'succeeded')
+
+    def test_no_endpoints(self):
+        self.assertEqual(JAGlobalLib.JACheckConnectivityNative([], 1.0, 1, 0, 60, 0), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
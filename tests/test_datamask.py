@@ -0,0 +1,83 @@
+"""
+Checks of in memory masking of IgnorePatterns while comparing files
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestDataMask(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.currentFileName = os.path.join(self.tempDir.name, 'item.current')
+        self.previousFileName = os.path.join(self.tempDir.name, 'item.prev')
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFiles(self, currentContent, previousContent):
+        with open(self.currentFileName, 'w') as file:
+            file.write(currentContent)
+        with open(self.previousFileName, 'w') as file:
+            file.write(previousContent)
+
+    def test_compile_ignore_patterns(self):
+        self.assertEqual(JAGlobalLib.JACompileIgnorePatterns(None), (True, None, ''))
+        returnStatus, compiledPattern, errorMsg = JAGlobalLib.JACompileIgnorePatterns(['pid=\\d+', 'time=\\S+'])
+        self.assertTrue(returnStatus)
+        self.assertEqual(compiledPattern.sub('X', 'pid=12 time=10:00 name=a'), 'X X name=a')
+        ### same patterns return cached compiled expression
+        self.assertIs(JAGlobalLib.JACompileIgnorePatterns(['pid=\\d+', 'time=\\S+'])[1], compiledPattern)
+        returnStatus, compiledPattern, errorMsg = JAGlobalLib.JACompileIgnorePatterns('(')
+        self.assertFalse(returnStatus)
+        self.assertIn('Invalid ignore pattern', errorMsg)
+
+    def test_mask_lines_normalizes_white_space(self):
+        returnStatus, compiledPattern, errorMsg = JAGlobalLib.JACompileIgnorePatterns('pid=\\d+')
+        lines = list(JAGlobalLib.JADataMaskLines(io.StringIO('  a   b  \n\n\tpid=42 c\n'), compiledPattern))
+        self.assertEqual(lines, ['a b', '__JADatamask__ c'])
+
+    def test_masked_files_match(self):
+        self.WriteFiles('name=a pid=100\nport 80\n', 'name=a  pid=200\n\nport 80\n')
+        returnStatus, diffLines, errorMsg = JAGlobalLib.JADiffDataMaskedFiles(
+            self.currentFileName, self.previousFileName, ['pid=\\d+'], 0)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(diffLines, [''])
+
+    def test_masked_files_differ(self):
+        self.WriteFiles('name=a pid=100\nport 81\n', 'name=a pid=200\nport 80\n')
+        returnStatus, diffLines, errorMsg = JAGlobalLib.JADiffDataMaskedFiles(
+            self.currentFileName, self.previousFileName, ['pid=\\d+'], 0)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertIn('-port 81', diffLines)
+        self.assertIn('+port 80', diffLines)
+
+    def test_leftover_datamasked_files_are_removed(self):
+        self.WriteFiles('a\n', 'a\n')
+        for fileName in (self.currentFileName, self.previousFileName):
+            with open(fileName + '.datamasked', 'w') as file:
+                file.write('a\n')
+        JAGlobalLib.JADiffDataMaskedFiles(self.currentFileName, self.previousFileName, None, 0)
+        self.assertFalse(os.path.exists(self.currentFileName + '.datamasked'))
+        self.assertFalse(os.path.exists(self.previousFileName + '.datamasked'))
+
+    def test_missing_file(self):
+        self.WriteFiles('a\n', 'a\n')
+        os.remove(self.previousFileName)
+        returnStatus, diffLines, errorMsg = JAGlobalLib.JADiffDataMaskedFiles(
+            self.currentFileName, self.previousFileName, None, 0)
+        self.assertFalse(returnStatus)
+        self.assertIn("Can't read file", errorMsg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Checks of DNS resolution cache used by connectivity checks
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestDNSCache(unittest.TestCase):
+
+    def setUp(self):
+        JAGlobalLib.JADNSCache.clear()
+
+    def tearDown(self):
+        JAGlobalLib.JADNSCache.clear()
+
+    def test_cache_expiry(self):
+        JAGlobalLib.JADNSCacheSet('host1', ['10.0.0.1'], '', 5.0, 60)
+        self.assertEqual(JAGlobalLib.JADNSCacheGet('host1'), (['10.0.0.1'], '', 5.0))
+        JAGlobalLib.JADNSCacheSet('host2', ['10.0.0.2'], '', 5.0, -1)
+        self.assertIsNone(JAGlobalLib.JADNSCacheGet('host2'))
+        ### expired entry is removed
+        self.assertNotIn('host2', JAGlobalLib.JADNSCache)
+        self.assertIsNone(JAGlobalLib.JADNSCacheGet('host3'))
+
+    def test_failed_resolution_is_cached(self):
+        JAGlobalLib.JADNSCacheSet('bad.host', [], 'Could not resolve hostname bad.host: error', 1.0, 60)
+        self.assertEqual(JAGlobalLib.JADNSCacheGet('bad.host')[1], 'Could not resolve hostname bad.host: error')
+
+    def test_get_host_address_uses_cache(self):
+        JAGlobalLib.JADNSCacheSet('cached.invalid', ['fe80::1', '10.1.2.3'], '', 1.0, 60)
+        self.assertEqual(JAGlobalLib.JAGetHostAddress('cached.invalid', 60), (True, '10.1.2.3', ''))
+
+    def test_resolve_host_name(self):
+        resolveExecutor = ThreadPoolExecutor(max_workers=1)
+        try:
+            addresses, errorMsg, dnsTime = asyncio.run(
+                JAGlobalLib.JAResolveHostName('127.0.0.1', 2.0, 60, resolveExecutor))
+            self.assertEqual((addresses, errorMsg), (['127.0.0.1'], ''))
+            ### second lookup is taken from cache
+            addresses, errorMsg, dnsTime = asyncio.run(
+                JAGlobalLib.JAResolveHostName('127.0.0.1', 2.0, 60, resolveExecutor))
+            self.assertEqual((addresses, dnsTime), (['127.0.0.1'], 0))
+        finally:
+            resolveExecutor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Checks of native health collectors and health metrics ring buffer
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestHealthMetricsHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.fileName = JAGlobalLib.JAGetHealthMetricsFileName(self.tempDir.name)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteSamples(self, values, historySize):
+        for value in values:
+            returnStatus, errorMsg = JAGlobalLib.JAWriteHealthMetricsHistory(
+                self.fileName, {'TimeStamp': value, 'CPUUsage': value * 10, 'Load1': value}, historySize)
+            self.assertTrue(returnStatus, errorMsg)
+
+    def test_file_name_under_log_path(self):
+        self.assertEqual(self.fileName, '{0}/{1}'.format(self.tempDir.name, JAGlobalLib.JAHealthMetricsFileName))
+
+    def test_ring_buffer_wraps(self):
+        self.WriteSamples(range(1, 8), 5)
+        self.assertEqual(
+            os.path.getsize(self.fileName),
+            JAGlobalLib.JAHealthMetricsHeader.size + JAGlobalLib.JAHealthMetricsRecord.size * 5)
+        returnStatus, samples, errorMsg = JAGlobalLib.JAReadHealthMetricsHistory(self.fileName)
+        self.assertTrue(returnStatus, errorMsg)
+        ### oldest first, first two samples are overwritten
+        self.assertEqual([sample['TimeStamp'] for sample in samples], [3.0, 4.0, 5.0, 6.0, 7.0])
+        returnStatus, samples, errorMsg = JAGlobalLib.JAReadHealthMetricsHistory(self.fileName, 2)
+        self.assertEqual([sample['CPUUsage'] for sample in samples], [60.0, 70.0])
+        ### metric not written is not available
+        self.assertNotEqual(samples[0]['MemUsedPercent'], samples[0]['MemUsedPercent'])
+
+    def test_history_size_change_recreates_file(self):
+        self.WriteSamples(range(1, 4), 5)
+        self.WriteSamples([9], 10)
+        returnStatus, samples, errorMsg = JAGlobalLib.JAReadHealthMetricsHistory(self.fileName)
+        self.assertEqual([sample['TimeStamp'] for sample in samples], [9.0])
+
+    def test_unexpected_layout(self):
+        with open(self.fileName, 'wb') as file:
+            file.write(b'CPU 10\n' * 20)
+        returnStatus, samples, errorMsg = JAGlobalLib.JAReadHealthMetricsHistory(self.fileName)
+        self.assertFalse(returnStatus)
+        self.assertIn('Unexpected layout', errorMsg)
+
+    def test_metric_trend(self):
+        self.WriteSamples(range(1, 6), 10)
+        self.assertEqual(JAGlobalLib.JAGetHealthMetricValue('CPUUsage.Average2', {}, self.fileName), (True, 45.0, ''))
+        self.assertEqual(JAGlobalLib.JAGetHealthMetricValue('Load1.Min3', {}, self.fileName), (True, 3.0, ''))
+        self.assertEqual(JAGlobalLib.JAGetHealthMetricValue('Load1.Max10', {}, self.fileName), (True, 5.0, ''))
+        self.assertEqual(JAGlobalLib.JAGetHealthMetricValue('CPUUsage', {'CPUUsage': 12.5}, self.fileName), (True, 12.5, ''))
+        self.assertFalse(JAGlobalLib.JAGetHealthMetricValue('MemUsedPercent.Average5', {}, self.fileName)[0])
+        self.assertFalse(JAGlobalLib.JAGetHealthMetricValue('Unknown', {}, self.fileName)[0])
+
+    def test_cpu_usage_history(self):
+        self.assertEqual(JAGlobalLib.JAReadCPUUsageHistory(healthMetricsFileName=self.fileName), ([0], 0))
+        for CPUUsage in (10, 20, 30):
+            self.assertTrue(JAGlobalLib.JAWriteCPUUsageHistory(CPUUsage, healthMetricsFileName=self.fileName, historySize=1440))
+        self.assertEqual(
+            JAGlobalLib.JAReadCPUUsageHistory(healthMetricsFileName=self.fileName), ([10.0, 20.0, 30.0], 20.0))
+        self.assertEqual(JAGlobalLib.JAGetAverageCPUUsage(self.fileName), 20.0)
+
+    def test_cpu_usage_history_old_signature(self):
+        ### file name is derived from LogFilePath of current run when not passed
+        with mock.patch.object(JAGlobalLib, 'JALogFilePath', os.path.dirname(self.fileName)):
+            for CPUUsage in (40, 60):
+                self.assertTrue(JAGlobalLib.JAWriteCPUUsageHistory(CPUUsage))
+            self.assertEqual(JAGlobalLib.JAReadCPUUsageHistory(), ([40.0, 60.0], 50.0))
+            self.assertEqual(JAGlobalLib.JAGetAverageCPUUsage(), 50.0)
+
+
+class TestEvaluateThreshold(unittest.TestCase):
+
+    def test_thresholds(self):
+        self.assertTrue(JAGlobalLib.JAEvaluateThreshold(50, '< 80'))
+        self.assertFalse(JAGlobalLib.JAEvaluateThreshold(90, '<80'))
+        self.assertTrue(JAGlobalLib.JAEvaluateThreshold(80, '>= 80'))
+        self.assertTrue(JAGlobalLib.JAEvaluateThreshold(-1, '!= 0'))
+        self.assertTrue(JAGlobalLib.JAEvaluateThreshold(2.5, '= 2.5'))
+        self.assertIsNone(JAGlobalLib.JAEvaluateThreshold(1, 'about 80'))
+
+
+@unittest.skipUnless(os.path.exists('/proc/stat'), 'needs /proc')
+class TestHealthMetrics(unittest.TestCase):
+
+    def test_collect(self):
+        returnStatus, metrics, errorMsg = JAGlobalLib.JAGetHealthMetrics()
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertGreater(metrics['MemTotalMB'], 0)
+        self.assertTrue(0 <= metrics['DiskUsedPercent'] <= 100)
+        ### CPU usage from ticks of previous sample
+        returnStatus, nextMetrics, errorMsg = JAGlobalLib.JAGetHealthMetrics(metrics)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertGreaterEqual(nextMetrics['CPUTotalTicks'], metrics['CPUTotalTicks'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Checks of input fingerprint used to skip Commands whose inputs did not change
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+
+class TestInputFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.tempDir.name, 'app.conf')
+        self.confDir = os.path.join(self.tempDir.name, 'conf.d')
+        os.mkdir(self.confDir)
+        with open(self.fileName, 'w') as file:
+            file.write('a=1\n')
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def Fingerprint(self, inputFingerprint, inputProbe=None):
+        returnStatus, fingerprint, errorMsg = JAOperationSaveCompare.JAInputFingerprintCompute(
+            inputFingerprint, inputProbe, '/bin/sh -c', 0, 'Linux')
+        self.assertTrue(returnStatus, errorMsg)
+        return fingerprint
+
+    def test_unchanged_inputs(self):
+        self.assertEqual(
+            self.Fingerprint([self.fileName, self.confDir]),
+            self.Fingerprint([self.fileName, self.confDir]))
+
+    def test_file_change(self):
+        fingerprint = self.Fingerprint([self.fileName])
+        with open(self.fileName, 'a') as file:
+            file.write('b=2\n')
+        self.assertNotEqual(self.Fingerprint([self.fileName]), fingerprint)
+
+    def test_directory_entry_added(self):
+        fingerprint = self.Fingerprint([self.confDir])
+        with open(os.path.join(self.confDir, 'new.conf'), 'w') as file:
+            file.write('c=3\n')
+        self.assertNotEqual(self.Fingerprint([self.confDir]), fingerprint)
+
+    def test_missing_input_created(self):
+        newFileName = os.path.join(self.tempDir.name, 'new.conf')
+        fingerprint = self.Fingerprint([newFileName])
+        with open(newFileName, 'w') as file:
+            file.write('d=4\n')
+        self.assertNotEqual(self.Fingerprint([newFileName]), fingerprint)
+
+    @unittest.skipUnless(os.path.exists('/bin/sh'), 'needs /bin/sh')
+    def test_input_probe(self):
+        self.assertEqual(self.Fingerprint(None, 'echo v1'), self.Fingerprint(None, 'echo v1'))
+        self.assertNotEqual(self.Fingerprint(None, 'echo v1'), self.Fingerprint(None, 'echo v2'))
+
+    def test_fingerprint_read(self):
+        self.assertEqual(JAOperationSaveCompare.JAInputFingerprintRead(self.tempDir.name, 'item'), '')
+        with open(JAOperationSaveCompare.JAInputFingerprintDeriveFileName(self.tempDir.name, 'item'), 'w') as file:
+            file.write('abcd\n')
+        self.assertEqual(JAOperationSaveCompare.JAInputFingerprintRead(self.tempDir.name, 'item'), 'abcd')
+
+
+if __name__ == '__main__':
+    unittest.main()
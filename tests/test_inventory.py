@@ -0,0 +1,83 @@
+"""
+Checks of package inventory parsing and change detection
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationCHILT
+
+
+class TestInventoryParse(unittest.TestCase):
+
+    def test_rpm(self):
+        packages = JAOperationCHILT.JAParseInventory('Packages', 'rpm', [
+            'openssl-libs-3.0.7-24.el9.x86_64',
+            'glibc-2.34-60.el9.x86_64',
+            'glibc-2.34-60.el9.i686',
+            'python3-pip-wheel-21.2.3-6.el9.noarch',
+            'gpg-pubkey-fd431d51-4ae0493b',
+            '' ])
+        self.assertEqual(packages, {
+            'openssl-libs.x86_64': '3.0.7-24.el9',
+            'glibc.x86_64': '2.34-60.el9',
+            'glibc.i686': '2.34-60.el9',
+            'python3-pip-wheel.noarch': '21.2.3-6.el9',
+            'gpg-pubkey': 'fd431d51-4ae0493b' })
+
+    def test_apt(self):
+        packages = JAOperationCHILT.JAParseInventory('Packages', 'apt', [
+            'Listing...',
+            'openssl/jammy-updates,now 3.0.2-0ubuntu1.10 amd64 [installed]',
+            'libc6/jammy-updates,now 2.35-0ubuntu3.4 amd64 [installed]',
+            'libc6/jammy-updates,now 2.35-0ubuntu3.4 i386 [installed]' ])
+        self.assertEqual(packages, {
+            'openssl.amd64': '3.0.2-0ubuntu1.10',
+            'libc6.amd64': '2.35-0ubuntu3.4',
+            'libc6.i386': '2.35-0ubuntu3.4' })
+
+    def test_dpkg_and_pip(self):
+        self.assertEqual(
+            JAOperationCHILT.JAParseInventory('Packages', 'dpkg', ['openssl\t3.0.2-0ubuntu1.10']),
+            {'openssl': '3.0.2-0ubuntu1.10'})
+        self.assertEqual(
+            JAOperationCHILT.JAParseInventory('Python', 'pip', ['Package Version', '------- -------', 'PyYAML 6.0.1', 'requests==2.31.0']),
+            {'PyYAML': '6.0.1', 'requests': '2.31.0'})
+
+    def test_single_line_version(self):
+        self.assertEqual(JAOperationCHILT.JAParseInventory('Java', None, ['', '17.0.9 ']), {'Java': '17.0.9'})
+        self.assertEqual(JAOperationCHILT.JAParseInventory('Java', None, ['a', 'b']), {})
+
+
+class TestInventoryChange(unittest.TestCase):
+
+    def test_delta(self):
+        self.assertEqual(
+            JAOperationCHILT.JAInventoryDelta(
+                {'glibc.x86_64': '2.34-60', 'glibc.i686': '2.34-60', 'zlib': '1.2'},
+                {'glibc.x86_64': '2.34-61', 'glibc.i686': '2.34-60', 'curl': '7.76'}),
+            ['Added: curl: 7.76', 'Changed: glibc.x86_64: 2.34-60 -> 2.34-61', 'Removed: zlib: 1.2'])
+        self.assertEqual(JAOperationCHILT.JAInventoryDelta({'a': '1'}, {'a': '1'}), [])
+
+    def test_change_signal(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            rpmDB = os.path.join(tempDir, 'rpmdb.sqlite')
+            changeSignal = '{0}, {1}/*.lock'.format(rpmDB, tempDir)
+            signal = JAOperationCHILT.JAGetInventoryChangeSignal(changeSignal)
+            ### files not present are part of signal so that those appearing are seen as change
+            self.assertEqual(signal, [[rpmDB, None, None], ['{0}/*.lock'.format(tempDir), None, None]])
+            with open(rpmDB, 'w') as file:
+                file.write('db')
+            changedSignal = JAOperationCHILT.JAGetInventoryChangeSignal(changeSignal)
+            self.assertNotEqual(changedSignal, signal)
+            self.assertEqual(changedSignal[0][2], 2)
+            self.assertEqual(JAOperationCHILT.JAGetInventoryChangeSignal(changeSignal), changedSignal)
+
+
+if __name__ == '__main__':
+    unittest.main()
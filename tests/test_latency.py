@@ -0,0 +1,66 @@
+"""
+Checks of latency and loss measurement with Samples
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import socket
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestLatency(unittest.TestCase):
+
+    def setUp(self):
+        self.listenSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listenSocket.bind(('127.0.0.1', 0))
+        self.listenSocket.listen(16)
+        self.openPort = str(self.listenSocket.getsockname()[1])
+
+    def tearDown(self):
+        self.listenSocket.close()
+
+    def ProbeSamples(self, port, samples, sampleInterval):
+        async def ProbeWithLimits():
+            probeLimits = {'Semaphore': asyncio.Semaphore(1), 'Rate': 0, 'NextStartTime': 0}
+            return await JAGlobalLib.JAProbeEndpoint(
+                'localhost', ['127.0.0.1'], (port, 'TCP', None, None, None, samples, sampleInterval), 1.0, probeLimits)
+        return asyncio.run(ProbeWithLimits())
+
+    def test_samples_summary(self):
+        returnOutput, latencyAvg, probeDetails = self.ProbeSamples(self.openPort, 5, 0.01)
+        self.assertRegex(returnOutput, r'port \[tcp\] succeeded, samples:5, loss:0.0%, latency min/avg/p95/max:')
+        self.assertEqual(probeDetails['Samples'], 5)
+        self.assertEqual(probeDetails['Loss'], 0.0)
+        self.assertLessEqual(probeDetails['LatencyMin'], probeDetails['LatencyAvg'])
+        self.assertLessEqual(probeDetails['LatencyAvg'], probeDetails['LatencyMax'])
+        self.assertLessEqual(probeDetails['LatencyP95'], probeDetails['LatencyMax'])
+
+    def test_all_samples_lost(self):
+        closedSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closedSocket.bind(('127.0.0.1', 0))
+        closedPort = str(closedSocket.getsockname()[1])
+        closedSocket.close()
+        returnOutput, latencyAvg, probeDetails = self.ProbeSamples(closedPort, 3, 0)
+        self.assertRegex(returnOutput, r'Connection refused')
+        self.assertEqual(probeDetails, {'Samples': 3, 'Loss': 100.0})
+
+    def test_rate_wait_spaces_probes(self):
+        async def WaitForProbes():
+            probeLimits = {'Semaphore': asyncio.Semaphore(1), 'Rate': 20, 'NextStartTime': 0}
+            startTime = time.perf_counter()
+            for probeNumber in range(5):
+                await JAGlobalLib.JAProbeRateWait(probeLimits)
+            return time.perf_counter() - startTime
+        ### 5 probes at 20 per second, 4 intervals of 50 ms
+        self.assertGreaterEqual(asyncio.run(WaitForProbes()), 0.19)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Checks of listen port inventory collected from /proc/net
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import socket
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+@unittest.skipUnless(sys.byteorder == 'little', 'addresses in /proc/net are decoded assuming little endian host')
+class TestProcNetAddress(unittest.TestCase):
+
+    def test_ipv4(self):
+        self.assertEqual(JAGlobalLib.JAProcNetAddress('0100007F:0016'), ('127.0.0.1', 22))
+        self.assertEqual(JAGlobalLib.JAProcNetAddress('00000000:1F90'), ('0.0.0.0', 8080))
+
+    def test_ipv6(self):
+        self.assertEqual(JAGlobalLib.JAProcNetAddress('00000000000000000000000001000000:0050'), ('::1', 80))
+        self.assertEqual(JAGlobalLib.JAProcNetAddress('00000000000000000000000000000000:01BB'), ('::', 443))
+
+
+@unittest.skipUnless(os.path.exists('/proc/net/tcp'), 'needs /proc/net')
+class TestListenPorts(unittest.TestCase):
+
+    def setUp(self):
+        JAGlobalLib.JAListenPorts = None
+        self.tcpSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcpSocket.bind(('127.0.0.1', 0))
+        self.tcpSocket.listen(1)
+        self.tcpPort = self.tcpSocket.getsockname()[1]
+        self.udpSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udpSocket.bind(('127.0.0.1', 0))
+        self.udpPort = self.udpSocket.getsockname()[1]
+
+    def tearDown(self):
+        self.tcpSocket.close()
+        self.udpSocket.close()
+        JAGlobalLib.JAListenPorts = None
+
+    def FindPort(self, listenPorts, protocol, port):
+        for listenPort in listenPorts:
+            if listenPort['Protocol'] == protocol and listenPort['Port'] == port:
+                return listenPort
+        return None
+
+    def test_listen_ports_with_process(self):
+        returnStatus, listenPorts, errorMsg = JAGlobalLib.JAGetListenPorts(True, 0)
+        self.assertTrue(returnStatus, errorMsg)
+        tcpPort = self.FindPort(listenPorts, 'tcp', self.tcpPort)
+        self.assertIsNotNone(tcpPort)
+        self.assertEqual(tcpPort['Address'], '127.0.0.1')
+        self.assertEqual(tcpPort['PID'], os.getpid())
+        self.assertIsNotNone(self.FindPort(listenPorts, 'udp', self.udpPort))
+
+    def test_connected_socket_is_not_listed(self):
+        clientSocket = socket.create_connection(('127.0.0.1', self.tcpPort))
+        try:
+            returnStatus, listenPorts, errorMsg = JAGlobalLib.JAGetListenPorts(False, 0)
+            self.assertIsNone(self.FindPort(listenPorts, 'tcp', clientSocket.getsockname()[1]))
+        finally:
+            clientSocket.close()
+
+    def test_result_is_cached(self):
+        returnStatus, listenPorts, errorMsg = JAGlobalLib.JAGetListenPorts(False, 0)
+        self.assertIs(JAGlobalLib.JAGetListenPorts(False, 0)[1], listenPorts)
+        ### process info not collected before, ports are collected again
+        self.assertIsNot(JAGlobalLib.JAGetListenPorts(True, 0)[1], listenPorts)
+
+
+if __name__ == '__main__':
+    unittest.main()
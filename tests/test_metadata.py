@@ -0,0 +1,74 @@
+"""
+Checks of metadata capture and compare for CompareType metadata
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+
+class TestMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.tempDir.name, 'app.conf')
+        self.linkName = os.path.join(self.tempDir.name, 'app.link')
+        with open(self.fileName, 'w') as file:
+            file.write('a=1\n')
+        os.chmod(self.fileName, 0o644)
+        os.symlink('app.conf', self.linkName)
+        self.itemFileNames = {
+            'file': self.fileName, 'link': self.linkName, 'dir': self.tempDir.name,
+            'missing': os.path.join(self.tempDir.name, 'missing') }
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_collect(self):
+        itemsMetadata = JAOperationSaveCompare.JAMetadataCollect(self.itemFileNames)
+        self.assertEqual(itemsMetadata['file']['Type'], 'f')
+        self.assertEqual(itemsMetadata['file']['Mode'], '644')
+        self.assertEqual(itemsMetadata['file']['Size'], '4')
+        self.assertEqual(itemsMetadata['link']['Type'], 'l')
+        self.assertEqual(itemsMetadata['link']['LinkTarget'], 'app.conf')
+        self.assertEqual(itemsMetadata['dir']['Type'], 'd')
+        self.assertEqual(itemsMetadata['dir']['Size'], '0')
+        self.assertEqual(itemsMetadata['missing']['Type'], 'missing')
+
+    def test_chmod_is_reported(self):
+        previousMetadata = JAOperationSaveCompare.JAMetadataCollect(self.itemFileNames)
+        os.chmod(self.fileName, 0o4755)
+        currentMetadata = JAOperationSaveCompare.JAMetadataCollect(self.itemFileNames)
+        changedAttributes = JAOperationSaveCompare.JAMetadataCompare(
+            currentMetadata['file'], previousMetadata['file'], False)
+        self.assertIn(('Mode', '4755', '644'), changedAttributes)
+        self.assertEqual(
+            JAOperationSaveCompare.JAMetadataCompare(currentMetadata['link'], previousMetadata['link'], False), [])
+
+    def test_mtime_skipped_for_host_to_host(self):
+        currentMetadata = JAOperationSaveCompare.JAMetadataCollect(self.itemFileNames)['file']
+        previousMetadata = dict(currentMetadata, MTime='1')
+        self.assertEqual(
+            [attribute[0] for attribute in JAOperationSaveCompare.JAMetadataCompare(currentMetadata, previousMetadata, False)],
+            ['MTime'])
+        self.assertEqual(JAOperationSaveCompare.JAMetadataCompare(currentMetadata, previousMetadata, True), [])
+
+    def test_write_and_read(self):
+        itemsMetadata = JAOperationSaveCompare.JAMetadataCollect(self.itemFileNames)
+        metadataFileName = JAOperationSaveCompare.JAMetadataDeriveFileName(
+            os.path.join(self.tempDir.name, 'App.compare'), 'sub1')
+        returnStatus, errorMsg = JAOperationSaveCompare.JAMetadataWrite(metadataFileName, itemsMetadata)
+        self.assertTrue(returnStatus, errorMsg)
+        returnStatus, readMetadata, errorMsg = JAOperationSaveCompare.JAMetadataRead(metadataFileName)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(readMetadata, itemsMetadata)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Checks of port range parsing and expansion of endpoints
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestPortRanges(unittest.TestCase):
+
+    def test_parse_port_ranges(self):
+        self.assertEqual(JAGlobalLib.JAParsePortRanges(22), (True, [range(22, 23)], ''))
+        self.assertEqual(
+            JAGlobalLib.JAParsePortRanges('22, 80 - 82,443,'),
+            (True, [range(22, 23), range(80, 83), range(443, 444)], ''))
+        ### large range is not expanded to list of ports
+        returnStatus, portRanges, errorMsg = JAGlobalLib.JAParsePortRanges('1-65535')
+        self.assertEqual(portRanges, [range(1, 65536)])
+
+    def test_invalid_ports(self):
+        for ports in ('http', '90-80', '1-65536', '22;23'):
+            returnStatus, portRanges, errorMsg = JAGlobalLib.JAParsePortRanges(ports)
+            self.assertFalse(returnStatus, ports)
+            self.assertRegex(errorMsg, r'^ERROR JAParsePortRanges\(\) invalid port')
+
+    def test_expand_endpoints(self):
+        endpoints = [
+            ('host1', range(80, 83), 'TCP', None, None, None, 1, 0),
+            ('host1', 81, 'TCP', None, None, None, 1, 0),
+            ('host2', 22, 'TCP', None, None, None, 1, 0) ]
+        expandedEndpoints = JAGlobalLib.JAExpandEndpoints(endpoints)
+        ### generator, ports are expanded one at a time
+        self.assertEqual(next(expandedEndpoints), ('host1', ('80', 'TCP', None, None, None, 1, 0)))
+        self.assertEqual(
+            [(hostName, probeSpec[0]) for hostName, probeSpec in expandedEndpoints],
+            [('host1', '81'), ('host1', '82'), ('host2', '22')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Checks of process table snapshot shared by conditions and process queries
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+class TestProcessQuery(unittest.TestCase):
+
+    def test_invalid_queries(self):
+        for processQuery in ({}, 'sleep', {'ProcessName': 'sleep', 'User': 'root'}):
+            returnStatus, processCount, errorMsg = JAGlobalLib.JACountProcesses(processQuery)
+            self.assertFalse(returnStatus, processQuery)
+            self.assertIn('Invalid process query', errorMsg)
+
+    def test_flow_mapping_without_yaml_module(self):
+        self.assertEqual(
+            JAGlobalLib.JAYamlParseFlowMapping("{ ProcessName: sshd, ProcessCmdLine: '-D' }"),
+            {'ProcessName': 'sshd', 'ProcessCmdLine': '-D'})
+        ### not a flow mapping, returned as is
+        for paramValue in ('{{ EmailAddress }}', '{}', "ps -ef |grep 'sshd' | wc -l"):
+            self.assertEqual(JAGlobalLib.JAYamlParseFlowMapping(paramValue), paramValue)
+
+        ### process query in shipped heal spec is read as query by basic yaml reader
+        healSpec = JAGlobalLib.JAYamlLoad(os.path.join(os.path.dirname(JAGlobalLib.__file__), 'LinuxAPP.Apps.heal.yml'))
+        processQuery = healSpec['All']['']['JAGatherOSStats']['Command']
+        self.assertEqual(processQuery, {'ProcessCmdLine': 'JAGatherOSStats.py'})
+        self.assertEqual(JAGlobalLib.JAIsSupportedCommand(processQuery, [], 'Linux'), (True, ''))
+
+
+@unittest.skipUnless(os.path.isdir('/proc/self') and shutil.which('sleep'), 'needs /proc and sleep command')
+class TestProcessSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        JAGlobalLib.JAInvalidateProcessSnapshot()
+        ### duration unique to this run, so that command line of other processes does not match
+        self.sleepDuration = '31.{0}'.format(os.getpid())
+        self.processQuery = {'ProcessName': 'sleep', 'ProcessCmdLine': self.sleepDuration}
+
+    def tearDown(self):
+        JAGlobalLib.JAInvalidateProcessSnapshot()
+
+    def StartProcess(self):
+        process = subprocess.Popen(['sleep', self.sleepDuration])
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        return process
+
+    def test_snapshot_is_shared(self):
+        returnStatus, processes, processNameIndex, errorMsg = JAGlobalLib.JAGetProcessSnapshot()
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertIs(JAGlobalLib.JAGetProcessSnapshot()[1], processes)
+        self.assertIsNot(JAGlobalLib.JAGetProcessSnapshot(refresh=True)[1], processes)
+        ### current program is not included
+        self.assertNotIn(os.getpid(), [process['PID'] for process in processes])
+
+    def test_invalidate_after_process_start(self):
+        self.assertEqual(JAGlobalLib.JACountProcesses(self.processQuery), (True, 0, ''))
+        process = self.StartProcess()
+        ### snapshot taken before the process started is used till it is invalidated
+        self.assertEqual(JAGlobalLib.JACountProcesses(self.processQuery), (True, 0, ''))
+        JAGlobalLib.JAInvalidateProcessSnapshot()
+        self.assertEqual(JAGlobalLib.JACountProcesses(self.processQuery), (True, 1, ''))
+
+        returnStatus, processes, processNameIndex, errorMsg = JAGlobalLib.JAGetProcessSnapshot()
+        sleepProcesses = [processes[processIndex] for processIndex in processNameIndex['sleep']]
+        sleepProcess = [tempProcess for tempProcess in sleepProcesses if tempProcess['PID'] == process.pid][0]
+        self.assertEqual(sleepProcess['PPID'], os.getpid())
+        self.assertEqual(sleepProcess['CmdLine'], 'sleep {0}'.format(self.sleepDuration))
+
+    def test_count_by_command_line_only(self):
+        self.StartProcess()
+        self.StartProcess()
+        JAGlobalLib.JAInvalidateProcessSnapshot()
+        self.assertEqual(JAGlobalLib.JACountProcesses({'ProcessCmdLine': 'sleep {0}'.format(self.sleepDuration)}), (True, 2, ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Checks of parallel self-test runner of test operation
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import xml.etree.ElementTree as ElementTree
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+import JAOperationCHILT
+
+### color codes are not used with colorIndex 0
+myColors = {
+    'red': [''], 'green': [''], 'yellow': [''], 'blue': [''], 'magenta': [''], 'cyan': [''], 'clear': [''] }
+
+
+class TestRunTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.startOrder = []
+        self.runningTests = 0
+        self.maxRunningTests = 0
+        self.outputFileHandle = io.StringIO()
+
+    def FakeRunTest(self, testName, testAttributes, defaultParameters, debugLevel,
+            interactiveMode, myColors, colorIndex, outputFileHandle, HTMLBRTag, OSType):
+        ### runs in place of JARunTest(), status is taken from test spec
+        with self.lock:
+            self.startOrder.append(testName)
+            self.runningTests += 1
+            self.maxRunningTests = max(self.maxRunningTests, self.runningTests)
+        time.sleep(testAttributes.get('Sleep', 0.01))
+        with self.lock:
+            self.runningTests -= 1
+        if testAttributes.get('Raise') == True:
+            raise RuntimeError('worker failed')
+        return {
+            'Condition': 'None', 'Status': testAttributes.get('Status', 'PASS'), 'Details': '', 'Output': [],
+            'DiffLines': [], 'ErrorMsg': '', 'PatternsMatched': 0, 'PatternsNotMatched': 0, 'PatternResults': [],
+            'StartTime': time.time(), 'Duration': 0.01 }
+
+    def RunTests(self, testParameters, maxParallelTests=4):
+        with mock.patch.object(JAOperationCHILT, 'JARunTest', self.FakeRunTest):
+            return JAOperationCHILT.JARunTests(
+                testParameters, {'MaxParallelTests': maxParallelTests}, 0,
+                False, myColors, 0, self.outputFileHandle, '', 'Linux')
+
+    def test_dependencies_run_in_order(self):
+        testResults = self.RunTests({
+            'Deploy': {'DependsOn': 'Start, Config'},
+            'Start': {'DependsOn': ['Config']},
+            'Config': {} })
+        self.assertEqual(list(testResults), ['Deploy', 'Start', 'Config'])
+        self.assertEqual(self.startOrder, ['Config', 'Start', 'Deploy'])
+        self.assertEqual({testResult['Status'] for testResult in testResults.values()}, {'PASS'})
+
+    def test_failed_or_undefined_dependency_skips_test(self):
+        testResults = self.RunTests({
+            'Config': {'Status': 'FAIL'},
+            'Start': {'DependsOn': 'Config'},
+            'Stop': {'DependsOn': 'Start'},
+            'Other': {'DependsOn': 'Missing'} })
+        self.assertEqual(testResults['Start']['Details'], 'Skipped, dependency Config status FAIL')
+        self.assertEqual(testResults['Stop']['Details'], 'Skipped, dependency Start status SKIPPED')
+        self.assertEqual(testResults['Other']['Details'], 'Skipped, dependency Missing not defined')
+        self.assertEqual(self.startOrder, ['Config'])
+
+    def test_dependency_cycle(self):
+        testResults = self.RunTests({
+            'A': {'DependsOn': 'B'}, 'B': {'DependsOn': 'A'}, 'C': {} })
+        self.assertEqual(testResults['A']['Details'], 'Skipped, dependency cycle in DependsOn')
+        self.assertEqual(testResults['B']['Status'], 'SKIPPED')
+        self.assertEqual(testResults['C']['Status'], 'PASS')
+
+    def test_worker_exception_is_error(self):
+        testResults = self.RunTests({'Boom': {'Raise': True}, 'After': {'DependsOn': 'Boom'}, 'Other': {}})
+        self.assertEqual(testResults['Boom']['Status'], 'ERROR')
+        self.assertEqual(testResults['Boom']['ErrorMsg'], 'RuntimeError: worker failed')
+        self.assertEqual(testResults['After']['Status'], 'SKIPPED')
+        self.assertEqual(testResults['Other']['Status'], 'PASS')
+        self.assertIn('ERROR JARunTests() test:Boom', self.outputFileHandle.getvalue())
+
+    def test_max_parallel_tests(self):
+        testParameters = {'T{0}'.format(index): {'Sleep': 0.05} for index in range(6)}
+        self.RunTests(testParameters, maxParallelTests=2)
+        self.assertEqual(self.maxRunningTests, 2)
+        self.RunTests(testParameters, maxParallelTests=0)
+        self.assertEqual(self.maxRunningTests, 2)
+
+    def test_write_reports(self):
+        testResults = self.RunTests({'Config': {'Status': 'DIFF'}, 'Start': {'DependsOn': 'Config'}, 'Boom': {'Raise': True}})
+        with tempfile.TemporaryDirectory() as tempDir:
+            reportFileName = os.path.join(tempDir, 'JAAudit.test')
+            returnStatus, errorMsg = JAOperationCHILT.JAWriteTestReports(
+                reportFileName, testResults, 'App.test', 'host1', time.time())
+            self.assertTrue(returnStatus, errorMsg)
+            testSuite = ElementTree.parse(reportFileName + '.xml').getroot()
+            self.assertEqual(
+                (testSuite.get('tests'), testSuite.get('failures'), testSuite.get('errors'), testSuite.get('skipped')),
+                ('3', '1', '1', '1'))
+            with open(reportFileName + '.json') as file:
+                testReport = json.load(file)
+            self.assertEqual(testReport['Counts'], {'DIFF': 1, 'SKIPPED': 1, 'ERROR': 1, 'FAIL': 0})
+
+
+@unittest.skipUnless(shutil.which('sh'), 'needs /bin/sh')
+class TestRunTestComparePatterns(unittest.TestCase):
+
+    def test_pattern_results_in_test_result(self):
+        outputFileHandle = io.StringIO()
+        testAttributes = {
+            'Command': None, 'Test': 'echo version: 3.2', 'ComparePatterns': {r'version: (\d+)\.(\d+)': {1: 3, 2: 4}},
+            'CompiledComparePatterns': JAGlobalLib.JACompileComparePatterns(
+                'Version', {r'version: (\d+)\.(\d+)': {1: 3, 2: 4}}, False, 0, myColors, 0, outputFileHandle, '', 'Linux') }
+        testResult = JAOperationCHILT.JARunTest(
+            'Version', testAttributes, {'CommandShell': '/bin/sh -c', 'TestTimeoutInSec': 10}, 0,
+            False, myColors, 0, outputFileHandle, '', 'Linux')
+        self.assertEqual(testResult['Status'], 'FAIL')
+        self.assertEqual(testResult['PatternResults'], [{'Pattern': r'version: (\d+)\.(\d+)', 'Found': False, 'Groups': [
+            {'Group': 1, 'Expected': 3, 'Current': '3', 'Matched': True},
+            {'Group': 2, 'Expected': 4, 'Current': '2', 'Matched': False}]}])
+
+        ### pattern results are part of JSON report and failure text of JUnit report
+        with tempfile.TemporaryDirectory() as tempDir:
+            reportFileName = os.path.join(tempDir, 'JAAudit.test')
+            JAOperationCHILT.JAWriteTestReports(reportFileName, {'Version': testResult}, 'App.test', 'host1', time.time())
+            with open(reportFileName + '.json') as file:
+                testReport = json.load(file)
+            self.assertEqual(testReport['Tests']['Version']['PatternResults'][0]['Groups'][1]['Current'], '2')
+            failure = ElementTree.parse(reportFileName + '.xml').getroot().find('testcase/failure')
+            self.assertIn('group:2 expected:|4| current:|2| NOT matched', failure.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Checks of JAOperationSaveItem() run from thread pool during save and backup operations
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+import JAOperationSaveCompare
+
+### color codes are not used with colorIndex 0
+myColors = {
+    'red': [''], 'green': [''], 'yellow': [''], 'blue': [''], 'magenta': [''], 'cyan': [''], 'clear': [''] }
+
+
+class TestSaveParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.sourceDir = os.path.join(self.tempDir.name, 'source')
+        self.saveDir = os.path.join(self.tempDir.name, 'save')
+        os.mkdir(self.sourceDir)
+        os.mkdir(self.saveDir)
+        self.defaultParameters = {
+            'ChecksumAlgorithm': JAGlobalLib.JAChecksumDefaultAlgorithm, 'CommandShell': '/bin/sh -c' }
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def SaveItem(self, itemName, objectAttributes):
+        attributes = {
+            'Command': None, 'FileNames': None, 'CompareType': None, 'ComparePatterns': None,
+            'IgnorePatterns': None, 'SkipH2H': False }
+        attributes.update(objectAttributes)
+        return JAOperationSaveCompare.JAOperationSaveItem(
+            itemName, attributes, self.saveDir, None,
+            self.defaultParameters, False, 0,
+            myColors, 0, None, '', 'Linux')
+
+    def test_save_items_in_parallel(self):
+        items = {}
+        for index in range(20):
+            fileName = os.path.join(self.sourceDir, 'file{0}.txt'.format(index))
+            with open(fileName, 'w') as file:
+                file.write('content {0}\n'.format(index))
+            items['file{0}'.format(index)] = {'FileNames': fileName}
+            items['sum{0}'.format(index)] = {'FileNames': fileName, 'CompareType': 'checksum'}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                itemName: executor.submit(self.SaveItem, itemName, objectAttributes)
+                for itemName, objectAttributes in items.items() }
+            results = {itemName: future.result() for itemName, future in futures.items()}
+
+        self.assertEqual(sum(result['Errors'] for result in results.values()), 0)
+        self.assertEqual(sum(result['FilesSaved'] for result in results.values()), 20)
+        self.assertEqual(sum(result['ChecksumsSaved'] for result in results.values()), 20)
+        for index in range(20):
+            with open(os.path.join(self.saveDir, 'file{0}'.format(index))) as file:
+                self.assertEqual(file.read(), 'content {0}\n'.format(index))
+            with open(os.path.join(self.saveDir, 'sum{0}.checksum'.format(index))) as file:
+                algorithm, digest = JAGlobalLib.JAParseChecksum(file.read())
+            self.assertEqual(algorithm, JAGlobalLib.JAChecksumDefaultAlgorithm)
+
+    def test_missing_file_counts_as_error(self):
+        itemCounters = self.SaveItem('missing', {'FileNames': os.path.join(self.sourceDir, 'missing')})
+        self.assertEqual(itemCounters['Errors'], 1)
+        self.assertEqual(itemCounters['FilesSaved'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Checks of packed snapshot of saved environment
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.saveDir = self.tempDir.name
+        self.snapshotFileName = JAOperationSaveCompare.JASnapshotDeriveFileName(
+            os.path.join(self.saveDir, 'App.compare'), 'sub1')
+        for memberName in ('item1', 'item2.checksum'):
+            with open(os.path.join(self.saveDir, memberName), 'w') as file:
+                file.write('content of {0}\n'.format(memberName) * 50)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_get_compression(self):
+        self.assertEqual(JAOperationSaveCompare.JASnapshotGetCompression(None), zipfile.ZIP_DEFLATED)
+        self.assertEqual(JAOperationSaveCompare.JASnapshotGetCompression('LZMA'), zipfile.ZIP_LZMA)
+        self.assertEqual(JAOperationSaveCompare.JASnapshotGetCompression('none'), zipfile.ZIP_STORED)
+        self.assertEqual(
+            JAOperationSaveCompare.JASnapshotGetCompression('zstd'),
+            getattr(zipfile, 'ZIP_ZSTANDARD', zipfile.ZIP_DEFLATED))
+
+    def test_write_and_read_member(self):
+        returnStatus, packedMemberNames, errorMsg = JAOperationSaveCompare.JASnapshotWrite(
+            self.snapshotFileName, self.saveDir, ['item1', 'item2.checksum', 'missing'], 'gzip')
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(packedMemberNames, ['item1', 'item2.checksum'])
+        self.assertFalse(os.path.exists('{0}.{1}.tmp'.format(self.snapshotFileName, os.getpid())))
+
+        returnStatus, content, errorMsg = JAOperationSaveCompare.JASnapshotReadMember(self.snapshotFileName, 'item1')
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(content, b'content of item1\n' * 50)
+
+        returnStatus, content, errorMsg = JAOperationSaveCompare.JASnapshotReadMember(self.snapshotFileName, 'missing')
+        self.assertFalse(returnStatus)
+        self.assertEqual(content, b'')
+
+    def test_reference_file_from_snapshot(self):
+        JAOperationSaveCompare.JASnapshotWrite(self.snapshotFileName, self.saveDir, ['item1'], 'gzip')
+        ### file present under save directory is used as is
+        referenceFileName, tempFile = JAOperationSaveCompare.JASnapshotGetReferenceFile(
+            self.saveDir, 'item1', self.snapshotFileName, self.saveDir)
+        self.assertEqual((referenceFileName, tempFile), ('{0}/item1'.format(self.saveDir), False))
+
+        ### file packed in snapshot is extracted to temporary file
+        os.remove(os.path.join(self.saveDir, 'item1'))
+        referenceFileName, tempFile = JAOperationSaveCompare.JASnapshotGetReferenceFile(
+            self.saveDir, 'item1', self.snapshotFileName, self.saveDir)
+        self.assertTrue(tempFile)
+        self.assertEqual(os.path.dirname(referenceFileName), self.saveDir)
+        with open(referenceFileName) as file:
+            self.assertEqual(file.read(), 'content of item1\n' * 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Checks of structured format aware compare
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+
+class TestStructured(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFile(self, fileName, content):
+        fileName = os.path.join(self.tempDir.name, fileName)
+        with open(fileName, 'w') as file:
+            file.write(content)
+        return fileName
+
+    def ParseFile(self, fileName, fileFormat):
+        returnStatus, keyValues, errorMsg = JAOperationSaveCompare.JAStructuredParseFile(fileName, fileFormat, False)
+        self.assertTrue(returnStatus, errorMsg)
+        return keyValues
+
+    def test_get_format(self):
+        self.assertEqual(JAOperationSaveCompare.JAStructuredGetFormat('/etc/app.JSON'), 'json')
+        self.assertEqual(JAOperationSaveCompare.JAStructuredGetFormat('/etc/app.yaml'), 'yaml')
+        ### .conf is used by many formats, needs StructuredFormat
+        self.assertIsNone(JAOperationSaveCompare.JAStructuredGetFormat('/etc/nginx.conf'))
+        self.assertEqual(JAOperationSaveCompare.JAStructuredGetFormat('/etc/app.conf', 'ini'), 'ini')
+
+    def test_flatten(self):
+        keyValues = {}
+        JAOperationSaveCompare.JAStructuredFlatten(
+            {'server': {'hosts': ['a', 'b'], 'port': 80, 'opts': {}}, 'empty': []}, '', keyValues)
+        self.assertEqual(keyValues, {
+            'server.hosts[0]': 'a', 'server.hosts[1]': 'b', 'server.port': '80', 'server.opts': '{}', 'empty': '[]'})
+
+    def test_key_order_does_not_matter(self):
+        currentFileName = self.WriteFile('current.json', '{"a": 1, "b": {"c": 2}}')
+        previousFileName = self.WriteFile('previous.json', '{"b": {"c": 2}, "a": 1}')
+        self.assertEqual(
+            JAOperationSaveCompare.JAStructuredCompare(
+                self.ParseFile(currentFileName, 'json'), self.ParseFile(previousFileName, 'json'), None),
+            ([], [], []))
+
+    def test_compare_with_ignore_keys(self):
+        currentKeyValues = {'server.a.host': 'h2', 'server.a.port': '81', 'log.level': 'debug', 'new': '1'}
+        previousKeyValues = {'server.a.host': 'h1', 'server.a.port': '80', 'log.level': 'info', 'old': '1'}
+        addedKeys, removedKeys, changedKeys = JAOperationSaveCompare.JAStructuredCompare(
+            currentKeyValues, previousKeyValues, 'server.*.host, log.level')
+        self.assertEqual(addedKeys, [('new', '1')])
+        self.assertEqual(removedKeys, [('old', '1')])
+        self.assertEqual(changedKeys, [('server.a.port', '81', '80')])
+
+    def test_ini_and_properties(self):
+        iniFileName = self.WriteFile('app.conf', '[Main]\nPort = 80\n')
+        self.assertEqual(self.ParseFile(iniFileName, 'ini'), {'Main.Port': '80'})
+        propertiesFileName = self.WriteFile('app.properties', '# comment\nname=a\nlist=x,\\\n  y\nflag\n')
+        self.assertEqual(self.ParseFile(propertiesFileName, 'properties'), {'name': 'a', 'list': 'x,y', 'flag': ''})
+
+    def test_parse_error(self):
+        fileName = self.WriteFile('bad.json', '{"a": ')
+        returnStatus, keyValues, errorMsg = JAOperationSaveCompare.JAStructuredParseFile(fileName, 'json', False)
+        self.assertFalse(returnStatus)
+        self.assertIn('Not able to parse file', errorMsg)
+
+    def test_keys_cache(self):
+        fileName = self.WriteFile('app.json', '{"a": 1}')
+        keysFileName = os.path.join(self.tempDir.name, 'app.keys')
+        JAOperationSaveCompare.JAStructuredGetKeys(fileName, 'sha256:1', 'json', keysFileName, False)
+        ### same digest, keys are read from cache without parsing the file
+        self.WriteFile('app.json', '{"a": 2}')
+        returnStatus, keyValues, errorMsg = JAOperationSaveCompare.JAStructuredGetKeys(
+            fileName, 'sha256:1', 'json', keysFileName, False)
+        self.assertEqual(keyValues, {'a': '1'})
+        returnStatus, keyValues, errorMsg = JAOperationSaveCompare.JAStructuredGetKeys(
+            fileName, 'sha256:2', 'json', keysFileName, False)
+        self.assertEqual(keyValues, {'a': '2'})
+
+
+if __name__ == '__main__':
+    unittest.main()
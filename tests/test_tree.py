@@ -0,0 +1,86 @@
+"""
+Checks of directory tree snapshot and Merkle compare
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAOperationSaveCompare
+
+
+class TestTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.rootDir = os.path.join(self.tempDir.name, 'root')
+        os.makedirs(os.path.join(self.rootDir, 'conf', 'sub'))
+        os.mkdir(os.path.join(self.rootDir, 'lib'))
+        self.WriteFile('conf/app.conf', 'a=1\n')
+        self.WriteFile('conf/sub/x.conf', 'x=1\n')
+        self.WriteFile('lib/lib.so', 'binary\n')
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def WriteFile(self, relName, content):
+        with open(os.path.join(self.rootDir, relName), 'w') as file:
+            file.write(content)
+
+    def BuildTree(self, previousNodes=None):
+        returnStatus, treeNodes, errorMsg = JAOperationSaveCompare.JATreeBuild(
+            self.rootDir, previousNodes if previousNodes != None else {}, 'sha256')
+        self.assertTrue(returnStatus, errorMsg)
+        return treeNodes
+
+    def test_unchanged_tree(self):
+        previousNodes = self.BuildTree()
+        currentNodes = self.BuildTree(previousNodes)
+        self.assertEqual(currentNodes['.'][4], previousNodes['.'][4])
+        self.assertEqual(JAOperationSaveCompare.JATreeCompare(currentNodes, previousNodes), ([], [], []))
+
+    def test_changes_are_reported(self):
+        previousNodes = self.BuildTree()
+        self.WriteFile('conf/sub/x.conf', 'x=2\n')
+        self.WriteFile('conf/new.conf', 'n=1\n')
+        os.remove(os.path.join(self.rootDir, 'lib/lib.so'))
+        os.chmod(os.path.join(self.rootDir, 'conf/app.conf'), 0o600)
+        currentNodes = self.BuildTree(previousNodes)
+        addedNames, removedNames, modifiedNames = JAOperationSaveCompare.JATreeCompare(currentNodes, previousNodes)
+        self.assertEqual(addedNames, ['conf/new.conf'])
+        self.assertEqual(removedNames, ['lib/lib.so'])
+        self.assertIn('conf/sub/x.conf', modifiedNames)
+        self.assertIn('conf/app.conf', modifiedNames)
+
+    def test_type_change(self):
+        previousNodes = self.BuildTree()
+        os.remove(os.path.join(self.rootDir, 'lib/lib.so'))
+        os.mkdir(os.path.join(self.rootDir, 'lib/lib.so'))
+        addedNames, removedNames, modifiedNames = JAOperationSaveCompare.JATreeCompare(
+            self.BuildTree(previousNodes), previousNodes)
+        self.assertEqual(addedNames, ['lib/lib.so'])
+        self.assertEqual(removedNames, ['lib/lib.so'])
+
+    def test_write_and_read(self):
+        treeNodes = self.BuildTree()
+        treeFileName = os.path.join(self.tempDir.name, 'item.tree')
+        returnStatus, errorMsg = JAOperationSaveCompare.JATreeWrite(treeFileName, treeNodes, 'sha256')
+        self.assertTrue(returnStatus, errorMsg)
+        returnStatus, readNodes, checksumAlgorithm, errorMsg = JAOperationSaveCompare.JATreeRead(treeFileName)
+        self.assertTrue(returnStatus, errorMsg)
+        self.assertEqual(checksumAlgorithm, 'sha256')
+        self.assertEqual(readNodes, treeNodes)
+
+    def test_not_a_directory(self):
+        returnStatus, treeNodes, errorMsg = JAOperationSaveCompare.JATreeBuild(
+            os.path.join(self.rootDir, 'lib/lib.so'), {}, 'sha256')
+        self.assertFalse(returnStatus)
+        self.assertIn('Not a directory', errorMsg)
+
+
+if __name__ == '__main__':
+    unittest.main()
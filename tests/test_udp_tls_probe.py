@@ -0,0 +1,124 @@
+"""
+Checks of UDP, TLS and HTTP probes of built-in connectivity prober
+
+Run from repository home directory
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import JAGlobalLib
+
+
+def JAEchoServer(udpSocket):
+    ### reply to each datagram till socket is closed
+    while True:
+        try:
+            request, clientAddress = udpSocket.recvfrom(65535)
+        except OSError:
+            return
+        udpSocket.sendto(b'pong:' + request, clientAddress)
+
+
+def JATLSServer(listenSocket, sslContext):
+    ### handshake and reply to one HTTP request per connection till socket is closed
+    while True:
+        try:
+            clientSocket, clientAddress = listenSocket.accept()
+        except OSError:
+            return
+        try:
+            with sslContext.wrap_socket(clientSocket, server_side=True) as tlsSocket:
+                tlsSocket.settimeout(2)
+                if tlsSocket.recv(4096).startswith(b'GET '):
+                    tlsSocket.sendall(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+        except (OSError, ssl.SSLError):
+            clientSocket.close()
+
+
+class TestUDPProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.udpSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udpSocket.bind(('127.0.0.1', 0))
+        self.udpPort = str(self.udpSocket.getsockname()[1])
+        threading.Thread(target=JAEchoServer, args=(self.udpSocket,), daemon=True).start()
+
+    def tearDown(self):
+        self.udpSocket.close()
+
+    def test_reply_matches(self):
+        returnOutput, responseTime, probeDetails = asyncio.run(JAGlobalLib.JAProbeUDPEndpoint(
+            'localhost', ['127.0.0.1'], self.udpPort, 2.0, 'ping\\n', '^pong:ping'))
+        self.assertRegex(returnOutput, r'port \[udp\] succeeded')
+        self.assertEqual(probeDetails['ReplyBytes'], 10)
+
+    def test_unexpected_reply(self):
+        returnOutput, responseTime, probeDetails = asyncio.run(JAGlobalLib.JAProbeUDPEndpoint(
+            'localhost', ['127.0.0.1'], self.udpPort, 2.0, 'ping', 'OK'))
+        self.assertRegex(returnOutput, r'^Unexpected reply')
+
+    def test_no_reply(self):
+        ### port not in use, port unreachable is received or no reply within timeout
+        closedSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        closedSocket.bind(('127.0.0.1', 0))
+        closedPort = str(closedSocket.getsockname()[1])
+        closedSocket.close()
+        returnOutput, responseTime, probeDetails = asyncio.run(JAGlobalLib.JAProbeUDPEndpoint(
+            'localhost', ['127.0.0.1'], closedPort, 0.5, 'ping', None))
+        self.assertRegex(returnOutput, r'Connection refused|Connection timed out')
+
+
+@unittest.skipUnless(shutil.which('openssl'), 'needs openssl to generate test certificate')
+class TestTLSProbe(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempDir = tempfile.TemporaryDirectory()
+        certFileName = os.path.join(cls.tempDir.name, 'cert.pem')
+        keyFileName = os.path.join(cls.tempDir.name, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '2',
+             '-subj', '/CN=jaaudit.test', '-keyout', keyFileName, '-out', certFileName],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        sslContext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        sslContext.load_cert_chain(certFileName, keyFileName)
+        cls.listenSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.listenSocket.bind(('127.0.0.1', 0))
+        cls.listenSocket.listen(16)
+        cls.tlsPort = str(cls.listenSocket.getsockname()[1])
+        threading.Thread(target=JATLSServer, args=(cls.listenSocket, sslContext), daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.listenSocket.close()
+        cls.tempDir.cleanup()
+
+    def test_self_signed_certificate(self):
+        returnOutput, connectTime, probeDetails = asyncio.run(JAGlobalLib.JAProbeTLSEndpoint(
+            'localhost', ['127.0.0.1'], self.tlsPort, 5.0))
+        ### port is reachable, verification failure is reported separately
+        self.assertRegex(returnOutput, r'port \[tls\] succeeded')
+        self.assertRegex(probeDetails['CertVerification'], r'^TLS certificate verification failed')
+        self.assertIn('jaaudit.test', probeDetails['CertSubject'])
+        self.assertRegex(probeDetails['CertNotAfter'], r' GMT$')
+        self.assertIn(probeDetails['TLSVersion'], ('TLSv1.2', 'TLSv1.3'))
+
+    def test_https_verification_failure(self):
+        returnOutput, connectTime, probeDetails = asyncio.run(JAGlobalLib.JAProbeHTTPEndpoint(
+            'localhost', ['127.0.0.1'], self.tlsPort, 5.0, True, None, None))
+        self.assertRegex(returnOutput, r'^TLS certificate verification failed')
+        self.assertEqual(JAGlobalLib.JAClassifyConnectivityOutput(returnOutput), 'FAILED')
+
+
+if __name__ == '__main__':
+    unittest.main()